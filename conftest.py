@@ -8,6 +8,7 @@ import yaml
 from django.db.models.signals import pre_save
 
 from fixtures.common import *  # pylint:disable=wildcard-import,unused-wildcard-import  # noqa: F403
+from gdrive_sync.api import clear_drive_clients
 from websites.constants import OMNIBUS_STARTER_SLUG
 from websites.models import WebsiteContent, WebsiteStarter
 from websites.signals import update_navmenu_on_page_url_change
@@ -18,6 +19,7 @@ from websites.site_config_api import SiteConfig
 def default_settings(settings):
     """Set default settings for all tests"""
     settings.DISABLE_WEBPACK_LOADER_STATS = True
+    settings.S3_INVENTORY_PATH = ":memory:"
 
 
 @pytest.fixture(autouse=True)
@@ -31,6 +33,8 @@ def mock_gdrive_build(mocker):
     """
     mocker.patch("gdrive_sync.api.build")
     mocker.patch("videos.youtube.build")
+    # Services cached by an earlier test would have been built by another mock
+    clear_drive_clients()
 
 
 @pytest.fixture
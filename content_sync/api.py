@@ -102,6 +102,7 @@ def get_mass_build_sites_pipeline(  # pylint:disable=too-many-arguments  # noqa:
     hugo_args: str | None = "",
     theme_slug: str | None = "",
     sync_with_delete: bool = False,
+    site_names: list[str] | None = None,
 ) -> object:
     """Get the mass build sites pipeline if the backend has one"""
     return import_string(
@@ -117,6 +118,7 @@ def get_mass_build_sites_pipeline(  # pylint:disable=too-many-arguments  # noqa:
         hugo_args=hugo_args,
         theme_slug=theme_slug,
         sync_with_delete=sync_with_delete,
+        site_names=site_names,
     )
 
 
@@ -1,5 +1,6 @@
 """Github API wrapper"""
 
+import json
 import logging
 from base64 import b64decode
 from dataclasses import dataclass
@@ -22,6 +23,7 @@ from github import (
     InputGitTreeElement,
 )
 from github.InputGitAuthor import InputGitAuthor
+from mitol.common.utils import chunks
 from safedelete.models import HARD_DELETE
 from yamale import YamaleError
 
@@ -550,3 +552,56 @@ def find_files_recursive(
         elif file_name in str(content.name):
             file_paths.append(content.path)
     return file_paths
+
+
+def get_top_level_tree(repo_url: str, branch: str) -> dict[str, str]:
+    """
+    Return the git object SHA of each top level file and directory on a branch of
+    a public repo, like ocw-hugo-themes or ocw-hugo-projects
+    """
+    repo_path = urlparse(repo_url).path.strip("/").removesuffix(".git")
+    git = Github(timeout=settings.GITHUB_TIMEOUT)
+    tree = git.get_repo(repo_path, lazy=True).get_git_tree(branch)
+    return {element.path: element.sha for element in tree.tree}
+
+
+def get_content_shas(
+    short_ids: Iterable[str], branch: str, chunk_size: int = 100
+) -> dict[str, str]:
+    """
+    Return the head commit SHA of a branch in each site content repo. Repos are
+    queried a chunk at a time with GraphQL instead of with a request per repo, and
+    repos in a chunk that could not be queried are left out.
+    """
+    git = Github(
+        timeout=settings.GITHUB_TIMEOUT,
+        login_or_token=get_token(),
+        **(
+            {"base_url": settings.GIT_API_URL}
+            if settings.GIT_API_URL is not None
+            else {}
+        ),
+    )
+    ref = json.dumps(f"refs/heads/{branch}")
+    owner = json.dumps(settings.GIT_ORGANIZATION)
+    shas = {}
+    for short_id_chunk in chunks(list(short_ids), chunk_size=chunk_size):
+        query = " ".join(
+            f"repo{index}: repository(owner: {owner}, name: {json.dumps(short_id)}) "
+            f"{{ ref(qualifiedName: {ref}) {{ target {{ oid }} }} }}"
+            for index, short_id in enumerate(short_id_chunk)
+        )
+        try:
+            _, response = git.requester.graphql_query(f"query {{ {query} }}", {})
+        except GithubException:
+            log.exception(
+                "Could not get the %s commits of %d content repos",
+                branch,
+                len(short_id_chunk),
+            )
+            continue
+        for index, short_id in enumerate(short_id_chunk):
+            repo = response["data"].get(f"repo{index}") or {}
+            if repo.get("ref"):
+                shas[short_id] = repo["ref"]["target"]["oid"]
+    return shas
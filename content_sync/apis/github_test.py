@@ -19,7 +19,9 @@ from content_sync.apis.github import (
     GithubApiWrapper,
     find_files_recursive,
     get_app_installation_id,
+    get_content_shas,
     get_token,
+    get_top_level_tree,
     sync_starter_configs,
 )
 from main import features
@@ -1064,3 +1066,46 @@ def test_find_files_recursive(mocker, mock_github):
     repo.get_contents.side_effect = get_content_side_effect
     files = find_files_recursive(repo=repo, path="", file_name="ocw-studio.yaml")
     assert files == ["site-1/ocw-studio.yaml", "site-2/ocw-studio.yaml"]
+
+
+def test_get_top_level_tree(mocker, mock_github):
+    """get_top_level_tree should return the SHA of each top level path of a branch"""
+    get_repo = mock_github.return_value.get_repo
+    get_repo.return_value.get_git_tree.return_value.tree = [
+        mocker.Mock(path="base-theme", sha="abc"),
+        mocker.Mock(path="package.json", sha="def"),
+    ]
+    assert get_top_level_tree(
+        "https://github.com/mitodl/ocw-hugo-themes.git", "main"
+    ) == {"base-theme": "abc", "package.json": "def"}
+    get_repo.assert_called_once_with("mitodl/ocw-hugo-themes", lazy=True)
+    get_repo.return_value.get_git_tree.assert_called_once_with("main")
+
+
+def test_get_content_shas(settings, mocker, mock_github):
+    """get_content_shas should query content repos in chunks and skip failed chunks"""
+    settings.GIT_TOKEN = "faketoken"  # noqa: S105
+    settings.GIT_ORGANIZATION = "fake_org"
+    mock_log = mocker.patch("content_sync.apis.github.log.exception")
+    graphql_query = mock_github.return_value.requester.graphql_query
+    graphql_query.side_effect = [
+        (
+            {},
+            {
+                "data": {
+                    "repo0": {"ref": {"target": {"oid": "sha1"}}},
+                    "repo1": {"ref": None},
+                }
+            },
+        ),
+        GithubException(502, "Bad gateway", {}),
+        ({}, {"data": {"repo0": {"ref": {"target": {"oid": "sha5"}}}}}),
+    ]
+    assert get_content_shas(
+        ["site1", "site2", "site3", "site4", "site5"], "release", chunk_size=2
+    ) == {"site1": "sha1", "site5": "sha5"}
+    assert graphql_query.call_count == 3
+    query = graphql_query.call_args_list[0].args[0]
+    assert 'repository(owner: "fake_org", name: "site2")' in query
+    assert 'ref(qualifiedName: "refs/heads/release")' in query
+    mock_log.assert_called_once()
@@ -0,0 +1,156 @@
+"""Tracking of site build inputs, so that mass builds can skip unchanged sites"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from content_sync.apis.github import get_content_shas, get_top_level_tree
+from content_sync.models import SITE_BUILD_INPUT_FIELDS, SiteBuildInputs
+from content_sync.utils import (
+    get_projects_branch,
+    get_site_content_branch,
+    get_theme_branch,
+)
+from websites.constants import OCW_HUGO_THEMES_GIT, STARTER_SOURCE_GITHUB
+from websites.models import Website, WebsiteStarter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+@dataclass(frozen=True)
+class BuildInputs:
+    """Everything that determines the output of a site build"""
+
+    content_sha: str
+    theme_sha: str
+    projects_sha: str
+    starter_config_hash: str
+
+
+def get_digest(value) -> str:
+    """Return a sha256 hex digest of the JSON representation of a value"""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _get_starter_paths(paths_by_slug: dict[str, set[str]], slug: str) -> set[str]:
+    """Return the paths that belong to starters other than the given one"""
+    return {
+        path
+        for other_slug, paths in paths_by_slug.items()
+        if other_slug != slug
+        for path in paths
+    }
+
+
+def _get_tree_digest(tree: dict[str, str], excluded: set[str]) -> str:
+    """Return a digest of the entries of a top level tree, leaving some paths out"""
+    return get_digest({path: sha for path, sha in tree.items() if path not in excluded})
+
+
+def get_build_inputs(
+    sites: Iterable[Website], version: str
+) -> dict[Website, BuildInputs]:
+    """
+    Return the current build inputs of each site. Top level paths of ocw-hugo-themes
+    and ocw-hugo-projects that only other starters use are left out of the theme
+    and projects digests of a site, so that changing them does not change its
+    inputs. Sites whose content repo could not be queried are left out.
+
+    Args:
+        sites(Iterable[Website]): The sites to get build inputs for
+        version(str): The version (draft/live) of the sites
+    """
+    sites = list(sites)
+    root_starter = Website.objects.get(name=settings.ROOT_WEBSITE_NAME).starter
+    theme_tree = get_top_level_tree(OCW_HUGO_THEMES_GIT, get_theme_branch())
+    projects_tree = get_top_level_tree(
+        root_starter.ocw_hugo_projects_url, get_projects_branch()
+    )
+    content_shas = get_content_shas(
+        [site.short_id for site in sites], get_site_content_branch(version)
+    )
+    theme_paths = {
+        slug: {path.strip() for path in paths.split(",") if path.strip()}
+        for slug, paths in settings.OCW_HUGO_THEMES_STARTER_PATHS.items()
+    }
+    project_paths = {
+        starter.slug: {urlparse(starter.path).path.rstrip("/").rsplit("/", 1)[-1]}
+        for starter in WebsiteStarter.objects.filter(source=STARTER_SOURCE_GITHUB)
+    }
+    starter_inputs = {}
+    inputs = {}
+    for site in sites:
+        if site.short_id not in content_shas:
+            continue
+        slug = site.starter.slug if site.starter else ""
+        if slug not in starter_inputs:
+            starter_inputs[slug] = (
+                _get_tree_digest(theme_tree, _get_starter_paths(theme_paths, slug)),
+                _get_tree_digest(
+                    projects_tree, _get_starter_paths(project_paths, slug)
+                ),
+                get_digest(site.starter.config if site.starter else None),
+            )
+        theme_sha, projects_sha, starter_config_hash = starter_inputs[slug]
+        inputs[site] = BuildInputs(
+            content_sha=content_shas[site.short_id],
+            theme_sha=theme_sha,
+            projects_sha=projects_sha,
+            starter_config_hash=starter_config_hash,
+        )
+    return inputs
+
+
+def get_changed_sites(
+    sites: Iterable[Website], version: str, inputs: dict[Website, BuildInputs]
+) -> list[Website]:
+    """
+    Return the sites whose current build inputs differ from the inputs of their
+    last successful build, or that have no recorded or current inputs
+
+    Args:
+        sites(Iterable[Website]): The sites to check
+        version(str): The version (draft/live) of the sites
+        inputs(dict[Website, BuildInputs]): The current build inputs of the sites
+    """
+    sites = list(sites)
+    recorded = {
+        values["website_id"]: BuildInputs(
+            **{field: values[field] for field in SITE_BUILD_INPUT_FIELDS}
+        )
+        for values in SiteBuildInputs.objects.filter(
+            version=version, website__in=sites
+        ).values("website_id", *SITE_BUILD_INPUT_FIELDS)
+    }
+    return [
+        site
+        for site in sites
+        if site not in inputs or recorded.get(site.pk) != inputs[site]
+    ]
+
+
+def record_pending_build_inputs(version: str, inputs: dict[Website, BuildInputs]):
+    """
+    Record the inputs of triggered site builds. They become the inputs of the last
+    successful build of each site when its build succeeds.
+
+    Args:
+        version(str): The version (draft/live) of the sites
+        inputs(dict[Website, BuildInputs]): The build inputs of the sites
+    """
+    SiteBuildInputs.objects.bulk_create(
+        [
+            SiteBuildInputs(
+                website_id=site.pk, version=version, pending=asdict(site_inputs)
+            )
+            for site, site_inputs in inputs.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["website", "version"],
+        update_fields=["pending", "updated_on"],
+    )
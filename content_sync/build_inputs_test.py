@@ -0,0 +1,136 @@
+"""Tests for site build inputs"""
+
+from dataclasses import asdict
+
+import pytest
+
+from content_sync.build_inputs import (
+    BuildInputs,
+    get_build_inputs,
+    get_changed_sites,
+    get_digest,
+    record_pending_build_inputs,
+)
+from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.models import SiteBuildInputs
+from websites.constants import OCW_HUGO_THEMES_GIT, STARTER_SOURCE_GITHUB
+from websites.factories import WebsiteFactory, WebsiteStarterFactory
+
+pytestmark = pytest.mark.django_db
+
+THEME_TREE = {"base-theme": "t1", "course-v2": "t2", "www": "t3"}
+PROJECTS_TREE = {"ocw-course-v2": "p1", "ocw-www": "p2", "README.md": "p3"}
+
+
+@pytest.fixture
+def starters(settings):
+    """Course and root website starters in ocw-hugo-projects"""
+    settings.OCW_HUGO_THEMES_STARTER_PATHS = {
+        "ocw-course-v2": "course-v2",
+        "ocw-www": " www ",
+    }
+    course_starter, root_starter = (
+        WebsiteStarterFactory.create(
+            slug=slug,
+            source=STARTER_SOURCE_GITHUB,
+            path=f"https://github.com/mitodl/ocw-hugo-projects/tree/main/{slug}",
+        )
+        for slug in ("ocw-course-v2", "ocw-www")
+    )
+    WebsiteFactory.create(name=settings.ROOT_WEBSITE_NAME, starter=root_starter)
+    return course_starter, root_starter
+
+
+@pytest.fixture
+def mock_github(mocker):
+    """Mock the github trees and content commits"""
+    mocker.patch(
+        "content_sync.build_inputs.get_top_level_tree",
+        side_effect=lambda repo_url, _: (
+            THEME_TREE if "ocw-hugo-themes" in repo_url else PROJECTS_TREE
+        ),
+    )
+    return mocker.patch(
+        "content_sync.build_inputs.get_content_shas",
+        side_effect=lambda short_ids, _: {
+            short_id: f"sha-{short_id}" for short_id in short_ids
+        },
+    )
+
+
+def test_get_build_inputs(starters, mock_github):
+    """Build inputs should only include the theme and project paths of the starter"""
+    course_starter, root_starter = starters
+    course_site = WebsiteFactory.create(starter=course_starter)
+    root_site = WebsiteFactory.create(starter=root_starter)
+    missing_site = WebsiteFactory.create(starter=course_starter)
+    mock_github.side_effect = lambda short_ids, _: {
+        short_id: f"sha-{short_id}"
+        for short_id in short_ids
+        if short_id != missing_site.short_id
+    }
+    inputs = get_build_inputs([course_site, root_site, missing_site], VERSION_LIVE)
+    assert inputs == {
+        course_site: BuildInputs(
+            content_sha=f"sha-{course_site.short_id}",
+            theme_sha=get_digest({"base-theme": "t1", "course-v2": "t2"}),
+            projects_sha=get_digest({"ocw-course-v2": "p1", "README.md": "p3"}),
+            starter_config_hash=get_digest(course_starter.config),
+        ),
+        root_site: BuildInputs(
+            content_sha=f"sha-{root_site.short_id}",
+            theme_sha=get_digest({"base-theme": "t1", "www": "t3"}),
+            projects_sha=get_digest({"ocw-www": "p2", "README.md": "p3"}),
+            starter_config_hash=get_digest(root_starter.config),
+        ),
+    }
+
+
+def test_get_build_inputs_branches(mocker, starters, mock_github):
+    """The theme and projects trees should be read from their own branches"""
+    mocker.patch(
+        "content_sync.build_inputs.get_theme_branch", return_value="theme-branch"
+    )
+    mocker.patch(
+        "content_sync.build_inputs.get_projects_branch",
+        return_value="projects-branch",
+    )
+    mock_tree = mocker.patch(
+        "content_sync.build_inputs.get_top_level_tree", return_value={}
+    )
+    get_build_inputs([], VERSION_LIVE)
+    assert [call.args for call in mock_tree.call_args_list] == [
+        (OCW_HUGO_THEMES_GIT, "theme-branch"),
+        (starters[1].ocw_hugo_projects_url, "projects-branch"),
+    ]
+
+
+def test_get_changed_sites(starters, mock_github):
+    """Only sites whose inputs changed since their last successful build should be returned"""
+    course_starter, _ = starters
+    sites = WebsiteFactory.create_batch(4, starter=course_starter)
+    inputs = get_build_inputs(sites, VERSION_DRAFT)
+    for site in sites[:3]:
+        SiteBuildInputs.objects.create(
+            website=site, version=VERSION_DRAFT, **asdict(inputs[site])
+        )
+    SiteBuildInputs.objects.filter(website=sites[1]).update(theme_sha="old")
+    SiteBuildInputs.objects.filter(website=sites[2]).update(version=VERSION_LIVE)
+    assert get_changed_sites(sites, VERSION_DRAFT, inputs) == sites[1:]
+    del inputs[sites[0]]
+    assert get_changed_sites(sites, VERSION_DRAFT, inputs) == sites
+
+
+def test_record_pending_build_inputs(starters, mock_github):
+    """Pending build inputs should be recorded once the build succeeds"""
+    course_starter, _ = starters
+    sites = WebsiteFactory.create_batch(2, starter=course_starter)
+    inputs = get_build_inputs(sites, VERSION_LIVE)
+    SiteBuildInputs.objects.create(
+        website=sites[0], version=VERSION_LIVE, theme_sha="old"
+    )
+    record_pending_build_inputs(VERSION_LIVE, inputs)
+    assert get_changed_sites(sites, VERSION_LIVE, inputs) == sites
+    assert SiteBuildInputs.objects.filter(website=sites[0]).apply_pending() == 1
+    assert get_changed_sites(sites, VERSION_LIVE, inputs) == sites[1:]
+    assert SiteBuildInputs.objects.get(website=sites[0]).pending is None
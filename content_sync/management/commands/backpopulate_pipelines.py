@@ -6,6 +6,7 @@ from mitol.common.utils.datetime import now_in_utc
 
 from content_sync.api import get_pipeline_api
 from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.models import PipelineConfigFingerprint
 from content_sync.tasks import upsert_pipelines
 from main.management.commands.filter import WebsiteFilterCommand
 from websites.models import Website
@@ -67,6 +68,13 @@ class Command(WebsiteFilterCommand):
             action="store_true",
             help="Delete all existing site pipelines first",
         )
+        parser.add_argument(
+            "-f",
+            "--force",
+            dest="force",
+            action="store_true",
+            help="Upsert site pipelines even if their configuration is unchanged",
+        )
 
     def handle(self, *args, **options):
         super().handle(*args, **options)
@@ -85,14 +93,20 @@ class Command(WebsiteFilterCommand):
         unpause = options["unpause"]
         delete_all = options["delete_all"]
 
+        pipeline_names = [VERSION_LIVE, VERSION_DRAFT]
+        for theme_slug in settings.OCW_EXTRA_COURSE_THEMES:
+            pipeline_names.append(f"{VERSION_DRAFT}-{theme_slug}")
+            pipeline_names.append(f"{VERSION_LIVE}-{theme_slug}")
+
+        if options["force"]:
+            PipelineConfigFingerprint.objects.filter(
+                pipeline_name__in=pipeline_names
+            ).delete()
+
         if delete_all:
             self.stdout.write("Deleting all existing site pipelines first")
             api = get_pipeline_api()
             if api:
-                pipeline_names = [VERSION_LIVE, VERSION_DRAFT]
-                for theme_slug in settings.OCW_EXTRA_COURSE_THEMES:
-                    pipeline_names.append(f"{VERSION_DRAFT}-{theme_slug}")
-                    pipeline_names.append(f"{VERSION_LIVE}-{theme_slug}")
                 api.delete_pipelines(names=pipeline_names)
                 self.stdout.write("Deleted all site pipelines")
             else:
@@ -0,0 +1,95 @@
+"""Management command for benchmarking the rendering of Concourse pipeline definitions"""  # noqa: E501, INP001
+
+import time
+
+import yaml
+from django.core.management import BaseCommand
+
+from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.pipelines.concourse import (
+    MassBuildSitesPipeline,
+    PipelineApi,
+    SitePipeline,
+    ThemeAssetsPipeline,
+)
+from websites.constants import STARTER_SOURCE_GITHUB
+from websites.models import Website
+
+
+class Command(BaseCommand):
+    """
+    Render site, mass build and theme assets pipeline definitions without
+    upserting them, and report how long rendering took
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sites",
+            dest="sites",
+            type=int,
+            default=20,
+            help="The number of websites to render site pipelines for",
+        )
+        parser.add_argument(
+            "--iterations",
+            dest="iterations",
+            type=int,
+            default=3,
+            help="The number of times to render each pipeline",
+        )
+        parser.add_argument(
+            "--compare-yaml",
+            dest="compare_yaml",
+            action="store_true",
+            help="Also time rendering the definitions through the YAML loader",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        iterations = max(options["iterations"], 1)
+        api = PipelineApi()
+        websites = Website.objects.filter(
+            starter__source=STARTER_SOURCE_GITHUB
+        ).select_related("starter")[: options["sites"]]
+        pipelines = {
+            "site": [SitePipeline(website, api=api) for website in websites],
+            "mass build": [
+                MassBuildSitesPipeline(version, api=api)
+                for version in (VERSION_DRAFT, VERSION_LIVE)
+            ],
+            "theme assets": [ThemeAssetsPipeline(api=api)],
+        }
+        for kind, kind_pipelines in pipelines.items():
+            build_seconds = render_seconds = yaml_seconds = 0.0
+            config_count = config_bytes = 0
+            for _ in range(iterations):
+                for pipeline in kind_pipelines:
+                    start = time.perf_counter()
+                    configs = pipeline.get_pipeline_configs()
+                    build_seconds += time.perf_counter() - start
+                    for _, config_str in configs:
+                        start = time.perf_counter()
+                        config = pipeline.render_config(config_str)
+                        render_seconds += time.perf_counter() - start
+                        config_count += 1
+                        config_bytes += len(config)
+                        if options["compare_yaml"]:
+                            start = time.perf_counter()
+                            yaml.load(config_str, Loader=yaml.SafeLoader)
+                            yaml_seconds += time.perf_counter() - start
+            if not config_count:
+                self.stdout.write(f"{kind}: no pipelines to render")
+                continue
+            self.stdout.write(
+                f"{kind}: rendered {config_count} definitions "
+                f"({config_bytes // config_count} bytes each) in "
+                f"{build_seconds + render_seconds:.3f}s, "
+                f"{1000 * build_seconds / config_count:.2f}ms building and "
+                f"{1000 * render_seconds / config_count:.2f}ms rendering each"
+            )
+            if options["compare_yaml"]:
+                self.stdout.write(
+                    f"{kind}: the YAML loader took "
+                    f"{1000 * yaml_seconds / config_count:.2f}ms per definition"
+                )
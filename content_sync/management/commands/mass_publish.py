@@ -68,6 +68,17 @@ class Command(WebsiteFilterCommand):
                 "Has no effect when --no-mass-build is set."
             ),
         )
+        parser.add_argument(
+            "--incremental",
+            dest="incremental",
+            action="store_true",
+            default=False,
+            help=(
+                "Only mass build the sites whose content, theme, projects or starter "
+                "config changed since their last successful build. Has no effect "
+                "when --no-mass-build is set."
+            ),
+        )
 
     def handle(self, *args, **options):  # pylint:disable=too-many-locals
         super().handle(*args, **options)
@@ -82,6 +93,7 @@ class Command(WebsiteFilterCommand):
         prepublish = options["prepublish"]
         no_mass_build = options["no_mass_build"]
         sync_with_delete = options["sync_with_delete"]
+        incremental = options["incremental"]
         is_verbose = options["verbosity"] > 1
 
         website_qset = Website.objects.filter(starter__source=STARTER_SOURCE_GITHUB)
@@ -126,6 +138,7 @@ Would you like to proceed? (y/n): """  # noqa: E501
             prepublish=prepublish,
             no_mass_build=no_mass_build,
             sync_with_delete=sync_with_delete,
+            incremental=incremental,
         )
 
         self.stdout.write(
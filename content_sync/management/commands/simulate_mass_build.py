@@ -0,0 +1,123 @@
+"""Management command for estimating how long a mass build takes to run"""  # noqa: INP001
+
+import json
+from random import shuffle
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.scheduling import (
+    get_expected_build_seconds,
+    schedule_batches,
+    simulate_batches,
+)
+from content_sync.utils import get_publishable_sites
+
+
+class Command(BaseCommand):
+    """
+    Estimate the wall-clock time of a mass build from recorded site build
+    durations, with sites batched in a random order and by expected build time
+    """
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--site-version",
+            dest="version",
+            default=VERSION_LIVE,
+            choices=[VERSION_DRAFT, VERSION_LIVE],
+            help="The version of the sites to build",
+        )
+        parser.add_argument(
+            "--offline",
+            dest="offline",
+            action="store_true",
+            help="Simulate an offline mass build",
+        )
+        parser.add_argument(
+            "--durations",
+            dest="durations",
+            default=None,
+            help=(
+                "A JSON file mapping site names to build durations in seconds, "
+                "used instead of the recorded durations"
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=settings.OCW_MASS_BUILD_BATCH_SIZE,
+            help="The number of sites per batch",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            dest="max_in_flight",
+            type=int,
+            default=settings.OCW_MASS_BUILD_MAX_IN_FLIGHT,
+            help="The number of sites each batch builds at the same time",
+        )
+        parser.add_argument(
+            "--iterations",
+            dest="iterations",
+            type=int,
+            default=20,
+            help="The number of random orderings to average",
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if options["durations"]:
+            with open(options["durations"]) as durations_file:  # noqa: PTH123
+                expected_seconds = {
+                    name: float(seconds)
+                    for name, seconds in json.load(durations_file).items()
+                }
+        else:
+            expected_seconds = {
+                site.name: seconds
+                for site, seconds in get_expected_build_seconds(
+                    get_publishable_sites(
+                        options["version"], is_offline=options["offline"]
+                    ).only("name", f"{options['version']}_build_duration"),
+                    options["version"],
+                ).items()
+            }
+        if not expected_seconds:
+            msg = "There are no site build durations to simulate"
+            raise CommandError(msg)
+        batch_size = max(options["batch_size"], 1)
+        max_in_flight = max(options["max_in_flight"], 1)
+        iterations = max(options["iterations"], 1)
+
+        names = list(expected_seconds)
+        random_seconds = 0.0
+        for _ in range(iterations):
+            shuffle(names)
+            random_seconds += simulate_batches(
+                schedule_batches(names, dict.fromkeys(names, 0), batch_size),
+                expected_seconds,
+                max_in_flight,
+            )
+        random_seconds /= iterations
+        shuffle(names)
+        scheduled_seconds = simulate_batches(
+            schedule_batches(names, expected_seconds, batch_size),
+            expected_seconds,
+            max_in_flight,
+        )
+        self.stdout.write(
+            f"{len(names)} sites in batches of {batch_size}, {max_in_flight} at a time"
+        )
+        self.stdout.write(
+            f"Random order: {random_seconds / 3600:.2f} hours "
+            f"(average of {iterations} orderings)"
+        )
+        self.stdout.write(
+            f"Longest first: {scheduled_seconds / 3600:.2f} hours "
+            f"({100 * (1 - scheduled_seconds / random_seconds):.1f}% shorter)"
+            if random_seconds
+            else f"Longest first: {scheduled_seconds / 3600:.2f} hours"
+        )
@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content_sync", "0004_content_not_nullable"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PipelineConfigFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("updated_on", models.DateTimeField(auto_now=True)),
+                ("pipeline_name", models.CharField(max_length=255)),
+                (
+                    "instance_vars",
+                    models.CharField(blank=True, default="", max_length=1024),
+                ),
+                ("fingerprint", models.CharField(max_length=64)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("pipeline_name", "instance_vars"),
+                        name="unique_pipeline_config_fingerprint",
+                    )
+                ],
+            },
+        ),
+    ]
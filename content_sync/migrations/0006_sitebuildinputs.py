@@ -0,0 +1,61 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content_sync", "0005_pipelineconfigfingerprint"),
+        ("websites", "0076_website_build_duration"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SiteBuildInputs",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                ("updated_on", models.DateTimeField(auto_now=True)),
+                ("version", models.CharField(max_length=20)),
+                (
+                    "content_sha",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("theme_sha", models.CharField(blank=True, default="", max_length=64)),
+                (
+                    "projects_sha",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                (
+                    "starter_config_hash",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("pending", models.JSONField(null=True)),
+                (
+                    "website",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="build_inputs",
+                        to="websites.website",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("website", "version"),
+                        name="unique_site_build_inputs",
+                    )
+                ],
+            },
+        ),
+    ]
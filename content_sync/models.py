@@ -2,9 +2,10 @@
 
 from bulk_update_or_create import BulkUpdateOrCreateQuerySet
 from django.db import models
+from django.db.models.fields.json import KT
 from mitol.common.models import TimestampedModel, TimestampedModelQuerySet
 
-from websites.models import WebsiteContent
+from websites.models import Website, WebsiteContent
 
 
 class ContentSyncStateQuerySet(TimestampedModelQuerySet):
@@ -38,3 +39,81 @@ class ContentSyncState(TimestampedModel):
     def __str__(self):  # pragma: no cover
         """Returns a string representation of the state"""  # noqa: D401
         return f"Sync State for content: {self.content.title if self.content else None}"
+
+
+class PipelineConfigFingerprint(TimestampedModel):
+    """
+    Data model for tracking the last configuration upserted for a pipeline, so
+    that unchanged configurations can be skipped
+    """
+
+    pipeline_name = models.CharField(max_length=255)
+    instance_vars = models.CharField(max_length=1024, blank=True, default="")
+    fingerprint = models.CharField(max_length=64)  # sized for a sha256
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_pipeline_config_fingerprint",
+                fields=("pipeline_name", "instance_vars"),
+            )
+        ]
+
+    def __str__(self):  # pragma: no cover
+        """Returns a string representation of the fingerprint"""  # noqa: D401
+        return (
+            f"Config fingerprint for pipeline: {self.pipeline_name}{self.instance_vars}"
+        )
+
+
+SITE_BUILD_INPUT_FIELDS = (
+    "content_sha",
+    "theme_sha",
+    "projects_sha",
+    "starter_config_hash",
+)
+
+
+class SiteBuildInputsQuerySet(models.QuerySet):
+    """Queryset for SiteBuildInputs"""
+
+    def apply_pending(self) -> int:
+        """Record the pending inputs as the inputs of the last successful build"""
+        return self.filter(pending__isnull=False).update(
+            **{field: KT(f"pending__{field}") for field in SITE_BUILD_INPUT_FIELDS},
+            pending=None,
+        )
+
+
+class SiteBuildInputs(TimestampedModel):
+    """
+    Data model for tracking the inputs of the last successful build of a site, so
+    that incremental mass builds can skip sites whose inputs have not changed
+    """
+
+    objects = SiteBuildInputsQuerySet.as_manager()
+
+    website = models.ForeignKey(
+        Website, on_delete=models.CASCADE, related_name="build_inputs"
+    )
+    version = models.CharField(max_length=20)
+    content_sha = models.CharField(max_length=64, blank=True, default="")
+    theme_sha = models.CharField(max_length=64, blank=True, default="")
+    projects_sha = models.CharField(max_length=64, blank=True, default="")
+    starter_config_hash = models.CharField(max_length=64, blank=True, default="")
+
+    pending = models.JSONField(
+        null=True
+    )  # the inputs of a triggered build, recorded above once it succeeds
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_site_build_inputs",
+                fields=("website", "version"),
+            )
+        ]
+
+    def __str__(self):  # pragma: no cover
+        """Returns a string representation of the build inputs"""  # noqa: D401
+        return f"Build inputs for {self.version} site: {self.website.name}"
@@ -1,6 +1,10 @@
 """Sync abstract base"""
 
 import abc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 
 class BasePipelineApi(abc.ABC):
@@ -16,6 +20,21 @@ class BasePipelineApi(abc.ABC):
         """Delete a list of pipelines"""
         ...
 
+    @abc.abstractmethod
+    def get_build_status(self, build_id: int) -> str:
+        """Retrieve the status of a build"""
+        ...
+
+    @abc.abstractmethod
+    def get_build_statuses(self, build_ids: Iterable[int]) -> dict[int, str]:
+        """Retrieve the statuses of as many of the given builds as can be found"""
+        ...
+
+    @abc.abstractmethod
+    def abort_build(self, build_id: int):
+        """Abort a build"""
+        ...
+
 
 class BasePipeline(abc.ABC):
     """Base class for a pipeline"""
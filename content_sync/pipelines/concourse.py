@@ -6,17 +6,22 @@ clearly exists but pylint thinks it doesn't
 """
 
 # pylint: disable=no-name-in-module
+import hashlib
 import json
 import logging
 import os
+import re
+import threading
+from collections import Counter
 from html import unescape
 from typing import TYPE_CHECKING
-from urllib.parse import quote, urljoin, urlparse
+from urllib.parse import quote, urlencode, urljoin, urlparse
 
 import requests
 import yaml
 from concoursepy.api import Api
 from django.conf import settings
+from django_redis import get_redis_connection
 from requests import HTTPError
 
 from content_sync.constants import (
@@ -24,6 +29,7 @@ from content_sync.constants import (
     VERSION_LIVE,
 )
 from content_sync.decorators import retry_on_failure
+from content_sync.models import PipelineConfigFingerprint
 from content_sync.pipelines.base import (
     BaseGeneralPipeline,
     BaseMassBuildSitesPipeline,
@@ -75,10 +81,24 @@ from main.utils import is_dev
 from websites.constants import STARTER_SOURCE_GITHUB
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from websites.models import Website
 
 log = logging.getLogger(__name__)
 
+# Identifiers in concourse API paths, replaced so that request counts are per route
+CONCOURSE_ROUTE_PATTERNS = [
+    (re.compile(rf"/{segment}/[^/]+"), f"/{segment}/:{name}")
+    for segment, name in [
+        ("teams", "team"),
+        ("pipelines", "pipeline"),
+        ("jobs", "job"),
+        ("resources", "resource"),
+        ("builds", "build"),
+    ]
+]
+
 MANDATORY_CONCOURSE_SETTINGS = [
     "CONCOURSE_URL",
     "CONCOURSE_USERNAME",
@@ -93,6 +113,9 @@ class PipelineApi(Api, BasePipelineApi):
 
     def __init__(self, url=None, username=None, password=None, token=None):
         """Initialize the API"""
+        self.request_counts = Counter()
+        # Worker threads share an instance, so only one of them logs in at a time
+        self._auth_lock = threading.Lock()
         super().__init__(
             url or settings.CONCOURSE_URL,
             username=username or settings.CONCOURSE_USERNAME,
@@ -100,40 +123,121 @@ class PipelineApi(Api, BasePipelineApi):
             token=token or settings.CONCOURSE_TEAM,
         )
 
+    def _count_request(self, method: str, path: str):
+        """Count a request by its method and route, with identifiers removed"""
+        route = urlparse(path).path
+        for pattern, replacement in CONCOURSE_ROUTE_PATTERNS:
+            route = pattern.sub(replacement, route)
+        self.request_counts[f"{method} {route}"] += 1
+
+    def _get_auth_cache_key(self) -> str:
+        """Return the Redis key that holds the auth token for this url and user"""
+        digest = hashlib.sha256(f"{self.url}\n{self.username}".encode()).hexdigest()
+        return f"concourse-auth-{digest}"
+
+    @staticmethod
+    def _get_cached_auth(client, key: str, rejected_token: str | None) -> str | None:
+        """Return the cached auth token, unless it is the one that was just rejected"""
+        token = client.get(key)
+        token = token.decode() if token else None
+        return token if token != rejected_token else None
+
     @retry_on_failure
     def auth(self):
-        """Same as the base class but with retries and support for concourse 7.7"""  # noqa: D401
-        if self.has_username_and_passwd:
-            self.ATC_AUTH = None
-            session = self._set_new_session()
-            # Get initial sky/login response
-            r = session.get(urljoin(self.url, "/sky/login"))
-            if r.status_code == 200:  # noqa: PLR2004
-                # Get second sky/login response based on the url found in the first response  # noqa: E501
-                r = session.get(
-                    unescape(urljoin(self.url, self._get_login_post_path(r.text)))
+        """
+        Same as the base class but with retries, support for concourse 7.7 and a
+        token shared through Redis. Every worker uses the cached token until it is
+        rejected, and then only one of them logs in again to replace it.
+        """  # noqa: D401
+        if not self.has_username_and_passwd:
+            return bool(self.ATC_AUTH)
+        # auth is only called again after a request was refused, so the token
+        # this instance already has is not to be reused
+        rejected_token = self.ATC_AUTH
+        with self._auth_lock:
+            if rejected_token != self.ATC_AUTH:
+                # Another thread replaced the token while this one waited
+                return bool(self.ATC_AUTH)
+            client = get_redis_connection("redis")
+            key = self._get_auth_cache_key()
+            token = self._get_cached_auth(client, key, rejected_token)
+            if token is None:
+                lock = client.lock(
+                    f"{key}-lock", timeout=settings.CONCOURSE_AUTH_TIMEOUT
                 )
-                # Post to the final url to authenticate
-                post_path = unescape(self._get_login_post_path(r.text))
-                r = session.post(
-                    urljoin(self.url, post_path),
-                    data={"login": self.username, "password": self.password},
+                has_lock = lock.acquire(
+                    blocking_timeout=settings.CONCOURSE_AUTH_TIMEOUT
                 )
                 try:
-                    r.raise_for_status()
-                except HTTPError:
-                    self._close_session()
-                    raise
-                else:
-                    # This case does not raise any HTTPError, the return code is 200
-                    if "invalid username and password" in r.text:
-                        msg = "Invalid username and password"
-                        raise ValueError(msg)
-                    if r.status_code == requests.codes.ok:
-                        self.ATC_AUTH = self._get_skymarshal_auth()
-                    else:
-                        self._close_session()
-        return bool(self.ATC_AUTH)
+                    # Another worker may have logged in while this one waited
+                    token = self._get_cached_auth(client, key, rejected_token)
+                    if token is None:
+                        self.request_counts["AUTH"] += 1
+                        if not self._login():
+                            return False
+                        client.set(
+                            key, self.ATC_AUTH, ex=settings.CONCOURSE_AUTH_TOKEN_TTL
+                        )
+                        return True
+                finally:
+                    if has_lock and lock.locked():
+                        lock.release()
+            self.ATC_AUTH = token
+            return True
+
+    def _get_skymarshal_auth(self, session=None):
+        """Same as the base class, but reading the cookies of the given session"""  # noqa: D401
+        cookies = (session or self.session).cookies.get_dict()
+        for key in ("skymarshal_auth", "skymarshal_auth0"):
+            if key in cookies:
+                return cookies[key].split('"')[1].split()[1]
+        msg = "Couldn't read Token"
+        raise ValueError(msg)
+
+    def _login(self):
+        """
+        Log in to concourse 7.7 through the sky/login form. The token and session
+        of this instance are only replaced once the login succeeded, so that other
+        threads keep using them until then.
+        """
+        if not self.has_username_and_passwd:
+            return False
+        session = requests.Session()
+        try:
+            token = self._get_login_token(session)
+        except:  # pylint:disable=bare-except
+            session.close()
+            raise
+        if not token:
+            session.close()
+            return False
+        # Not closed, requests of other threads may still be using it
+        self.session = session
+        self.ATC_AUTH = token
+        return True
+
+    def _get_login_token(self, session: requests.Session) -> str | None:
+        """Go through the sky/login form with a session and return the token"""
+        # Get initial sky/login response
+        r = session.get(urljoin(self.url, "/sky/login"))
+        if r.status_code != 200:  # noqa: PLR2004
+            return None
+        # Get second sky/login response based on the url found in the first response
+        r = session.get(unescape(urljoin(self.url, self._get_login_post_path(r.text))))
+        # Post to the final url to authenticate
+        post_path = unescape(self._get_login_post_path(r.text))
+        r = session.post(
+            urljoin(self.url, post_path),
+            data={"login": self.username, "password": self.password},
+        )
+        r.raise_for_status()
+        # This case does not raise any HTTPError, the return code is 200
+        if "invalid username and password" in r.text:
+            msg = "Invalid username and password"
+            raise ValueError(msg)
+        if r.status_code != requests.codes.ok:
+            return None
+        return self._get_skymarshal_auth(session)
 
     @retry_on_failure
     def get_with_headers(  # pylint:disable=too-many-branches
@@ -143,6 +247,7 @@ class PipelineApi(Api, BasePipelineApi):
         iterator: bool = False,  # noqa: FBT001, FBT002
     ) -> tuple[dict, dict]:
         """Customized base get method, returning response data and headers"""  # noqa: D401
+        self._count_request("GET", path)
         url = self._make_api_url(path)
         r = self.requests.get(url, headers=self.headers, stream=stream)
         if not self._is_response_ok(r) and self.has_username_and_passwd:
@@ -168,6 +273,7 @@ class PipelineApi(Api, BasePipelineApi):
         """
         Allow additional headers to be sent with a put request
         """
+        self._count_request("PUT", path)
         url = self._make_api_url(path)
         request_headers = self.headers
         request_headers.update(headers or {})
@@ -184,19 +290,27 @@ class PipelineApi(Api, BasePipelineApi):
             r.raise_for_status()
         return False
 
+    def get(self, path, *args, **kwargs):
+        """Same as base get method but counted"""  # noqa: D401
+        self._count_request("GET", path)
+        return super().get(path, *args, **kwargs)
+
     @retry_on_failure
     def post(self, path, data=None):
         """Same as base post method but with a retry"""  # noqa: D401
+        self._count_request("POST", path)
         return super().post(path, data)
 
     @retry_on_failure
     def put(self, path, data=None):
         """Same as base put method but with a retry"""  # noqa: D401
+        self._count_request("PUT", path)
         return super().put(path, data)
 
     @retry_on_failure
     def delete(self, path, data=None):
         """Make a delete request"""
+        self._count_request("DELETE", path)
         url = self._make_api_url(path)
         kwargs = {"headers": self.headers}
         if data is not None:
@@ -211,6 +325,40 @@ class PipelineApi(Api, BasePipelineApi):
             r.raise_for_status()
         return False
 
+    def get_build_status(self, build_id: int) -> str:
+        """Retrieve the status of a build"""
+        return self.get_build(build_id)["status"]
+
+    def get_build_statuses(self, build_ids: Iterable[int]) -> dict[int, str]:
+        """
+        Retrieve the statuses of builds from the team's build list, newest first,
+        one page at a time. Paging stops once every build has been found, the
+        oldest build has been passed, or CONCOURSE_BUILDS_MAX_PAGES is reached,
+        so builds that are missing from the result should be checked one by one.
+        """
+        remaining = set(build_ids)
+        statuses = {}
+        to_id = None
+        for _ in range(settings.CONCOURSE_BUILDS_MAX_PAGES):
+            if not remaining:
+                break
+            query = {"limit": settings.CONCOURSE_BUILDS_PAGE_SIZE}
+            if to_id is not None:
+                query["to"] = to_id
+            builds, _ = self.get_with_headers(
+                f"/api/v1/teams/{settings.CONCOURSE_TEAM}/builds?{urlencode(query)}"
+            )
+            for build in builds:
+                if build["id"] in remaining:
+                    statuses[build["id"]] = build["status"]
+                    remaining.discard(build["id"])
+            if len(builds) < settings.CONCOURSE_BUILDS_PAGE_SIZE:
+                break
+            to_id = min(build["id"] for build in builds) - 1
+            if to_id < min(remaining, default=0):
+                break
+        return statuses
+
     def get_pipelines(self, names: list[str] | None = None):
         """Retrieve a list of concourse pipelines, filtered by team and optionally name"""  # noqa: E501
         pipelines = super().list_pipelines(settings.CONCOURSE_TEAM)
@@ -229,6 +377,12 @@ class PipelineApi(Api, BasePipelineApi):
             if instance_vars:
                 pipeline.set_instance_vars(instance_vars)
             pipeline.delete_pipeline(item["name"])
+        # Concourse returns instance vars with sorted keys, which need not match
+        # the order they were upserted with, so the fingerprints of the deleted
+        # pipelines may not have been found by their instance vars
+        PipelineConfigFingerprint.objects.filter(
+            pipeline_name__in={item["name"] for item in pipeline_list}
+        ).delete()
 
 
 class GeneralPipeline(BaseGeneralPipeline):
@@ -332,6 +486,9 @@ class GeneralPipeline(BaseGeneralPipeline):
     def delete_pipeline(self, pipeline_name: str):
         """Delete a pipeline"""
         self.api.delete(self._make_pipeline_url(pipeline_name))
+        PipelineConfigFingerprint.objects.filter(
+            pipeline_name=pipeline_name, instance_vars=self.instance_vars
+        ).delete()
 
     def get_build_status(self, build_id: int):
         """Retrieve the status of the build"""
@@ -357,12 +514,44 @@ class GeneralPipeline(BaseGeneralPipeline):
             msg = "No default name specified for this pipeline"
             raise ValueError(msg)
 
-    def upsert_config(self, config_str: str, pipeline_name: str):
-        """Upsert the configuration for a pipeline"""
-        config = json.dumps(yaml.load(config_str, Loader=yaml.SafeLoader))
+    @staticmethod
+    def render_config(config_str: str) -> str:
+        """
+        Render a pipeline definition as the JSON document sent to Concourse.
+        Definitions built from pydantic models are already JSON, so they are
+        parsed as such and only YAML definitions go through the YAML loader.
+        """
+        try:
+            config = json.loads(config_str)
+        except ValueError:
+            config = yaml.load(config_str, Loader=yaml.SafeLoader)
+        return json.dumps(config)
+
+    def upsert_config(self, config_str: str, pipeline_name: str) -> bool:
+        """
+        Upsert the configuration for a pipeline, unless it is the same as the
+        last configuration upserted for it. Returns True if it was upserted.
+        """
+        config = self.render_config(config_str)
+        url_path = self._make_pipeline_config_url(pipeline_name)
+        # The Concourse URL and team are part of the fingerprint so that moving
+        # to another server or team upserts every pipeline again.
+        fingerprint = hashlib.sha256(
+            f"{settings.CONCOURSE_URL}{url_path}\n{config}".encode()
+        ).hexdigest()
+        if PipelineConfigFingerprint.objects.filter(
+            pipeline_name=pipeline_name,
+            instance_vars=self.instance_vars,
+            fingerprint=fingerprint,
+        ).exists():
+            log.debug(
+                "Skipping upsert of unchanged pipeline %s%s",
+                pipeline_name,
+                self.instance_vars,
+            )
+            return False
         # Try to get the pipeline_name of the pipeline if it already exists, because it will be  # noqa: E501
         # necessary to update an existing pipeline.
-        url_path = self._make_pipeline_config_url(pipeline_name)
         try:
             _, headers = self.api.get_with_headers(url_path)
             version_headers = {
@@ -371,6 +560,12 @@ class GeneralPipeline(BaseGeneralPipeline):
         except HTTPError:
             version_headers = None
         self.api.put_with_headers(url_path, data=config, headers=version_headers)
+        PipelineConfigFingerprint.objects.update_or_create(
+            pipeline_name=pipeline_name,
+            instance_vars=self.instance_vars,
+            defaults={"fingerprint": fingerprint},
+        )
+        return True
 
     def upsert_pipeline(self):
         """Placeholder for upsert_pipeline"""  # noqa: D401
@@ -405,8 +600,8 @@ class ThemeAssetsPipeline(GeneralPipeline, BaseThemeAssetsPipeline):
         self.BRANCH = themes_branch or get_theme_branch()
         self.set_instance_vars({"branch": self.BRANCH})
 
-    def upsert_pipeline(self):
-        """Upsert the theme assets pipeline"""
+    def get_pipeline_configs(self) -> list[tuple[str, str]]:
+        """Return the theme assets pipeline definition"""
         template_vars = get_common_pipeline_vars()
         pipeline_definition = ThemeAssetsPipelineDefinition(
             artifacts_bucket=template_vars["artifacts_bucket_name"],
@@ -415,7 +610,12 @@ class ThemeAssetsPipeline(GeneralPipeline, BaseThemeAssetsPipeline):
             test_bucket=template_vars["test_bucket_name"],
             ocw_hugo_themes_branch=self.BRANCH,
         )
-        self.upsert_config(pipeline_definition.json(), self.PIPELINE_NAME)
+        return [(self.PIPELINE_NAME, pipeline_definition.json())]
+
+    def upsert_pipeline(self):
+        """Upsert the theme assets pipeline"""
+        for pipeline_name, config_str in self.get_pipeline_configs():
+            self.upsert_config(config_str, pipeline_name)
 
 
 class SitePipeline(BaseSitePipeline, GeneralPipeline):
@@ -459,11 +659,11 @@ class SitePipeline(BaseSitePipeline, GeneralPipeline):
         self.NOINDEX = noindex
         self.set_instance_vars({"site": self.WEBSITE.name})
 
-    def upsert_pipeline(
+    def get_pipeline_configs(
         self,
-    ):  # pylint:disable=too-many-locals,too-many-statements
+    ) -> list[tuple[str, str]]:  # pylint:disable=too-many-locals
         """
-        Create or update a concourse pipeline for the given Website
+        Return the draft and live pipeline definitions for the given Website
         """
         ocw_hugo_themes_branch = self.BRANCH
         ocw_hugo_projects_branch = (
@@ -475,11 +675,11 @@ class SitePipeline(BaseSitePipeline, GeneralPipeline):
         starter = self.WEBSITE.starter
         if starter.source != STARTER_SOURCE_GITHUB:
             # This pipeline only handles sites with github-based starters
-            return
+            return []
         starter_path_url = urlparse(starter.path)
         if not starter_path_url.netloc:
             # Invalid github url, so skip
-            return
+            return []
 
         is_default_theme = (
             self.THEME_SLUG is None
@@ -488,6 +688,7 @@ class SitePipeline(BaseSitePipeline, GeneralPipeline):
         pipeline_name_suffix = "" if is_default_theme else f"-{self.THEME_SLUG}"
 
         pipeline_vars = get_common_pipeline_vars()
+        pipeline_configs = []
         for branch_vars in [
             {
                 "branch": settings.GIT_BRANCH_PREVIEW,
@@ -532,9 +733,20 @@ class SitePipeline(BaseSitePipeline, GeneralPipeline):
                 noindex=self.NOINDEX,
                 theme_slug=self.THEME_SLUG,
             )
-            self.upsert_config(
-                SitePipelineDefinition(config=pipeline_config).json(), pipeline_name
+            pipeline_configs.append(
+                (
+                    pipeline_name,
+                    SitePipelineDefinition(config=pipeline_config).json(),
+                )
             )
+        return pipeline_configs
+
+    def upsert_pipeline(self):
+        """
+        Create or update a concourse pipeline for the given Website
+        """
+        for pipeline_name, config_str in self.get_pipeline_configs():
+            self.upsert_config(config_str, pipeline_name)
 
     def check_online_site_job_resources(self, pipeline_name: str):
         """Trigger resource checks for all resources required by online-site-job"""
@@ -565,6 +777,7 @@ class MassBuildSitesPipeline(BaseMassBuildSitesPipeline, GeneralPipeline):  # py
         hugo_args: str | None = None,
         theme_slug: str | None = None,
         sync_with_delete: bool = False,
+        site_names: list[str] | None = None,
     ):
         """Initialize the pipeline instance"""
         self.MANDATORY_SETTINGS = [
@@ -596,6 +809,7 @@ class MassBuildSitesPipeline(BaseMassBuildSitesPipeline, GeneralPipeline):  # py
         self.HUGO_ARGS = hugo_args
         self.THEME_SLUG = theme_slug
         self.SYNC_WITH_DELETE = sync_with_delete
+        self.SITE_NAMES = site_names
         instance_vars = {
             "version": version,
             "themes_branch": self.THEMES_BRANCH,
@@ -609,12 +823,14 @@ class MassBuildSitesPipeline(BaseMassBuildSitesPipeline, GeneralPipeline):  # py
             # A distinct pipeline instance so the default mass build is never
             # mutated to run destructive syncs
             instance_vars["sync_with_delete"] = True
+        if site_names is not None:
+            # A distinct pipeline instance so the default mass build keeps
+            # building every site
+            instance_vars["incremental"] = True
         self.set_instance_vars(instance_vars)
 
-    def upsert_pipeline(self):  # pylint:disable=too-many-locals
-        """
-        Create or update the concourse pipeline
-        """
+    def get_pipeline_configs(self) -> list[tuple[str, str]]:
+        """Return the mass build pipeline definition"""
         site_content_branch = get_site_content_branch(self.VERSION)
         pipeline_config = MassBuildSitesPipelineDefinitionConfig(
             version=self.VERSION,
@@ -627,9 +843,17 @@ class MassBuildSitesPipeline(BaseMassBuildSitesPipeline, GeneralPipeline):  # py
             instance_vars=self.instance_vars,
             theme_slug=self.THEME_SLUG,
             sync_with_delete=self.SYNC_WITH_DELETE,
+            site_names=self.SITE_NAMES,
         )
         pipeline_definition = MassBuildSitesPipelineDefinition(config=pipeline_config)
-        self.upsert_config(pipeline_definition.json(), self.PIPELINE_NAME)
+        return [(self.PIPELINE_NAME, pipeline_definition.json())]
+
+    def upsert_pipeline(self):
+        """
+        Create or update the concourse pipeline
+        """
+        for pipeline_name, config_str in self.get_pipeline_configs():
+            self.upsert_config(config_str, pipeline_name)
 
 
 class UnpublishedSiteRemovalPipeline(
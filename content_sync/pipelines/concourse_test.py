@@ -6,6 +6,7 @@ from urllib.parse import quote, unquote, urljoin
 
 import pytest
 from django.core.exceptions import ImproperlyConfigured
+from django_redis import get_redis_connection
 from requests import HTTPError
 
 from content_sync.constants import (
@@ -14,11 +15,13 @@ from content_sync.constants import (
     VERSION_DRAFT,
     VERSION_LIVE,
 )
+from content_sync.models import PipelineConfigFingerprint
 from content_sync.pipelines.base import (
     BaseMassBuildSitesPipeline,
     BaseUnpublishedSiteRemovalPipeline,
 )
 from content_sync.pipelines.concourse import (
+    GeneralPipeline,
     MassBuildSitesPipeline,
     PipelineApi,
     SitePipeline,
@@ -108,6 +111,14 @@ PIPELINES_LIST = [
 ]
 
 
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    """Remove any concourse auth token shared by an earlier test"""
+    redis = get_redis_connection("redis")
+    for key in redis.scan_iter("concourse-auth-*"):
+        redis.delete(key)
+
+
 @pytest.fixture
 def mock_auth(mocker):
     """Mock the concourse api auth method"""
@@ -707,6 +718,118 @@ def test_upsert_pipeline(
     )
 
 
+@pytest.mark.parametrize(
+    "config_str",
+    [
+        '{"jobs": [{"name": "build", "plan": []}]}',
+        "jobs:\n  - name: build\n    plan: []\n",
+    ],
+)
+def test_render_config(config_str):
+    """render_config should render JSON and YAML definitions as the same JSON"""
+    assert (
+        GeneralPipeline.render_config(config_str)
+        == '{"jobs": [{"name": "build", "plan": []}]}'
+    )
+
+
+def test_upsert_config_skips_unchanged(settings, mocker, mock_auth):
+    """upsert_config should only send a configuration that changed since the last upsert"""
+    mock_get = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.get_with_headers",
+        return_value=({}, {"X-Concourse-Config-Version": "3"}),
+    )
+    mock_put_headers = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.put_with_headers"
+    )
+    pipeline = GeneralPipeline(api=PipelineApi("http://test.edu", "a", "b", "team"))
+    pipeline.set_instance_vars({"site": "my-site"})
+
+    assert pipeline.upsert_config("jobs: []", VERSION_DRAFT) is True
+    assert pipeline.upsert_config("jobs: []", VERSION_DRAFT) is False
+    assert pipeline.upsert_config("jobs: []", VERSION_LIVE) is True
+    assert pipeline.upsert_config("jobs: [{name: build}]", VERSION_DRAFT) is True
+    settings.CONCOURSE_TEAM = "other-team"
+    assert pipeline.upsert_config("jobs: [{name: build}]", VERSION_DRAFT) is True
+
+    assert mock_get.call_count == 4
+    assert mock_put_headers.call_count == 4
+    assert PipelineConfigFingerprint.objects.count() == 2
+
+
+def test_get_build_statuses(settings, mocker, mock_auth):
+    """get_build_statuses should page through the team's builds until all are found"""
+    settings.CONCOURSE_BUILDS_PAGE_SIZE = 2
+    pages = [
+        [{"id": 10, "status": "started"}, {"id": 9, "status": "succeeded"}],
+        [{"id": 8, "status": "failed"}, {"id": 7, "status": "errored"}],
+        [{"id": 6, "status": "succeeded"}, {"id": 5, "status": "succeeded"}],
+    ]
+    mock_get = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.get_with_headers",
+        side_effect=[(page, {}) for page in pages],
+    )
+    api = PipelineApi("http://test.edu", "a", "b", "team")
+    assert api.get_build_statuses([9, 7, 12]) == {9: "succeeded", 7: "errored"}
+    assert [call.args[0] for call in mock_get.call_args_list] == [
+        f"/api/v1/teams/{settings.CONCOURSE_TEAM}/builds?limit=2",
+        f"/api/v1/teams/{settings.CONCOURSE_TEAM}/builds?limit=2&to=8",
+    ]
+
+
+def test_delete_pipeline_clears_fingerprint(mocker, mock_auth):
+    """Deleting a pipeline should make the next upsert of its configuration happen"""
+    mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.get_with_headers",
+        side_effect=HTTPError(),
+    )
+    mock_put_headers = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.put_with_headers"
+    )
+    mocker.patch("content_sync.pipelines.concourse.PipelineApi.delete")
+    pipeline = GeneralPipeline(api=PipelineApi("http://test.edu", "a", "b", "team"))
+    pipeline.set_instance_vars({"site": "my-site"})
+
+    pipeline.upsert_config("jobs: []", VERSION_DRAFT)
+    pipeline.delete_pipeline(VERSION_DRAFT)
+    assert pipeline.upsert_config("jobs: []", VERSION_DRAFT) is True
+    assert mock_put_headers.call_count == 2
+
+
+def test_delete_pipelines_clears_fingerprints(mocker, mock_auth):
+    """Deleting pipelines should make the next upserts happen, whatever the order of their instance vars"""
+    mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.get_with_headers",
+        side_effect=HTTPError(),
+    )
+    mock_put_headers = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi.put_with_headers"
+    )
+    mock_delete = mocker.patch("content_sync.pipelines.concourse.PipelineApi.delete")
+    api = PipelineApi("http://test.edu", "a", "b", "team")
+    pipeline = GeneralPipeline(api=api)
+    pipeline.set_instance_vars({"version": VERSION_LIVE, "prefix": ""})
+    pipeline.upsert_config("jobs: []", BaseMassBuildSitesPipeline.PIPELINE_NAME)
+    mocker.patch(
+        "content_sync.pipelines.concourse.Api.list_pipelines",
+        return_value=[
+            {
+                "name": BaseMassBuildSitesPipeline.PIPELINE_NAME,
+                "instance_vars": {"prefix": "", "version": VERSION_LIVE},
+            }
+        ],
+    )
+
+    api.delete_pipelines(names=[BaseMassBuildSitesPipeline.PIPELINE_NAME])
+    mock_delete.assert_called_once()
+    assert not PipelineConfigFingerprint.objects.exists()
+    assert (
+        pipeline.upsert_config("jobs: []", BaseMassBuildSitesPipeline.PIPELINE_NAME)
+        is True
+    )
+    assert mock_put_headers.call_count == 2
+
+
 @pytest.mark.parametrize("pipeline_exists", [True, False])
 @pytest.mark.parametrize("version", [VERSION_DRAFT, VERSION_LIVE])
 @pytest.mark.parametrize("themes_branch", ["", "main", "test_themes_branch"])
@@ -888,9 +1011,7 @@ def test_api_auth(  # noqa: PLR0913, PLR0917
         "content_sync.pipelines.concourse.PipelineApi._get_skymarshal_auth",
         return_value=auth_token,
     )
-    mock_session = mocker.patch(
-        "content_sync.pipelines.concourse.PipelineApi._set_new_session"
-    )
+    mock_session = mocker.patch("content_sync.pipelines.concourse.requests.Session")
     mock_session.return_value.get.side_effect = [
         mocker.Mock(text=url, status_code=get_status) for url in [*get_urls, *get_urls]
     ]
@@ -924,6 +1045,81 @@ def test_api_auth(  # noqa: PLR0913, PLR0917
     )
 
 
+def test_api_auth_shared(mocker, settings):
+    """Instances should share a token, and log in again only once it is rejected"""
+    tokens = iter(["first-token", "second-token"])
+
+    def login(api):
+        api.ATC_AUTH = next(tokens)
+        return True
+
+    mock_login = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi._login",
+        autospec=True,
+        side_effect=login,
+    )
+    first_api = PipelineApi(settings.CONCOURSE_URL, "test", "password", "team")
+    second_api = PipelineApi(settings.CONCOURSE_URL, "test", "password", "team")
+    assert first_api.ATC_AUTH == second_api.ATC_AUTH == "first-token"
+    assert mock_login.call_count == 1
+    assert first_api.request_counts["AUTH"] == 1
+    assert second_api.request_counts["AUTH"] == 0
+
+    assert second_api.auth() is True
+    assert second_api.ATC_AUTH == "second-token"
+    assert first_api.auth() is True
+    assert first_api.ATC_AUTH == "second-token"
+    assert mock_login.call_count == 2
+
+
+def test_api_auth_failed_login(mocker, settings):
+    """A failed login should keep the token and session of the instance"""
+    mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi._get_login_token",
+        side_effect=["first-token", None],
+    )
+    api = PipelineApi(settings.CONCOURSE_URL, "test", "password", "team")
+    session = api.session
+    assert api.ATC_AUTH == "first-token"
+    assert api.auth() is False
+    assert api.ATC_AUTH == "first-token"
+    assert api.session is session
+
+
+def test_api_auth_replaced_while_waiting(mocker, settings):
+    """Auth should not log in again if another thread replaced the token meanwhile"""
+    mock_login_token = mocker.patch(
+        "content_sync.pipelines.concourse.PipelineApi._get_login_token",
+        return_value="first-token",
+    )
+    api = PipelineApi(settings.CONCOURSE_URL, "test", "password", "team")
+    api._auth_lock = mocker.MagicMock()  # noqa: SLF001
+    api._auth_lock.__enter__.side_effect = lambda *_: setattr(  # noqa: SLF001
+        api, "ATC_AUTH", "second-token"
+    )
+    assert api.auth() is True
+    assert api.ATC_AUTH == "second-token"
+    assert mock_login_token.call_count == 1
+
+
+def test_api_request_counts(mocker, mock_auth):
+    """Requests should be counted per route, without identifiers"""
+    mocker.patch(
+        "content_sync.pipelines.concourse.requests.get",
+        return_value=mocker.Mock(text="{}", status_code=200, headers={}),
+    )
+    api = PipelineApi("http://test.edu", "test", "test", "myteam")
+    for site in ["site-1", "site-2"]:
+        api.get_with_headers(
+            f"/api/v1/teams/myteam/pipelines/draft/config?vars={{site={site}}}"
+        )
+    api.get_with_headers("/api/v1/builds/123")
+    assert api.request_counts == {
+        "GET /api/v1/teams/:team/pipelines/:pipeline/config": 2,
+        "GET /api/v1/builds/:build": 1,
+    }
+
+
 @pytest.mark.parametrize("theme_slug", [None, "ocw-course-v2", "ocw-course-v3"])
 @pytest.mark.parametrize("version", [VERSION_DRAFT, VERSION_LIVE])
 def test_upsert_pipeline_with_theme_slug(  # noqa: PLR0913, PLR0917
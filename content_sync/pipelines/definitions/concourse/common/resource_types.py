@@ -1,3 +1,6 @@
+from functools import cache
+from typing import TYPE_CHECKING
+
 from ol_concourse.lib.constants import REGISTRY_IMAGE
 from ol_concourse.lib.models.pipeline import ResourceType
 
@@ -7,6 +10,9 @@ from content_sync.pipelines.definitions.concourse.common.identifiers import (
     S3_IAM_RESOURCE_TYPE_IDENTIFIER,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 class HttpResourceType(ResourceType):
     """
@@ -51,3 +57,22 @@ class S3IamResourceType(ResourceType):
             source={"repository": "governmentpaas/s3-resource", "tag": "latest"},
             **kwargs,
         )
+
+
+@cache
+def _get_resource_type(
+    resource_type: Callable[[], ResourceType],
+) -> ResourceType:
+    """Build a ResourceType once per process"""
+    return resource_type()
+
+
+def get_resource_type(resource_type: Callable[[], ResourceType]) -> ResourceType:
+    """
+    Return a copy of a memoized ResourceType. The common resource types do not
+    depend on any settings, so each one is only validated once per process.
+
+    Args:
+        resource_type(Callable): A ResourceType class or factory taking no arguments
+    """
+    return _get_resource_type(resource_type).model_copy()
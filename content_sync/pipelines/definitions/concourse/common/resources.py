@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from urllib.parse import urljoin
 
 from django.conf import settings
@@ -16,6 +17,9 @@ from content_sync.pipelines.definitions.concourse.common.identifiers import (
     SLACK_ALERT_RESOURCE_IDENTIFIER,
     get_ocw_catalog_identifier,
 )
+from content_sync.pipelines.definitions.concourse.common.resource_types import (
+    get_resource_type,
+)
 from content_sync.utils import get_ocw_studio_api_url
 from main.utils import is_dev
 from websites.constants import OCW_HUGO_THEMES_GIT
@@ -32,7 +36,7 @@ class SlackAlertResource(Resource):
         super().__init__(
             name=SLACK_ALERT_RESOURCE_IDENTIFIER,
             icon="slack",
-            type=slack_notification_resource().name,
+            type=get_resource_type(slack_notification_resource).name,
             check_every="never",
             source={"url": "((slack-url))", "disabled": "false"},
             **kwargs,
@@ -254,3 +258,35 @@ class SiteContentGitResource(GitResource):
             private_key=private_key,
             **kwargs,
         )
+
+
+def get_settings_snapshot() -> tuple:
+    """Return the values of the settings that the common resources are built from"""
+    return (is_dev(), settings.AWS_ACCESS_KEY_ID, settings.AWS_SECRET_ACCESS_KEY)
+
+
+@lru_cache(maxsize=256)
+def _get_common_resource(
+    resource_class: type[Resource],
+    settings_snapshot: tuple,  # noqa: ARG001
+    kwargs: tuple,
+) -> Resource:
+    """Build a Resource once per settings snapshot and set of arguments"""
+    return resource_class(**dict(kwargs))
+
+
+def get_common_resource(resource_class: type[Resource], **kwargs) -> Resource:
+    """
+    Return a copy of a memoized Resource. Resources are memoized per snapshot of
+    the settings they read, so a change to those settings builds new ones.
+
+    The copy is shallow, so attributes like check_every can be set on it but its
+    source must not be modified in place.
+
+    Args:
+        resource_class(type[Resource]): The Resource class to build
+        kwargs: Hashable keyword arguments for the Resource class
+    """
+    return _get_common_resource(
+        resource_class, get_settings_snapshot(), tuple(sorted(kwargs.items()))
+    ).model_copy()
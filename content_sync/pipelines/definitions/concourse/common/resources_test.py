@@ -0,0 +1,54 @@
+"""Tests for common Concourse resources"""
+
+from ol_concourse.lib.resource_types import slack_notification_resource
+
+from content_sync.pipelines.definitions.concourse.common.resource_types import (
+    HttpResourceType,
+    get_resource_type,
+)
+from content_sync.pipelines.definitions.concourse.common.resources import (
+    OcwHugoThemesGitResource,
+    WebpackManifestResource,
+    get_common_resource,
+)
+
+
+def test_get_resource_type():
+    """get_resource_type should return equal copies of a memoized ResourceType"""
+    for resource_type in [HttpResourceType, slack_notification_resource]:
+        first = get_resource_type(resource_type)
+        second = get_resource_type(resource_type)
+        assert first == second == resource_type()
+        assert first is not second
+
+
+def test_get_common_resource():
+    """get_common_resource should return copies that can be changed independently"""
+    first = get_common_resource(OcwHugoThemesGitResource, branch="main")
+    second = get_common_resource(OcwHugoThemesGitResource, branch="main")
+    assert first == second == OcwHugoThemesGitResource(branch="main")
+    assert first is not second
+    second.check_every = "1m"
+    assert get_common_resource(OcwHugoThemesGitResource, branch="main") == first
+    assert get_common_resource(
+        OcwHugoThemesGitResource, branch="other"
+    ) == OcwHugoThemesGitResource(branch="other")
+
+
+def test_get_common_resource_settings(mocker, settings):
+    """get_common_resource should build new resources when its settings change"""
+    mocker.patch(
+        "content_sync.pipelines.definitions.concourse.common.resources.is_dev",
+        return_value=True,
+    )
+    settings.AWS_ACCESS_KEY_ID = "first-key"
+    kwargs = {"name": "webpack", "bucket": "bucket", "branch": "main"}
+    assert (
+        get_common_resource(WebpackManifestResource, **kwargs).source["access_key_id"]
+        == "first-key"
+    )
+    settings.AWS_ACCESS_KEY_ID = "second-key"
+    assert (
+        get_common_resource(WebpackManifestResource, **kwargs).source["access_key_id"]
+        == "second-key"
+    )
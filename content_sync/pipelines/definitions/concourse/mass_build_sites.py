@@ -2,19 +2,25 @@ import json
 from random import shuffle
 from urllib.parse import quote
 
-import more_itertools
 from django.conf import settings
 from ol_concourse.lib.models.pipeline import (
     AcrossVar,
+    Command,
     DoStep,
     Duration,
     GetStep,
+    Identifier,
+    Input,
     Job,
+    Output,
     Pipeline,
     PutStep,
     Resource,
     ResourceType,
     StepModifierMixin,
+    TaskConfig,
+    TaskStep,
+    TryStep,
 )
 from ol_concourse.lib.resource_types import slack_notification_resource
 
@@ -29,19 +35,26 @@ from content_sync.pipelines.definitions.concourse.common.identifiers import (
     WEBPACK_MANIFEST_S3_IDENTIFIER,
     WEBPACK_MANIFEST_S3_TRIGGER_IDENTIFIER,
 )
+from content_sync.pipelines.definitions.concourse.common.image_resources import (
+    AWS_CLI_REGISTRY_IMAGE,
+    BASH_REGISTRY_IMAGE,
+    CURL_REGISTRY_IMAGE,
+    OCW_COURSE_PUBLISHER_REGISTRY_IMAGE,
+)
 from content_sync.pipelines.definitions.concourse.common.resource_types import (
     HttpResourceType,
     KeyvalResourceType,
     S3IamResourceType,
+    get_resource_type,
 )
 from content_sync.pipelines.definitions.concourse.common.resources import (
     GitResource,
     OcwHugoProjectsGitResource,
     OcwHugoThemesGitResource,
-    OcwStudioWebhookResource,
     OpenCatalogResource,
     SlackAlertResource,
     WebpackManifestResource,
+    get_common_resource,
 )
 from content_sync.pipelines.definitions.concourse.common.steps import (
     SiteContentGitTaskStep,
@@ -54,10 +67,23 @@ from content_sync.pipelines.definitions.concourse.site_pipeline import (
     get_site_pipeline_definition_vars,
     is_extra_theme,
 )
-from content_sync.utils import get_common_pipeline_vars, get_publishable_sites
+from content_sync.scheduling import get_expected_build_seconds, schedule_batches
+from content_sync.utils import (
+    get_cli_endpoint_url,
+    get_common_pipeline_vars,
+    get_ocw_studio_api_url,
+    get_publishable_sites,
+)
 from main.utils import is_dev
 from websites.models import Website, WebsiteStarter
 
+SITE_STATUSES_IDENTIFIER = Identifier("site-statuses").root
+CREATE_SITE_STATUSES_IDENTIFIER = Identifier("create-site-statuses").root
+RECORD_SITE_STATUS_IDENTIFIER = Identifier("record-site-status").root
+COLLECT_SITE_STATUSES_IDENTIFIER = Identifier("collect-site-statuses").root
+POST_SITE_STATUSES_IDENTIFIER = Identifier("post-site-statuses").root
+SITE_STATUSES_S3_PATH = f"mass-build-site-statuses/$(cat {SITE_STATUSES_IDENTIFIER}/id)"
+
 
 class MassBuildSitesPipelineDefinitionConfig:
     """
@@ -76,6 +102,7 @@ class MassBuildSitesPipelineDefinitionConfig:
         hugo_override_args(str): (Optional) Arguments to override in the hugo command
         theme_slug(str): (Optional) Override for the theme slug to use in the builds
         sync_with_delete(bool): (Optional) If True, non-root site online syncs run with --delete
+        site_names(list[str]): (Optional) Only build these sites, and never trigger automatically
     """  # noqa: E501
 
     def __init__(  # noqa: PLR0913, PLR0917
@@ -93,11 +120,17 @@ class MassBuildSitesPipelineDefinitionConfig:
         theme_slug: str | None = None,
         *,
         sync_with_delete: bool = False,
+        site_names: list[str] | None = None,
     ):
         vars = get_common_pipeline_vars()  # noqa: A001
-        sites = list(get_publishable_sites(version, is_offline=offline))
+        sites = get_publishable_sites(version, is_offline=offline)
+        if site_names is not None:
+            sites = sites.filter(name__in=site_names)
+        sites = list(sites)
+        # Sites with the same expected build time are built in a random order
         shuffle(sites)
         self.sites = sites
+        self.expected_build_seconds = get_expected_build_seconds(sites, version)
         self.version = version
         self.prefix = prefix
         self.artifacts_bucket = artifacts_bucket
@@ -110,6 +143,7 @@ class MassBuildSitesPipelineDefinitionConfig:
         self.instance_vars = instance_vars
         self.theme_slug = theme_slug or ""
         self.sync_with_delete = sync_with_delete
+        self.incremental = site_names is not None
         self.web_bucket = (
             vars["preview_bucket_name"]
             if version == VERSION_DRAFT
@@ -125,10 +159,10 @@ class MassBuildSitesPipelineResourceTypes(list[ResourceType]):
     def __init__(self):
         self.extend(
             [
-                HttpResourceType(),
-                KeyvalResourceType(),
-                S3IamResourceType(),
-                slack_notification_resource(),
+                get_resource_type(HttpResourceType),
+                get_resource_type(KeyvalResourceType),
+                get_resource_type(S3IamResourceType),
+                get_resource_type(slack_notification_resource),
             ]
         )
 
@@ -142,23 +176,25 @@ class MassBuildSitesResources(list[Resource]):
     """
 
     def __init__(self, config: MassBuildSitesPipelineDefinitionConfig):
-        site_pipeline_vars = get_site_pipeline_definition_vars(namespace=".:site.")
-        webpack_manifest_resource = WebpackManifestResource(
+        webpack_manifest_resource = get_common_resource(
+            WebpackManifestResource,
             name=WEBPACK_MANIFEST_S3_IDENTIFIER,
             bucket=config.artifacts_bucket,
             branch=config.ocw_hugo_themes_branch,
         )
-        webpack_manifest_trigger_resource = WebpackManifestResource(
+        webpack_manifest_trigger_resource = get_common_resource(
+            WebpackManifestResource,
             name=WEBPACK_MANIFEST_S3_TRIGGER_IDENTIFIER,
             bucket=config.artifacts_bucket,
             branch=config.ocw_hugo_themes_branch,
         )
         webpack_manifest_trigger_resource.check_every = Duration("1m")
-        ocw_hugo_themes_resource = OcwHugoThemesGitResource(
-            branch=config.ocw_hugo_themes_branch
+        ocw_hugo_themes_resource = get_common_resource(
+            OcwHugoThemesGitResource, branch=config.ocw_hugo_themes_branch
         )
         root_starter = Website.objects.get(name=settings.ROOT_WEBSITE_NAME).starter
-        ocw_hugo_projects_resource = OcwHugoProjectsGitResource(
+        ocw_hugo_projects_resource = get_common_resource(
+            OcwHugoProjectsGitResource,
             uri=root_starter.ocw_hugo_projects_url,
             branch=config.ocw_hugo_projects_branch,
         )
@@ -173,17 +209,13 @@ class MassBuildSitesResources(list[Resource]):
         self.append(ocw_hugo_themes_resource)
         self.append(ocw_hugo_projects_resource)
         self.append(ocw_hugo_projects_trigger_resource)
-        if not is_extra_theme(config.theme_slug):
-            self.append(
-                OcwStudioWebhookResource(
-                    site_name=site_pipeline_vars["site_name"],
-                    api_token=settings.API_BEARER_TOKEN or "",
-                )
-            )
-        self.append(SlackAlertResource())
+        self.append(get_common_resource(SlackAlertResource))
         if not is_dev() and config.version == "live":
             self.extend(
-                [OpenCatalogResource(url) for url in settings.OPEN_CATALOG_URLS]
+                [
+                    get_common_resource(OpenCatalogResource, open_url=url)
+                    for url in settings.OPEN_CATALOG_URLS
+                ]
             )
 
 
@@ -220,6 +252,197 @@ class MassBuildSitesPipelineBaseTasks(list[StepModifierMixin]):
         )
 
 
+class CreateSiteStatusesStep(TaskStep):
+    """
+    A TaskStep that creates a unique id for the S3 folder where the sites of a
+    batch record their build statuses
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            task=CREATE_SITE_STATUSES_IDENTIFIER,
+            timeout="1m",
+            config=TaskConfig(
+                platform="linux",
+                image_resource=BASH_REGISTRY_IMAGE,
+                outputs=[Output(name=SITE_STATUSES_IDENTIFIER)],
+                run=Command(
+                    path="sh",
+                    args=[
+                        "-exc",
+                        f"cat /proc/sys/kernel/random/uuid > {SITE_STATUSES_IDENTIFIER}/id",  # noqa: E501
+                    ],
+                ),
+            ),
+            **kwargs,
+        )
+        self.model_rebuild()
+
+
+class RecordSiteStatusStep(TryStep):
+    """
+    A TaskStep wrapped in a TryStep that records the build status of a site in the
+    S3 folder of its batch, to be posted to ocw-studio with the rest of the batch
+
+    Args:
+        bucket(str): The bucket where the statuses are recorded
+        site_name(str): The name of the site the status is in reference to
+        version(str): The version of the site being built (draft / live)
+        status(str): The status to record (failed, errored, aborted, succeeded)
+    """
+
+    def __init__(
+        self, bucket: str, site_name: str, version: str, status: str, **kwargs
+    ):
+        status_data = json.dumps(
+            {"name": site_name, "version": version, "status": status}
+        )
+        record_step = TaskStep(
+            task=RECORD_SITE_STATUS_IDENTIFIER,
+            timeout="1m",
+            attempts=3,
+            params={},
+            config=TaskConfig(
+                platform="linux",
+                image_resource=AWS_CLI_REGISTRY_IMAGE,
+                inputs=[Input(name=SITE_STATUSES_IDENTIFIER)],
+                run=Command(
+                    path="sh",
+                    args=[
+                        "-exc",
+                        f"echo '{status_data}' | aws s3{get_cli_endpoint_url()} cp - \"s3://{bucket}/{SITE_STATUSES_S3_PATH}/{site_name}.json\"",
+                    ],
+                ),
+            ),
+        )
+        if is_dev():
+            record_step.params["AWS_ACCESS_KEY_ID"] = settings.AWS_ACCESS_KEY_ID or ""
+            record_step.params["AWS_SECRET_ACCESS_KEY"] = (
+                settings.AWS_SECRET_ACCESS_KEY or ""
+            )
+        super().__init__(try_=record_step, **kwargs)
+        self.model_rebuild()
+
+
+class PostSiteStatusesStep(TryStep):
+    """
+    A DoStep wrapped in a TryStep that collects the build statuses recorded by the
+    sites of a batch and posts them to ocw-studio in one request
+
+    Args:
+        bucket(str): The bucket where the statuses are recorded
+    """
+
+    def __init__(self, bucket: str, **kwargs):
+        collect_command = f"""
+        STATUSES_PATH="s3://{bucket}/{SITE_STATUSES_S3_PATH}"
+        mkdir -p {SITE_STATUSES_IDENTIFIER}/sites
+        aws s3{get_cli_endpoint_url()} cp --recursive "$STATUSES_PATH" {SITE_STATUSES_IDENTIFIER}/sites
+        find {SITE_STATUSES_IDENTIFIER}/sites -name '*.json' -exec cat {{}} + | jq -s '{{statuses: .}}' > {SITE_STATUSES_IDENTIFIER}/statuses.json
+        aws s3{get_cli_endpoint_url()} rm --recursive "$STATUSES_PATH"
+        """  # noqa: E501
+        collect_step = TaskStep(
+            task=COLLECT_SITE_STATUSES_IDENTIFIER,
+            timeout="5m",
+            attempts=3,
+            params={},
+            config=TaskConfig(
+                platform="linux",
+                image_resource=OCW_COURSE_PUBLISHER_REGISTRY_IMAGE,
+                inputs=[Input(name=SITE_STATUSES_IDENTIFIER)],
+                outputs=[Output(name=SITE_STATUSES_IDENTIFIER)],
+                run=Command(path="sh", args=["-exc", collect_command]),
+            ),
+        )
+        if is_dev():
+            collect_step.params["AWS_ACCESS_KEY_ID"] = settings.AWS_ACCESS_KEY_ID or ""
+            collect_step.params["AWS_SECRET_ACCESS_KEY"] = (
+                settings.AWS_SECRET_ACCESS_KEY or ""
+            )
+        post_step = TaskStep(
+            task=POST_SITE_STATUSES_IDENTIFIER,
+            timeout="5m",
+            attempts=3,
+            config=TaskConfig(
+                platform="linux",
+                image_resource=CURL_REGISTRY_IMAGE,
+                inputs=[Input(name=SITE_STATUSES_IDENTIFIER)],
+                run=Command(
+                    path="curl",
+                    args=[
+                        "-f",
+                        "-X",
+                        "POST",
+                        "-H",
+                        "Content-Type: application/json",
+                        "-H",
+                        f"Authorization: Bearer {settings.API_BEARER_TOKEN}",
+                        "--data",
+                        f"@{SITE_STATUSES_IDENTIFIER}/statuses.json",
+                        f"{get_ocw_studio_api_url().rstrip('/')}/api/websites/pipeline_statuses/",
+                    ],
+                ),
+            ),
+        )
+        super().__init__(try_=DoStep(do=[collect_step, post_step]), **kwargs)
+        self.model_rebuild()
+
+
+def get_site_build_steps(
+    config: MassBuildSitesPipelineDefinitionConfig,
+    site_build_tasks: list[StepModifierMixin],
+    across_var_values: list[dict],
+    site_name: str,
+) -> list[StepModifierMixin]:
+    """
+    Return the steps that run the site build tasks across the sites of a batch.
+    For online builds every site records its status instead of posting it, and the
+    statuses of the batch are posted once all of its sites are done.
+
+    Args:
+        config(MassBuildSitesPipelineDefinitionConfig): The mass build config object
+        site_build_tasks(list[StepModifierMixin]): The tasks that build one site
+        across_var_values(list[dict]): The site pipeline values of each site
+        site_name(str): The var holding the name of the site being built
+
+    Returns:
+        list[StepModifierMixin]: The steps to add to the batch job
+    """
+    site_build_step = DoStep(do=site_build_tasks)
+    across_step = DoStep(
+        do=[site_build_step],
+        across=[
+            AcrossVar(
+                var="site",
+                values=across_var_values,
+                max_in_flight=settings.OCW_MASS_BUILD_MAX_IN_FLIGHT,
+            )
+        ],
+    )
+    if config.offline or is_extra_theme(config.theme_slug):
+        # ocw-studio ignores the statuses of these builds
+        return [across_step]
+    record_status_kwargs = {
+        "bucket": config.artifacts_bucket,
+        "site_name": site_name,
+        "version": config.version,
+    }
+    site_build_step.on_success = RecordSiteStatusStep(
+        status="succeeded", **record_status_kwargs
+    )
+    site_build_step.on_failure = RecordSiteStatusStep(
+        status="failed", **record_status_kwargs
+    )
+    site_build_step.on_error = RecordSiteStatusStep(
+        status="errored", **record_status_kwargs
+    )
+    site_build_step.on_abort = RecordSiteStatusStep(
+        status="aborted", **record_status_kwargs
+    )
+    across_step.ensure = PostSiteStatusesStep(bucket=config.artifacts_bucket)
+    return [CreateSiteStatusesStep(), across_step]
+
+
 class MassBuildSitesPipelineDefinition(Pipeline):
     """
     The Pipeline object representing the mass build
@@ -228,6 +451,9 @@ class MassBuildSitesPipelineDefinition(Pipeline):
 
     Each batch builds sites in parallel, the amount of which is controlled by settings.OCW_MASS_BUILD_MAX_IN_FLIGHT
 
+    The online builds of each batch record the status of every site, and post them to
+    ocw-studio in one request once the batch is done
+
     Args:
         config(MassBuildSitesPipelineDefinitionConfig): The mass build config object
     """  # noqa: E501
@@ -245,15 +471,19 @@ class MassBuildSitesPipelineDefinition(Pipeline):
         )
         jobs = []
         batch_gate_resources = []
-        batches = list(
-            more_itertools.batched(config.sites, settings.OCW_MASS_BUILD_BATCH_SIZE)
+        batches = schedule_batches(
+            config.sites,
+            config.expected_build_seconds,
+            settings.OCW_MASS_BUILD_BATCH_SIZE,
         )
         batch_count = len(batches)
         batch_number = 1
         for batch in batches:
             tasks = []
             if batch_number == 1:
-                trigger = not config.offline and not config.sync_with_delete
+                trigger = not (
+                    config.offline or config.sync_with_delete or config.incremental
+                )
                 tasks.extend(
                     [
                         GetStep(
@@ -327,7 +557,7 @@ class MassBuildSitesPipelineDefinition(Pipeline):
                         pipeline_name=config.version,
                         destructive_sync=config.sync_with_delete,
                         filter_videos=True,
-                        skip_webhooks=is_extra_theme(config.theme_slug),
+                        skip_webhooks=True,
                     )
                 )
             else:
@@ -336,7 +566,7 @@ class MassBuildSitesPipelineDefinition(Pipeline):
                         pipeline_vars=site_pipeline_vars,
                         fastly_var=config.version,
                         pipeline_name=config.version,
-                        skip_webhooks=is_extra_theme(config.theme_slug),
+                        skip_webhooks=True,
                     )
                 )
             if batch_number > 1:
@@ -349,16 +579,12 @@ class MassBuildSitesPipelineDefinition(Pipeline):
                         trigger=True,
                     )
                 )
-            tasks.append(
-                DoStep(
-                    do=site_build_tasks,
-                    across=[
-                        AcrossVar(
-                            var="site",
-                            values=across_var_values,
-                            max_in_flight=settings.OCW_MASS_BUILD_MAX_IN_FLIGHT,
-                        )
-                    ],
+            tasks.extend(
+                get_site_build_steps(
+                    config,
+                    site_build_tasks,
+                    across_var_values,
+                    site_pipeline_vars["site_name"],
                 )
             )
             if batch_number < batch_count:
@@ -1,6 +1,5 @@
 import json
-import os
-from urllib.parse import quote, urljoin
+from urllib.parse import quote
 
 import pytest
 from ol_concourse.lib.resource_types import slack_notification_resource
@@ -23,6 +22,10 @@ from content_sync.pipelines.definitions.concourse.common.identifiers import (
     WEBPACK_MANIFEST_S3_TRIGGER_IDENTIFIER,
 )
 from content_sync.pipelines.definitions.concourse.mass_build_sites import (
+    COLLECT_SITE_STATUSES_IDENTIFIER,
+    CREATE_SITE_STATUSES_IDENTIFIER,
+    POST_SITE_STATUSES_IDENTIFIER,
+    RECORD_SITE_STATUS_IDENTIFIER,
     MassBuildSitesPipelineDefinition,
     MassBuildSitesPipelineDefinitionConfig,
 )
@@ -155,17 +158,14 @@ def test_generate_mass_build_sites_definition(  # noqa: C901, PLR0913, PLR0912,
     assert (
         ocw_hugo_projects_git_resource["source"]["branch"] == ocw_hugo_projects_branch
     )
-    ocw_studio_webhook_resource = get_dict_list_item_by_field(
-        items=resources, field="name", value=OCW_STUDIO_WEBHOOK_RESOURCE_TYPE_IDENTIFIER
-    )
-    expected_api_path = os.path.join(  # noqa: PTH118
-        "api", "websites", site_pipeline_vars["site_name"], "pipeline_status"
-    )
-    expected_api_url = urljoin(ocw_studio_url, expected_api_path)
-    assert ocw_studio_webhook_resource["source"]["url"] == f"{expected_api_url}/"
+    # Site statuses are posted once per batch instead of by each site
     assert (
-        ocw_studio_webhook_resource["source"]["headers"]["Authorization"]
-        == f"Bearer {settings.API_BEARER_TOKEN}"
+        get_dict_list_item_by_field(
+            items=resources,
+            field="name",
+            value=OCW_STUDIO_WEBHOOK_RESOURCE_TYPE_IDENTIFIER,
+        )
+        is None
     )
     assert (
         get_dict_list_item_by_field(
@@ -294,7 +294,55 @@ def test_generate_mass_build_sites_definition(  # noqa: C901, PLR0913, PLR0912,
                         across_values["course_v3_canonical_domain"]
                         == settings.COURSE_V3_CANONICAL_DOMAIN
                     )
-                build_steps = step["do"]
+                site_build_step = step["do"][0]
+                build_steps = site_build_step["do"]
+                if offline:
+                    assert "ensure" not in step
+                    assert "on_success" not in site_build_step
+                else:
+                    assert (
+                        get_dict_list_item_by_field(
+                            items=steps,
+                            field="task",
+                            value=CREATE_SITE_STATUSES_IDENTIFIER,
+                        )
+                        is not None
+                    )
+                    for hook, status in (
+                        ("on_success", "succeeded"),
+                        ("on_failure", "failed"),
+                        ("on_error", "errored"),
+                        ("on_abort", "aborted"),
+                    ):
+                        record_step = site_build_step[hook]["try"]
+                        assert record_step["task"] == RECORD_SITE_STATUS_IDENTIFIER
+                        record_command = record_step["config"]["run"]["args"][1]
+                        assert (
+                            json.dumps(
+                                {
+                                    "name": site_pipeline_vars["site_name"],
+                                    "version": version,
+                                    "status": status,
+                                }
+                            )
+                            in record_command
+                        )
+                        assert f"s3://{artifacts_bucket}/" in record_command
+                    collect_step, post_step = step["ensure"]["try"]["do"]
+                    assert collect_step["task"] == COLLECT_SITE_STATUSES_IDENTIFIER
+                    assert post_step["task"] == POST_SITE_STATUSES_IDENTIFIER
+                    assert post_step["config"]["run"]["args"][-1] == (
+                        f"{ocw_studio_url.rstrip('/')}/api/websites/pipeline_statuses/"
+                    )
+                # Sites never post their own statuses
+                assert (
+                    get_dict_list_item_by_field(
+                        items=build_steps,
+                        field="put",
+                        value=OCW_STUDIO_WEBHOOK_RESOURCE_TYPE_IDENTIFIER,
+                    )
+                    is None
+                )
                 site_content_git_step = get_dict_list_item_by_field(
                     items=build_steps,
                     field="task",
@@ -377,7 +425,7 @@ def test_mass_build_sites_definition_sync_with_delete(
             if "across" not in step:
                 continue
             upload_online_build_task = get_dict_list_item_by_field(
-                items=step["do"],
+                items=step["do"][0]["do"],
                 field="task",
                 value=UPLOAD_ONLINE_BUILD_IDENTIFIER,
             )
@@ -408,3 +456,34 @@ def test_mass_build_sites_definition_sync_with_delete(
     expected_trigger = not sync_with_delete
     assert webpack_trigger_step["trigger"] == expected_trigger
     assert projects_trigger_step["trigger"] == expected_trigger
+
+
+def test_mass_build_sites_definition_site_names(mass_build_websites, settings):
+    """An incremental mass build should only build the given sites and not trigger"""
+    settings.ROOT_WEBSITE_NAME = "root-website"
+    settings.OCW_MASS_BUILD_BATCH_SIZE = 2
+    settings.OCW_MASS_BUILD_MAX_IN_FLIGHT = 2
+    site_names = [website.name for website in mass_build_websites[:3]]
+    pipeline_config = MassBuildSitesPipelineDefinitionConfig(
+        version=VERSION_LIVE,
+        artifacts_bucket=settings.AWS_ARTIFACTS_BUCKET_NAME,
+        site_content_branch=get_site_content_branch(VERSION_LIVE),
+        ocw_hugo_themes_branch="main",
+        ocw_hugo_projects_branch="main",
+        offline=False,
+        instance_vars="",
+        site_names=site_names,
+    )
+    assert sorted(site.name for site in pipeline_config.sites) == sorted(site_names)
+    pipeline_definition = MassBuildSitesPipelineDefinition(config=pipeline_config)
+    rendered_definition = json.loads(pipeline_definition.json(indent=2, by_alias=True))
+    assert len(rendered_definition["jobs"]) == 2
+    first_batch_steps = rendered_definition["jobs"][0]["plan"]
+    for trigger_identifier in (
+        WEBPACK_MANIFEST_S3_TRIGGER_IDENTIFIER,
+        OCW_HUGO_PROJECTS_GIT_TRIGGER_IDENTIFIER,
+    ):
+        trigger_step = get_dict_list_item_by_field(
+            items=first_batch_steps, field="get", value=trigger_identifier
+        )
+        assert trigger_step["trigger"] is False
@@ -43,6 +43,7 @@ from content_sync.pipelines.definitions.concourse.common.resource_types import (
     HttpResourceType,
     KeyvalResourceType,
     S3IamResourceType,
+    get_resource_type,
 )
 from content_sync.pipelines.definitions.concourse.common.resources import (
     OcwHugoProjectsGitResource,
@@ -53,6 +54,7 @@ from content_sync.pipelines.definitions.concourse.common.resources import (
     SiteContentGitResource,
     SlackAlertResource,
     WebpackManifestResource,
+    get_common_resource,
 )
 from content_sync.pipelines.definitions.concourse.common.steps import (
     ClearCdnCacheStep,
@@ -324,9 +326,9 @@ class SitePipelineResourceTypes(list[ResourceType]):
     def __init__(self):
         self.extend(
             [
-                HttpResourceType(),
-                S3IamResourceType(),
-                slack_notification_resource(),
+                get_resource_type(HttpResourceType),
+                get_resource_type(S3IamResourceType),
+                get_resource_type(slack_notification_resource),
             ]
         )
 
@@ -343,15 +345,17 @@ class SitePipelineResources(list[Resource]):
         self,
         config: SitePipelineDefinitionConfig,
     ):
-        webpack_manifest_resource = WebpackManifestResource(
+        webpack_manifest_resource = get_common_resource(
+            WebpackManifestResource,
             name=WEBPACK_MANIFEST_S3_IDENTIFIER,
             bucket=config.vars["artifacts_bucket"],
             branch=config.vars["ocw_hugo_themes_branch"],
         )
-        ocw_hugo_themes_resource = OcwHugoThemesGitResource(
-            branch=config.vars["ocw_hugo_themes_branch"]
+        ocw_hugo_themes_resource = get_common_resource(
+            OcwHugoThemesGitResource, branch=config.vars["ocw_hugo_themes_branch"]
         )
-        ocw_hugo_projects_resource = OcwHugoProjectsGitResource(
+        ocw_hugo_projects_resource = get_common_resource(
+            OcwHugoProjectsGitResource,
             uri=config.vars["ocw_hugo_projects_url"],
             branch=config.vars["ocw_hugo_projects_branch"],
         )
@@ -370,7 +374,7 @@ class SitePipelineResources(list[Resource]):
             ocw_hugo_themes_resource,
             ocw_hugo_projects_resource,
             ocw_studio_webhook_offline_gate_resource,
-            SlackAlertResource(),
+            get_common_resource(SlackAlertResource),
         ]
         if not config.is_extra_theme:
             ocw_studio_webhook_resource = OcwStudioWebhookResource(
@@ -381,7 +385,10 @@ class SitePipelineResources(list[Resource]):
         self.extend(resources)
         if not is_dev() and config.values["pipeline_name"] == "live":
             self.extend(
-                [OpenCatalogResource(url) for url in settings.OPEN_CATALOG_URLS]
+                [
+                    get_common_resource(OpenCatalogResource, open_url=url)
+                    for url in settings.OPEN_CATALOG_URLS
+                ]
             )
 
 
@@ -999,7 +1006,7 @@ class SitePipelineDefinition(Pipeline):
         base = super()
         base.__init__(**kwargs)
         resource_types = SitePipelineResourceTypes()
-        resource_types.append(KeyvalResourceType())
+        resource_types.append(get_resource_type(KeyvalResourceType))
         resources = SitePipelineResources(config=config)
         online_job = self.get_online_build_job(config=config)
 
@@ -20,9 +20,13 @@ from content_sync.pipelines.definitions.concourse.common.image_resources import
     AWS_CLI_REGISTRY_IMAGE,
     OCW_COURSE_PUBLISHER_REGISTRY_IMAGE,
 )
+from content_sync.pipelines.definitions.concourse.common.resource_types import (
+    get_resource_type,
+)
 from content_sync.pipelines.definitions.concourse.common.resources import (
     GitResource,
     SlackAlertResource,
+    get_common_resource,
 )
 from content_sync.pipelines.definitions.concourse.common.steps import (
     ClearCdnCacheStep,
@@ -72,7 +76,8 @@ class ThemeAssetsPipelineDefinition(Pipeline):
     ):
         base = super()
         base.__init__(**kwargs)
-        ocw_hugo_themes_resource = GitResource(
+        ocw_hugo_themes_resource = get_common_resource(
+            GitResource,
             name=OCW_HUGO_THEMES_GIT_IDENTIFIER,
             uri=OCW_HUGO_THEMES_GIT,
             branch=ocw_hugo_themes_branch,
@@ -169,7 +174,7 @@ class ThemeAssetsPipelineDefinition(Pipeline):
         ]
         job = Job(name=self._build_theme_assets_job_identifier, serial=True)
         if not is_dev():
-            resource_types.append(slack_notification_resource())
+            resource_types.append(get_resource_type(slack_notification_resource))
             resources.append(self._slack_resource)
             tasks.extend(
                 [
@@ -0,0 +1,77 @@
+"""Scheduling of site builds into mass build batches"""
+
+import heapq
+from statistics import median
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+    from websites.models import Website
+
+
+def get_expected_build_seconds(
+    sites: Iterable[Website], version: str
+) -> dict[Website, float]:
+    """
+    Return the expected build time of each site in seconds. This is the duration
+    of the latest successful build of the given version, or the median of those
+    for sites that have not recorded one yet.
+
+    Args:
+        sites(Iterable[Website]): The sites to build
+        version(str): The version being built (draft / live)
+    """
+    durations = {site: getattr(site, f"{version}_build_duration") for site in sites}
+    recorded = [duration.total_seconds() for duration in durations.values() if duration]
+    fallback = median(recorded) if recorded else 0.0
+    return {
+        site: duration.total_seconds() if duration else fallback
+        for site, duration in durations.items()
+    }
+
+
+def schedule_batches(
+    items: Iterable[Hashable], expected_seconds: dict, batch_size: int
+) -> list[list]:
+    """
+    Split items into batches using longest-processing-time-first ordering.
+
+    Batches run one after another and each runs its builds in list order, a few
+    at a time, so a batch lasts about as long as its longest build. Ordering all
+    items longest first puts the longest builds together in the earliest batches,
+    where they overlap with each other, and starts them first within each batch.
+    Items with the same expected time keep their order.
+
+    Args:
+        items(Iterable): The items to build
+        expected_seconds(dict): The expected build time of each item
+        batch_size(int): The number of items per batch
+    """
+    ordered = sorted(items, key=lambda item: expected_seconds[item], reverse=True)
+    return [
+        ordered[start : start + batch_size]
+        for start in range(0, len(ordered), batch_size)
+    ]
+
+
+def simulate_batches(
+    batches: Iterable[Iterable[Hashable]], expected_seconds: dict, max_in_flight: int
+) -> float:
+    """
+    Return how long a mass build of the given batches would take in seconds.
+    Batches run one after another, and in each one every build starts, in list
+    order, as soon as one of max_in_flight slots is free.
+
+    Args:
+        batches(Iterable): The batches of items, in the order they run
+        expected_seconds(dict): The build time of each item
+        max_in_flight(int): The number of builds a batch runs at the same time
+    """
+    total = 0.0
+    for batch in batches:
+        slots = [0.0] * max(max_in_flight, 1)
+        for item in batch:
+            heapq.heapreplace(slots, slots[0] + expected_seconds[item])
+        total += max(slots)
+    return total
@@ -0,0 +1,77 @@
+"""Tests for mass build scheduling"""
+
+from datetime import timedelta
+
+import pytest
+
+from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.scheduling import (
+    get_expected_build_seconds,
+    schedule_batches,
+    simulate_batches,
+)
+from websites.factories import WebsiteFactory
+
+
+@pytest.mark.parametrize("version", [VERSION_DRAFT, VERSION_LIVE])
+@pytest.mark.parametrize(
+    ("recorded", "expected"),
+    [
+        ([60, 120, 600, None], [60, 120, 600, 120]),
+        ([None, None], [0, 0]),
+    ],
+)
+@pytest.mark.django_db
+def test_get_expected_build_seconds(version, recorded, expected):
+    """Sites without a recorded build duration should get the median of the others"""
+    other_version = VERSION_LIVE if version == VERSION_DRAFT else VERSION_DRAFT
+    sites = [
+        WebsiteFactory.create(
+            **{
+                f"{version}_build_duration": (
+                    timedelta(seconds=seconds) if seconds else None
+                ),
+                f"{other_version}_build_duration": timedelta(hours=1),
+            }
+        )
+        for seconds in recorded
+    ]
+    expected_seconds = get_expected_build_seconds(sites, version)
+    assert [expected_seconds[site] for site in sites] == expected
+
+
+def test_schedule_batches():
+    """Items should be batched longest first, keeping the order of ties"""
+    expected_seconds = {"a": 1, "b": 5, "c": 3, "d": 5, "e": 1}
+    assert schedule_batches(["a", "b", "c", "d", "e"], expected_seconds, 2) == [
+        ["b", "d"],
+        ["c", "a"],
+        ["e"],
+    ]
+    assert schedule_batches([], expected_seconds, 2) == []
+
+
+@pytest.mark.parametrize(
+    ("batches", "max_in_flight", "expected"),
+    [
+        ([["a", "b", "c"]], 3, 10),
+        ([["a", "b", "c"]], 2, 10),
+        ([["a", "b", "c"]], 1, 17),
+        ([["a", "b"], ["c"]], 2, 12),
+        ([["a", "c"], ["b"]], 2, 15),
+    ],
+)
+def test_simulate_batches(batches, max_in_flight, expected):
+    """Batches should run one after another, each running builds in parallel"""
+    expected_seconds = {"a": 10, "b": 5, "c": 2}
+    assert simulate_batches(batches, expected_seconds, max_in_flight) == expected
+
+
+def test_schedule_batches_shorter():
+    """Batching longest first should finish sooner than mixing short and long builds"""
+    expected_seconds = {"a": 10, "b": 1, "c": 10, "d": 1}
+    mixed = [["a", "b"], ["c", "d"]]
+    scheduled = schedule_batches(["a", "b", "c", "d"], expected_seconds, 2)
+    assert simulate_batches(scheduled, expected_seconds, 2) < simulate_batches(
+        mixed, expected_seconds, 2
+    )
@@ -2,12 +2,17 @@
 
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import timedelta
+from statistics import median
+from time import monotonic
 from urllib.parse import urlparse
 
 import botocore
 import celery
 from django.conf import settings
+from django.db import connections
 from django.db.models import F, Q
 from django.utils.module_loading import import_string
 from github.GithubException import RateLimitExceededException
@@ -16,6 +21,11 @@ from requests import HTTPError
 
 from content_sync import api
 from content_sync.apis import github
+from content_sync.build_inputs import (
+    get_build_inputs,
+    get_changed_sites,
+    record_pending_build_inputs,
+)
 from content_sync.constants import VERSION_DRAFT, VERSION_LIVE, WEBSITE_LISTING_DIRPATH
 from content_sync.decorators import single_task
 from content_sync.models import ContentSyncState
@@ -23,9 +33,10 @@ from content_sync.utils import get_publishable_sites
 from main.celery import app
 from main.s3_utils import get_boto3_resource
 from websites.api import (
+    WebsiteStatusUpdate,
     get_website_in_root_website_metadata,
     reset_publishing_fields,
-    update_website_status,
+    update_website_statuses,
 )
 from websites.constants import (
     CONTENT_TYPE_WEBSITE,
@@ -120,26 +131,29 @@ def upsert_website_publishing_pipeline(website_name: str):
         pipeline.upsert_pipeline()
 
 
-@app.task(acks_late=True)
-def upsert_website_pipeline_batch(
-    website_names: list[str],
-    create_backend=False,  # noqa: FBT002
-    unpause=False,  # noqa: FBT002
-    hugo_args="",
+def _upsert_website_pipelines(  # pylint: disable=too-many-arguments  # noqa: PLR0913
+    website: Website,
+    pipeline_api: object | None,
+    backend_lock: threading.Lock,
+    *,
+    create_backend: bool,
+    unpause: bool,
+    hugo_args: str,
 ):
-    """Create/update publishing pipelines for multiple websites"""
-    api_instance = None
-    for website_name in website_names:
-        website = Website.objects.get(name=website_name)
+    """
+    Create/update the publishing pipelines of a website, and its backend if asked.
+    The backend is created and synced while holding backend_lock, so that git
+    backend calls stay spaced out by the throttle even when websites are processed
+    in parallel.
+    """
+    try:
         if create_backend:
-            backend = api.get_sync_backend(website)
-            api.throttle_git_backend_calls(backend)
-            backend.create_website_in_backend()
-            backend.sync_all_content_to_backend()
-        pipeline = api.get_site_pipeline(website, hugo_args=hugo_args, api=api_instance)
-        if not api_instance:
-            # Keep using the same api instance to minimize multiple authentication calls
-            api_instance = pipeline.api
+            with backend_lock:
+                backend = api.get_sync_backend(website)
+                api.throttle_git_backend_calls(backend)
+                backend.create_website_in_backend()
+                backend.sync_all_content_to_backend()
+        pipeline = api.get_site_pipeline(website, hugo_args=hugo_args, api=pipeline_api)
         pipeline.upsert_pipeline()
         if unpause:
             for version in [
@@ -157,7 +171,7 @@ def upsert_website_pipeline_batch(
                 theme_pipeline = api.get_site_pipeline(
                     website,
                     hugo_args=hugo_args,
-                    api=api_instance,
+                    api=pipeline_api,
                     theme_slug=theme_slug,
                     prefix=theme_slug,
                     noindex=True,
@@ -170,7 +184,92 @@ def upsert_website_pipeline_batch(
                     ]:
                         theme_pipeline_name = f"{version}-{theme_slug}"
                         theme_pipeline.unpause_pipeline(theme_pipeline_name)
-    return True
+    finally:
+        # Each worker thread has its own database connection
+        connections.close_all()
+
+
+@app.task(acks_late=True)
+def upsert_website_pipeline_batch(
+    website_names: list[str],
+    create_backend=False,  # noqa: FBT002
+    unpause=False,  # noqa: FBT002
+    hugo_args="",
+):
+    """
+    Create/update publishing pipelines for multiple websites. Up to
+    settings.CONCOURSE_UPSERT_CONCURRENCY websites have their pipelines upserted in
+    parallel, sharing one pipeline API instance to minimize authentication calls.
+    Their git backends are still created and synced one at a time. An error for
+    one website is logged without stopping the others.
+    """
+    start = monotonic()
+    websites = Website.objects.select_related("starter").in_bulk(
+        website_names, field_name="name"
+    )
+    result = True
+    missing_names = sorted(set(website_names) - set(websites))
+    if missing_names:
+        log.error("Cannot upsert pipelines for missing websites %s", missing_names)
+        result = False
+    pipeline_api = (
+        api.get_pipeline_api() if settings.CONTENT_SYNC_PIPELINE_BACKEND else None
+    )
+    backend_lock = threading.Lock()
+
+    def upsert(website: Website) -> float:
+        """Upsert the pipelines of a website and return how long it took"""
+        site_start = monotonic()
+        _upsert_website_pipelines(
+            website,
+            pipeline_api,
+            backend_lock,
+            create_backend=create_backend,
+            unpause=unpause,
+            hugo_args=hugo_args,
+        )
+        return monotonic() - site_start
+
+    durations = {}
+    with ThreadPoolExecutor(
+        max_workers=max(settings.CONCOURSE_UPSERT_CONCURRENCY, 1)
+    ) as executor:
+        futures = {
+            executor.submit(upsert, website): name for name, website in websites.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                durations[name] = future.result()
+            except:  # pylint:disable=bare-except  # noqa: E722
+                log.exception("Error upserting pipelines for website %s", name)
+                result = False
+    if durations:
+        slowest = max(durations, key=durations.get)
+        log.info(
+            "Upserted pipelines for %d/%d websites in %.1fs, median %.1fs per "
+            "website, slowest %s at %.1fs",
+            len(durations),
+            len(website_names),
+            monotonic() - start,
+            median(durations.values()),
+            slowest,
+            durations[slowest],
+        )
+    if pipeline_api is not None:
+        _log_pipeline_requests(pipeline_api, "Pipeline batch upsert")
+    return result
+
+
+def _log_pipeline_requests(pipeline_api, description: str):
+    """Log how many requests of each kind a pipeline API instance has made"""
+    request_counts = dict(pipeline_api.request_counts)
+    log.info(
+        "%s made %d pipeline API requests: %s",
+        description,
+        sum(request_counts.values()),
+        request_counts,
+    )
 
 
 @app.task(bind=True)
@@ -231,16 +330,41 @@ def upsert_test_pipeline(
 
 
 @app.task(acks_late=True)
-def trigger_mass_build(version: str, *, sync_with_delete: bool = False) -> bool:
-    """Trigger the mass build pipeline for the specified version"""
+def trigger_mass_build(
+    version: str, *, sync_with_delete: bool = False, incremental: bool = False
+) -> bool:
+    """
+    Trigger the mass build pipeline for the specified version. An incremental mass
+    build only builds the sites whose build inputs changed since their last
+    successful build.
+    """
     if settings.CONTENT_SYNC_PIPELINE_BACKEND:
+        site_names = None
+        if incremental:
+            sites = list(get_publishable_sites(version).select_related("starter"))
+            inputs = get_build_inputs(sites, version)
+            changed_sites = get_changed_sites(sites, version, inputs)
+            log.info(
+                "%d of %d %s sites have changed build inputs",
+                len(changed_sites),
+                len(sites),
+                version,
+            )
+            if not changed_sites:
+                return True
+            site_names = [site.name for site in changed_sites]
         pipeline = api.get_mass_build_sites_pipeline(
-            version, sync_with_delete=sync_with_delete
+            version, sync_with_delete=sync_with_delete, site_names=site_names
         )
-        if sync_with_delete:
-            # The destructive variant is a separate pipeline instance that does
-            # not exist until upserted; delete it manually once the run is done
+        if sync_with_delete or incremental:
+            # These variants are separate pipeline instances that do not exist
+            # until upserted; delete destructive ones manually once the run is done
             pipeline.upsert_pipeline()
+        if incremental:
+            record_pending_build_inputs(
+                version,
+                {site: inputs[site] for site in changed_sites if site in inputs},
+            )
         pipeline.unpause()
         pipeline.trigger()
     return True
@@ -388,6 +512,7 @@ def publish_websites(  # pylint: disable=too-many-arguments  # noqa: PLR0913
     prepublish: bool | None = False,
     no_mass_build: bool | None = False,
     sync_with_delete: bool = False,
+    incremental: bool = False,
 ):
     """Publish live or draft versions of multiple websites in parallel batches"""
     if not settings.CONTENT_SYNC_BACKEND or not settings.CONTENT_SYNC_PIPELINE_BACKEND:
@@ -406,7 +531,9 @@ def publish_websites(  # pylint: disable=too-many-arguments  # noqa: PLR0913
         return self.replace(celery.group(site_tasks))
     workflow = celery.chain(
         celery.group(site_tasks),
-        trigger_mass_build.si(version, sync_with_delete=sync_with_delete),
+        trigger_mass_build.si(
+            version, sync_with_delete=sync_with_delete, incremental=incremental
+        ),
     )
     return self.replace(celery.group(workflow))
 
@@ -419,6 +546,22 @@ def sync_github_site_configs(url: str, files: list[str], commit: str | None = No
     github.sync_starter_configs(url, files, commit=commit)
 
 
+def _get_build_status(pipeline_api, website: Website, version: str, build_id: int):
+    """Get the status of a single build, treating a missing build as errored"""
+    try:
+        return pipeline_api.get_build_status(build_id)
+    except HTTPError as err:
+        if err.response.status_code == 404:  # noqa: PLR2004
+            log.error(  # noqa: TRY400
+                "Could not find %s build %s for %s",
+                version,
+                build_id,
+                website.name,
+            )
+            return PUBLISH_STATUS_ERRORED
+        raise
+
+
 @app.task(acks_late=True)
 def check_incomplete_publish_build_statuses():  # noqa: C901
     """
@@ -429,6 +572,7 @@ def check_incomplete_publish_build_statuses():  # noqa: C901
     now = now_in_utc()
     wait_dt = now - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME)
     cutoff_dt = now - timedelta(seconds=settings.PUBLISH_STATUS_CUTOFF)
+    builds_to_check = []
     for website in (
         Website.objects.exclude(
             (
@@ -444,63 +588,55 @@ def check_incomplete_publish_build_statuses():  # noqa: C901
             Q(draft_publish_status_updated_on__lte=wait_dt)
             | Q(live_publish_status_updated_on__lte=wait_dt)
         )
+        .select_related("draft_last_published_by", "live_last_published_by")
         .iterator()
     ):
-        try:
-            versions_to_check = []
+        for version in [VERSION_DRAFT, VERSION_LIVE]:
+            last_status = getattr(website, f"{version}_publish_status")
+            update_dt = getattr(website, f"{version}_publish_status_updated_on")
+            build_id = getattr(website, f"latest_build_id_{version}")
             if (
-                website.draft_publish_status not in PUBLISH_STATUSES_FINAL
-                and website.draft_publish_status_updated_on
-                and website.draft_publish_status_updated_on <= wait_dt
+                last_status not in PUBLISH_STATUSES_FINAL
+                and update_dt
+                and update_dt <= wait_dt
+                and build_id is not None
             ):
-                versions_to_check.append(
-                    (
-                        VERSION_DRAFT,
-                        website.draft_publish_status_updated_on,
-                        website.draft_publish_status,
-                    )
+                builds_to_check.append(
+                    (website, version, build_id, update_dt, last_status)
                 )
-            if (
-                website.live_publish_status not in PUBLISH_STATUSES_FINAL
-                and website.live_publish_status_updated_on
-                and website.live_publish_status_updated_on <= wait_dt
-            ):
-                versions_to_check.append(
-                    (
-                        VERSION_LIVE,
-                        website.live_publish_status_updated_on,
-                        website.live_publish_status,
-                    )
+    if not builds_to_check:
+        return
+
+    # One authenticated API instance and a few pages of the team's builds cover
+    # every site, instead of a pipeline and a build request per site.
+    pipeline_api = api.get_pipeline_api()
+    try:
+        statuses = pipeline_api.get_build_statuses(
+            {build_id for _, _, build_id, _, _ in builds_to_check}
+        )
+    except HTTPError:
+        log.exception("Error listing builds, checking their statuses one by one")
+        statuses = {}
+    status_updates = []
+    for website, version, build_id, update_dt, last_status in builds_to_check:
+        try:
+            status = statuses.get(build_id) or _get_build_status(
+                pipeline_api, website, version, build_id
+            )
+            if status not in PUBLISH_STATUSES_FINAL and update_dt <= cutoff_dt:
+                # Abort so another attempt can be made
+                pipeline_api.abort_build(build_id)
+                status = PUBLISH_STATUS_ABORTED
+            if status != last_status:
+                status_updates.append(
+                    WebsiteStatusUpdate(website, version, status, build_id=build_id)
                 )
-            for version, update_dt, last_status in versions_to_check:
-                build_id = getattr(website, f"latest_build_id_{version}")
-                if build_id is not None:
-                    pipeline = api.get_site_pipeline(website)
-                    try:
-                        status = pipeline.get_build_status(build_id)
-                    except HTTPError as err:
-                        if err.response.status_code == 404:  # noqa: PLR2004
-                            log.error(  # noqa: TRY400
-                                "Could not find %s build %s for %s",
-                                version,
-                                build_id,
-                                website.name,
-                            )
-                            status = PUBLISH_STATUS_ERRORED
-                        else:
-                            raise
-                    if status not in PUBLISH_STATUSES_FINAL and update_dt <= cutoff_dt:
-                        # Abort so another attempt can be made
-                        pipeline.abort_build(build_id)
-                        status = PUBLISH_STATUS_ABORTED
-                    if status != last_status:
-                        update_website_status(
-                            website, version, status, now, build_id=build_id
-                        )
         except:  # pylint: disable=bare-except  # noqa: E722
             log.exception(
                 "Error updating publishing status for website %s", website.name
             )
+    update_website_statuses(status_updates, now)
+    _log_pipeline_requests(pipeline_api, "Publish status check")
 
 
 @app.task(acks_late=True)
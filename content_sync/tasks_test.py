@@ -1,7 +1,10 @@
 """Content sync task tests"""
 
 import os
+import threading
+from collections import Counter
 from datetime import timedelta
+from time import sleep
 
 import factory
 import pytest
@@ -22,6 +25,7 @@ from content_sync.pipelines.base import (
     BaseUnpublishedSiteRemovalPipeline,
 )
 from main.s3_utils import get_boto3_resource
+from websites.api import WebsiteStatusUpdate
 from websites.constants import (
     PUBLISH_STATUS_ABORTED,
     PUBLISH_STATUS_ERRORED,
@@ -34,7 +38,7 @@ from websites.factories import (
     WebsiteFactory,
     WebsiteStarterFactory,
 )
-from websites.models import WebsiteContent
+from websites.models import Website, WebsiteContent
 
 pytestmark = pytest.mark.django_db
 
@@ -393,19 +397,27 @@ def test_upsert_website_pipeline_batch(  # pylint:disable=too-many-arguments  #
     """upsert_website_pipeline_batch should make the expected function calls"""
     settings.GITHUB_RATE_LIMIT_CHECK = check_limit
     settings.OCW_EXTRA_COURSE_THEMES = []  # No extra themes for this test
+    settings.CONTENT_SYNC_PIPELINE_BACKEND = "concourse"
     mock_get_backend = mocker.patch("content_sync.tasks.api.get_sync_backend")
     mock_get_pipeline = mocker.patch("content_sync.tasks.api.get_site_pipeline")
+    mock_get_api = mocker.patch("content_sync.tasks.api.get_pipeline_api")
     mock_throttle = mocker.patch("content_sync.tasks.api.throttle_git_backend_calls")
     websites = WebsiteFactory.create_batch(2)
     website_names = sorted([website.name for website in websites])
-    tasks.upsert_website_pipeline_batch(
-        website_names,
-        create_backend=create_backend,
-        unpause=unpause,
-        hugo_args=hugo_args,
+    assert (
+        tasks.upsert_website_pipeline_batch(
+            website_names,
+            create_backend=create_backend,
+            unpause=unpause,
+            hugo_args=hugo_args,
+        )
+        is True
     )
-    mock_get_pipeline.assert_any_call(websites[0], hugo_args=hugo_args, api=None)
-    mock_get_pipeline.assert_any_call(websites[1], hugo_args=hugo_args, api=mocker.ANY)
+    mock_get_api.assert_called_once_with()
+    for website in websites:
+        mock_get_pipeline.assert_any_call(
+            website, hugo_args=hugo_args, api=mock_get_api.return_value
+        )
     if create_backend:
         for website in websites:
             mock_get_backend.assert_any_call(website)
@@ -424,6 +436,90 @@ def test_upsert_website_pipeline_batch(  # pylint:disable=too-many-arguments  #
         mock_pipeline.unpause_pipeline.assert_not_called()
 
 
+def test_upsert_website_pipeline_batch_serial_backend(mocker, settings):
+    """upsert_website_pipeline_batch should sync one git backend at a time"""
+    settings.OCW_EXTRA_COURSE_THEMES = []
+    settings.CONCOURSE_UPSERT_CONCURRENCY = 4
+    mocker.patch("content_sync.tasks.api.get_site_pipeline")
+    mocker.patch("content_sync.tasks.api.get_pipeline_api")
+    mock_throttle = mocker.patch("content_sync.tasks.api.throttle_git_backend_calls")
+    counter_lock = threading.Lock()
+    active = []
+    max_active = []
+
+    def sync():
+        """Record how many backends are being synced at once"""
+        with counter_lock:
+            active.append(1)
+            max_active.append(len(active))
+        sleep(0.05)
+        with counter_lock:
+            active.pop()
+
+    mock_get_backend = mocker.patch("content_sync.tasks.api.get_sync_backend")
+    mock_get_backend.return_value.sync_all_content_to_backend.side_effect = sync
+    websites = WebsiteFactory.create_batch(4)
+    assert (
+        tasks.upsert_website_pipeline_batch(
+            [website.name for website in websites], create_backend=True
+        )
+        is True
+    )
+    assert mock_throttle.call_count == 4
+    assert max(max_active) == 1
+
+
+def test_upsert_website_pipeline_batch_request_counts(mocker, settings):
+    """upsert_website_pipeline_batch should log the requests made by its pipeline API"""
+    settings.OCW_EXTRA_COURSE_THEMES = []
+    settings.CONTENT_SYNC_PIPELINE_BACKEND = "concourse"
+    mocker.patch("content_sync.tasks.api.get_site_pipeline")
+    mock_get_api = mocker.patch("content_sync.tasks.api.get_pipeline_api")
+    mock_get_api.return_value.request_counts = Counter(
+        {"AUTH": 1, "PUT /api/v1/teams/:team/pipelines/:pipeline/config": 2}
+    )
+    mock_log = mocker.patch("content_sync.tasks.log.info")
+    websites = WebsiteFactory.create_batch(2)
+    assert (
+        tasks.upsert_website_pipeline_batch([website.name for website in websites])
+        is True
+    )
+    mock_log.assert_any_call(
+        "%s made %d pipeline API requests: %s",
+        "Pipeline batch upsert",
+        3,
+        {"AUTH": 1, "PUT /api/v1/teams/:team/pipelines/:pipeline/config": 2},
+    )
+
+
+def test_upsert_website_pipeline_batch_errors(mocker, settings):
+    """upsert_website_pipeline_batch should keep upserting pipelines after an error"""
+    settings.OCW_EXTRA_COURSE_THEMES = []
+    websites = WebsiteFactory.create_batch(3)
+    mock_get_pipeline = mocker.patch(
+        "content_sync.tasks.api.get_site_pipeline",
+        side_effect=lambda website, **_: (
+            mocker.Mock(upsert_pipeline=mocker.Mock(side_effect=HTTPError))
+            if website == websites[0]
+            else mocker.DEFAULT
+        ),
+    )
+    mocker.patch("content_sync.tasks.api.get_pipeline_api")
+    mock_log = mocker.patch("content_sync.tasks.log.exception")
+    assert (
+        tasks.upsert_website_pipeline_batch([website.name for website in websites])
+        is False
+    )
+    assert mock_get_pipeline.call_count == 3
+    assert mock_get_pipeline.return_value.upsert_pipeline.call_count == 2
+    mock_log.assert_called_once_with(
+        "Error upserting pipelines for website %s", websites[0].name
+    )
+    assert (
+        tasks.upsert_website_pipeline_batch([websites[1].name, "missing-site"]) is False
+    )
+
+
 @pytest.mark.parametrize("unpause", [True, False])
 def test_upsert_website_pipeline_batch_with_extra_themes(mocker, settings, unpause):
     """upsert_website_pipeline_batch should create extra theme pipelines for OCW sites"""
@@ -433,6 +529,7 @@ def test_upsert_website_pipeline_batch_with_extra_themes(mocker, settings, unpau
     settings.CONTENT_SYNC_PIPELINE_BACKEND = "concourse"
 
     mock_get_pipeline = mocker.patch("content_sync.tasks.api.get_site_pipeline")
+    mocker.patch("content_sync.tasks.api.get_pipeline_api")
 
     ocw_starter = WebsiteStarterFactory.create(slug="ocw-course-v2")
     other_starter = WebsiteStarterFactory.create(slug="other-site-type")
@@ -518,7 +615,7 @@ def test_publish_websites(  # pylint:disable=unused-argument,too-many-arguments
         )
     if not trigger_pipeline:
         mock_mass_build.assert_called_once_with(
-            version, sync_with_delete=sync_with_delete
+            version, sync_with_delete=sync_with_delete, incremental=False
         )
     else:
         mock_mass_build.assert_not_called()
@@ -579,7 +676,7 @@ def test_check_incomplete_publish_build_statuses(  # noqa: PLR0913, PLR0917
 ):  # pylint:disable=too-many-arguments,too-many-locals
     """check_incomplete_publish_build_statuses should update statuses of pipeline builds"""
     settings.CONTENT_SYNC_PIPELINE_BACKEND = pipeline
-    mock_update_status = mocker.patch("content_sync.tasks.update_website_status")
+    mock_update_statuses = mocker.patch("content_sync.tasks.update_website_statuses")
     now = now_in_utc()
     draft_site_in_query = WebsiteFactory.create(
         draft_publish_status_updated_on=now
@@ -587,13 +684,13 @@ def test_check_incomplete_publish_build_statuses(  # noqa: PLR0913, PLR0917
         draft_publish_status=old_status,
         latest_build_id_draft=1,
     )
-    draft_site_to_exclude_time = WebsiteFactory.create(
+    WebsiteFactory.create(
         draft_publish_status_updated_on=now
         - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME - 5),
         draft_publish_status=old_status,
         latest_build_id_draft=2,
     )
-    draft_site_to_exclude_status = WebsiteFactory.create(
+    WebsiteFactory.create(
         draft_publish_status_updated_on=now
         - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME + 5),
         draft_publish_status=PUBLISH_STATUS_SUCCEEDED,
@@ -605,50 +702,65 @@ def test_check_incomplete_publish_build_statuses(  # noqa: PLR0913, PLR0917
         live_publish_status=old_status,
         latest_build_id_live=3,
     )
-    live_site_excluded_time = WebsiteFactory.create(
+    WebsiteFactory.create(
         live_publish_status_updated_on=now
         - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME - 5),
         live_publish_status=old_status,
         latest_build_id_live=4,
     )
-    live_site_excluded_status = WebsiteFactory.create(
+    WebsiteFactory.create(
         live_publish_status_updated_on=now
         - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME + 5),
         live_publish_status=None,
         latest_build_id_live=4,
     )
-    api_mock.get_site_pipeline.return_value.get_build_status.return_value = new_status
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.return_value = {1: new_status, 3: new_status}
     tasks.check_incomplete_publish_build_statuses.delay()
-    for website, version, build_id in [
-        (draft_site_in_query, VERSION_DRAFT, 1),
-        (live_site_in_query, VERSION_LIVE, 3),
-    ]:
-        if should_check and pipeline is not None:
-            api_mock.get_site_pipeline.assert_any_call(website)
-            api_mock.get_site_pipeline.return_value.get_build_status.assert_any_call(
-                getattr(website, f"latest_build_id_{version}")
-            )
-            if should_update:
-                mock_update_status.assert_any_call(
-                    website, version, new_status, mocker.ANY, build_id=build_id
-                )
-        else:
-            with pytest.raises(AssertionError):
-                api_mock.get_site_pipeline.assert_any_call(website)
-            with pytest.raises(AssertionError):
-                mock_update_status.assert_any_call(
-                    website, version, new_status, mocker.ANY
-                )
-    for website, version in [
-        (draft_site_to_exclude_time, VERSION_DRAFT),
-        (draft_site_to_exclude_status, VERSION_DRAFT),
-        (live_site_excluded_time, VERSION_LIVE),
-        (live_site_excluded_status, VERSION_LIVE),
-    ]:
-        with pytest.raises(AssertionError):
-            api_mock.get_site_pipeline.assert_any_call(website)
-        with pytest.raises(AssertionError):
-            mock_update_status.assert_any_call(website, version, new_status, mocker.ANY)
+    if should_check and pipeline is not None:
+        api_mock.get_pipeline_api.assert_called_once()
+        pipeline_api.get_build_statuses.assert_called_once_with({1, 3})
+        pipeline_api.get_build_status.assert_not_called()
+        expected_updates = (
+            [
+                WebsiteStatusUpdate(
+                    draft_site_in_query, VERSION_DRAFT, new_status, build_id=1
+                ),
+                WebsiteStatusUpdate(
+                    live_site_in_query, VERSION_LIVE, new_status, build_id=3
+                ),
+            ]
+            if should_update
+            else []
+        )
+        mock_update_statuses.assert_called_once_with(expected_updates, mocker.ANY)
+    else:
+        api_mock.get_pipeline_api.assert_not_called()
+        mock_update_statuses.assert_not_called()
+
+
+def test_check_incomplete_publish_build_statuses_request_counts(
+    settings, mocker, api_mock
+):
+    """check_incomplete_publish_build_statuses should log the requests made by its pipeline API"""
+    mocker.patch("content_sync.tasks.update_website_statuses")
+    mock_log = mocker.patch("content_sync.tasks.log.info")
+    WebsiteFactory.create(
+        draft_publish_status_updated_on=now_in_utc()
+        - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME + 5),
+        draft_publish_status=PUBLISH_STATUS_STARTED,
+        latest_build_id_draft=1,
+    )
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.return_value = {1: PUBLISH_STATUS_SUCCEEDED}
+    pipeline_api.request_counts = Counter({"GET /api/v1/teams/:team/builds": 1})
+    tasks.check_incomplete_publish_build_statuses.delay()
+    mock_log.assert_called_once_with(
+        "%s made %d pipeline API requests: %s",
+        "Publish status check",
+        1,
+        {"GET /api/v1/teams/:team/builds": 1},
+    )
 
 
 def test_check_incomplete_publish_build_statuses_no_setting(settings, api_mock):
@@ -660,11 +772,8 @@ def test_check_incomplete_publish_build_statuses_no_setting(settings, api_mock):
         draft_publish_status=PUBLISH_STATUS_NOT_STARTED,
         latest_build_id_draft=1,
     )
-    api_mock.get_site_pipeline.return_value.get_build_status.return_value = (
-        PUBLISH_STATUS_NOT_STARTED
-    )
     tasks.check_incomplete_publish_build_statuses.delay()
-    api_mock.get_site_pipeline.assert_not_called()
+    api_mock.get_pipeline_api.assert_not_called()
     stuck_website.refresh_from_db()
     assert stuck_website.draft_publish_status == PUBLISH_STATUS_NOT_STARTED
 
@@ -677,17 +786,43 @@ def test_check_incomplete_publish_build_statuses_abort(settings, api_mock):
         draft_publish_status=PUBLISH_STATUS_NOT_STARTED,
         latest_build_id_draft=1,
     )
-    api_mock.get_site_pipeline.return_value.get_build_status.return_value = (
-        PUBLISH_STATUS_NOT_STARTED
-    )
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.return_value = {1: PUBLISH_STATUS_NOT_STARTED}
     tasks.check_incomplete_publish_build_statuses.delay()
-    api_mock.get_site_pipeline.return_value.abort_build.assert_called_once_with(
+    pipeline_api.abort_build.assert_called_once_with(
         stuck_website.latest_build_id_draft
     )
     stuck_website.refresh_from_db()
     assert stuck_website.draft_publish_status == PUBLISH_STATUS_ABORTED
 
 
+def test_check_incomplete_publish_build_statuses_bulk_update(settings, api_mock):
+    """Status changes for many websites should all be applied"""
+    websites = WebsiteFactory.create_batch(
+        3,
+        live_publish_status_updated_on=now_in_utc()
+        - timedelta(seconds=settings.PUBLISH_STATUS_WAIT_TIME + 5),
+        live_publish_status=PUBLISH_STATUS_NOT_STARTED,
+    )
+    for build_id, website in enumerate(websites, start=10):
+        website.latest_build_id_live = build_id
+        website.save()
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.return_value = {
+        10: PUBLISH_STATUS_SUCCEEDED,
+        11: PUBLISH_STATUS_STARTED,
+    }
+    pipeline_api.get_build_status.return_value = PUBLISH_STATUS_ERRORED
+    tasks.check_incomplete_publish_build_statuses.delay()
+    pipeline_api.get_build_status.assert_called_once_with(12)
+    for website, expected_status in zip(
+        websites,
+        [PUBLISH_STATUS_SUCCEEDED, PUBLISH_STATUS_STARTED, PUBLISH_STATUS_ERRORED],
+    ):
+        website.refresh_from_db()
+        assert website.live_publish_status == expected_status
+
+
 def test_check_incomplete_publish_build_statuses_404(settings, mocker, api_mock):
     """A website with a non-existent pipeline/build should have publishing status set to errored"""
     mock_log = mocker.patch("content_sync.tasks.log.error")
@@ -697,7 +832,9 @@ def test_check_incomplete_publish_build_statuses_404(settings, mocker, api_mock)
         draft_publish_status=PUBLISH_STATUS_NOT_STARTED,
         latest_build_id_draft=1,
     )
-    api_mock.get_site_pipeline.return_value.get_build_status.side_effect = HTTPError(
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.return_value = {}
+    pipeline_api.get_build_status.side_effect = HTTPError(
         response=mocker.Mock(status_code=404)
     )
     tasks.check_incomplete_publish_build_statuses.delay()
@@ -720,11 +857,16 @@ def test_check_incomplete_publish_build_statuses_500(settings, mocker, api_mock)
         live_publish_status=PUBLISH_STATUS_NOT_STARTED,
         latest_build_id_live=1,
     )
-    api_mock.get_site_pipeline.return_value.get_build_status.side_effect = HTTPError(
+    pipeline_api = api_mock.get_pipeline_api.return_value
+    pipeline_api.get_build_statuses.side_effect = HTTPError(
+        response=mocker.Mock(status_code=500)
+    )
+    pipeline_api.get_build_status.side_effect = HTTPError(
         response=mocker.Mock(status_code=500)
     )
     tasks.check_incomplete_publish_build_statuses.delay()
-    mock_log.assert_called_once_with(
+    mock_log.assert_any_call("Error listing builds, checking their statuses one by one")
+    mock_log.assert_called_with(
         "Error updating publishing status for website %s", website.name
     )
     website.refresh_from_db()
@@ -744,7 +886,7 @@ def test_trigger_mass_build(settings, mocker, backend, version, sync_with_delete
     tasks.trigger_mass_build.delay(version, sync_with_delete=sync_with_delete)
     if backend == "concourse":
         mock_get_pipeline.assert_called_once_with(
-            version, sync_with_delete=sync_with_delete
+            version, sync_with_delete=sync_with_delete, site_names=None
         )
         if sync_with_delete:
             mock_pipeline.upsert_pipeline.assert_called_once_with()
@@ -756,6 +898,44 @@ def test_trigger_mass_build(settings, mocker, backend, version, sync_with_delete
         mock_get_pipeline.assert_not_called()
 
 
+@pytest.mark.parametrize("has_changes", [True, False])
+def test_trigger_mass_build_incremental(settings, mocker, has_changes):
+    """An incremental mass build should only build the sites with changed inputs"""
+    settings.CONTENT_SYNC_PIPELINE_BACKEND = "concourse"
+    sites = WebsiteFactory.create_batch(3)
+    mocker.patch(
+        "content_sync.tasks.get_publishable_sites",
+        return_value=Website.objects.filter(pk__in=[site.pk for site in sites]),
+    )
+    inputs = {site: mocker.Mock() for site in sites}
+    mock_get_inputs = mocker.patch(
+        "content_sync.tasks.get_build_inputs", return_value=inputs
+    )
+    changed_sites = sites[1:] if has_changes else []
+    mocker.patch("content_sync.tasks.get_changed_sites", return_value=changed_sites)
+    mock_record = mocker.patch("content_sync.tasks.record_pending_build_inputs")
+    mock_get_pipeline = mocker.patch(
+        "content_sync.tasks.api.get_mass_build_sites_pipeline"
+    )
+    mock_pipeline = mock_get_pipeline.return_value
+    tasks.trigger_mass_build.delay(VERSION_LIVE, incremental=True)
+    mock_get_inputs.assert_called_once()
+    if has_changes:
+        mock_get_pipeline.assert_called_once_with(
+            VERSION_LIVE,
+            sync_with_delete=False,
+            site_names=[site.name for site in changed_sites],
+        )
+        mock_pipeline.upsert_pipeline.assert_called_once_with()
+        mock_record.assert_called_once_with(
+            VERSION_LIVE, {site: inputs[site] for site in changed_sites}
+        )
+        mock_pipeline.trigger.assert_called_once_with()
+    else:
+        mock_get_pipeline.assert_not_called()
+        mock_record.assert_not_called()
+
+
 @pytest.mark.parametrize("backend", ["concourse", None])
 def test_trigger_unpublished_removal(settings, mocker, backend):
     """trigger_unpublished_removal should call trigger_pipeline_build if enabled"""
@@ -28,7 +28,11 @@ from content_sync.constants import (
     TARGET_OFFLINE,
     VERSION_DRAFT,
 )
-from main.s3_utils import get_boto3_resource
+from main.s3_utils import (
+    get_boto3_resource,
+    get_s3_copy_config,
+    get_s3_copy_extra_args,
+)
 from main.utils import is_dev
 from websites.constants import CONTENT_TYPE_METADATA, WEBSITE_CONTENT_FILETYPE
 from websites.models import Website, WebsiteContent
@@ -104,7 +108,11 @@ def move_s3_object(from_path, to_path):
     bucket = settings.AWS_STORAGE_BUCKET_NAME
     extra_args = {"ACL": "public-read"}
     s3.meta.client.copy(
-        {"Bucket": bucket, "Key": from_path}, bucket, to_path, extra_args
+        {"Bucket": bucket, "Key": from_path},
+        bucket,
+        to_path,
+        get_s3_copy_extra_args(s3.meta.client, bucket, from_path, extra_args),
+        Config=get_s3_copy_config(),
     )
     s3.Object(bucket, from_path).delete()
 
@@ -184,6 +184,30 @@ def test_move_s3_object(settings):
     assert client.get_object(Bucket=MOCK_BUCKET_NAME, Key=to_path) is not None
 
 
+@mock_aws
+def test_move_s3_object_multipart(settings):
+    """A large moved object should keep its content type and metadata"""
+    settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+    settings.S3_COPY_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+    settings.S3_COPY_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+    setup_s3(settings)
+    client = get_boto3_client("s3")
+    client.put_object(
+        Bucket=MOCK_BUCKET_NAME,
+        Key="courses/mycourse/video.mp4",
+        Body=b"x" * (6 * 1024 * 1024),
+        ContentType="video/mp4",
+        Metadata={"filename": "video.mp4"},
+    )
+    move_s3_object("courses/mycourse/video.mp4", "courses/mycourse/moved.mp4")
+    moved = client.head_object(
+        Bucket=MOCK_BUCKET_NAME, Key="courses/mycourse/moved.mp4"
+    )
+    assert moved["ContentType"] == "video/mp4"
+    assert moved["Metadata"] == {"filename": "video.mp4"}
+    client.close()
+
+
 @pytest.mark.parametrize("is_dev", [True, False])
 def test_get_common_pipeline_vars(settings, mocker, is_dev):
     """get_common_pipeline_vars should return the correct values based on environment"""
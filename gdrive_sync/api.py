@@ -4,43 +4,59 @@ import io
 import json
 import logging
 import os
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from itertools import pairwise
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
 from django.conf import settings
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Case, Q, Value, When
 from django.utils.text import slugify
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import (  # pylint:disable=no-name-in-module
     Credentials as ServiceAccountCredentials,
 )
 from googleapiclient.discovery import Resource, build
-from googleapiclient.http import MediaIoBaseDownload
+from mitol.common.utils import chunks, now_in_utc
 from pypdf import PdfReader
 from pypdf.errors import PdfReadError
 
 from content_sync.api import get_sync_backend
 from content_sync.decorators import retry_on_failure
 from gdrive_sync.constants import (
+    DRIVE_CHANGES_PAGE_SIZE,
     DRIVE_FILE_CREATED_TIME,
     DRIVE_FILE_DOWNLOAD_LINK,
     DRIVE_FILE_ID,
     DRIVE_FILE_MD5_CHECKSUM,
+    DRIVE_FILE_MEDIA_URL,
     DRIVE_FILE_MIME_TYPE,
     DRIVE_FILE_MODIFIED_TIME,
     DRIVE_FILE_NAME,
     DRIVE_FILE_SIZE,
     DRIVE_FOLDER_FILES,
     DRIVE_FOLDER_FILES_FINAL,
+    DRIVE_FOLDER_QUERY_BATCH_SIZE,
     DRIVE_FOLDER_VIDEOS_FINAL,
     DRIVE_MIMETYPE_FOLDER,
+    S3_COPY_MAX_CANDIDATES,
+    S3_MD5_METADATA_KEY,
     VALID_TEXT_FILE_TYPES,
     DriveFileStatus,
     WebsiteSyncStatus,
 )
 from gdrive_sync.models import DriveFile
-from main.s3_utils import get_boto3_resource
+from main.s3_utils import (
+    get_boto3_resource,
+    get_s3_copy_config,
+    get_s3_copy_extra_args,
+)
 from main.utils import get_base_filename, get_dirpath_and_filename
 from videos.api import create_media_convert_job
 from videos.constants import CAPTION_FILE_EXTENSIONS, VideoJobStatus, VideoStatus
@@ -65,45 +81,252 @@ if TYPE_CHECKING:
     from collections.abc import Iterable
     from datetime import datetime
 
+    import requests
+
 log = logging.getLogger(__name__)
 
+# DriveFile fields that are set from a GDrive file object on each sync
+_DRIVE_FILE_SYNC_FIELDS = [
+    "drive_path",
+    "name",
+    "website",
+    "mime_type",
+    "checksum",
+    "modified_time",
+    "created_time",
+    "size",
+    "download_link",
+    "sync_error",
+    "sync_dt",
+]
+
 
 class GDriveStreamReader:
-    """Read a Gdrive media file as bytes via the API"""
+    """
+    Read a Gdrive media file as bytes via the API.
 
-    def __init__(self, drive_file: DriveFile):
+    Byte ranges of `chunk_size` are downloaded ahead of the reader by
+    `concurrency` threads, each directly into one of a fixed ring of buffers,
+    so memory use stays constant while throughput scales with the number of
+    concurrent range requests.
+    """
+
+    def __init__(
+        self,
+        drive_file: DriveFile,
+        *,
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+        session: requests.Session | None = None,
+        media_url: str | None = None,
+    ):
         """Initialize the object with a DriveFile"""
-        self.service = get_drive_service()
-        self.request = self.service.files().get_media(
-            fileId=drive_file.file_id, supportsAllDrives=True
+        self.chunk_size = chunk_size or settings.DRIVE_DOWNLOAD_CHUNK_SIZE
+        self.concurrency = max(concurrency or settings.DRIVE_DOWNLOAD_CONCURRENCY, 1)
+        self.session = session or AuthorizedSession(get_drive_credentials())
+        self.media_url = media_url or DRIVE_FILE_MEDIA_URL.format(
+            file_id=drive_file.file_id
+        )
+        self.size = drive_file.size
+        self.position = 0
+        self.buffers = None
+        self.executor = None
+        # Range index -> Future for the ranges currently held in the ring
+        self.futures = {}
+        self.next_index = 0
+
+    def _get(self, start: int, end: int) -> requests.Response:
+        """Request the bytes from `start` to `end` inclusive"""
+        return self.session.get(
+            self.media_url,
+            headers={"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"},
+            stream=True,
+            timeout=60,
         )
-        self.fh = io.BytesIO()
-        self.downloader = MediaIoBaseDownload(self.fh, self.request)
-        self.done = False
 
-    def read(self, amount: int | None = None):
-        """Read and return the next chunk of bytes from the GDrive file"""
-        if amount:
-            # Make sure the chunksize is the same as what's requested by boto3
-            self.downloader._chunksize = (  # noqa: SLF001
-                amount  # pylint:disable=protected-access
+    def _get_size(self) -> int:
+        """Return the size of the file, as reported for a one-byte range request"""
+        with self._get(0, 0) as response:
+            if response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+                return 0
+            response.raise_for_status()
+            # Read the probe's byte so the connection can be reused
+            response.content  # noqa: B018
+            content_range = response.headers.get("Content-Range")
+            if content_range:
+                return int(content_range.rpartition("/")[2])
+            return int(response.headers["Content-Length"])
+
+    def _start(self):
+        """Allocate the ring of buffers and start downloading the first ranges"""
+        if self.size is None:
+            self.size = self._get_size()
+        range_count = -(-self.size // self.chunk_size)
+        self.concurrency = min(self.concurrency, max(range_count, 1))
+        self.buffers = [bytearray(self.chunk_size) for _ in range(self.concurrency)]
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._schedule()
+
+    def _schedule(self):
+        """Start downloading the next ranges into any free buffers"""
+        while (
+            len(self.futures) < self.concurrency
+            and self.next_index * self.chunk_size < self.size
+        ):
+            self.futures[self.next_index] = self.executor.submit(
+                self._download_range, self.next_index
             )
-        if self.done is False:
-            self.fh.seek(0)
-            self.fh.truncate()
-            _, self.done = self.downloader.next_chunk()
-            self.fh.seek(0)
-            return self.fh.read()
-        return b""
+            self.next_index += 1
+
+    def _download_range(self, index: int) -> memoryview:
+        """Download a byte range into its buffer and return a view of the data"""
+        start = index * self.chunk_size
+        end = min(start + self.chunk_size, self.size)
+        view = memoryview(self.buffers[index % self.concurrency])[: end - start]
+        with self._get(start, end - 1) as response:
+            response.raise_for_status()
+            if response.status_code != HTTPStatus.PARTIAL_CONTENT and (
+                start != 0 or end != self.size
+            ):
+                msg = f"Expected a partial response for bytes {start}-{end - 1}, got {response.status_code}"  # noqa: E501
+                raise OSError(msg)
+            received = 0
+            while received < len(view):
+                count = response.raw.readinto(view[received:])
+                if not count:
+                    msg = f"Incomplete response for bytes {start}-{end - 1}"
+                    raise OSError(msg)
+                received += count
+        return view
+
+    def _release(self, indexes: list[int]):
+        """Free the buffers of ranges that have been fully read"""
+        for index in indexes:
+            del self.futures[index]
+        indexes.clear()
+        self._schedule()
+
+    def read(self, amount: int | None = None):
+        """Read and return the next `amount` bytes (or all remaining bytes)"""
+        if self.executor is None:
+            self._start()
+        if amount is None or amount < 0:
+            amount = self.size - self.position
+        parts = []
+        views = []
+        consumed = []
+        while amount > 0 and self.position < self.size:
+            index, offset = divmod(self.position, self.chunk_size)
+            if index not in self.futures:
+                # Every buffer holds data for this read, so copy it out
+                # before the buffers are reused
+                parts.append(b"".join(views))
+                views.clear()
+                self._release(consumed)
+            try:
+                data = self.futures[index].result()
+            except:
+                self.close()
+                raise
+            view = data[offset : offset + amount]
+            views.append(view)
+            self.position += len(view)
+            amount -= len(view)
+            if offset + len(view) == len(data):
+                consumed.append(index)
+        # The single copy of the data, which boto3 can then use as-is
+        parts.append(b"".join(views))
+        views.clear()
+        self._release(consumed)
+        if self.position >= self.size:
+            self.close()
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+
+    def close(self):
+        """Stop any downloads in progress"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        self.futures = {}
+
+
+class DriveClientCache:
+    """
+    Caches the service account credentials for the process and a Google Drive
+    service Resource for each thread. The httplib2 transport of a Resource is
+    not thread-safe, so threads can't share one, but a thread reusing its own
+    Resource also reuses its open HTTP connections. The credentials refresh
+    their access token whenever it expires.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.credentials = None
+        self.credentials_info = None
+        self.generation = 0
+        self.stats = Counter()
+
+    def clear(self):
+        """Drop the cached credentials and the Resources of every thread"""
+        with self.lock:
+            self.credentials = None
+            self.credentials_info = None
+            self.generation += 1
+            self.stats.clear()
+
+    def get_credentials(self) -> ServiceAccountCredentials:
+        """Return the credentials for settings.DRIVE_SERVICE_ACCOUNT_CREDS"""
+        with self.lock:
+            if self.credentials_info != settings.DRIVE_SERVICE_ACCOUNT_CREDS:
+                self.credentials = ServiceAccountCredentials.from_service_account_info(
+                    json.loads(settings.DRIVE_SERVICE_ACCOUNT_CREDS),
+                    scopes=["https://www.googleapis.com/auth/drive"],
+                )
+                self.credentials_info = settings.DRIVE_SERVICE_ACCOUNT_CREDS
+                # Resources built with the old credentials are no longer used
+                self.generation += 1
+            return self.credentials
+
+    def get_service(self) -> Resource:
+        """Return this thread's Resource, building it if needed"""
+        credentials = self.get_credentials()
+        cached = getattr(self.local, "service", None)
+        if cached and cached[0] == self.generation:
+            with self.lock:
+                self.stats["reuses"] += 1
+            return cached[1]
+        service = build("drive", "v3", credentials=credentials, cache_discovery=False)
+        self.local.service = (self.generation, service)
+        with self.lock:
+            self.stats["builds"] += 1
+        return service
+
+
+_drive_clients = DriveClientCache()
+
+
+def get_drive_credentials() -> ServiceAccountCredentials:
+    """Return the service account credentials used for the Google Drive API"""
+    return _drive_clients.get_credentials()
 
 
 def get_drive_service() -> Resource:
-    """Return a Google Drive service Resource"""
-    key = json.loads(settings.DRIVE_SERVICE_ACCOUNT_CREDS)
-    creds = ServiceAccountCredentials.from_service_account_info(
-        key, scopes=["https://www.googleapis.com/auth/drive"]
-    )
-    return build("drive", "v3", credentials=creds, cache_discovery=False)
+    """Return a Google Drive service Resource, reused within the current thread"""
+    return _drive_clients.get_service()
+
+
+def get_drive_client_stats() -> dict[str, int]:
+    """Return how many Drive service Resources were built and reused"""
+    with _drive_clients.lock:
+        return {
+            "builds": _drive_clients.stats["builds"],
+            "reuses": _drive_clients.stats["reuses"],
+        }
+
+
+def clear_drive_clients():
+    """Drop all cached Drive credentials and service Resources"""
+    _drive_clients.clear()
 
 
 def query_files(query: str, fields: str) -> Iterable[dict]:
@@ -137,38 +360,153 @@ def query_files(query: str, fields: str) -> Iterable[dict]:
         yield from file_response["files"]
 
 
-def _get_or_create_drive_file(
-    file_obj: dict,
-    drive_path: str,
-    website: Website,
-    sync_date: datetime | None,
-    replace_file: bool = True,  # noqa: FBT001, FBT002
-) -> DriveFile | None:
+def get_changes_start_page_token() -> str:
+    """Return a page token for listing the Drive changes made from now on"""
+    extra_kwargs = {}
+    if settings.DRIVE_SHARED_ID:
+        extra_kwargs["driveId"] = settings.DRIVE_SHARED_ID
+    response = (
+        get_drive_service()
+        .changes()
+        .getStartPageToken(supportsAllDrives=True, **extra_kwargs)
+        .execute()
+    )
+    return response["startPageToken"]
+
+
+def query_changes(page_token: str, fields: str) -> tuple[list[dict], str]:
     """
-    Determines if `file_obj` is a new or updated file and returns a new or updated
-    DriveFile respectively.
-    Returns None if no change is detected.
-    """  # noqa: D401
-    existing_file_same_id = DriveFile.objects.filter(
-        file_id=file_obj.get(DRIVE_FILE_ID)
-    ).first()
-    if (
-        existing_file_same_id
-        and existing_file_same_id.checksum == file_obj.get(DRIVE_FILE_MD5_CHECKSUM, "")
-        and existing_file_same_id.name == file_obj.get(DRIVE_FILE_NAME, "")
-        and existing_file_same_id.status
+    Get the list of Google Drive changes made since `page_token`, and the page
+    token to use for the next query.
+    """
+    service = get_drive_service()
+    extra_kwargs = {}
+    if settings.DRIVE_SHARED_ID:
+        extra_kwargs["driveId"] = settings.DRIVE_SHARED_ID
+    changes = []
+    while True:
+        change_response = (
+            service.changes()
+            .list(
+                pageToken=page_token,
+                pageSize=DRIVE_CHANGES_PAGE_SIZE,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+                fields=fields,
+                **extra_kwargs,
+            )
+            .execute()
+        )
+        changes.extend(change_response.get("changes", []))
+        if change_response.get("newStartPageToken"):
+            return changes, change_response["newStartPageToken"]
+        page_token = change_response["nextPageToken"]
+
+
+def _get_sync_website(
+    folder_tree: list[dict], websites: dict[str, Website]
+) -> Website | None:
+    """
+    Return the website whose files_final or videos_final folder is in
+    `folder_tree`, or None.
+    """
+    for folder, subfolder in pairwise(folder_tree):
+        if folder["id"] in websites and subfolder["name"] in (
+            DRIVE_FOLDER_FILES_FINAL,
+            DRIVE_FOLDER_VIDEOS_FINAL,
+        ):
+            return websites[folder["id"]]
+    return None
+
+
+def group_changes_by_website(
+    changes: list[dict], parent_trees: dict
+) -> dict[Website, tuple[list[dict], list[DriveFile]]]:
+    """
+    Map Drive changes to the websites they affect by the files' parent folders.
+
+    Changes to folders themselves are ignored, so files that moved along with
+    a folder are only picked up by a full import.
+
+    Args:
+        changes (list[dict]): Drive change objects, as returned by the changes API.
+        parent_trees (dict): A cache of parent folder trees, keyed by parent folder id.
+
+    Returns:
+        dict: For each affected website, the changed file objects in its
+            files_final and videos_final folders, and the DriveFiles that were
+            deleted, trashed or moved out of those folders.
+    """
+    file_changes = {change["fileId"]: change for change in changes}
+    folder_trees = {}
+    for file_id, change in file_changes.items():
+        file_obj = change.get("file") or {}
+        parents = file_obj.get("parents")
+        if (
+            change.get("removed")
+            or file_obj.get("trashed")
+            or file_obj.get(DRIVE_FILE_MIME_TYPE) == DRIVE_MIMETYPE_FOLDER
+            or not parents
+        ):
+            continue
+        if parents[0] not in parent_trees:
+            parent_trees[parents[0]] = get_parent_tree(parents)
+        folder_trees[file_id] = parent_trees[parents[0]]
+
+    websites = {
+        website.gdrive_folder: website
+        for website in Website.objects.filter(
+            gdrive_folder__in={
+                folder["id"]
+                for folder_tree in folder_trees.values()
+                for folder in folder_tree
+            }
+        )
+    }
+    existing_files = DriveFile.objects.select_related("website").in_bulk(
+        list(file_changes)
+    )
+    website_changes = {}
+    for file_id, change in file_changes.items():
+        website = _get_sync_website(folder_trees.get(file_id, []), websites)
+        if website:
+            website_changes.setdefault(website, ([], []))[0].append(change["file"])
+        existing_file = existing_files.get(file_id)
+        if existing_file and existing_file.website and existing_file.website != website:
+            website_changes.setdefault(existing_file.website, ([], []))[1].append(
+                existing_file
+            )
+    return website_changes
+
+
+def _is_unchanged_drive_file(drive_file: DriveFile, file_obj: dict) -> bool:
+    """
+    Return True if `file_obj` has the same checksum and name as `drive_file` and
+    the file processing is complete or in progress.
+    """
+    # For inexplicable reasons, sometimes Google Drive continuously updates
+    # the modifiedTime of files, so only update the DriveFile if the checksum or name changed,  # noqa: E501
+    # and the status indicates that the file processing is not complete or in progress.  # noqa: E501
+    return (
+        drive_file.checksum == file_obj.get(DRIVE_FILE_MD5_CHECKSUM, "")
+        and drive_file.name == file_obj.get(DRIVE_FILE_NAME, "")
+        and drive_file.status
         in (
             DriveFileStatus.COMPLETE,
             DriveFileStatus.UPLOADING,
             DriveFileStatus.UPLOAD_COMPLETE,
         )
-    ):
-        # For inexplicable reasons, sometimes Google Drive continuously updates
-        # the modifiedTime of files, so only update the DriveFile if the checksum or name changed,  # noqa: E501
-        # and the status indicates that the file processing is not complete or in progress.  # noqa: E501
-        return None
+    )
+
 
-    file_data = {
+def _get_drive_file_data(
+    file_obj: dict,
+    drive_path: str,
+    website: Website,
+    sync_date: datetime | None,
+) -> dict:
+    """Return the DriveFile field values for `file_obj`"""
+    return {
         "drive_path": drive_path,
         "name": file_obj.get(DRIVE_FILE_NAME),
         "website": website,
@@ -182,6 +520,46 @@ def _get_or_create_drive_file(
         "sync_dt": sync_date,
     }
 
+
+def _replace_drive_file_on_same_path(
+    existing_file_same_path: DriveFile, file_data: dict, sync_date: datetime | None
+):
+    """
+    Detach the resource from a drive file that already exists on the same path,
+    so that it can be attached to the new DriveFile described by `file_data`.
+    """
+    file_data.update(
+        {
+            "resource": existing_file_same_path.resource,
+        }
+    )
+    existing_file_same_path.resource = None
+    existing_file_same_path.save()
+    delete_drive_file(existing_file_same_path, sync_date)
+
+
+def _get_or_create_drive_file(
+    file_obj: dict,
+    drive_path: str,
+    website: Website,
+    sync_date: datetime | None,
+    replace_file: bool = True,  # noqa: FBT001, FBT002
+) -> DriveFile | None:
+    """
+    Determines if `file_obj` is a new or updated file and returns a new or updated
+    DriveFile respectively.
+    Returns None if no change is detected.
+    """  # noqa: D401
+    existing_file_same_id = DriveFile.objects.filter(
+        file_id=file_obj.get(DRIVE_FILE_ID)
+    ).first()
+    if existing_file_same_id and _is_unchanged_drive_file(
+        existing_file_same_id, file_obj
+    ):
+        return None
+
+    file_data = _get_drive_file_data(file_obj, drive_path, website, sync_date)
+
     if existing_file_same_id:
         for k, v in file_data.items():
             setattr(existing_file_same_id, k, v)
@@ -197,17 +575,9 @@ def _get_or_create_drive_file(
         file_data.update({"file_id": file_obj.get(DRIVE_FILE_ID)})
 
         if replace_file and existing_file_same_path:
-            # A drive file already exists on the same path.
-            # We'll detach the resource from this one and attach it
-            # to a new DriveFile.
-            file_data.update(
-                {
-                    "resource": existing_file_same_path.resource,
-                }
+            _replace_drive_file_on_same_path(
+                existing_file_same_path, file_data, sync_date
             )
-            existing_file_same_path.resource = None
-            existing_file_same_path.save()
-            delete_drive_file(existing_file_same_path, sync_date)
 
         drive_file = DriveFile.objects.create(**file_data)
     return drive_file
@@ -230,6 +600,48 @@ def get_parent_tree(parents):
     return tree[1:]  # first one is the drive
 
 
+def get_drive_path(file_obj: dict, parent_trees: dict | None = None) -> str | None:
+    """
+    Return the folder path of a GDrive file object, or None if the file is not
+    in a website folder or is not eligible for processing.
+
+    Args:
+        file_obj (dict): A GDrive file object.
+        parent_trees (dict, optional): A cache of parent folder trees, keyed by
+            parent folder id, shared between calls for files in the same folders.
+    """
+    parents = file_obj.get("parents")
+    if not parents:
+        return None
+    if parent_trees is None:
+        folder_tree = get_parent_tree(parents)
+    else:
+        if parents[0] not in parent_trees:
+            parent_trees[parents[0]] = get_parent_tree(parents)
+        folder_tree = parent_trees[parents[0]]
+    if len(folder_tree) < 2 or (  # noqa: PLR2004
+        settings.DRIVE_UPLOADS_PARENT_FOLDER_ID
+        and (
+            settings.DRIVE_UPLOADS_PARENT_FOLDER_ID
+            not in [folder["id"] for folder in folder_tree]
+        )
+    ):
+        return None
+
+    folder_names = [folder["name"] for folder in folder_tree]
+    in_video_folder = DRIVE_FOLDER_VIDEOS_FINAL in folder_names
+    in_file_folder = DRIVE_FOLDER_FILES_FINAL in folder_names
+    is_video = file_obj[DRIVE_FILE_MIME_TYPE].lower().startswith("video/")
+    processable = (
+        ((in_video_folder and is_video) or in_file_folder)
+        and file_obj.get(DRIVE_FILE_DOWNLOAD_LINK) is not None
+        and file_obj.get(DRIVE_FILE_MD5_CHECKSUM) is not None
+    )
+    if not processable:
+        return None
+    return "/".join([folder.get("name") for folder in folder_tree])
+
+
 def process_file_result(
     file_obj: dict,
     website: Website,
@@ -251,43 +663,179 @@ def process_file_result(
         Optional[DriveFile]: A DriveFile object that corresponds to `file_obj`.
             None for files that are ineligible or have not changed.
     """  # noqa: E501
-    parents = file_obj.get("parents")
-    if parents:
-        folder_tree = get_parent_tree(parents)
-        if len(folder_tree) < 2 or (  # noqa: PLR2004
-            settings.DRIVE_UPLOADS_PARENT_FOLDER_ID
-            and (
-                settings.DRIVE_UPLOADS_PARENT_FOLDER_ID
-                not in [folder["id"] for folder in folder_tree]
+    drive_path = get_drive_path(file_obj)
+    if website and drive_path:
+        return _get_or_create_drive_file(
+            file_obj=file_obj,
+            drive_path=drive_path,
+            website=website,
+            sync_date=sync_date,
+            replace_file=replace_file,
+        )
+    return None
+
+
+def _get_eligible_files(
+    file_objs: list[dict], website: Website, parent_trees: dict
+) -> tuple[list[tuple[dict, str]], list[dict]]:
+    """
+    Return (file object, drive path) pairs for the files that should be synced,
+    and the file objects whose folders could not be resolved.
+    """
+    eligible = []
+    failed = []
+    for file_obj in file_objs:
+        try:
+            drive_path = get_drive_path(file_obj, parent_trees=parent_trees)
+        except:  # pylint:disable=bare-except  # noqa: E722
+            log.exception(
+                "Error processing gdrive file %s for %s",
+                file_obj.get(DRIVE_FILE_NAME),
+                website.short_id,
             )
-        ):
-            return None
-
-        folder_names = [folder["name"] for folder in folder_tree]
-        in_video_folder = DRIVE_FOLDER_VIDEOS_FINAL in folder_names
-        in_file_folder = DRIVE_FOLDER_FILES_FINAL in folder_names
-        is_video = file_obj[DRIVE_FILE_MIME_TYPE].lower().startswith("video/")
-        processable = (
-            ((in_video_folder and is_video) or in_file_folder)
-            and file_obj.get(DRIVE_FILE_DOWNLOAD_LINK) is not None
-            and file_obj.get(DRIVE_FILE_MD5_CHECKSUM) is not None
+            failed.append(file_obj)
+            continue
+        if website and drive_path:
+            eligible.append((file_obj, drive_path))
+    return eligible, failed
+
+
+def process_file_results(
+    file_objs: Iterable[dict],
+    website: Website,
+    sync_date: datetime | None = None,
+    parent_trees: dict | None = None,
+) -> tuple[list[DriveFile], list[dict]]:
+    """
+    Convert a batch of API file responses into DriveFile objects, the same way
+    process_file_result does for a single file. Existing DriveFiles are fetched
+    in one query, and new and changed files are saved with bulk operations.
+
+    A file replaces the DriveFile on the same path only if no other file in the
+    batch has the same name.
+
+    Args:
+        file_objs (Iterable[dict]): GDrive file objects, usually one subfolder's listing.
+        website (Website): The website being synced.
+        sync_date (datetime, optional): Time of sync. Defaults to None.
+        parent_trees (dict, optional): A cache of parent folder trees, keyed by
+            parent folder id, to share with other calls.
+
+    Returns:
+        tuple[list[DriveFile], list[dict]]: The DriveFiles that were created or
+            changed, and the file objects that could not be processed.
+    """  # noqa: E501
+    file_objs = list(
+        {file_obj[DRIVE_FILE_ID]: file_obj for file_obj in file_objs}.values()
+    )
+    occurrences = Counter(file_obj.get(DRIVE_FILE_NAME) for file_obj in file_objs)
+    eligible, failed = _get_eligible_files(
+        file_objs, website, {} if parent_trees is None else parent_trees
+    )
+    if not eligible:
+        return [], failed
+
+    existing_files = DriveFile.objects.in_bulk(
+        [file_obj[DRIVE_FILE_ID] for file_obj, _ in eligible]
+    )
+    new_files = [
+        (file_obj, drive_path)
+        for file_obj, drive_path in eligible
+        if file_obj[DRIVE_FILE_ID] not in existing_files
+    ]
+    existing_files_same_path = {}
+    if new_files:
+        for drive_file in DriveFile.objects.filter(
+            website=website,
+            name__in={file_obj.get(DRIVE_FILE_NAME) for file_obj, _ in new_files},
+        ).select_related("resource"):
+            existing_files_same_path.setdefault(
+                (drive_file.drive_path, drive_file.name), drive_file
+            )
+
+    now = now_in_utc()
+    to_update = []
+    to_create = []
+    for file_obj, drive_path in eligible:
+        file_data = _get_drive_file_data(file_obj, drive_path, website, sync_date)
+        existing_file_same_id = existing_files.get(file_obj[DRIVE_FILE_ID])
+        if existing_file_same_id:
+            if _is_unchanged_drive_file(existing_file_same_id, file_obj):
+                continue
+            for k, v in file_data.items():
+                setattr(existing_file_same_id, k, v)
+            existing_file_same_id.updated_on = now
+            to_update.append(existing_file_same_id)
+            continue
+
+        file_data.update({"file_id": file_obj[DRIVE_FILE_ID]})
+        existing_file_same_path = existing_files_same_path.get(
+            (drive_path, file_obj.get(DRIVE_FILE_NAME))
+        )
+        if occurrences[file_obj.get(DRIVE_FILE_NAME)] == 1 and existing_file_same_path:
+            _replace_drive_file_on_same_path(
+                existing_file_same_path, file_data, sync_date
+            )
+        to_create.append(DriveFile(**file_data))
+
+    with transaction.atomic():
+        DriveFile.objects.bulk_update(
+            to_update, [*_DRIVE_FILE_SYNC_FIELDS, "updated_on"]
         )
+        DriveFile.objects.bulk_create(to_create)
+    return [*to_update, *to_create], failed
+
 
-        if website and processable:
-            drive_path = "/".join([folder.get("name") for folder in folder_tree])
-            return _get_or_create_drive_file(
-                file_obj=file_obj,
-                drive_path=drive_path,
-                website=website,
-                sync_date=sync_date,
-                replace_file=replace_file,
+def find_uploaded_copy(drive_file: DriveFile, s3_client) -> str | None:
+    """
+    Return the S3 key of an object that already has the same content as
+    `drive_file`, or None.
+
+    DriveFiles with the same md5 checksum and size are the candidates, up to
+    S3_COPY_MAX_CANDIDATES of them, and a candidate's S3 object is only trusted
+    if its size matches and its md5 metadata (or, for single part uploads, its
+    ETag) matches the checksum.
+    """
+    if not drive_file.checksum or drive_file.size is None:
+        return None
+    candidate_keys = (
+        DriveFile.objects.filter(checksum=drive_file.checksum, size=drive_file.size)
+        .exclude(s3_key__isnull=True)
+        .exclude(s3_key="")
+        # The file's own key is the cheapest to reuse, so it is checked first
+        .annotate(
+            is_other_key=Case(
+                When(s3_key=drive_file.s3_key, then=Value(0)), default=Value(1)
+            )
+        )
+        .order_by("is_other_key", "s3_key")
+        .values_list("s3_key", flat=True)
+        .distinct()[:S3_COPY_MAX_CANDIDATES]
+    )
+    for s3_key in candidate_keys:
+        try:
+            response = s3_client.head_object(
+                Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=s3_key
             )
+        except ClientError:
+            continue
+        md5 = response.get("Metadata", {}).get(S3_MD5_METADATA_KEY) or response.get(
+            "ETag", ""
+        ).strip('"')
+        if response.get("ContentLength") == drive_file.size and md5 == (
+            drive_file.checksum
+        ):
+            return s3_key
     return None
 
 
 @retry_on_failure
 def stream_to_s3(drive_file: DriveFile):
-    """Stream a Google Drive file to S3"""
+    """
+    Stream a Google Drive file to S3. If S3 already has an object with the
+    same content, it is copied within S3 instead, or nothing is transferred
+    if that object is already at the file's key.
+    """
     try:
         s3 = get_boto3_resource("s3")
         bucket_name = settings.AWS_STORAGE_BUCKET_NAME
@@ -299,17 +847,35 @@ def stream_to_s3(drive_file: DriveFile):
 
         if drive_file.mime_type.startswith("video/"):
             extra_args["ContentDisposition"] = "attachment"
+        if drive_file.checksum:
+            extra_args["Metadata"] = {S3_MD5_METADATA_KEY: drive_file.checksum}
 
         config = TransferConfig(
             multipart_chunksize=64 * 1024 * 1024,  # 64 MB chunks
             max_concurrency=5,
         )
-        bucket.upload_fileobj(
-            Fileobj=GDriveStreamReader(drive_file),
-            Key=drive_file.s3_key,
-            ExtraArgs=extra_args,
-            Config=config,
-        )
+        source_key = find_uploaded_copy(drive_file, s3.meta.client)
+        if source_key == drive_file.s3_key:
+            log.info("%s is already in S3 at %s", drive_file.name, source_key)
+        elif source_key:
+            log.info("Copying %s from %s in S3", drive_file.name, source_key)
+            bucket.copy(
+                CopySource={"Bucket": bucket_name, "Key": source_key},
+                Key=drive_file.s3_key,
+                ExtraArgs={**extra_args, "MetadataDirective": "REPLACE"},
+                Config=config,
+            )
+        else:
+            reader = GDriveStreamReader(drive_file)
+            try:
+                bucket.upload_fileobj(
+                    Fileobj=reader,
+                    Key=drive_file.s3_key,
+                    ExtraArgs=extra_args,
+                    Config=config,
+                )
+            finally:
+                reader.close()
         drive_file.update_status(DriveFileStatus.UPLOAD_COMPLETE)
     except Exception as exc:
         log.exception(
@@ -430,14 +996,39 @@ def gdrive_root_url():
 
 
 def walk_gdrive_folder(folder_id: str, fields: str) -> Iterable[dict]:
-    """Yield a list of all files under a Google Drive folder and its subfolders"""
-    query = f'parents = "{folder_id}" and not trashed'
-    drive_results = query_files(query=query, fields=fields)
-    for result in drive_results:
-        if result["mimeType"] != DRIVE_MIMETYPE_FOLDER:
-            yield result
-        else:
-            yield from walk_gdrive_folder(result["id"], fields)
+    """
+    Yield a list of all files under a Google Drive folder and its subfolders.
+
+    The folder tree is listed breadth-first. The folders found at each depth
+    are listed together, DRIVE_FOLDER_QUERY_BATCH_SIZE folders per query, with
+    the queries run concurrently by up to DRIVE_LIST_CONCURRENCY threads.
+    """
+
+    def list_children(folder_ids: list[str]) -> list[dict]:
+        """List the children of `folder_ids`"""
+        parents_query = " or ".join(
+            f'"{parent_id}" in parents' for parent_id in folder_ids
+        )
+        return list(
+            query_files(query=f"({parents_query}) and not trashed", fields=fields)
+        )
+
+    folder_ids = [folder_id]
+    with ThreadPoolExecutor(
+        max_workers=max(settings.DRIVE_LIST_CONCURRENCY, 1)
+    ) as executor:
+        while folder_ids:
+            subfolder_ids = []
+            for results in executor.map(
+                list_children,
+                chunks(folder_ids, chunk_size=DRIVE_FOLDER_QUERY_BATCH_SIZE),
+            ):
+                for result in results:
+                    if result["mimeType"] != DRIVE_MIMETYPE_FOLDER:
+                        yield result
+                    else:
+                        subfolder_ids.append(result["id"])
+            folder_ids = subfolder_ids
 
 
 def get_pdf_title(drive_file: DriveFile) -> str:
@@ -736,8 +1327,14 @@ def rename_file(obj_text_id, obj_new_filename):
     df.save()
     obj.save()
 
-    s3.Object(settings.AWS_STORAGE_BUCKET_NAME, new_key).copy_from(
-        CopySource=settings.AWS_STORAGE_BUCKET_NAME + "/" + old_key
+    s3.meta.client.copy(
+        {"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": old_key},
+        settings.AWS_STORAGE_BUCKET_NAME,
+        new_key,
+        ExtraArgs=get_s3_copy_extra_args(
+            s3.meta.client, settings.AWS_STORAGE_BUCKET_NAME, old_key
+        ),
+        Config=get_s3_copy_config(),
     )
     s3.Object(settings.AWS_STORAGE_BUCKET_NAME, old_key).delete()
 
@@ -755,9 +1352,10 @@ def find_missing_files(
     Returns:
         Iterable[DriveFile]: DriveFile objects that exist in our database but not in `gDriveFiles`.
     """  # noqa: D401, E501
-    gdrive_file_ids = [f["id"] for f in gDriveFiles]
-    drive_files = DriveFile.objects.filter(website=website)
-    return [file for file in drive_files if file.file_id not in gdrive_file_ids]
+    gdrive_file_ids = {f["id"] for f in gDriveFiles}
+    return list(
+        DriveFile.objects.filter(website=website).exclude(file_id__in=gdrive_file_ids)
+    )
 
 
 def delete_drive_file(drive_file: DriveFile, sync_datetime: datetime, user_pk=None):
@@ -1,11 +1,17 @@
 """gdrive_sync.api tests"""
 
+import hashlib
+import io
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+import requests
 from botocore.exceptions import ClientError
-from googleapiclient.http import MediaDownloadProgress
 from mitol.common.utils import now_in_utc
 from moto import mock_aws
 from requests import HTTPError
@@ -19,6 +25,7 @@ from gdrive_sync.api import (
     gdrive_root_url,
     get_resource_type,
     process_file_result,
+    process_file_results,
     rename_file,
     transcode_gdrive_video,
     update_sync_status,
@@ -30,10 +37,15 @@ from gdrive_sync.conftest import (
     generate_related_content_data,
 )
 from gdrive_sync.constants import (
+    DRIVE_CHANGE_FIELDS,
+    DRIVE_CHANGES_PAGE_SIZE,
     DRIVE_FILE_FIELDS,
+    DRIVE_FOLDER_FILES,
     DRIVE_FOLDER_FILES_FINAL,
     DRIVE_FOLDER_VIDEOS_FINAL,
     DRIVE_MIMETYPE_FOLDER,
+    S3_COPY_MAX_CANDIDATES,
+    S3_MD5_METADATA_KEY,
     DriveFileStatus,
     WebsiteSyncStatus,
 )
@@ -41,6 +53,7 @@ from gdrive_sync.factories import DriveFileFactory
 from gdrive_sync.models import DriveFile
 from main.s3_utils import get_boto3_resource
 from users.factories import UserFactory
+from videos.conftest import MOCK_BUCKET_NAME, setup_s3
 from videos.constants import VideoJobStatus, VideoStatus
 from videos.factories import VideoFactory, VideoJobFactory
 from websites.constants import (
@@ -84,6 +97,30 @@ def test_get_drive_service(settings, mocker):
     assert service.files() is not None
 
 
+def test_get_drive_service_cached(settings, mocker):
+    """get_drive_service should build one service per thread and reuse it"""
+    settings.DRIVE_SERVICE_ACCOUNT_CREDS = '{"credentials": "data"}'
+    mock_credentials = mocker.patch("gdrive_sync.api.ServiceAccountCredentials")
+    mock_build = mocker.patch(
+        "gdrive_sync.api.build", side_effect=lambda *_args, **_kwargs: object()
+    )
+    service = api.get_drive_service()
+    assert api.get_drive_service() is service
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_thread_service = executor.submit(api.get_drive_service).result()
+    assert other_thread_service is not service
+    assert api.get_drive_client_stats() == {"builds": 2, "reuses": 1}
+    mock_credentials.from_service_account_info.assert_called_once()
+    assert mock_build.call_count == 2
+
+    settings.DRIVE_SERVICE_ACCOUNT_CREDS = '{"credentials": "other"}'
+    assert api.get_drive_service() is not service
+    assert mock_credentials.from_service_account_info.call_count == 2
+
+    api.clear_drive_clients()
+    assert api.get_drive_client_stats() == {"builds": 0, "reuses": 0}
+
+
 @pytest.mark.parametrize("drive_id", [None, "testDrive"])
 def test_query_files(settings, mock_service, drive_id):
     """query_files should return expected results"""
@@ -115,6 +152,39 @@ def test_query_files(settings, mock_service, drive_id):
     )
 
 
+@pytest.mark.parametrize("drive_id", [None, "testDrive"])
+def test_query_changes(settings, mock_service, drive_id):
+    """query_changes should return the changes from every page and the next page token"""
+    settings.DRIVE_SHARED_ID = drive_id
+    mock_list = mock_service.return_value.changes.return_value.list
+    mock_list.return_value.execute.side_effect = [
+        {"nextPageToken": "2", "changes": [{"fileId": "a"}]},
+        {"newStartPageToken": "3", "changes": [{"fileId": "b"}]},
+    ]
+    changes, next_page = api.query_changes("1", DRIVE_CHANGE_FIELDS)
+    assert changes == [{"fileId": "a"}, {"fileId": "b"}]
+    assert next_page == "3"
+    drive_kwargs = {"driveId": drive_id} if drive_id else {}
+    for page_token in ["1", "2"]:
+        mock_list.assert_any_call(
+            pageToken=page_token,
+            pageSize=DRIVE_CHANGES_PAGE_SIZE,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+            fields=DRIVE_CHANGE_FIELDS,
+            **drive_kwargs,
+        )
+
+
+def test_get_changes_start_page_token(settings, mock_service):
+    """get_changes_start_page_token should return the token for the shared drive"""
+    settings.DRIVE_SHARED_ID = "testDrive"
+    mock_get_token = mock_service.return_value.changes.return_value.getStartPageToken
+    mock_get_token.return_value.execute.return_value = {"startPageToken": "123"}
+    assert api.get_changes_start_page_token() == "123"
+    mock_get_token.assert_called_once_with(supportsAllDrives=True, driveId="testDrive")
+
+
 def test_get_parent_tree(mock_service):
     """get_parent_tree should return expected dict values"""
     mock_execute = mock_service.return_value.files.return_value.get.return_value.execute
@@ -159,11 +229,13 @@ def test_stream_to_s3(settings, mocker, is_video, current_s3_key):
             "ContentType": drive_file.mime_type,
             "ACL": "public-read",
             "ContentDisposition": "attachment",
+            "Metadata": {S3_MD5_METADATA_KEY: drive_file.checksum},
         }
     else:
         expected_extra_args = {
             "ContentType": drive_file.mime_type,
             "ACL": "public-read",
+            "Metadata": {S3_MD5_METADATA_KEY: drive_file.checksum},
         }
 
     mock_bucket.upload_fileobj.assert_called_with(
@@ -173,12 +245,97 @@ def test_stream_to_s3(settings, mocker, is_video, current_s3_key):
         Config=mocker.ANY,
     )
     mock_download.assert_called_once_with(drive_file)
+    mock_download.return_value.close.assert_called_once()
     drive_file.refresh_from_db()
     assert drive_file.status == DriveFileStatus.UPLOAD_COMPLETE
     assert drive_file.s3_key == expected_key
 
 
 @pytest.mark.django_db
+def test_find_uploaded_copy_max_candidates(mocker):
+    """find_uploaded_copy should check a limited number of candidates, own key first"""
+    drive_file = DriveFileFactory.create(
+        s3_key="courses/site/zzz.pdf", checksum="abc", size=0
+    )
+    for _ in range(S3_COPY_MAX_CANDIDATES * 2):
+        DriveFileFactory.create(checksum="abc", size=0)
+    mock_s3 = mocker.Mock()
+    mock_s3.head_object.side_effect = ClientError({}, "HeadObject")
+    assert api.find_uploaded_copy(drive_file, mock_s3) is None
+    assert mock_s3.head_object.call_count == S3_COPY_MAX_CANDIDATES
+    assert mock_s3.head_object.call_args_list[0].kwargs["Key"] == drive_file.s3_key
+
+
+@pytest.mark.django_db
+@mock_aws
+@pytest.mark.parametrize("same_key", [True, False])
+@pytest.mark.parametrize("use_metadata", [True, False])
+def test_stream_to_s3_existing_content(settings, mocker, same_key, use_metadata):
+    """stream_to_s3 should not download a file whose content is already in S3"""
+    settings.ENVIRONMENT = "test"
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    content = b"existing content"
+    checksum = hashlib.md5(content).hexdigest()  # noqa: S324
+    bucket = get_boto3_resource("s3").Bucket(settings.AWS_STORAGE_BUCKET_NAME)
+    bucket.create()
+    source = DriveFileFactory.create(
+        s3_key="courses/other-site/existing.pdf",
+        checksum=checksum,
+        size=len(content),
+        mime_type="application/pdf",
+    )
+    # Multipart uploads do not have the md5 as their ETag, so the metadata is used
+    bucket.put_object(
+        Key=source.s3_key,
+        Body=content,
+        Metadata={S3_MD5_METADATA_KEY: checksum} if use_metadata else {},
+    )
+    drive_file = DriveFileFactory.create(
+        s3_key=source.s3_key if same_key else None,
+        checksum=checksum,
+        size=len(content),
+        mime_type="application/pdf",
+        status=DriveFileStatus.CREATED,
+    )
+    mock_reader = mocker.patch("gdrive_sync.api.GDriveStreamReader")
+
+    api.stream_to_s3(drive_file)
+
+    mock_reader.assert_not_called()
+    assert len(list(bucket.objects.all())) == (1 if same_key else 2)
+    drive_file.refresh_from_db()
+    assert drive_file.status == DriveFileStatus.UPLOAD_COMPLETE
+    s3_object = bucket.Object(drive_file.s3_key)
+    assert s3_object.get()["Body"].read() == content
+    if not same_key:
+        assert drive_file.s3_key != source.s3_key
+        assert s3_object.metadata == {S3_MD5_METADATA_KEY: checksum}
+        assert s3_object.content_type == "application/pdf"
+
+
+@mock_aws
+def test_stream_to_s3_changed_content(settings, mocker):
+    """stream_to_s3 should upload a file if the S3 object has other content"""
+    settings.ENVIRONMENT = "test"
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    content = b"new content"
+    bucket = get_boto3_resource("s3").Bucket(settings.AWS_STORAGE_BUCKET_NAME)
+    bucket.create()
+    drive_file = DriveFileFactory.create(
+        s3_key="courses/site/file.pdf",
+        checksum=hashlib.md5(content).hexdigest(),  # noqa: S324
+        size=len(content),
+        mime_type="application/pdf",
+        status=DriveFileStatus.CREATED,
+    )
+    bucket.put_object(Key=drive_file.s3_key, Body=b"old content")
+    mocker.patch("gdrive_sync.api.GDriveStreamReader", return_value=io.BytesIO(content))
+
+    api.stream_to_s3(drive_file)
+
+    assert bucket.Object(drive_file.s3_key).get()["Body"].read() == content
+
+
 @pytest.mark.parametrize("fail_at", ["bucket", "upload"])
 def test_stream_to_s3_error_marks_failed(settings, mocker, fail_at):
     """Task should mark DriveFile status as UPLOAD_FAILED and raise if S3 upload errors occur."""
@@ -498,41 +655,219 @@ def test_process_file_result_replace_file(settings, mocker, replace_file):
         assert DriveFile.objects.filter(pk=drive_file.file_id).first() is None
 
 
-def test_walk_gdrive_folder(mocker):
-    """walk_gdrive_folder should yield all expected files"""
-    files = [
-        [
+def _mock_files_parent_tree(mocker, website):
+    """Patch get_parent_tree to place files in the website's files_final folder"""
+    parent_tree = [
+        {"id": "parent", "name": "ancestor_exists"},
+        {"id": "websiteId", "name": website.short_id},
+        {"id": "subFolderId", "name": DRIVE_FOLDER_FILES_FINAL},
+    ]
+    mock_get_parent_tree = mocker.patch(
+        "gdrive_sync.api.get_parent_tree", return_value=parent_tree
+    )
+    return mock_get_parent_tree, "/".join(folder["name"] for folder in parent_tree)
+
+
+def _file_result(file_id, name, checksum="check-sum"):
+    """Return a GDrive file object in the files_final folder"""
+    return {
+        "id": file_id,
+        "name": name,
+        "mimeType": "image/jpeg",
+        "parents": ["subFolderId"],
+        "webContentLink": "http://link",
+        "createdTime": "2021-07-28T00:06:40.439Z",
+        "modifiedTime": "2021-07-29T14:25:19.375Z",
+        "md5Checksum": checksum,
+        "trashed": False,
+    }
+
+
+def test_process_file_results(settings, mocker, django_assert_max_num_queries):
+    """
+    process_file_results should create new files, update changed files and skip
+    unchanged files, with a fixed number of queries
+    """
+    settings.DRIVE_SHARED_ID = "test_drive"
+    settings.DRIVE_UPLOADS_PARENT_FOLDER_ID = "parent"
+    website = WebsiteFactory.create()
+    mock_get_parent_tree, drive_path = _mock_files_parent_tree(mocker, website)
+    unchanged = DriveFileFactory.create(
+        website=website, drive_path=drive_path, status=DriveFileStatus.COMPLETE
+    )
+    changed = DriveFileFactory.create(
+        website=website, drive_path=drive_path, status=DriveFileStatus.COMPLETE
+    )
+    file_results = [
+        _file_result(unchanged.file_id, unchanged.name, unchanged.checksum),
+        _file_result(changed.file_id, "renamed.jpg", changed.checksum),
+        *[_file_result(f"new_id_{idx}", f"new_{idx}.jpg") for idx in range(5)],
+        {**_file_result("no_link", "no_link.jpg"), "webContentLink": None},
+    ]
+
+    with django_assert_max_num_queries(6):
+        drive_files, failed = process_file_results(file_results, website)
+
+    assert failed == []
+    assert sorted(drive_file.file_id for drive_file in drive_files) == sorted(
+        [changed.file_id, *[f"new_id_{idx}" for idx in range(5)]]
+    )
+    mock_get_parent_tree.assert_called_once_with(["subFolderId"])
+    changed.refresh_from_db()
+    assert changed.name == "renamed.jpg"
+    assert DriveFile.objects.filter(website=website).count() == 7
+    assert not DriveFile.objects.filter(file_id="no_link").exists()
+
+
+@pytest.mark.parametrize("duplicate_name", [True, False])
+def test_process_file_results_replace_file(settings, mocker, duplicate_name):
+    """
+    A new file should replace the file on the same path only if no other file in
+    the batch has the same name
+    """
+    settings.DRIVE_SHARED_ID = "test_drive"
+    settings.DRIVE_UPLOADS_PARENT_FOLDER_ID = "parent"
+    mocker.patch("main.s3_utils.boto3")
+    website = WebsiteFactory.create()
+    _, drive_path = _mock_files_parent_tree(mocker, website)
+    drive_file = DriveFileFactory.create(
+        file_id="old_file_id", website=website, drive_path=drive_path
+    )
+    file_results = [_file_result("new_file_id", drive_file.name)]
+    if duplicate_name:
+        file_results.append(_file_result("other_file_id", drive_file.name))
+
+    process_file_results(file_results, website)
+
+    assert DriveFile.objects.filter(pk=drive_file.file_id).exists() is duplicate_name
+    assert DriveFile.objects.filter(pk="new_file_id").exists()
+
+
+def test_process_file_results_error(settings, mocker):
+    """Files whose folders cannot be resolved should be returned as failed"""
+    settings.DRIVE_SHARED_ID = "test_drive"
+    website = WebsiteFactory.create()
+    mocker.patch(
+        "gdrive_sync.api.get_parent_tree", side_effect=Exception("Drive API error")
+    )
+    file_result = _file_result("new_file_id", "new.jpg")
+
+    assert process_file_results([file_result], website) == ([], [file_result])
+    assert not DriveFile.objects.filter(pk="new_file_id").exists()
+
+
+def test_group_changes_by_website(mocker):
+    """group_changes_by_website should map changed and removed files to their websites"""
+    website = WebsiteFactory.create(gdrive_folder="websiteId")
+    other_website = WebsiteFactory.create(gdrive_folder="otherWebsiteId")
+    mock_get_parent_tree = mocker.patch(
+        "gdrive_sync.api.get_parent_tree",
+        side_effect=[
+            [
+                {"id": "websiteId", "name": website.short_id},
+                {"id": "subFolderId", "name": DRIVE_FOLDER_FILES_FINAL},
+            ],
+            [
+                {"id": "otherWebsiteId", "name": other_website.short_id},
+                {"id": "filesFolderId", "name": DRIVE_FOLDER_FILES},
+            ],
+        ],
+    )
+    moved_out = DriveFileFactory.create(file_id="moved", website=other_website)
+    trashed = DriveFileFactory.create(file_id="trashed", website=website)
+    removed = DriveFileFactory.create(file_id="removed", website=website)
+    new_file = _file_result("new", "new.pdf")
+    changed_file = _file_result("changed", "changed.pdf")
+    changes = [
+        {"fileId": "new", "removed": False, "file": new_file},
+        {"fileId": "changed", "removed": False, "file": changed_file},
+        {
+            "fileId": "moved",
+            "removed": False,
+            "file": {
+                **_file_result("moved", "moved.pdf"),
+                "parents": ["filesFolderId"],
+            },
+        },
+        {
+            "fileId": "trashed",
+            "removed": False,
+            "file": {**_file_result("trashed", "trashed.pdf"), "trashed": True},
+        },
+        {"fileId": "removed", "removed": True},
+        {
+            "fileId": "folder",
+            "removed": False,
+            "file": {"id": "folder", "mimeType": DRIVE_MIMETYPE_FOLDER},
+        },
+    ]
+    parent_trees = {}
+    assert api.group_changes_by_website(changes, parent_trees) == {
+        website: ([new_file, changed_file], [trashed, removed]),
+        other_website: ([], [moved_out]),
+    }
+    assert mock_get_parent_tree.call_count == 2
+    assert set(parent_trees) == {"subFolderId", "filesFolderId"}
+
+
+@pytest.mark.parametrize("batch_size", [1, 50])
+def test_walk_gdrive_folder(settings, mocker, batch_size):
+    """walk_gdrive_folder should list each depth of the folder tree in batches"""
+    settings.DRIVE_LIST_CONCURRENCY = 2
+    mocker.patch("gdrive_sync.api.DRIVE_FOLDER_QUERY_BATCH_SIZE", batch_size)
+    children = {
+        "folderId": [
             {"id": "image1.jpg", "mimeType": "image/jpeg"},
             {"id": "image2.jpg", "mimeType": "image/jpeg"},
             {"id": "subfolder1", "mimeType": DRIVE_MIMETYPE_FOLDER},
             {"id": "subfolder2", "mimeType": DRIVE_MIMETYPE_FOLDER},
         ],
-        [
+        "subfolder1": [
             {"id": "subfolder1a.jpg", "mimeType": "image/jpeg"},
             {"id": "subfolder1b.jpg", "mimeType": "image/jpeg"},
             {"id": "subfolder1_1", "mimeType": DRIVE_MIMETYPE_FOLDER},
         ],
-        [
+        "subfolder1_1": [
             {"id": "subfolder1_1a.pdf", "mimeType": "application/pdf"},
             {"id": "subfolder1_1b.pdf", "mimeType": "application/pdf"},
         ],
-        [
+        "subfolder2": [
             {"id": "subfolder2a.mp4", "mimeType": "application/pdf"},
             {"id": "subfolder2b.mp4", "mimeType": "application/pdf"},
         ],
+    }
+
+    def mock_query_files(query, fields):
+        """Return the children of the folders in the query"""
+        assert fields == "field1,field2,field3"
+        return [
+            child
+            for folder_id, folder_children in children.items()
+            if f'"{folder_id}" in parents' in query
+            for child in folder_children
+        ]
+
+    mock_query = mocker.patch(
+        "gdrive_sync.api.query_files", side_effect=mock_query_files
+    )
+    assert [
+        item["id"] for item in walk_gdrive_folder("folderId", "field1,field2,field3")
+    ] == [
+        "image1.jpg",
+        "image2.jpg",
+        "subfolder1a.jpg",
+        "subfolder1b.jpg",
+        "subfolder2a.mp4",
+        "subfolder2b.mp4",
+        "subfolder1_1a.pdf",
+        "subfolder1_1b.pdf",
     ]
-    mock_query_files = mocker.patch(
-        "gdrive_sync.api.query_files", side_effect=iter(files)
-    )
-    assert (list(walk_gdrive_folder("folderId", "field1,field2,field3"))) == [
-        item
-        for sublist in files
-        for item in sublist
-        if item["mimeType"] != DRIVE_MIMETYPE_FOLDER
-    ]
-    assert (
-        mock_query_files.call_count == 4
-    )  # parent, subfolder1, subfolder1_1, subfolder2
+    # One query per depth, or per folder if batches hold a single folder
+    assert mock_query.call_count == (4 if batch_size == 1 else 3)
+    mock_query.assert_any_call(
+        query='("folderId" in parents) and not trashed',
+        fields="field1,field2,field3",
+    )
 
 
 @pytest.fixture
@@ -971,49 +1306,142 @@ def test_update_sync_status(file_errors, site_errors, status):
     )
 
 
-@pytest.mark.parametrize("chunk_size", [1, 2, 3])
-def test_gdrive_stream_reader(mocker, mock_service, chunk_size):
-    """The GDriveStreamReader should return the expected bytes"""
-    expected_bytes = [b"a", b"b", b"c"]
-    bytes_idx = 0
+class FakeDriveMediaHandler(BaseHTTPRequestHandler):
+    """Serve a file's bytes with Range support, like the Drive media endpoint"""
 
-    mock_resp = mocker.Mock(status=200)
-    mocker.patch(
-        "googleapiclient.http._retry_request", return_value=(mock_resp, b"abc")
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        """Return the requested range of the file, or all of it"""
+        content = self.server.content
+        byte_range = self.headers.get("Range")
+        self.server.ranges.append(byte_range)
+        if byte_range and not self.server.ignore_range:
+            start, end = (
+                int(value) for value in byte_range.removeprefix("bytes=").split("-")
+            )
+            if start >= len(content):
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{len(content)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            end = min(end, len(content) - 1)
+            body = content[start : end + 1]
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+        else:
+            body = content
+            self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep the test output quiet"""
+
+
+@pytest.fixture
+def fake_drive_media():
+    """Run a local HTTP server standing in for the Drive media endpoint"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDriveMediaHandler)
+    server.daemon_threads = True
+    server.content = bytes(range(256)) * 4
+    server.ranges = []
+    server.ignore_range = False
+    server.url = f"http://127.0.0.1:{server.server_port}/media"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _stream_reader(server, **kwargs):
+    """Return a GDriveStreamReader for the fake server's content"""
+    return GDriveStreamReader(
+        DriveFileFactory.build(size=len(server.content)),
+        session=requests.Session(),
+        media_url=server.url,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [100, 333, 2000])
+@pytest.mark.parametrize("concurrency", [1, 3])
+@pytest.mark.parametrize("amount", [None, 7, 250])
+def test_gdrive_stream_reader(fake_drive_media, chunk_size, concurrency, amount):
+    """The GDriveStreamReader should return the file's bytes in order"""
+    reader = _stream_reader(
+        fake_drive_media, chunk_size=chunk_size, concurrency=concurrency
+    )
+    chunks = []
+    while chunk := reader.read(amount):
+        chunks.append(chunk)
+    assert b"".join(chunks) == fake_drive_media.content
+    if amount:
+        assert {len(chunk) for chunk in chunks[:-1]} <= {amount}
+    assert len(reader.buffers) == min(
+        concurrency, -(-len(fake_drive_media.content) // chunk_size)
+    )
+    assert reader.read(amount) == b""
+    assert len(fake_drive_media.ranges) == -(
+        -len(fake_drive_media.content) // chunk_size
     )
-    reader = GDriveStreamReader(DriveFileFactory.build())
 
-    def mock_next_chunk():
-        """Overwrite the MediaIoBaseDownload.next_chunk function for testing purposes"""
-        reader.downloader._fd.write(  # noqa: SLF001
-            b"".join(expected_bytes[bytes_idx : bytes_idx + chunk_size])
-        )
-        return MediaDownloadProgress(bytes_idx + chunk_size, 3), bytes_idx >= 2
 
-    reader.downloader.next_chunk = mock_next_chunk
+@pytest.mark.parametrize("content", [b"", b"abc"])
+def test_gdrive_stream_reader_unknown_size(fake_drive_media, content):
+    """The GDriveStreamReader should ask for the file size if it is not known"""
+    fake_drive_media.content = content
+    reader = GDriveStreamReader(
+        DriveFileFactory.build(size=None),
+        session=requests.Session(),
+        media_url=fake_drive_media.url,
+    )
+    assert reader.read() == content
+    assert reader.size == len(content)
+    assert fake_drive_media.ranges[0] == "bytes=0-0"
 
-    for i in range(0, 3, chunk_size):
-        bytes_read = reader.read(amount=chunk_size)
-        bytes_idx += chunk_size
-        assert reader.downloader._chunksize == chunk_size  # noqa: SLF001
-        assert bytes_read == b"".join(expected_bytes[i : i + chunk_size])
 
+def test_gdrive_stream_reader_range_ignored(fake_drive_media):
+    """The GDriveStreamReader should raise an error if ranges are not honored"""
+    fake_drive_media.ignore_range = True
+    reader = _stream_reader(fake_drive_media, chunk_size=100)
+    with pytest.raises(OSError, match="Expected a partial response"):
+        reader.read(100)
 
-def test_rename_file(mocker, settings):
+
+@mock_aws
+def test_rename_file(settings):
     """rename_file should update the WebsiteContent and DriveFile objects with a new file path"""
+    settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+    settings.S3_COPY_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+    settings.S3_COPY_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
     content = WebsiteContentFactory.create(
         file="test/path/old_name.pdf", text_id="abc-123"
     )
     drive_file = DriveFileFactory.create(
         website=content.website, s3_key="test/path/old_name.pdf", resource=content
     )
-    mocker.patch("main.s3_utils.boto3")
-    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    setup_s3(settings)
+    s3 = get_boto3_resource("s3")
+    s3.meta.client.put_object(
+        Bucket=MOCK_BUCKET_NAME,
+        Key="test/path/old_name.pdf",
+        Body=b"x" * (6 * 1024 * 1024),
+        ContentType="application/pdf",
+    )
     rename_file("abc-123", "new_name.pdf")
     content.refresh_from_db()
     drive_file.refresh_from_db()
     assert content.file == "test/path/new_name.pdf"
     assert drive_file.s3_key == "test/path/new_name.pdf"
+    bucket = s3.Bucket(MOCK_BUCKET_NAME)
+    assert bucket.Object("test/path/new_name.pdf").content_type == "application/pdf"
+    assert [obj.key for obj in bucket.objects.filter(Prefix="test/path/")] == [
+        "test/path/new_name.pdf"
+    ]
 
 
 @pytest.mark.parametrize("deleted_drive_files_count", [0, 5, 10])
@@ -6,6 +6,13 @@ DRIVE_API_CHANGES = "changes"
 DRIVE_API_FILES = "files"
 DRIVE_API_RESOURCES = [DRIVE_API_FILES, DRIVE_API_CHANGES]
 
+DRIVE_CHANGES_PAGE_SIZE = 1000
+DRIVE_CHANGE_FIELDS = (
+    "nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, "
+    "md5Checksum, mimeType, createdTime, modifiedTime, size, webContentLink, "
+    "trashed, parents))"
+)
+
 DRIVE_FILE_CREATED_TIME = "createdTime"
 DRIVE_FILE_DOWNLOAD_LINK = "webContentLink"
 DRIVE_FILE_FIELDS = (
@@ -19,13 +26,21 @@ DRIVE_FILE_MODIFIED_TIME = "modifiedTime"
 DRIVE_FILE_NAME = "name"
 DRIVE_FILE_SIZE = "size"
 DRIVE_FILE_VIEW_URL = "https://drive.google.com/file/d/{file_id}/view"
+DRIVE_FILE_MEDIA_URL = "https://www.googleapis.com/drive/v3/files/{file_id}?alt=media&supportsAllDrives=true"
 
 DRIVE_FOLDER_FILES = "files"
 DRIVE_FOLDER_FILES_FINAL = "files_final"
 DRIVE_FOLDER_VIDEOS_FINAL = "videos_final"
+# Number of folders whose children are listed with a single files.list query
+DRIVE_FOLDER_QUERY_BATCH_SIZE = 50
 
 DRIVE_MIMETYPE_FOLDER = "application/vnd.google-apps.folder"
 
+# S3 object metadata key holding the md5 checksum of an uploaded Drive file
+S3_MD5_METADATA_KEY = "gdrive-md5"
+# Maximum number of S3 objects checked for an existing copy of a Drive file
+S3_COPY_MAX_CANDIDATES = 5
+
 VALID_TEXT_FILE_TYPES = [
     ".pdf",
     ".htm",
@@ -0,0 +1,56 @@
+"""Tests for the move_misplaced_s3_keys management command"""
+
+import pytest
+from django.core.management import call_command
+from moto import mock_aws
+
+from gdrive_sync.factories import DriveFileFactory
+from main.s3_utils import get_boto3_client
+from videos.conftest import MOCK_BUCKET_NAME, setup_s3
+from websites.constants import WEBSITE_SOURCE_STUDIO
+from websites.factories import WebsiteContentFactory, WebsiteFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@mock_aws
+def test_move_misplaced_s3_keys(mocker, settings):
+    """Files under the short_id path should be moved to the name path, skipping missing keys"""
+    settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+    mock_sync = mocker.patch(
+        "gdrive_sync.management.commands.move_misplaced_s3_keys.sync_website_content.delay"
+    )
+    website = WebsiteFactory.create(
+        source=WEBSITE_SOURCE_STUDIO, name="site-name", short_id="site-id"
+    )
+    moved_file, missing_file = (
+        DriveFileFactory.create(
+            website=website, mime_type="application/pdf", drive_path="files"
+        )
+        for _ in range(2)
+    )
+    prefix = moved_file.s3_prefix
+    moved_file.s3_key = f"{prefix}/site-id/moved.pdf"
+    moved_file.save()
+    missing_file.s3_key = f"{prefix}/site-id/missing.pdf"
+    missing_file.save()
+    content = WebsiteContentFactory.create(website=website, file=moved_file.s3_key)
+    setup_s3(settings, test_files={moved_file.s3_key: b"moved"})
+
+    call_command("move_misplaced_s3_keys")
+
+    new_s3_key = f"{prefix}/site-name/moved.pdf"
+    moved_file.refresh_from_db()
+    missing_file.refresh_from_db()
+    content.refresh_from_db()
+    assert moved_file.s3_key == new_s3_key
+    assert missing_file.s3_key == f"{prefix}/site-id/missing.pdf"
+    assert content.file.name == new_s3_key
+    s3 = get_boto3_client("s3")
+    assert s3.get_object(Bucket=MOCK_BUCKET_NAME, Key=new_s3_key)["Body"].read() == (
+        b"moved"
+    )
+    assert "Contents" not in s3.list_objects_v2(
+        Bucket=MOCK_BUCKET_NAME, Prefix=f"{prefix}/site-id/"
+    )
+    mock_sync.assert_called_once_with("site-name")
@@ -14,6 +14,7 @@ class Command(WebsiteFilterCommand):
     ./manage.py populate_file_sizes
     ./manage.py populate_file_sizes --filter course-id
     ./manage.py populate_file_sizes --filter course-id --override-existing
+    ./manage.py populate_file_sizes --filter course-id --no-list-prefix
     """
 
     help = __doc__
@@ -27,6 +28,13 @@ class Command(WebsiteFilterCommand):
             default=False,
             help="Override existing file_size values",
         )
+        parser.add_argument(
+            "--no-list-prefix",
+            dest="list_prefix",
+            action="store_false",
+            default=True,
+            help="Fetch each file size with a HEAD request instead of listing each site's S3 prefix once",  # noqa: E501
+        )
 
     def handle(self, *args, **options):
         super().handle(*args, **options)
@@ -38,7 +46,7 @@ class Command(WebsiteFilterCommand):
         self.stdout.write("Scheduling populate_file_sizes_bulk...")
 
         task = populate_file_sizes_bulk.delay(
-            website_names, options["override_existing"]
+            website_names, options["override_existing"], options["list_prefix"]
         )
 
         self.stdout.write("Waiting on task...")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("gdrive_sync", "0009_use_bigint_for_drivefile_size"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="drivefile",
+            index=models.Index(
+                fields=["checksum", "size"], name="drivefile_checksum_size_idx"
+            ),
+        ),
+    ]
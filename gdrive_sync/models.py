@@ -160,5 +160,13 @@ class DriveFile(TimestampedModel):
             else self.website.starter.config.get("root-url-path").rstrip("/")
         )
 
+    class Meta:
+        indexes = [
+            # Used to find an uploaded copy of a file's content
+            models.Index(
+                fields=["checksum", "size"], name="drivefile_checksum_size_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"'{self.name}' ({self.drive_path} {self.status} {self.file_id})"
@@ -1,12 +1,17 @@
 """gdrive_sync tasks"""
 
 import logging
-from collections import Counter
+from collections.abc import Iterable  # noqa: TC003
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime  # noqa: TC003
+from functools import partial
 
 import celery
+from botocore.client import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from celery import chain, chord
 from django.conf import settings
+from django_redis import get_redis_connection
 from mitol.common.utils import chunks, now_in_utc
 
 from content_sync.api import upsert_content_sync_state
@@ -14,13 +19,15 @@ from content_sync.decorators import single_task
 from content_sync.tasks import sync_website_content
 from gdrive_sync import api, utils
 from gdrive_sync.constants import (
+    DRIVE_API_CHANGES,
+    DRIVE_CHANGE_FIELDS,
     DRIVE_FILE_FIELDS,
     DRIVE_FOLDER_FILES_FINAL,
     DRIVE_FOLDER_VIDEOS_FINAL,
     DRIVE_MIMETYPE_FOLDER,
     WebsiteSyncStatus,
 )
-from gdrive_sync.models import DriveFile
+from gdrive_sync.models import DriveApiQueryTracker, DriveFile
 from main.celery import app
 from main.s3_utils import get_boto3_resource
 from main.tasks import chord_finisher
@@ -152,48 +159,57 @@ def _get_gdrive_files(website: Website) -> tuple[dict[str, list[dict]], list[str
     return gdrive_subfolder_files, errors
 
 
-@app.task(bind=True, acks_late=True, autoretry_for=(BlockingIOError,), retry_backoff=30)
-@single_task(30)
-def import_website_files(self, name: str, user_pk=None):
-    """Query the Drive API for all children of a website folder and import the files"""
-    if not api.is_gdrive_enabled():
-        return None
-    website = Website.objects.get(name=name)
-    website.sync_status = WebsiteSyncStatus.PROCESSING
-    website.synced_on = now_in_utc()
-    website.sync_errors = []
+def _get_file_error(name: str | None) -> str:
+    """Return the sync error recorded for a gdrive file that could not be processed"""
+    return f"Error processing gdrive file {name}"
 
-    gdrive_subfolder_files, errors = _get_gdrive_files(website)
 
-    deleted_drive_files = api.find_missing_files(
-        sum(gdrive_subfolder_files.values(), []),  # noqa: RUF017
-        website,
+def _get_website_import_lock(name: str, timeout: int):
+    """Return the lock held while the gdrive files of a website are imported"""
+    return get_redis_connection("redis").lock(
+        f"import_website_files-id-{name}", timeout=timeout
     )
+
+
+def _get_import_workflow(  # noqa: PLR0913
+    website: Website,
+    gdrive_file_groups: Iterable[list[dict]],
+    deleted_drive_files: Iterable[DriveFile],
+    errors: list[str],
+    *,
+    user_pk=None,
+    parent_trees: dict | None = None,
+):
+    """
+    Save DriveFiles for new and changed gdrive files and the website's sync
+    errors, and return a workflow that uploads, deletes and publishes them, or
+    None if there is nothing to do.
+    """
     delete_file_tasks = [
         delete_drive_file.si(drive_file.file_id, website.synced_on, user_pk=user_pk)
         for drive_file in deleted_drive_files
     ]
 
     file_tasks = []
-    for gdrive_files in gdrive_subfolder_files.values():
-        occurrences = Counter([file.get("name") for file in gdrive_files])
-        for gdfile in gdrive_files:
-            try:
-                drive_file = api.process_file_result(
-                    gdfile,
-                    website=website,
-                    sync_date=website.synced_on,
-                    replace_file=occurrences[gdfile.get("name")] == 1,
-                )
-                if drive_file:
-                    file_tasks.append(process_drive_file.s(drive_file.file_id))
-            except:  # pylint:disable=bare-except  # noqa: E722
-                errors.append(f"Error processing gdrive file {gdfile.get('name')}")
-                log.exception(
-                    "Error processing gdrive file %s for %s",
-                    gdfile.get("name"),
-                    website.short_id,
-                )
+    for gdrive_files in gdrive_file_groups:
+        try:
+            drive_files, failed_files = api.process_file_results(
+                gdrive_files,
+                website=website,
+                sync_date=website.synced_on,
+                parent_trees=parent_trees,
+            )
+        except:  # pylint:disable=bare-except  # noqa: E722
+            drive_files = []
+            failed_files = gdrive_files
+            log.exception(
+                "Error processing gdrive files for %s",
+                website.short_id,
+            )
+        file_tasks.extend(
+            process_drive_file.s(drive_file.file_id) for drive_file in drive_files
+        )
+        errors.extend(_get_file_error(gdfile.get("name")) for gdfile in failed_files)
     website.sync_errors = errors
     website.save()
 
@@ -212,18 +228,137 @@ def import_website_files(self, name: str, user_pk=None):
         step = chord(celery.group(*delete_file_tasks), chord_finisher.si())
         workflow_steps.append(step)
 
-    if workflow_steps:
-        workflow_steps.append(update_website_status.si(website.pk, website.synced_on))
-        workflow_steps.append(sync_website_content.si(name))
-        workflow = chain(*workflow_steps)
+    if not workflow_steps:
+        return None
+    workflow_steps.append(update_website_status.si(website.pk, website.synced_on))
+    workflow_steps.append(sync_website_content.si(website.name))
+    return chain(*workflow_steps)
+
+
+def _start_website_sync(website: Website):
+    """Mark a website's gdrive sync as in progress"""
+    website.sync_status = WebsiteSyncStatus.PROCESSING
+    website.synced_on = now_in_utc()
+
+
+@app.task(bind=True, acks_late=True, autoretry_for=(BlockingIOError,), retry_backoff=30)
+def import_website_files(self, name: str, user_pk=None):
+    """Query the Drive API for all children of a website folder and import the files"""
+    if not api.is_gdrive_enabled():
+        return None
+    lock = _get_website_import_lock(name, 30)
+    if not lock.acquire(blocking=False):
+        raise BlockingIOError
+    try:
+        return _import_website_files(self, name, user_pk=user_pk)
+    finally:
+        if lock.locked():
+            lock.release()
+
 
-        return self.replace(celery.group(workflow))
+def _import_website_files(task, name: str, user_pk=None):
+    """Import all the gdrive files of a website, while holding its import lock"""
+    website = Website.objects.get(name=name)
+    _start_website_sync(website)
+    website.sync_errors = []
+
+    gdrive_subfolder_files, errors = _get_gdrive_files(website)
+
+    deleted_drive_files = api.find_missing_files(
+        (
+            gdfile
+            for gdrive_files in gdrive_subfolder_files.values()
+            for gdfile in gdrive_files
+        ),
+        website,
+    )
+    workflow = _get_import_workflow(
+        website,
+        gdrive_subfolder_files.values(),
+        deleted_drive_files,
+        errors,
+        user_pk=user_pk,
+    )
+    if workflow:
+        return task.replace(celery.group(workflow))
 
     update_website_status(website.pk, website.synced_on)
 
     return None
 
 
+@app.task(bind=True, acks_late=True, autoretry_for=(BlockingIOError,), retry_backoff=30)
+@single_task(300)
+def import_drive_changes(self):
+    """
+    Import only the gdrive files that changed since the last run, using the
+    Drive changes API and the page token stored in DriveApiQueryTracker.
+
+    The first run only stores a page token, so files changed before then must
+    be imported with import_website_files. If import_website_files is running for
+    an affected website, the run is retried later without consuming the changes.
+    Sync errors of files that did not change are kept.
+    """
+    if not api.is_gdrive_enabled():
+        return None
+    tracker, _ = DriveApiQueryTracker.objects.get_or_create(api_call=DRIVE_API_CHANGES)
+    now = now_in_utc()
+    if not tracker.last_page:
+        tracker.last_page = api.get_changes_start_page_token()
+        tracker.last_dt = now
+        tracker.save()
+        return None
+
+    changes, next_page = api.query_changes(tracker.last_page, DRIVE_CHANGE_FIELDS)
+    parent_trees = {}
+    website_changes = api.group_changes_by_website(changes, parent_trees)
+    locks = []
+    try:
+        for website in website_changes:
+            lock = _get_website_import_lock(website.name, 300)
+            if not lock.acquire(blocking=False):
+                raise BlockingIOError
+            locks.append(lock)
+
+        workflows = []
+        for website, (gdrive_files, deleted_drive_files) in website_changes.items():
+            _start_website_sync(website)
+            changed_file_errors = {
+                *(_get_file_error(gdfile.get("name")) for gdfile in gdrive_files),
+                *(
+                    _get_file_error(drive_file.name)
+                    for drive_file in deleted_drive_files
+                ),
+            }
+            workflow = _get_import_workflow(
+                website,
+                [gdrive_files],
+                deleted_drive_files,
+                [
+                    error
+                    for error in website.sync_errors or []
+                    if error not in changed_file_errors
+                ],
+                parent_trees=parent_trees,
+            )
+            if workflow:
+                workflows.append(workflow)
+            else:
+                update_website_status(website.pk, website.synced_on)
+
+        tracker.last_page = next_page
+        tracker.last_dt = now
+        tracker.save()
+    finally:
+        for lock in locks:
+            if lock.locked():
+                lock.release()
+
+    if workflows:
+        return self.replace(celery.group(workflows))
+    return None
+
+
 @app.task()
 def create_gdrive_folders(website_short_id: str):
     """Create gdrive folder for website if it doesn't already exist"""
@@ -264,58 +399,97 @@ def update_website_status(website_pk: str, sync_dt: datetime):
     api.update_sync_status(Website.objects.get(pk=website_pk), sync_dt)
 
 
+def _fetch_content_file_size(
+    content: WebsiteContent,
+    bucket,
+    known_sizes: dict[str, int] | None,
+) -> int | None:
+    """Fetch the file size for `content`, logging instead of raising errors."""
+    try:
+        size = utils.fetch_content_file_size(content, bucket, known_sizes=known_sizes)
+    except Exception as ex:  # pylint:disable=broad-except  # noqa: BLE001
+        log.warning("Could not fetch file size for %s. %s", content, ex)
+        return None
+    if size is None:
+        log.info("Content %s has no file associated with it.", content)
+    return size
+
+
+def _fetch_drive_file_size(
+    drive_file: DriveFile,
+    bucket,
+    known_sizes: dict[str, int] | None,
+) -> int | None:
+    """Fetch the size for `drive_file`, keeping the existing size on errors."""
+    try:
+        size = utils.fetch_drive_file_size(drive_file, bucket, known_sizes=known_sizes)
+    except Exception as ex:  # pylint:disable=broad-except  # noqa: BLE001
+        log.warning("Could not fetch file size for %s. %s", drive_file, ex)
+        return drive_file.size
+    if size is None:
+        log.info("DriveFile %s has no file associated to it.", drive_file)
+    return size
+
+
 @app.task
-def populate_file_sizes(  # noqa: C901
+def populate_file_sizes(
     website_name: str,
     override_existing: bool = False,  # noqa: FBT001, FBT002
+    list_prefix: bool = True,  # noqa: FBT001, FBT002
 ):
-    """Populate all resource content of `website` with the `file_size` metadata field."""  # noqa: E501
+    """
+    Populate all resource content of `website` with the `file_size` metadata field.
+
+    If `list_prefix` is True, the website's S3 prefix is listed once and sizes
+    are looked up from that listing, falling back to a HEAD request for files
+    stored elsewhere. HEAD requests are made concurrently, bounded by
+    settings.AWS_MAX_CONCURRENT_CONNECTIONS.
+    """
     website = Website.objects.get(name=website_name)
     log.info("Starting file size population for %s.", website_name)
 
-    updated_drive_files = []
-    updated_contents = []
-
-    s3 = get_boto3_resource("s3")
+    max_workers = settings.AWS_MAX_CONCURRENT_CONNECTIONS
+    s3 = get_boto3_resource(
+        "s3", extra_options={"config": Config(max_pool_connections=max_workers)}
+    )
     bucket = s3.Bucket(settings.AWS_STORAGE_BUCKET_NAME)
 
-    for content in website.websitecontent_set.filter(type=CONTENT_TYPE_RESOURCE):
-        if not override_existing and content.metadata.get("file_size"):
-            continue
+    known_sizes = None
+    if list_prefix and website.starter:
         try:
-            content.metadata["file_size"] = utils.fetch_content_file_size(
-                content, bucket=bucket
-            )
-        except Exception as ex:  # pylint:disable=broad-except  # noqa: BLE001
-            log.warning("Could not fetch file size for %s. %s", content, ex)
-            content.metadata["file_size"] = None
-        else:
-            if content.metadata["file_size"] is None:
-                log.info("Content %s has no file associated with it.", content)
+            known_sizes = utils.list_s3_object_sizes(bucket, website.s3_path)
+        except (BotoCoreError, ClientError) as ex:
+            log.warning("Could not list files for %s. %s", website_name, ex)
+
+    updated_contents = [
+        content
+        for content in website.websitecontent_set.filter(
+            type=CONTENT_TYPE_RESOURCE
+        ).prefetch_related("drivefile_set")
+        if override_existing or not content.metadata.get("file_size")
+    ]
+    updated_drive_files = [
+        drive_file
+        for content in updated_contents
+        for drive_file in content.drivefile_set.all()
+        if override_existing or not drive_file.size
+    ]
 
-        log.debug(
-            "WebsiteContent %s now has file_size %s.",
-            content,
-            content.metadata["file_size"],
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        content_sizes = executor.map(
+            partial(_fetch_content_file_size, bucket=bucket, known_sizes=known_sizes),
+            updated_contents,
         )
-
-        drive_files = content.drivefile_set.all()
-        for drive_file in drive_files:
-            if not override_existing and drive_file.size:
-                continue
-
-            try:
-                drive_file.size = utils.fetch_drive_file_size(drive_file, bucket)
-            except Exception as ex:  # pylint:disable=broad-except  # noqa: BLE001
-                log.warning("Could not fetch file size for %s. %s", drive_file, ex)
-            else:
-                if drive_file.size is None:
-                    log.info("DriveFile %s has no file associated to it.", drive_file)
-
-            log.debug("DriveFile %s now has size %s.", drive_file, drive_file.size)
-
-        updated_drive_files.extend(drive_files)
-        updated_contents.append(content)
+        drive_file_sizes = executor.map(
+            partial(_fetch_drive_file_size, bucket=bucket, known_sizes=known_sizes),
+            updated_drive_files,
+        )
+        for content, size in zip(updated_contents, content_sizes):
+            content.metadata["file_size"] = size
+            log.debug("WebsiteContent %s now has file_size %s.", content, size)
+        for drive_file, size in zip(updated_drive_files, drive_file_sizes):
+            drive_file.size = size
+            log.debug("DriveFile %s now has size %s.", drive_file, size)
 
     DriveFile.objects.bulk_update(updated_drive_files, ["size"])
     WebsiteContent.objects.bulk_update(updated_contents, ["metadata"])
@@ -335,10 +509,11 @@ def populate_file_sizes_bulk(
     self,
     website_names: list[str],
     override_existing: bool = False,  # noqa: FBT001, FBT002
+    list_prefix: bool = True,  # noqa: FBT001, FBT002
 ):
-    """Run populate_file_sizes for `website_names` sequentially."""
+    """Run populate_file_sizes for `website_names` in parallel."""
     sub_tasks = [
-        populate_file_sizes.si(name, override_existing) for name in website_names
+        populate_file_sizes.si(name, override_existing, list_prefix)
+        for name in website_names
     ]
-    task_chain = chain(*sub_tasks)
-    return self.replace(task_chain)
+    return self.replace(celery.group(sub_tasks))
@@ -5,18 +5,22 @@ from celery.exceptions import Retry
 from mitol.common.utils import now_in_utc
 from moto import mock_aws
 
-from gdrive_sync import tasks
-from gdrive_sync.conftest import LIST_FILE_RESPONSES
+from gdrive_sync import tasks, utils
+from gdrive_sync.conftest import LIST_FILE_RESPONSES, setup_s3_test_file_bucket
 from gdrive_sync.constants import (
+    DRIVE_API_CHANGES,
+    DRIVE_CHANGE_FIELDS,
     DRIVE_FOLDER_FILES_FINAL,
     DRIVE_FOLDER_VIDEOS_FINAL,
     WebsiteSyncStatus,
 )
-from gdrive_sync.factories import DriveFileFactory
+from gdrive_sync.factories import DriveApiQueryTrackerFactory, DriveFileFactory
+from gdrive_sync.models import DriveApiQueryTracker
 from gdrive_sync.tasks import (
     create_gdrive_folders_batch,
     create_gdrive_resource_content_batch,
     delete_drive_file,
+    import_drive_changes,
     import_website_files,
     populate_file_sizes,
     populate_file_sizes_bulk,
@@ -117,7 +121,7 @@ def test_create_gdrive_folders_batch_errors(mocker, has_error):
 def test_import_website_files(
     mocker, mocked_celery, mock_gdrive_files, has_user, process_file_result_returns_none
 ):  # pylint:disable=unused-argument
-    """import_website_files should run process_file_result for each drive file and trigger tasks"""
+    """import_website_files should run process_file_results for each subfolder and trigger tasks"""
     mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
     website = WebsiteFactory.create()
     user = UserFactory.create() if has_user else None
@@ -125,12 +129,13 @@ def test_import_website_files(
     drive_files = DriveFileFactory.create_batch(2, website=website)
 
     if process_file_result_returns_none:
-        mock_process_file_result = mocker.patch(
-            "gdrive_sync.tasks.api.process_file_result", return_value=None
+        mock_process_file_results = mocker.patch(
+            "gdrive_sync.tasks.api.process_file_results", return_value=([], [])
         )
     else:
-        mock_process_file_result = mocker.patch(
-            "gdrive_sync.tasks.api.process_file_result", side_effect=drive_files
+        mock_process_file_results = mocker.patch(
+            "gdrive_sync.tasks.api.process_file_results",
+            side_effect=[([], []), (drive_files, [])],
         )
 
     mock_process_gdrive_file = mocker.patch("gdrive_sync.tasks.process_drive_file.s")
@@ -141,17 +146,18 @@ def test_import_website_files(
     mock_update_status = mocker.patch("gdrive_sync.tasks.update_website_status.si")
     with pytest.raises(mocked_celery.replace_exception_class):
         import_website_files.delay(website.name, user_pk=user_pk)
-    assert mock_process_file_result.call_count == 2
+    # Called once per subfolder
+    assert mock_process_file_results.call_count == 2
 
     if process_file_result_returns_none:
         # for already synced drive files that have not been modified,
-        # process_file_result returns None. These files should be
+        # process_file_results returns no drive files. These files should be
         # skipped by process_drive_file i.e their
         # sync_to_s3 and related steps should not be called
         mock_process_gdrive_file.assert_not_called()
         mock_transcode_videos.assert_not_called()
     else:
-        # When process_file_result returns drive files, process_drive_file should be called for each
+        # When process_file_results returns drive files, process_drive_file should be called for each
         for drive_file in drive_files:
             mock_process_gdrive_file.assert_any_call(drive_file.file_id)
         mock_transcode_videos.assert_called_once()
@@ -211,11 +217,11 @@ def test_import_website_files_query_error(mocker):
 
 
 def test_import_website_files_processing_error(mocker, mock_gdrive_files):  # pylint:disable=unused-argument
-    """import_website_files should log exceptions raised by process_file_result and update website status"""
+    """import_website_files should log exceptions raised while processing files and update website status"""
     mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
-    mock_log = mocker.patch("gdrive_sync.tasks.log.exception")
+    mock_log = mocker.patch("gdrive_sync.api.log.exception")
     mocker.patch(
-        "gdrive_sync.tasks.api.process_file_result",
+        "gdrive_sync.api.get_parent_tree",
         side_effect=Exception("Error processing the file"),
     )
     website = WebsiteFactory.create()
@@ -248,6 +254,119 @@ def test_import_website_files_delete_missing(mocker, mocked_celery):
         )
 
 
+def test_import_drive_changes_first_run(mocker):
+    """The first import_drive_changes run should only store a page token"""
+    mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
+    mocker.patch(
+        "gdrive_sync.tasks.api.get_changes_start_page_token", return_value="123"
+    )
+    mock_query_changes = mocker.patch("gdrive_sync.tasks.api.query_changes")
+    import_drive_changes.delay()
+    mock_query_changes.assert_not_called()
+    tracker = DriveApiQueryTracker.objects.get(api_call=DRIVE_API_CHANGES)
+    assert tracker.last_page == "123"
+    assert tracker.last_dt is not None
+
+
+def test_import_drive_changes(mocker, mocked_celery):
+    """import_drive_changes should import the changed files of each affected website"""
+    mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
+    DriveApiQueryTrackerFactory.create(api_call=DRIVE_API_CHANGES, last_page="1")
+    changed_website, unchanged_website = WebsiteFactory.create_batch(2)
+    drive_file = DriveFileFactory.create(website=changed_website)
+    deleted_file = DriveFileFactory.create(website=changed_website)
+    gdrive_files = [{"id": drive_file.file_id, "name": drive_file.name}]
+    changes = [{"fileId": drive_file.file_id, "file": gdrive_files[0]}]
+    mock_query_changes = mocker.patch(
+        "gdrive_sync.tasks.api.query_changes", return_value=(changes, "2")
+    )
+    mocker.patch(
+        "gdrive_sync.tasks.api.group_changes_by_website",
+        return_value={
+            changed_website: (gdrive_files, [deleted_file]),
+            unchanged_website: ([], []),
+        },
+    )
+    mock_process_file_results = mocker.patch(
+        "gdrive_sync.tasks.api.process_file_results",
+        side_effect=[([drive_file], []), ([], [])],
+    )
+    mock_process_gdrive_file = mocker.patch("gdrive_sync.tasks.process_drive_file.s")
+    mock_delete_drive_file = mocker.patch("gdrive_sync.tasks.delete_drive_file.si")
+    mock_sync_content = mocker.patch("gdrive_sync.tasks.sync_website_content.si")
+    mock_update_status = mocker.patch("gdrive_sync.tasks.api.update_sync_status")
+
+    with pytest.raises(mocked_celery.replace_exception_class):
+        import_drive_changes.delay()
+
+    mock_query_changes.assert_called_once_with("1", DRIVE_CHANGE_FIELDS)
+    mock_process_file_results.assert_any_call(
+        gdrive_files,
+        website=changed_website,
+        sync_date=changed_website.synced_on,
+        parent_trees={},
+    )
+    mock_process_gdrive_file.assert_called_once_with(drive_file.file_id)
+    mock_delete_drive_file.assert_called_once_with(
+        deleted_file.file_id, changed_website.synced_on, user_pk=None
+    )
+    mock_sync_content.assert_called_once_with(changed_website.name)
+    # Websites with nothing to do get their status updated right away
+    mock_update_status.assert_called_once_with(
+        unchanged_website, unchanged_website.synced_on
+    )
+    tracker = DriveApiQueryTracker.objects.get(api_call=DRIVE_API_CHANGES)
+    assert tracker.last_page == "2"
+
+
+def test_import_drive_changes_keeps_errors(mocker, mocked_celery):  # pylint:disable=unused-argument
+    """import_drive_changes should only replace the sync errors of the changed files"""
+    mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
+    DriveApiQueryTrackerFactory.create(api_call=DRIVE_API_CHANGES, last_page="1")
+    website = WebsiteFactory.create(
+        sync_errors=[
+            "Error processing gdrive file unchanged.pdf",
+            "Error processing gdrive file changed.pdf",
+        ]
+    )
+    gdrive_files = [{"id": "abc", "name": "changed.pdf"}]
+    mocker.patch("gdrive_sync.tasks.api.query_changes", return_value=([], "2"))
+    mocker.patch(
+        "gdrive_sync.tasks.api.group_changes_by_website",
+        return_value={website: (gdrive_files, [])},
+    )
+    mocker.patch("gdrive_sync.tasks.api.process_file_results", return_value=([], []))
+    mocker.patch("gdrive_sync.tasks.api.update_sync_status")
+    import_drive_changes.delay()
+    website.refresh_from_db()
+    assert website.sync_errors == ["Error processing gdrive file unchanged.pdf"]
+
+
+def test_import_drive_changes_locked(mocker):
+    """import_drive_changes should retry without consuming changes if a website import is running"""
+    mocker.patch("gdrive_sync.tasks.api.is_gdrive_enabled", return_value=True)
+    DriveApiQueryTrackerFactory.create(api_call=DRIVE_API_CHANGES, last_page="1")
+    website = WebsiteFactory.create()
+    mocker.patch("gdrive_sync.tasks.api.query_changes", return_value=([], "2"))
+    mocker.patch(
+        "gdrive_sync.tasks.api.group_changes_by_website",
+        return_value={website: ([{"id": "abc", "name": "changed.pdf"}], [])},
+    )
+    mock_process_file_results = mocker.patch(
+        "gdrive_sync.tasks.api.process_file_results"
+    )
+    lock = tasks._get_website_import_lock(website.name, 30)  # noqa: SLF001
+    assert lock.acquire(blocking=False)
+    try:
+        with pytest.raises(Retry):
+            import_drive_changes.delay()
+    finally:
+        lock.release()
+    mock_process_file_results.assert_not_called()
+    tracker = DriveApiQueryTracker.objects.get(api_call=DRIVE_API_CHANGES)
+    assert tracker.last_page == "1"
+
+
 def test_update_website_status(mocker):
     """Calling the update_website_status task should call api.update_sync_status with args"""
     website = WebsiteFactory.create()
@@ -360,6 +479,7 @@ def test_delete_drive_file(mocker, has_user):
 @pytest.mark.parametrize("override_existing", [True, False])
 def test_populate_file_sizes_for_content(settings, mocker, override_existing):
     """populate_file_sizes should populate file sizes for website's content."""
+    settings.ENVIRONMENT = "test"
     settings.AWS_STORAGE_BUCKET_NAME = "storage_bucket"
 
     NEW_FILE_SIZE = 1234
@@ -397,6 +517,7 @@ def test_populate_file_sizes_for_content(settings, mocker, override_existing):
 @pytest.mark.parametrize("override_existing", [True, False])
 def test_populate_file_sizes_for_drive_file(settings, mocker, override_existing):
     """populate_file_sizes should populate file sizes for drive files associated with content."""
+    settings.ENVIRONMENT = "test"
     settings.AWS_STORAGE_BUCKET_NAME = "storage_bucket"
 
     NEW_FILE_SIZE = 1234
@@ -446,4 +567,53 @@ def test_populate_file_sizes_bulk_delegates(mocker, mocked_celery, override_exis
 
     assert mock_populate_file_sizes.call_count == 3
     for name in website_names:
-        mock_populate_file_sizes.assert_any_call(name, override_existing)
+        mock_populate_file_sizes.assert_any_call(name, override_existing, True)  # noqa: FBT003
+    mocked_celery.group.assert_called_once_with(
+        [mock_populate_file_sizes.return_value] * 3
+    )
+
+
+@mock_aws
+@pytest.mark.parametrize("list_prefix", [True, False])
+def test_populate_file_sizes_from_s3(settings, mocker, list_prefix):
+    """populate_file_sizes should get sizes from a prefix listing or HEAD requests."""
+    settings.ENVIRONMENT = "test"
+    settings.AWS_STORAGE_BUCKET_NAME = "storage_bucket"
+    website = WebsiteFactory.create()
+    in_prefix_key = f"{website.s3_path}/in_prefix.pdf"
+    legacy_key = "courses/legacy/elsewhere.pdf"
+    bucket = setup_s3_test_file_bucket(settings, in_prefix_key)
+    bucket.put_object(Key=legacy_key, Body=b"12345")
+
+    in_prefix_content = WebsiteContentFactory.create(
+        website=website,
+        type=CONTENT_TYPE_RESOURCE,
+        metadata={"file": in_prefix_key},
+    )
+    legacy_content = WebsiteContentFactory.create(
+        website=website,
+        type=CONTENT_TYPE_RESOURCE,
+        metadata={"file_location": f"/{legacy_key}"},
+    )
+    drive_file = DriveFileFactory.create(
+        resource=in_prefix_content, website=website, s3_key=in_prefix_key, size=None
+    )
+    head_object_spy = mocker.spy(utils, "get_s3_object_size")
+
+    populate_file_sizes.delay(website.name, False, list_prefix)  # noqa: FBT003
+
+    expected_size = bucket.Object(in_prefix_key).content_length
+    in_prefix_content.refresh_from_db()
+    legacy_content.refresh_from_db()
+    drive_file.refresh_from_db()
+    assert in_prefix_content.metadata["file_size"] == expected_size
+    assert legacy_content.metadata["file_size"] == 5
+    assert drive_file.size == expected_size
+    known_sizes = [
+        call.kwargs["known_sizes"] for call in head_object_spy.call_args_list
+    ]
+    assert len(known_sizes) == 3
+    if list_prefix:
+        assert all(sizes == {in_prefix_key: expected_size} for sizes in known_sizes)
+    else:
+        assert known_sizes == [None] * 3
@@ -18,9 +18,43 @@ if TYPE_CHECKING:
     from websites.models import WebsiteContent
 
 
+def get_s3_object_size(
+    bucket: s3.Bucket,  # noqa: F821
+    file_key: str,
+    known_sizes: dict[str, int] | None = None,
+) -> int:
+    """
+    Return the size (in bytes) of `file_key` in `bucket`.
+
+    The size is taken from `known_sizes` (see list_s3_object_sizes) when the key
+    is present there, otherwise it is fetched with a HEAD request. The request
+    goes through the bucket's underlying client, which is thread-safe, so this
+    can be called concurrently with a shared bucket.
+    """
+    if known_sizes is not None and file_key in known_sizes:
+        return known_sizes[file_key]
+    return bucket.meta.client.head_object(Bucket=bucket.name, Key=file_key)[
+        "ContentLength"
+    ]
+
+
+def list_s3_object_sizes(
+    bucket: s3.Bucket,  # noqa: F821
+    prefix: str,
+) -> dict[str, int]:
+    """Return a mapping of key to size for every object under `prefix`."""
+    paginator = bucket.meta.client.get_paginator("list_objects_v2")
+    return {
+        obj["Key"]: obj["Size"]
+        for page in paginator.paginate(Bucket=bucket.name, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    }
+
+
 def fetch_content_file_size(
     content: WebsiteContent,
     bucket: s3.Bucket,  # noqa: F821
+    known_sizes: dict[str, int] | None = None,
 ) -> int | None:
     """Return the size (in bytes) of the file associated with `content`."""
     size = None
@@ -35,7 +69,7 @@ def fetch_content_file_size(
 
     if file_key:
         file_key = file_key.strip("/")
-        size = bucket.Object(file_key).content_length
+        size = get_s3_object_size(bucket, file_key, known_sizes=known_sizes)
     elif content.metadata.get("video_files", {}).get("archive_url"):
         # Some of our video resources are directly linked to YT videos, and their
         # downloadable content is in an archive url.
@@ -49,13 +83,14 @@ def fetch_content_file_size(
 def fetch_drive_file_size(
     drive_file: DriveFile,
     bucket: s3.Bucket,  # noqa: F821
+    known_sizes: dict[str, int] | None = None,
 ) -> int | None:
     """Return the size (in bytes) of the file associated with `drive_file.s3_key`."""
     size = None
     file_key = drive_file.s3_key
 
     if file_key:
-        size = bucket.Object(file_key).content_length
+        size = get_s3_object_size(bucket, file_key, known_sizes=known_sizes)
 
     return size
 
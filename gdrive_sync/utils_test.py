@@ -6,7 +6,11 @@ from moto import mock_aws
 
 from gdrive_sync.conftest import setup_s3_test_file_bucket
 from gdrive_sync.factories import DriveFileFactory
-from gdrive_sync.utils import fetch_content_file_size, fetch_drive_file_size
+from gdrive_sync.utils import (
+    fetch_content_file_size,
+    fetch_drive_file_size,
+    list_s3_object_sizes,
+)
 from websites.factories import WebsiteContentFactory
 
 pytestmark = pytest.mark.django_db
@@ -79,3 +83,28 @@ def test_fetch_content_file_size_no_file(mocker):
     content = WebsiteContentFactory.create()
     result = fetch_content_file_size(content, mocker.Mock)
     assert result is None
+
+
+@mock_aws
+def test_list_s3_object_sizes(settings):
+    """list_s3_object_sizes should return sizes for every key under the prefix."""
+    settings.AWS_STORAGE_BUCKET_NAME = "storage_bucket"
+    bucket = setup_s3_test_file_bucket(settings, "sites/site-1/a.pdf")
+    bucket.put_object(Key="sites/site-1/b.pdf", Body=b"12345")
+    bucket.put_object(Key="sites/site-2/c.pdf", Body=b"123")
+
+    assert list_s3_object_sizes(bucket, "sites/site-1/") == {
+        "sites/site-1/a.pdf": bucket.Object("sites/site-1/a.pdf").content_length,
+        "sites/site-1/b.pdf": 5,
+    }
+
+
+def test_fetch_drive_file_size_known_sizes(mocker):
+    """fetch_drive_file_size should not make a request for a size that is already known."""
+    drive_file = DriveFileFactory.build(s3_key="sites/site-1/a.pdf")
+    bucket = mocker.Mock()
+    result = fetch_drive_file_size(
+        drive_file, bucket, known_sizes={"sites/site-1/a.pdf": 42}
+    )
+    assert result == 42
+    bucket.meta.client.head_object.assert_not_called()
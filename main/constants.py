@@ -12,3 +12,6 @@ PRIORITY_STEPS = 5  # priority range (0 - 4)
 DEFAULT_PRIORITY = 2  # Half step of range (0 - 4)
 
 IS_FILTER_REQUIRED = False
+
+# Number of rows fetched per query by management commands that iterate in batches
+DEFAULT_BATCH_SIZE = 500
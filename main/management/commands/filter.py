@@ -1,25 +1,64 @@
 """Filter options for website management commands"""
 
 import json
+import time
 from typing import TYPE_CHECKING
 
 from django.core.management import BaseCommand
 from django.db.models import Q
 
 from content_sync.constants import VERSION_DRAFT
-from main.constants import IS_FILTER_REQUIRED
+from main.constants import DEFAULT_BATCH_SIZE, IS_FILTER_REQUIRED
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django.db.models import Model, QuerySet
+
     from content_sync.models import ContentSyncStateQuerySet
     from videos.models import VideoQuerySet
     from websites.models import WebsiteContentQuerySet, WebsiteQuerySet
 
 
+def keyset_batches(
+    queryset: QuerySet,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fields: Iterable[str] | None = None,
+) -> Iterator[list[Model]]:
+    """
+    Yield lists of model instances from queryset, ordered by primary key.
+
+    Each batch is a separate `pk > last_pk LIMIT batch_size` query, so every
+    page costs the same no matter how deep into the table it is (unlike
+    OFFSET pagination), and rows are streamed with a server-side cursor where
+    the database supports it. Any ordering on the queryset is replaced.
+
+    Args:
+        queryset: The queryset to iterate over. Must return model instances.
+        batch_size: The number of rows fetched per query.
+        fields: If provided, only these columns are loaded (see QuerySet.only).
+    """
+    queryset = queryset.order_by("pk")
+    if fields:
+        queryset = queryset.only(*fields)
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size].iterator(chunk_size=batch_size))
+        if not batch:
+            return
+        yield batch
+        if len(batch) < batch_size:
+            return
+        last_pk = batch[-1].pk
+
+
 class WebsiteFilterCommand(BaseCommand):
     """Common options for filtering by Website"""
 
     filter_list = None
     exclude_list = None
+    verbosity = 1
 
     def add_arguments(self, parser, is_filter_required=IS_FILTER_REQUIRED):
         parser.add_argument(
@@ -43,10 +82,18 @@ class WebsiteFilterCommand(BaseCommand):
             default="",
             help="If specified, exclude website pipelines whose names are in this comma-delimited list",  # noqa: E501
         )
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"The number of rows to fetch per query when iterating in batches (default: {DEFAULT_BATCH_SIZE})",  # noqa: E501
+        )
 
     def handle(self, *args, **options):  # noqa: ARG002
         self.filter_list = []
         self.exclude_list = []
+        self.verbosity = options["verbosity"]
         filter_sites = options["filter"]
         filter_json = options["filter_json"]
         exclude_sites = options["exclude"]
@@ -66,6 +113,34 @@ class WebsiteFilterCommand(BaseCommand):
         if self.exclude_list and options["verbosity"] > 1:
             self.stdout.write(f"Excluding websites: {self.exclude_list}")
 
+    def iterate_batches(
+        self,
+        queryset: QuerySet,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        fields: Iterable[str] | None = None,
+        total: int | None = None,
+    ) -> Iterator[list[Model]]:
+        """
+        Iterate over queryset in keyset-paginated batches (see keyset_batches),
+        writing progress and throughput to stdout after each batch.
+
+        Args:
+            queryset: The queryset to iterate over.
+            batch_size: The number of rows fetched per query.
+            fields: If provided, only these columns are loaded.
+            total: If provided, the expected number of rows, used for progress.
+        """
+        start = time.monotonic()
+        processed = 0
+        for batch in keyset_batches(queryset, batch_size=batch_size, fields=fields):
+            yield batch
+            processed += len(batch)
+            if self.verbosity >= 1:
+                elapsed = time.monotonic() - start
+                rate = processed / elapsed if elapsed else 0
+                progress = f"{processed}/{total}" if total is not None else processed
+                self.stdout.write(f"Processed {progress} rows ({rate:.1f} rows/sec)")
+
     def filter_websites(self, websites: WebsiteQuerySet) -> WebsiteQuerySet:
         """Filter websites based on CLI arguments"""
         filtered_websites = websites
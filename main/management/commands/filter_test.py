@@ -0,0 +1,66 @@
+"""Tests for WebsiteFilterCommand batch iteration"""
+
+from io import StringIO
+
+import pytest
+
+from main.management.commands.filter import WebsiteFilterCommand, keyset_batches
+from websites.factories import WebsiteContentFactory, WebsiteFactory
+from websites.models import WebsiteContent
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 5, 10])
+def test_keyset_batches(batch_size):
+    """keyset_batches should yield every row once, in pk order and in batches"""
+    website = WebsiteFactory.create()
+    contents = WebsiteContentFactory.create_batch(5, website=website)
+    queryset = WebsiteContent.objects.filter(website=website).order_by("-title")
+
+    batches = list(keyset_batches(queryset, batch_size=batch_size))
+
+    assert all(len(batch) <= batch_size for batch in batches)
+    assert [content.pk for batch in batches for content in batch] == sorted(
+        content.pk for content in contents
+    )
+
+
+def test_keyset_batches_only_fields(django_assert_num_queries):
+    """keyset_batches should defer columns that are not requested"""
+    website = WebsiteFactory.create()
+    WebsiteContentFactory.create_batch(3, website=website)
+    queryset = WebsiteContent.objects.filter(website=website)
+
+    with django_assert_num_queries(2):
+        batches = list(keyset_batches(queryset, batch_size=2, fields=["text_id"]))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert batches[0][0].get_deferred_fields() >= {"markdown", "metadata"}
+
+
+def test_keyset_batches_empty():
+    """keyset_batches should yield nothing for an empty queryset"""
+    assert list(keyset_batches(WebsiteContent.objects.none())) == []
+
+
+@pytest.mark.parametrize("verbosity", [0, 1])
+def test_iterate_batches_reports_progress(verbosity):
+    """iterate_batches should report progress after each batch"""
+    website = WebsiteFactory.create()
+    WebsiteContentFactory.create_batch(3, website=website)
+    command = WebsiteFilterCommand(stdout=StringIO())
+    command.verbosity = verbosity
+
+    batches = list(
+        command.iterate_batches(
+            WebsiteContent.objects.filter(website=website), batch_size=2, total=3
+        )
+    )
+
+    assert [len(batch) for batch in batches] == [2, 1]
+    output = command.stdout.getvalue()
+    if verbosity:
+        assert "Processed 2/3 rows" in output
+        assert "Processed 3/3 rows" in output
+    else:
+        assert output == ""
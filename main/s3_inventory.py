@@ -0,0 +1,222 @@
+"""A local SQLite snapshot of S3 listings shared by management commands"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from botocore.config import Config
+from django.conf import settings
+
+from main.s3_utils import get_boto3_client
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS s3_prefix (
+    bucket TEXT NOT NULL,
+    prefix TEXT NOT NULL,
+    listed_at REAL NOT NULL,
+    PRIMARY KEY (bucket, prefix)
+);
+CREATE TABLE IF NOT EXISTS s3_object (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    PRIMARY KEY (bucket, key)
+);
+"""
+
+
+@dataclass(frozen=True)
+class InventoryObject:
+    """A single S3 object as recorded in the inventory"""
+
+    key: str
+    size: int | None
+    etag: str | None
+    last_modified: str | None
+
+
+def list_prefix(s3_client, bucket: str, prefix: str) -> list[InventoryObject]:
+    """Return every object under `prefix`, paginating through list_objects_v2"""
+    paginator = s3_client.get_paginator("list_objects_v2")
+    return [
+        InventoryObject(
+            key=obj["Key"],
+            size=obj.get("Size"),
+            etag=obj.get("ETag", "").strip('"') or None,
+            last_modified=(
+                obj["LastModified"].isoformat() if obj.get("LastModified") else None
+            ),
+        )
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    ]
+
+
+class S3Inventory:
+    """
+    Lists S3 prefixes once, concurrently, into a local SQLite snapshot so that
+    existence checks and orphan detection become local lookups and set
+    operations instead of repeated LIST/HEAD requests.
+
+    A prefix listed by this instance is always considered fresh. A prefix
+    listed by an earlier run is reused only if it is younger than `ttl`
+    seconds, so with the default ttl of 0 every run re-lists what it needs.
+    """
+
+    def __init__(
+        self,
+        bucket: str | None = None,
+        path: str | None = None,
+        ttl: int | None = None,
+        s3_client=None,
+    ):
+        self.bucket = bucket or settings.AWS_STORAGE_BUCKET_NAME
+        self.ttl = settings.S3_INVENTORY_TTL_SECONDS if ttl is None else ttl
+        self.max_workers = max(settings.AWS_MAX_CONCURRENT_CONNECTIONS, 1)
+        self.s3_client = s3_client or get_boto3_client(
+            "s3",
+            extra_options={"config": Config(max_pool_connections=self.max_workers)},
+        )
+        self.connection = sqlite3.connect(path or settings.S3_INVENTORY_PATH)
+        self.connection.executescript(SCHEMA)
+        self.listed_prefixes = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.connection.close()
+
+    def is_fresh(self, prefix: str) -> bool:
+        """Return True if `prefix` has a listing that can be reused"""
+        if prefix in self.listed_prefixes:
+            return True
+        if self.ttl <= 0:
+            return False
+        row = self.connection.execute(
+            "SELECT listed_at FROM s3_prefix WHERE bucket = ? AND prefix = ?",
+            (self.bucket, prefix),
+        ).fetchone()
+        return row is not None and row[0] >= time.time() - self.ttl
+
+    def refresh(self, prefixes: Iterable[str], *, force: bool = False) -> int:
+        """
+        List every prefix that does not already have a fresh listing and store
+        the results. Returns the number of prefixes that were listed.
+        """
+        stale = sorted(
+            {prefix for prefix in prefixes if force or not self.is_fresh(prefix)}
+        )
+        if not stale:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(list_prefix, self.s3_client, self.bucket, prefix): (
+                    prefix
+                )
+                for prefix in stale
+            }
+            # SQLite connections are not shared across threads, so results
+            # are written here as each listing completes.
+            for future in as_completed(futures):
+                self._store(futures[future], future.result())
+        return len(stale)
+
+    def _store(self, prefix: str, objects: list[InventoryObject]):
+        """Replace the stored listing of `prefix`"""
+        with self.connection:
+            self.connection.execute(
+                # A range over the (bucket, key) index: no key under the prefix
+                # sorts after the prefix followed by the highest code point
+                "DELETE FROM s3_object WHERE bucket = ? "
+                "AND key >= ? AND key < ? || char(1114111)",
+                (self.bucket, prefix, prefix),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO s3_object "
+                "(bucket, key, size, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (self.bucket, obj.key, obj.size, obj.etag, obj.last_modified)
+                    for obj in objects
+                ],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO s3_prefix (bucket, prefix, listed_at) "
+                "VALUES (?, ?, ?)",
+                (self.bucket, prefix, time.time()),
+            )
+        self.listed_prefixes.add(prefix)
+
+    def covers(self, key: str) -> bool:
+        """Return True if `key` falls under a prefix with a fresh listing"""
+        if any(key.startswith(prefix) for prefix in self.listed_prefixes):
+            return True
+        if self.ttl <= 0:
+            return False
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM s3_prefix WHERE bucket = ? "
+                "AND substr(?, 1, length(prefix)) = prefix AND listed_at >= ?",
+                (self.bucket, key, time.time() - self.ttl),
+            ).fetchone()
+            is not None
+        )
+
+    def lookup(self, key: str) -> InventoryObject | None:
+        """
+        Return the object for `key`, listing its directory first if needed.
+        Keys that share a directory cost one LIST between them instead of a
+        HEAD request each.
+        """
+        if not self.covers(key):
+            directory, _, _ = key.rpartition("/")
+            self.refresh([f"{directory}/" if directory else key])
+        return self.get(key)
+
+    def keys(self, prefix: str) -> set[str]:
+        """Return the stored keys under `prefix`"""
+        return {
+            row[0]
+            for row in self.connection.execute(
+                "SELECT key FROM s3_object WHERE bucket = ? "
+                "AND key >= ? AND key < ? || char(1114111)",
+                (self.bucket, prefix, prefix),
+            )
+        }
+
+    def get(self, key: str) -> InventoryObject | None:
+        """Return the stored object for `key`, or None if it was not listed"""
+        row = self.connection.execute(
+            "SELECT key, size, etag, last_modified FROM s3_object "
+            "WHERE bucket = ? AND key = ?",
+            (self.bucket, key),
+        ).fetchone()
+        return InventoryObject(*row) if row else None
+
+    def add(self, obj: InventoryObject):
+        """Record an object written by the caller so the snapshot stays current"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO s3_object "
+                "(bucket, key, size, etag, last_modified) VALUES (?, ?, ?, ?, ?)",
+                (self.bucket, obj.key, obj.size, obj.etag, obj.last_modified),
+            )
+
+    def discard(self, keys: Iterable[str]):
+        """Forget objects deleted by the caller so the snapshot stays current"""
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM s3_object WHERE bucket = ? AND key = ?",
+                [(self.bucket, key) for key in keys],
+            )
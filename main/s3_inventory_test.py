@@ -0,0 +1,113 @@
+"""Tests for s3_inventory"""
+
+import pytest
+from moto import mock_aws
+
+from main.s3_inventory import InventoryObject, S3Inventory
+from main.s3_utils import get_boto3_client
+from videos.conftest import MOCK_BUCKET_NAME, setup_s3
+
+
+@pytest.fixture
+def s3_client(settings):
+    """Provide a moto-backed S3 bucket with a couple of sites' objects"""
+    with mock_aws():
+        setup_s3(
+            settings,
+            test_files={
+                "courses/site-a/a1.pdf": b"a1",
+                "courses/site-a/a2.pdf": b"a22",
+                "courses/site-a-2/b1.pdf": b"b1",
+            },
+        )
+        settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+        yield get_boto3_client("s3")
+
+
+@pytest.fixture
+def inventory_path(tmp_path):
+    """Provide a path for an on-disk inventory"""
+    return str(tmp_path / "inventory.sqlite3")
+
+
+def test_refresh_and_keys(s3_client):
+    """Refresh should list each prefix once and keys should respect the prefix"""
+    with S3Inventory(s3_client=s3_client) as inventory:
+        assert inventory.refresh(["courses/site-a/", "courses/site-a-2/"]) == 2
+        assert inventory.keys("courses/site-a/") == {
+            "courses/site-a/a1.pdf",
+            "courses/site-a/a2.pdf",
+        }
+        assert inventory.keys("courses/site-a-2/") == {"courses/site-a-2/b1.pdf"}
+        assert inventory.refresh(["courses/site-a/"]) == 0
+
+
+def test_get(s3_client):
+    """Get should return the size and etag of a listed object"""
+    with S3Inventory(s3_client=s3_client) as inventory:
+        inventory.refresh(["courses/site-a/"])
+        obj = inventory.get("courses/site-a/a2.pdf")
+        assert obj.size == 3
+        assert obj.etag == s3_client.head_object(
+            Bucket=MOCK_BUCKET_NAME, Key="courses/site-a/a2.pdf"
+        )["ETag"].strip('"')
+        assert obj.last_modified is not None
+        assert inventory.get("courses/site-a/missing.pdf") is None
+
+
+def test_lookup_lists_directory_once(mocker, s3_client):
+    """Lookup should list a key's directory once and answer the rest locally"""
+    refresh_spy = mocker.spy(S3Inventory, "refresh")
+    with S3Inventory(s3_client=s3_client) as inventory:
+        assert inventory.lookup("courses/site-a/a1.pdf").size == 2
+        assert inventory.lookup("courses/site-a/missing.pdf") is None
+        assert inventory.covers("courses/site-a/a2.pdf") is True
+        assert inventory.covers("courses/site-a-2/b1.pdf") is False
+        refresh_spy.assert_called_once_with(inventory, ["courses/site-a/"])
+
+
+@pytest.mark.parametrize(("ttl", "expected_listed"), [(0, 1), (3600, 0)])
+def test_ttl(s3_client, inventory_path, ttl, expected_listed):
+    """A listing from an earlier run should only be reused within the ttl"""
+    with S3Inventory(path=inventory_path, s3_client=s3_client) as inventory:
+        inventory.refresh(["courses/site-a/"])
+
+    with S3Inventory(path=inventory_path, ttl=ttl, s3_client=s3_client) as inventory:
+        assert inventory.is_fresh("courses/site-a/") is bool(ttl)
+        assert inventory.covers("courses/site-a/a1.pdf") is bool(ttl)
+        assert inventory.refresh(["courses/site-a/"]) == expected_listed
+        assert len(inventory.keys("courses/site-a/")) == 2
+
+
+def test_refresh_replaces_stale_rows(s3_client, inventory_path):
+    """Refreshing a prefix should drop objects that no longer exist"""
+    with S3Inventory(path=inventory_path, s3_client=s3_client) as inventory:
+        inventory.refresh(["courses/site-a/"])
+    s3_client.delete_object(Bucket=MOCK_BUCKET_NAME, Key="courses/site-a/a1.pdf")
+
+    with S3Inventory(path=inventory_path, ttl=3600, s3_client=s3_client) as inventory:
+        assert inventory.refresh(["courses/site-a/"], force=True) == 1
+        assert inventory.keys("courses/site-a/") == {"courses/site-a/a2.pdf"}
+
+
+def test_add_and_discard(s3_client):
+    """Add and discard should keep the snapshot in step with the caller's writes"""
+    with S3Inventory(s3_client=s3_client) as inventory:
+        inventory.refresh(["courses/site-a/"])
+        inventory.add(InventoryObject("courses/site-a/a3.pdf", 5, "etag", None))
+        inventory.discard(["courses/site-a/a1.pdf"])
+        assert inventory.keys("courses/site-a/") == {
+            "courses/site-a/a2.pdf",
+            "courses/site-a/a3.pdf",
+        }
+
+
+def test_keys_uses_index(s3_client):
+    """Prefix lookups should be a range over the (bucket, key) index"""
+    with S3Inventory(s3_client=s3_client) as inventory:
+        plan = inventory.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT key FROM s3_object WHERE bucket = ? "
+            "AND key >= ? AND key < ? || char(1114111)",
+            (MOCK_BUCKET_NAME, "courses/site-a/", "courses/site-a/"),
+        ).fetchall()
+    assert "USING COVERING INDEX" in plan[0][-1]
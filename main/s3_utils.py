@@ -1,8 +1,17 @@
 """S3 utility functions"""
 
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from django.conf import settings
 
+log = logging.getLogger(__name__)
+
 
 def get_boto3_options(extra_options=None):
     """
@@ -72,3 +81,139 @@ def get_s3_object_and_read(obj, iteration=0):
             return get_s3_object_and_read(obj, iteration + 1)
         else:
             raise
+
+
+def get_s3_copy_config():
+    """
+    Provides the transfer config for server-side copies. Objects larger than
+    S3_COPY_MULTIPART_THRESHOLD are copied with multipart UploadPartCopy, with
+    parts copied in parallel, which also lifts the 5 GB CopyObject limit.
+
+    Returns:
+        TransferConfig: The transfer config to pass to managed copies
+    """  # noqa: D401
+    return TransferConfig(
+        multipart_threshold=settings.S3_COPY_MULTIPART_THRESHOLD,
+        multipart_chunksize=settings.S3_COPY_MULTIPART_CHUNKSIZE,
+        max_concurrency=max(settings.AWS_MAX_CONCURRENT_CONNECTIONS, 1),
+    )
+
+
+# Object attributes that CopyObject keeps but multipart copies do not
+S3_COPY_PRESERVED_ATTRIBUTES = (
+    "CacheControl",
+    "ContentDisposition",
+    "ContentEncoding",
+    "ContentLanguage",
+    "ContentType",
+    "Metadata",
+)
+
+
+def get_s3_copy_extra_args(s3_client, bucket, key, extra_args=None):
+    """
+    Provides the ExtraArgs for a managed copy of an object. Unlike CopyObject,
+    multipart copies do not carry over the content type and metadata of the
+    source, so for objects at or above S3_COPY_MULTIPART_THRESHOLD they are read
+    from the source and passed along, unless extra_args already sets them.
+
+    Args:
+        s3_client (s3.Client): The client to read the source object with
+        bucket (str): The source bucket
+        key (str): The source key
+        extra_args (dict): (Optional) Extra arguments for the copy
+
+    Returns:
+        dict: The extra arguments to pass to the copy, or None
+    """  # noqa: D401
+    extra_args = dict(extra_args or {})
+    source = s3_client.head_object(Bucket=bucket, Key=key)
+    if source["ContentLength"] >= settings.S3_COPY_MULTIPART_THRESHOLD:
+        for attribute in S3_COPY_PRESERVED_ATTRIBUTES:
+            if source.get(attribute):
+                extra_args.setdefault(attribute, source[attribute])
+    return extra_args or None
+
+
+class _BytesCounter:
+    """Thread-safe total of the bytes reported by transfer callbacks"""
+
+    def __init__(self):
+        self.total = 0
+        self._lock = Lock()
+
+    def __call__(self, bytes_amount):
+        with self._lock:
+            self.total += bytes_amount
+
+
+def copy_s3_objects(  # noqa: PLR0913
+    keys,
+    *,
+    bucket=None,
+    dest_bucket=None,
+    extra_args=None,
+    s3_client=None,
+    max_workers=None,
+):
+    """
+    Copy S3 objects server-side, several at a time. Large objects are copied
+    with parallel multipart UploadPartCopy (see get_s3_copy_config), and many
+    small objects such as captions and transcripts are copied concurrently.
+
+    Args:
+        keys (list of tuple): (source key, destination key) pairs
+        bucket (str): (Optional) The source bucket, AWS_STORAGE_BUCKET_NAME by default
+        dest_bucket (str): (Optional) The destination bucket, the source bucket by default
+        extra_args (dict): (Optional) Extra arguments for each copy, e.g. an ACL
+        s3_client (s3.Client): (Optional) The client to copy with
+        max_workers (int): (Optional) How many objects to copy at once
+
+    Returns:
+        int: The number of bytes copied
+    """  # noqa: E501
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return 0
+    bucket = bucket or settings.AWS_STORAGE_BUCKET_NAME
+    dest_bucket = dest_bucket or bucket
+    max_workers = max_workers or max(settings.AWS_MAX_CONCURRENT_CONNECTIONS, 1)
+    config = get_s3_copy_config()
+    own_client = s3_client is None
+    s3_client = s3_client or get_boto3_client(
+        "s3",
+        extra_options={
+            "config": Config(
+                max_pool_connections=max_workers * config.max_request_concurrency
+            )
+        },
+    )
+    counter = _BytesCounter()
+
+    def _copy(source_key, dest_key):
+        s3_client.copy(
+            {"Bucket": bucket, "Key": source_key},
+            dest_bucket,
+            dest_key,
+            ExtraArgs=get_s3_copy_extra_args(s3_client, bucket, source_key, extra_args),
+            Callback=counter,
+            Config=config,
+        )
+
+    start = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            # Consume the results so that the first failed copy is raised
+            list(executor.map(lambda pair: _copy(*pair), keys))
+    finally:
+        if own_client:
+            s3_client.close()
+    elapsed = time.monotonic() - start
+    log.info(
+        "Copied %d S3 objects (%d bytes) in %.2fs, %.0f bytes/s",
+        len(keys),
+        counter.total,
+        elapsed,
+        counter.total / elapsed if elapsed else counter.total,
+    )
+    return counter.total
@@ -1,8 +1,10 @@
 """Tests for s3_utils"""
 
 import pytest
+from moto import mock_aws
 
-from main.s3_utils import get_s3_object_and_read
+from main.s3_utils import copy_s3_objects, get_boto3_client, get_s3_object_and_read
+from videos.conftest import MOCK_BUCKET_NAME, setup_s3
 
 
 @pytest.mark.parametrize("iterations", [1, 2, 5])
@@ -15,3 +17,80 @@ def test_s3_object_and_read(settings, mocker, iterations):
     with pytest.raises(Exception):  # noqa: B017, PT011
         get_s3_object_and_read(mock_s3_object)
     assert mock_s3_object.get.call_count == iterations + 1
+
+
+@mock_aws
+def test_copy_s3_objects(settings):
+    """copy_s3_objects should copy small objects whole and large ones in parts"""
+    settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+    settings.S3_COPY_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+    settings.S3_COPY_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+    large_content = b"x" * (6 * 1024 * 1024)
+    setup_s3(
+        settings,
+        test_files={
+            "courses/source/lecture1.mp4": large_content,
+            "courses/source/lecture1_captions.vtt": b"captions",
+        },
+    )
+    client = get_boto3_client("s3")
+
+    copied = copy_s3_objects(
+        [
+            ("courses/source/lecture1.mp4", "courses/dest/lecture1.mp4"),
+            (
+                "courses/source/lecture1_captions.vtt",
+                "courses/dest/lecture1_captions.vtt",
+            ),
+            (
+                "courses/source/lecture1_captions.vtt",
+                "courses/dest/lecture1_captions.vtt",
+            ),
+        ]
+    )
+
+    assert copied == len(large_content) + len(b"captions")
+    large_copy = client.head_object(
+        Bucket=MOCK_BUCKET_NAME, Key="courses/dest/lecture1.mp4", PartNumber=1
+    )
+    assert large_copy["PartsCount"] == 2
+    assert (
+        client.get_object(
+            Bucket=MOCK_BUCKET_NAME, Key="courses/dest/lecture1_captions.vtt"
+        )["Body"].read()
+        == b"captions"
+    )
+    client.close()
+
+
+@mock_aws
+def test_copy_s3_objects_multipart_attributes(settings):
+    """copy_s3_objects should keep the content type and metadata of large objects"""
+    settings.AWS_STORAGE_BUCKET_NAME = MOCK_BUCKET_NAME
+    settings.S3_COPY_MULTIPART_THRESHOLD = 5 * 1024 * 1024
+    settings.S3_COPY_MULTIPART_CHUNKSIZE = 5 * 1024 * 1024
+    setup_s3(settings)
+    client = get_boto3_client("s3")
+    client.put_object(
+        Bucket=MOCK_BUCKET_NAME,
+        Key="courses/source/lecture1.mp4",
+        Body=b"x" * (6 * 1024 * 1024),
+        ContentType="video/mp4",
+        Metadata={"filename": "lecture1.mp4"},
+    )
+
+    copy_s3_objects([("courses/source/lecture1.mp4", "courses/dest/lecture1.mp4")])
+
+    large_copy = client.head_object(
+        Bucket=MOCK_BUCKET_NAME, Key="courses/dest/lecture1.mp4"
+    )
+    assert large_copy["ContentType"] == "video/mp4"
+    assert large_copy["Metadata"] == {"filename": "lecture1.mp4"}
+    client.close()
+
+
+def test_copy_s3_objects_empty(mocker):
+    """copy_s3_objects should not create a client when there is nothing to copy"""
+    mock_boto3 = mocker.patch("main.s3_utils.boto3")
+    assert copy_s3_objects([]) == 0
+    mock_boto3.client.assert_not_called()
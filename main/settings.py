@@ -388,6 +388,26 @@ AWS_MAX_CONCURRENT_CONNECTIONS = get_int(
     default=10,
     description="The max concurrent connections used by cp and sync AWS CLI commands",
 )
+S3_COPY_MULTIPART_THRESHOLD = get_int(
+    name="S3_COPY_MULTIPART_THRESHOLD",
+    default=64 * 1024 * 1024,
+    description="Size in bytes above which S3 objects are copied with parallel multipart UploadPartCopy",  # noqa: E501
+)
+S3_COPY_MULTIPART_CHUNKSIZE = get_int(
+    name="S3_COPY_MULTIPART_CHUNKSIZE",
+    default=64 * 1024 * 1024,
+    description="Size in bytes of each part of a multipart S3 copy",
+)
+S3_INVENTORY_PATH = get_string(
+    name="S3_INVENTORY_PATH",
+    default="/tmp/ocw_studio_s3_inventory.sqlite3",  # noqa: S108
+    description="Path of the local SQLite snapshot of S3 listings used by management commands",  # noqa: E501
+)
+S3_INVENTORY_TTL_SECONDS = get_int(
+    name="S3_INVENTORY_TTL_SECONDS",
+    default=0,
+    description="How long an S3 prefix listing in the local inventory can be reused, in seconds. 0 always re-lists.",  # noqa: E501
+)
 AWS_ACCESS_KEY_ID = get_string(
     name="AWS_ACCESS_KEY_ID", default=None, description="AWS Access Key for S3 storage."
 )
@@ -491,6 +511,33 @@ DRIVE_UPLOADS_PARENT_FOLDER_ID = get_string(
     description="Gdrive folder for video uploads",
     required=False,
 )
+DRIVE_DOWNLOAD_CHUNK_SIZE = get_int(
+    name="DRIVE_DOWNLOAD_CHUNK_SIZE",
+    default=16 * 1024 * 1024,
+    description="Size in bytes of each byte range requested when downloading a Google Drive file",  # noqa: E501
+)
+DRIVE_DOWNLOAD_CONCURRENCY = get_int(
+    name="DRIVE_DOWNLOAD_CONCURRENCY",
+    default=4,
+    description="Number of byte ranges of a Google Drive file that are downloaded ahead in parallel",  # noqa: E501
+)
+DRIVE_LIST_CONCURRENCY = get_int(
+    name="DRIVE_LIST_CONCURRENCY",
+    default=4,
+    description="Number of Google Drive folder listing queries that are run in parallel",  # noqa: E501
+)
+ENABLE_DRIVE_CHANGES_SYNC = get_bool(
+    name="ENABLE_DRIVE_CHANGES_SYNC",
+    default=False,
+    description="Periodically import Google Drive files that changed since the last sync",  # noqa: E501
+    required=False,
+)
+DRIVE_CHANGES_SYNC_FREQUENCY = get_int(
+    name="DRIVE_CHANGES_SYNC_FREQUENCY",
+    default=300,
+    description="Frequency (in seconds) to import Google Drive files that changed since the last sync",  # noqa: E501
+    required=False,
+)
 OPEN_CATALOG_WEBHOOK_KEY = get_string(
     name="OPEN_CATALOG_WEBHOOK_KEY",
     default="",
@@ -538,6 +585,16 @@ YT_UPLOAD_LIMIT = get_int(
     default=50,
     description="Max Youtube uploads allowed per day",
 )
+YT_DAILY_QUOTA = get_int(
+    name="YT_DAILY_QUOTA",
+    default=10000,
+    description="The daily YouTube Data API quota, in units, shared by all workers",
+)
+YT_METADATA_CONCURRENCY = get_int(
+    name="YT_METADATA_CONCURRENCY",
+    default=4,
+    description="Max number of videos whose YouTube metadata is updated concurrently",
+)
 
 ARCHIVE_URL_REQUEST_TIMEOUT = get_int(
     name="ARCHIVE_URL_REQUEST_TIMEOUT",
@@ -750,6 +807,12 @@ if ENABLE_WAYBACK_TASKS:
         "schedule": UPDATE_WAYBACK_JOBS_STATUS_FREQUENCY,
     }
 
+if ENABLE_DRIVE_CHANGES_SYNC:
+    CELERY_BEAT_SCHEDULE["import-drive-changes"] = {
+        "task": "gdrive_sync.tasks.import_drive_changes",
+        "schedule": DRIVE_CHANGES_SYNC_FREQUENCY,
+    }
+
 if ENABLE_CHECK_EXTERNAL_RESOURCE_TASK:
     CELERY_BEAT_SCHEDULE["check-broken-external-urls"] = {
         "task": "external_resources.tasks.check_external_resources_for_breakages",
@@ -830,6 +893,18 @@ THREEPLAY_BASE_TIMEOUT = get_int(
     "incremented on timeout retries",
 )
 
+THREEPLAY_CONCURRENCY = get_int(
+    name="THREEPLAY_CONCURRENCY",
+    default=4,
+    description="Max number of videos whose 3Play transcripts are updated concurrently",
+)
+
+THREEPLAY_MAX_RETRIES = get_int(
+    name="THREEPLAY_MAX_RETRIES",
+    default=3,
+    description="Max retries, with exponential backoff, for failed 3Play requests",
+)
+
 S3_TRANSCRIPTS_PREFIX = get_string(
     name="S3_TRANSCRIPTS_PREFIX",
     default="transcript_files",
@@ -959,6 +1034,36 @@ CONCOURSE_TEAM = get_string(
     description="The concourse-ci team",
     required=False,
 )
+CONCOURSE_AUTH_TOKEN_TTL = get_int(
+    name="CONCOURSE_AUTH_TOKEN_TTL",
+    default=43200,
+    description="Number of seconds to share a concourse-ci auth token between workers before logging in again",  # noqa: E501
+    required=False,
+)
+CONCOURSE_AUTH_TIMEOUT = get_int(
+    name="CONCOURSE_AUTH_TIMEOUT",
+    default=60,
+    description="Number of seconds a worker may hold the concourse-ci login lock, and others wait for it",  # noqa: E501
+    required=False,
+)
+CONCOURSE_BUILDS_PAGE_SIZE = get_int(
+    name="CONCOURSE_BUILDS_PAGE_SIZE",
+    default=500,
+    description="The number of builds to request per page when listing concourse-ci builds",  # noqa: E501
+    required=False,
+)
+CONCOURSE_BUILDS_MAX_PAGES = get_int(
+    name="CONCOURSE_BUILDS_MAX_PAGES",
+    default=20,
+    description="The maximum number of pages of concourse-ci builds to request when checking build statuses",  # noqa: E501
+    required=False,
+)
+CONCOURSE_UPSERT_CONCURRENCY = get_int(
+    name="CONCOURSE_UPSERT_CONCURRENCY",
+    default=8,
+    description="The number of sites whose pipelines are upserted in parallel by each upsert_website_pipeline_batch task",  # noqa: E501
+    required=False,
+)
 CONCOURSE_HARD_PURGE = get_bool(
     name="CONCOURSE_HARD_PURGE",
     default=True,
@@ -1132,6 +1237,21 @@ OCW_MASS_BUILD_MAX_IN_FLIGHT = get_int(
     default=10,
     description="The amount of sites to build simultaneously in each job created by MassBuildSitesPipelineDefinition",  # noqa: E501
 )
+PIPELINE_SITE_LIST_CACHE_TIMEOUT = get_int(
+    name="PIPELINE_SITE_LIST_CACHE_TIMEOUT",
+    default=3600,
+    description=(
+        "How long in seconds to cache the site lists served to the mass build and "
+        "unpublished site removal pipelines"
+    ),
+    required=False,
+)
+PIPELINE_SITE_LIST_MAX_PAGE_SIZE = get_int(
+    name="PIPELINE_SITE_LIST_MAX_PAGE_SIZE",
+    default=1000,
+    description="The largest page of sites the pipeline site list endpoints return",
+    required=False,
+)
 
 ROOT_WEBSITE_NAME = get_string(
     name="ROOT_WEBSITE_NAME",
@@ -1278,6 +1398,13 @@ OCW_HUGO_THEMES_BRANCH = get_string(
     required=False,
     dev_only=True,
 )
+# Maps starter slugs to comma-separated top level paths in ocw-hugo-themes that
+# only sites with that starter use, so that incremental mass builds do not
+# rebuild other sites when those paths change
+OCW_HUGO_THEMES_STARTER_PATHS = get_dict_of_str(
+    name="OCW_HUGO_THEMES_STARTER_PATHS",
+    default={},
+)
 OCW_DEFAULT_COURSE_THEME = get_string(
     name="OCW_DEFAULT_COURSE_THEME",
     default="ocw-course-v2",
@@ -18,6 +18,7 @@ function run_test {
 }
 
 run_test pytest
+run_test ./manage.py benchmark_markdown_cleanup
 run_test ./scripts/test/detect_missing_migrations.sh
 run_test ./scripts/test/no_auto_migrations.sh
 
@@ -1,8 +1,11 @@
 """Common test vars for videos"""
 
 import pytest
+from django_redis import get_redis_connection
 
 from main.s3_utils import get_boto3_resource
+from videos.constants import YT_METADATA_KEY_PREFIX
+from videos.youtube import clear_youtube_quota
 
 MOCK_BUCKET_NAME = "testbucket"
 TEST_VIDEOS_WEBHOOK_PATH = "./test_videos_webhook"
@@ -67,3 +70,26 @@ def youtube_settings(settings, mocker):
 def mock_smart_open_reader(mocker):
     """Mock the smartopen s3 Reader"""
     mocker.patch("videos.youtube.Reader")
+
+
+@pytest.fixture
+def youtube_quota():
+    """Start and end with none of today's YouTube API quota used"""
+    clear_youtube_quota()
+    yield
+    clear_youtube_quota()
+
+
+@pytest.fixture
+def youtube_metadata_digests():
+    """Start and end without any record of metadata pushed to YouTube videos"""
+    redis = get_redis_connection("redis")
+
+    def clear_digests():
+        keys = list(redis.scan_iter(f"{YT_METADATA_KEY_PREFIX}*"))
+        if keys:
+            redis.delete(*keys)
+
+    clear_digests()
+    yield
+    clear_digests()
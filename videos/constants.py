@@ -14,11 +14,29 @@ YT_MAX_LENGTH_DESCRIPTION = 5000
 PDF_FORMAT_ID = 46
 WEBVTT_FORMAT_ID = 51
 
+# 3Play transcript downloads are streamed to a temporary file in chunks, and
+# only kept in memory if they are small
+THREEPLAY_DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64 KiB
+THREEPLAY_DOWNLOAD_MAX_MEMORY = 5 * 1024 * 1024  # 5 MiB
+THREEPLAY_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 # YouTube Data API v3 quota costs and batch size
 QUOTA_COST_VIDEO_LIST = 1  # videos.list costs 1 unit per call (up to 50 IDs)
 QUOTA_COST_VIDEO_UPDATE = 50  # videos.update costs 50 units
+QUOTA_COST_VIDEO_INSERT = 1600  # videos.insert costs 1600 units
+QUOTA_COST_CAPTION_LIST = 50  # captions.list costs 50 units
+QUOTA_COST_CAPTION_UPDATE = 450  # captions.update costs 450 units, insert costs 400
 YT_LIST_BATCH_SIZE = 50  # Maximum video IDs per videos.list call
 
+# Quota usage is tracked per Pacific time day, which is when YouTube resets it
+YT_QUOTA_TIMEZONE = "America/Los_Angeles"
+YT_QUOTA_KEY_TTL = 2 * 24 * 60 * 60  # 2 days
+
+# Hashes of the metadata last pushed to each YouTube video expire so that any
+# changes made directly on YouTube are eventually overwritten again
+YT_METADATA_KEY_PREFIX = "youtube-metadata-"
+YT_METADATA_KEY_TTL = 30 * 24 * 60 * 60  # 30 days
+
 ARCHIVE_URL_FILESIZE_TASK_RATE_LIMIT = "0.1/s"
 S3_FILESIZE_TASK_RATE_LIMIT = "5/s"
 
@@ -27,6 +45,9 @@ S3_FILESIZE_TASK_RATE_LIMIT = "5/s"
 # Long enough for a full batch to complete; short enough to self-heal after a crash.
 YTAGS_BATCH_LOCK_TTL = 30 * 60  # 30 minutes
 
+# Lock TTL for a single upload_youtube_video task, long enough for large uploads
+YT_UPLOAD_LOCK_TTL = 6 * 60 * 60  # 6 hours
+
 
 class VideoStatus:
     """Simple class for possible Video statuses"""
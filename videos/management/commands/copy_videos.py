@@ -5,7 +5,7 @@ Management command for copying videos from one course to another.
 from django.core.management import BaseCommand
 from django.db.models import Q
 
-from videos.tasks import copy_video_resource
+from videos.tasks import copy_video_resources
 from websites.models import Website, WebsiteContent
 
 
@@ -87,10 +87,11 @@ class Command(BaseCommand):
         if not source_course_videos:
             return
 
-        for video in source_course_videos:
-            video_copy_task = copy_video_resource.delay(
-                source_course.uuid, destination_course.uuid, video.text_id
-            )
-            self.stdout.write(
-                f"Started celery task {video_copy_task.id} for video {video.text_id}."
-            )
+        video_ids = [str(video.text_id) for video in source_course_videos]
+        video_copy_task = copy_video_resources.delay(
+            source_course.uuid, destination_course.uuid, video_ids
+        )
+        self.stdout.write(
+            f"Started celery task {video_copy_task.id} "
+            f"for videos {', '.join(video_ids)}."
+        )
@@ -1,9 +1,11 @@
 """Management command to sync captions and transcripts for any videos missing them from 3play API"""  # noqa: E501
 
+from itertools import groupby
+
 from django.db.models import Q
 
 from main.management.commands.filter import WebsiteFilterCommand
-from videos.threeplay_sync import sync_video_captions_and_transcripts
+from videos.threeplay_sync import sync_website_captions_and_transcripts
 from websites.models import WebsiteContent
 
 
@@ -46,10 +48,15 @@ class Command(WebsiteFilterCommand):
             self.stdout.write("No courses found")
             return
 
-        for video in content_videos:
-            youtube_id = video.metadata["video_metadata"]["youtube_id"]
-            sync_video_captions_and_transcripts(
-                video,
+        content_videos = content_videos.select_related("website").order_by(
+            "website_id", "id"
+        )
+        for website, website_videos in groupby(
+            content_videos, key=lambda video: video.website
+        ):
+            sync_website_captions_and_transcripts(
+                website,
+                website_videos,
                 self.summary,
                 self.missing_results,
                 write_output=write_stdout,
@@ -1,5 +1,7 @@
 """Video models"""
 
+from typing import TYPE_CHECKING
+
 from django.db import models
 from django.db.models import CASCADE
 from mitol.common.models import TimestampedModel, TimestampedModelQuerySet
@@ -18,6 +20,9 @@ from websites.models import Website, WebsiteContent
 from websites.site_config_api import SiteConfig
 from websites.utils import get_dict_query_field
 
+if TYPE_CHECKING:
+    from videos.utils import CaptionTranscriptIndex
+
 
 class VideoQuerySet(TimestampedModelQuerySet):
     """Queryset for Video"""
@@ -49,7 +54,7 @@ class Video(TimestampedModel):
             return None
 
     def caption_transcript_resources(
-        self,
+        self, index: CaptionTranscriptIndex | None = None
     ) -> tuple[list[WebsiteContent], list[WebsiteContent]]:
         """Search for and return the video's caption resources and transcript resources.
 
@@ -63,8 +68,16 @@ class Video(TimestampedModel):
         rather than the filename's tail because ``find_available_name`` can
         append a bare digit to a colliding filename (e.g. ``..._vtt`` ->
         ``..._vtt2``), which would defeat an exact suffix match.
+
+        Pass an ``index`` of the video's website to match in memory instead of
+        querying, when looking up many videos of the same website.
         """
         youtube_id = self.youtube_id()
+        if index is not None:
+            return (
+                index.resources(youtube_id, "captions"),
+                index.resources(youtube_id, "transcript"),
+            )
 
         query_youtube_id_field = get_dict_query_field("metadata", settings.YT_FIELD_ID)
         video_resource = (
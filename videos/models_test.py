@@ -4,6 +4,7 @@ import pytest
 
 from videos.constants import DESTINATION_YOUTUBE
 from videos.factories import VideoFactory, VideoFileFactory
+from videos.utils import CaptionTranscriptIndex
 from websites.factories import WebsiteContentFactory, WebsiteFactory
 from websites.site_config_api import SiteConfig
 
@@ -115,6 +116,9 @@ def test_video_caption_transcript_resources_multi_language(
 
     assert len(captions) == 2
     assert len(transcripts) == 1
+    assert video.caption_transcript_resources(
+        CaptionTranscriptIndex(video.website)
+    ) == (captions, transcripts)
 
 
 @pytest.mark.django_db
@@ -1,12 +1,13 @@
 """Video tasks"""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 import celery
 import requests
 from django.conf import settings
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import Q
 from googleapiclient.errors import HttpError
 from mitol.common.utils import now_in_utc
@@ -37,8 +38,10 @@ from videos import threeplay_api
 from videos.constants import (
     ARCHIVE_URL_FILESIZE_TASK_RATE_LIMIT,
     DESTINATION_YOUTUBE,
+    QUOTA_COST_VIDEO_INSERT,
     S3_FILESIZE_TASK_RATE_LIMIT,
     YT_THUMBNAIL_IMG,
+    YT_UPLOAD_LOCK_TTL,
     YTAGS_BATCH_LOCK_TTL,
     VideoFileStatus,
     VideoStatus,
@@ -52,6 +55,7 @@ from videos.exceptions import (
 from videos.models import Video, VideoFile
 from videos.threeplay_sync import link_threeplay_files_as_resources
 from videos.utils import (
+    copy_objs_s3,
     create_new_content,
     fetch_youtube_snippets,
     parse_caption_language_locale,
@@ -60,9 +64,12 @@ from videos.utils import (
 from videos.youtube import (
     API_QUOTA_ERROR_MSG,
     YouTubeApi,
+    exhaust_youtube_quota,
+    get_youtube_quota_remaining,
     is_youtube_enabled,
     mail_youtube_upload_failure,
     mail_youtube_upload_success,
+    reserve_youtube_quota,
 )
 from websites.api import (
     is_ocw_site,
@@ -77,63 +84,105 @@ from websites.utils import get_dict_field, get_dict_query_field, set_dict_field
 log = logging.getLogger()
 
 
-@app.task
+@app.task(bind=True)
 @single_task(timeout=settings.YT_UPLOAD_FREQUENCY, raise_block=False)
-def upload_youtube_videos():  # noqa: C901
+def upload_youtube_videos(self):
+    """
+    Upload public videos to YouTube in parallel (if not already there), as many
+    as the per-run maximum and the remaining daily API quota allow.
     """
-    Upload public videos one at a time to YouTube (if not already there) until the daily maximum is reached.
-    """  # noqa: E501
     if not is_youtube_enabled():
+        return None
+    upload_limit = min(
+        settings.YT_UPLOAD_LIMIT,
+        get_youtube_quota_remaining() // QUOTA_COST_VIDEO_INSERT,
+    )
+    if upload_limit <= 0:
+        log.info("Not enough YouTube API quota left today to upload videos")
+        return None
+    video_file_ids = list(
+        VideoFile.objects.filter(
+            Q(destination=DESTINATION_YOUTUBE)
+            & Q(destination_id__isnull=True)
+            & Q(status=STATUS_CREATED)
+        )
+        .order_by("-created_on")
+        .values_list("id", flat=True)[:upload_limit]
+    )
+    if not video_file_ids:
+        return None
+    return self.replace(
+        celery.group(
+            [upload_youtube_video.si(video_file_id) for video_file_id in video_file_ids]
+        )
+    )
+
+
+@app.task(acks_late=True)
+@single_task(timeout=YT_UPLOAD_LOCK_TTL, raise_block=False)
+def upload_youtube_video(video_file_id: int):
+    """
+    Upload a video file to YouTube if it has not been uploaded yet and there is
+    enough API quota left today.
+    """
+    video_file = (
+        VideoFile.objects.filter(
+            pk=video_file_id,
+            destination_id__isnull=True,
+            status=STATUS_CREATED,
+        )
+        .select_related("video__website")
+        .first()
+    )
+    if video_file is None:
         return
-    yt_queue = VideoFile.objects.filter(
-        Q(destination=DESTINATION_YOUTUBE)
-        & Q(destination_id__isnull=True)
-        & Q(status=STATUS_CREATED)
-    ).order_by("-created_on")[: settings.YT_UPLOAD_LIMIT]
-    if yt_queue.count() == 0:
+    if not reserve_youtube_quota(QUOTA_COST_VIDEO_INSERT):
+        log.info("YouTube API quota exceeded, not uploading %s", video_file.s3_key)
         return
-    youtube = YouTubeApi()
-
-    for video_file in yt_queue:
-        error_msg = None
-        try:
-            # Get existing tags from WebsiteContent before upload
-            existing_tags = ""
-            drive_file = DriveFile.objects.filter(video=video_file.video).first()
-            if drive_file and drive_file.resource:
-                existing_tags = get_dict_field(
-                    drive_file.resource.metadata, settings.YT_FIELD_TAGS
-                )
 
-            response, merged_tags = youtube.upload_video(
-                video_file, existing_tags=existing_tags
+    error_msg = None
+    drive_file = (
+        DriveFile.objects.filter(video=video_file.video)
+        .select_related("resource")
+        .first()
+    )
+    try:
+        # Get existing tags from WebsiteContent before upload
+        existing_tags = ""
+        if drive_file and drive_file.resource:
+            existing_tags = get_dict_field(
+                drive_file.resource.metadata, settings.YT_FIELD_TAGS
             )
-            video_file.destination_id = response["id"]
-            video_file.destination_status = response["status"]["uploadStatus"]
-            video_file.status = VideoFileStatus.UPLOADED
-
-        except HttpError as error:
-            error_msg = error.content.decode("utf-8")
-            if API_QUOTA_ERROR_MSG in error_msg:
-                break
-            log.exception("HttpError uploading video to Youtube: %s", video_file.s3_key)
-            video_file.status = VideoFileStatus.FAILED
-        except:  # pylint: disable=bare-except  # noqa: E722
-            log.exception("Error uploading video to Youtube: %s", video_file.s3_key)
-            video_file.status = VideoFileStatus.FAILED
-        else:
-            # Save the merged tags back to the video metadata (only on success)
-            if merged_tags and drive_file and drive_file.resource:
-                video_resource = drive_file.resource
-                set_dict_field(
-                    video_resource.metadata, settings.YT_FIELD_TAGS, merged_tags
-                )
-                video_resource.save(update_fields=["metadata", "updated_on"])
 
-        # Always save video_file status
-        video_file.save()
-        if error_msg:
-            mail_youtube_upload_failure(video_file)
+        response, merged_tags = YouTubeApi().upload_video(
+            video_file, existing_tags=existing_tags
+        )
+        video_file.destination_id = response["id"]
+        video_file.destination_status = response["status"]["uploadStatus"]
+        video_file.status = VideoFileStatus.UPLOADED
+
+    except HttpError as error:
+        error_msg = error.content.decode("utf-8")
+        if API_QUOTA_ERROR_MSG in error_msg:
+            # Let the other uploads know, this one will be retried on a later run
+            exhaust_youtube_quota()
+            return
+        log.exception("HttpError uploading video to Youtube: %s", video_file.s3_key)
+        video_file.status = VideoFileStatus.FAILED
+    except:  # pylint: disable=bare-except  # noqa: E722
+        log.exception("Error uploading video to Youtube: %s", video_file.s3_key)
+        video_file.status = VideoFileStatus.FAILED
+    else:
+        # Save the merged tags back to the video metadata (only on success)
+        if merged_tags and drive_file and drive_file.resource:
+            video_resource = drive_file.resource
+            set_dict_field(video_resource.metadata, settings.YT_FIELD_TAGS, merged_tags)
+            video_resource.save(update_fields=["metadata", "updated_on"])
+
+    # Always save video_file status
+    video_file.save()
+    if error_msg:
+        mail_youtube_upload_failure(video_file)
 
 
 @app.task(
@@ -239,71 +288,114 @@ def start_transcript_job(self, video_id: int, timeout_override: int | None = Non
             raise
 
 
+def _get_youtube_statuses(
+    youtube: YouTubeApi, video_files: list[VideoFile]
+) -> dict[str, str] | None:
+    """
+    Get the YouTube upload statuses of video files that are not processed yet,
+    or None if they could not be fetched, in which case the next run retries.
+    """
+    try:
+        return youtube.video_statuses(
+            [
+                video_file.destination_id
+                for video_file in video_files
+                if video_file.destination_status != YouTubeStatus.PROCESSED
+            ]
+        )
+    except HttpError as error:
+        error_msg = error.content.decode("utf-8")
+        if API_QUOTA_ERROR_MSG in error_msg:
+            # Don't raise the error, task will try on next run until daily quota is reset  # noqa: E501
+            exhaust_youtube_quota()
+            return None
+        log.exception("Error getting the statuses of YouTube videos: %s", error_msg)
+        return None
+
+
 @app.task(bind=True)
 @single_task(timeout=settings.YT_STATUS_UPDATE_FREQUENCY, raise_block=False)
-def update_youtube_statuses(self):
+def update_youtube_statuses(self):  # noqa: C901
     """
     Update the status of recently uploaded YouTube videos if complete
     """
     if not is_youtube_enabled():
         return None
-    videos_processing = VideoFile.objects.filter(
-        Q(status=VideoFileStatus.UPLOADED) & Q(destination=DESTINATION_YOUTUBE)
+    videos_processing = list(
+        VideoFile.objects.filter(
+            Q(status=VideoFileStatus.UPLOADED) & Q(destination=DESTINATION_YOUTUBE)
+        ).select_related("video__website")
     )
-    if videos_processing.count() == 0:
+    if not videos_processing:
         return None
-    youtube = YouTubeApi()
+    statuses = _get_youtube_statuses(YouTubeApi(), videos_processing)
+    if statuses is None:
+        return None
+
+    drive_files = {}
+    for drive_file in (
+        DriveFile.objects.filter(
+            video_id__in={video_file.video_id for video_file in videos_processing}
+        )
+        .select_related("resource")
+        .order_by("pk")
+    ):
+        drive_files.setdefault(drive_file.video_id, drive_file)
+
     group_tasks = []
     for video_file in videos_processing:
-        try:
-            with transaction.atomic():
-                if video_file.destination_status != YouTubeStatus.PROCESSED:
-                    video_file.destination_status = youtube.video_status(
-                        video_file.destination_id
-                    )
-                    video_file.save()
-                drive_file = DriveFile.objects.filter(video=video_file.video).first()
-                if (
-                    video_file.destination_status == YouTubeStatus.PROCESSED
-                    and drive_file
-                    and drive_file.resource
-                ):
-                    resource = drive_file.resource
-                    set_dict_field(
-                        resource.metadata,
-                        settings.YT_FIELD_ID,
-                        video_file.destination_id,
-                    )
-                    set_dict_field(
-                        resource.metadata,
-                        settings.YT_FIELD_THUMBNAIL,
-                        YT_THUMBNAIL_IMG.format(video_id=video_file.destination_id),
-                    )
-                    resource.save()
-                    video_file.status = VideoFileStatus.COMPLETE
-                    video_file.save()
-                    group_tasks.append(start_transcript_job.s(video_file.video.id))
-                    mail_youtube_upload_success(video_file)
-
-        except IndexError:
+        if (
+            video_file.destination_status != YouTubeStatus.PROCESSED
+            and video_file.destination_id not in statuses
+        ):
             # Video might be a dupe or deleted, mark it as failed and continue to next one.  # noqa: E501
             video_file.status = VideoFileStatus.FAILED
             video_file.save()
-            log.exception(
+            log.error(
                 "Status of YouTube video not found: youtube_id %s",
                 video_file.destination_id,
             )
             mail_youtube_upload_failure(video_file)
-        except HttpError as error:
-            if API_QUOTA_ERROR_MSG in error.content.decode("utf-8"):
-                # Don't raise the error, task will try on next run until daily quota is reset  # noqa: E501
-                break
-            log.exception(
-                "Error for youtube_id %s: %s",
-                video_file.destination_id,
-                error.content.decode("utf-8"),
-            )
-            mail_youtube_upload_failure(video_file)
+            continue
+        with transaction.atomic():
+            if video_file.destination_status != YouTubeStatus.PROCESSED:
+                video_file.destination_status = statuses[video_file.destination_id]
+                video_file.save()
+            if video_file.destination_status in (
+                YouTubeStatus.FAILED,
+                YouTubeStatus.REJECTED,
+            ):
+                video_file.status = VideoFileStatus.FAILED
+                video_file.save()
+                log.error(
+                    "YouTube upload %s: youtube_id %s",
+                    video_file.destination_status,
+                    video_file.destination_id,
+                )
+                mail_youtube_upload_failure(video_file)
+                continue
+            drive_file = drive_files.get(video_file.video_id)
+            if (
+                video_file.destination_status == YouTubeStatus.PROCESSED
+                and drive_file
+                and drive_file.resource
+            ):
+                resource = drive_file.resource
+                set_dict_field(
+                    resource.metadata,
+                    settings.YT_FIELD_ID,
+                    video_file.destination_id,
+                )
+                set_dict_field(
+                    resource.metadata,
+                    settings.YT_FIELD_THUMBNAIL,
+                    YT_THUMBNAIL_IMG.format(video_id=video_file.destination_id),
+                )
+                resource.save()
+                video_file.status = VideoFileStatus.COMPLETE
+                video_file.save()
+                group_tasks.append(start_transcript_job.s(video_file.video.id))
+                mail_youtube_upload_success(video_file)
 
     if group_tasks:
         return self.replace(celery.group(group_tasks))
@@ -477,10 +569,29 @@ def update_transcripts_for_website(
     website: Website,
     **kwargs,  # noqa: ARG001
 ):  # pylint:disable=unused-argument
-    """Update transcripts from 3play for every video for a website"""
+    """
+    Update transcripts from 3play for every video for a website, for up to
+    THREEPLAY_CONCURRENCY videos at a time
+    """
+    video_ids = list(website.videos.values_list("id", flat=True))
+    if not video_ids:
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(settings.THREEPLAY_CONCURRENCY, len(video_ids))
+    ) as executor:
+        # Consume the results so that any error is raised here
+        list(executor.map(_update_transcripts_for_video_in_thread, video_ids))
 
-    for video in website.videos.all():
-        update_transcripts_for_video(video.id)
+
+def _update_transcripts_for_video_in_thread(video_id: int):
+    """
+    Update transcripts for a video from a worker thread, closing the thread's
+    database connection when done
+    """
+    try:
+        update_transcripts_for_video(video_id)
+    finally:
+        connection.close()
 
 
 def mail_transcripts_complete_notification(website: Website):
@@ -574,25 +685,9 @@ def create_drivefile(gdrive_file_id, new_resource, destination_course, files_or_
     )
 
 
-@app.task(acks_late=True)
-def copy_video_resource(source_course_id, destination_course_id, source_resource_id):
-    """
-    Copy a video resource and associated captions/transcripts (celery task).
-
-    Captions and transcripts are discovered via the ``video_captions_resources`` and
-    ``video_transcript_resources`` relation fields introduced in migration 0075.  For
-    each linked resource the content record is copied to the destination course and the
-    relation field on the new video resource is updated to point at the copy.  The
-    legacy ``_file`` fields in stored metadata are left untouched.  Associated Google
-    Drive files are also copied when present.
-    """
-    source_course = Website.objects.get(uuid=source_course_id)
-    destination_course = Website.objects.get(uuid=destination_course_id)
-    source_resource = WebsiteContent.objects.get(
-        website=source_course, text_id=source_resource_id
-    )
-    new_resource = create_new_content(source_resource, destination_course)
-
+def _get_linked_content_ids(source_resource: WebsiteContent) -> dict[str, list]:
+    """Return the caption/transcript text ids linked to a video resource"""
+    linked_ids = {}
     for resource_field in (
         settings.YT_FIELD_CAPTIONS_RESOURCES,
         settings.YT_FIELD_TRANSCRIPT_RESOURCES,
@@ -601,15 +696,38 @@ def copy_video_resource(source_course_id, destination_course_id, source_resource
         content_ids = relation.get("content") or []
         if isinstance(content_ids, str):
             content_ids = [content_ids] if content_ids else []
+        linked_ids[resource_field] = content_ids
+    return linked_ids
 
+
+def _copy_video_resource(
+    source_resource: WebsiteContent,
+    linked_contents: dict[str, WebsiteContent],
+    new_s3_paths: dict[int, str],
+    source_course: Website,
+    destination_course: Website,
+):
+    """
+    Copy a video resource and its captions/transcripts to destination_course,
+    given the new S3 paths of their already-copied files.
+    """
+    new_resource = create_new_content(
+        source_resource,
+        destination_course,
+        new_s3_path=new_s3_paths.get(source_resource.id),
+    )
+
+    for resource_field, content_ids in _get_linked_content_ids(source_resource).items():
         new_ids = []
         for text_id in content_ids:
-            source_content = WebsiteContent.objects.filter(
-                website=source_course, text_id=text_id
-            ).first()
+            source_content = linked_contents.get(str(text_id))
             if not source_content:
                 continue
-            new_content = create_new_content(source_content, destination_course)
+            new_content = create_new_content(
+                source_content,
+                destination_course,
+                new_s3_path=new_s3_paths.get(source_content.id),
+            )
             new_ids.append(str(new_content.text_id))
 
             # Copy the associated DriveFile if one exists.
@@ -660,6 +778,63 @@ def copy_video_resource(source_course_id, destination_course_id, source_resource
             )
 
 
+@app.task(acks_late=True)
+def copy_video_resources(
+    source_course_id, destination_course_id, source_resource_ids: list[str]
+):
+    """
+    Copy video resources and associated captions/transcripts (celery task).
+
+    Captions and transcripts are discovered via the ``video_captions_resources`` and
+    ``video_transcript_resources`` relation fields introduced in migration 0075.  For
+    each linked resource the content record is copied to the destination course and the
+    relation field on the new video resource is updated to point at the copy.  The
+    legacy ``_file`` fields in stored metadata are left untouched.  Associated Google
+    Drive files are also copied when present.
+
+    The S3 files of every video, caption and transcript are copied server-side
+    up front and concurrently, so a whole lecture series is copied in one task.
+    """
+    source_course = Website.objects.get(uuid=source_course_id)
+    destination_course = Website.objects.get(uuid=destination_course_id)
+    source_resources = list(
+        WebsiteContent.objects.filter(
+            website=source_course, text_id__in=source_resource_ids
+        )
+    )
+    linked_ids = {
+        str(text_id)
+        for source_resource in source_resources
+        for content_ids in _get_linked_content_ids(source_resource).values()
+        for text_id in content_ids
+    }
+    linked_contents = {
+        str(content.text_id): content
+        for content in WebsiteContent.objects.filter(
+            website=source_course, text_id__in=linked_ids
+        )
+    }
+    new_s3_paths = copy_objs_s3(
+        [*source_resources, *linked_contents.values()], destination_course
+    )
+    for source_resource in source_resources:
+        _copy_video_resource(
+            source_resource,
+            linked_contents,
+            new_s3_paths,
+            source_course,
+            destination_course,
+        )
+
+
+@app.task(acks_late=True)
+def copy_video_resource(source_course_id, destination_course_id, source_resource_id):
+    """
+    Copy a video resource and associated captions/transcripts (celery task).
+    """
+    copy_video_resources(source_course_id, destination_course_id, [source_resource_id])
+
+
 @app.task(
     bind=True,
     acks_late=True,
@@ -32,6 +32,7 @@ from users.factories import UserFactory
 from videos.conftest import MOCK_BUCKET_NAME, MockHttpErrorResponse, setup_s3
 from videos.constants import (
     DESTINATION_YOUTUBE,
+    QUOTA_COST_VIDEO_INSERT,
     YT_THUMBNAIL_IMG,
     VideoFileStatus,
     VideoStatus,
@@ -43,6 +44,7 @@ from videos.tasks import (
     attempt_to_update_missing_transcripts,
     copy_gdrive_file,
     copy_video_resource,
+    copy_video_resources,
     create_drivefile,
     delete_s3_objects,
     mail_transcripts_complete_notification,
@@ -52,9 +54,14 @@ from videos.tasks import (
     update_transcripts_for_website,
     update_youtube_statuses,
     update_youtube_tags_batch,
+    upload_youtube_video,
     upload_youtube_videos,
 )
-from videos.youtube import API_QUOTA_ERROR_MSG
+from videos.youtube import (
+    API_QUOTA_ERROR_MSG,
+    exhaust_youtube_quota,
+    get_youtube_quota_remaining,
+)
 from websites.constants import RESOURCE_TYPE_VIDEO
 from websites.factories import WebsiteContentFactory, WebsiteFactory
 from websites.messages import VideoTranscriptingCompleteMessage
@@ -150,41 +157,99 @@ def youtube_video_files_processing():
     )
 
 
+@pytest.mark.usefixtures("youtube_quota")
 @pytest.mark.parametrize("is_enabled", [True, False])
 @pytest.mark.parametrize("max_uploads", [2, 4])
-def test_upload_youtube_videos(
-    mocker, youtube_video_files_new, max_uploads, is_enabled, mocked_celery
+@pytest.mark.parametrize("quota_uploads", [1, 5])
+def test_upload_youtube_videos(  # pylint:disable=too-many-arguments  # noqa: PLR0913, PLR0917
+    settings,
+    mocker,
+    youtube_video_files_new,
+    max_uploads,
+    quota_uploads,
+    is_enabled,
+    mocked_celery,
 ):
     """
-    Test that the upload_youtube_videos task calls YouTubeApi.upload_video
-    & creates a YoutubeVideo object for each public video, up to the max daily limit
+    Test that the upload_youtube_videos task starts a parallel upload for the newest
+    videos, up to the max per run and the remaining daily API quota
     """
     if not is_enabled:
         settings.YT_CLIENT_ID = None
     settings.YT_UPLOAD_LIMIT = max_uploads
+    settings.YT_DAILY_QUOTA = QUOTA_COST_VIDEO_INSERT * quota_uploads
+    mock_upload = mocker.patch("videos.tasks.upload_youtube_video.si")
+    expected_ids = [
+        video_file.id
+        for video_file in sorted(
+            youtube_video_files_new, key=lambda video_file: video_file.created_on
+        )
+    ][::-1][: min(3, max_uploads, quota_uploads)]
+
+    if is_enabled:
+        with pytest.raises(mocked_celery.replace_exception_class):
+            upload_youtube_videos.delay()
+        assert [call.args[0] for call in mock_upload.call_args_list] == expected_ids
+        mocked_celery.group.assert_called_once_with(
+            [mock_upload.return_value] * len(expected_ids)
+        )
+    else:
+        upload_youtube_videos.delay()
+        mock_upload.assert_not_called()
+
+
+@pytest.mark.usefixtures("youtube_quota")
+def test_upload_youtube_videos_no_quota(settings, mocker, youtube_video_files_new):
+    """No uploads should be started if the daily API quota has been used up"""
+    exhaust_youtube_quota()
+    mock_upload = mocker.patch("videos.tasks.upload_youtube_video.si")
+    upload_youtube_videos.delay()
+    mock_upload.assert_not_called()
+
+
+@pytest.mark.usefixtures("youtube_quota")
+def test_upload_youtube_video(settings, mocker, youtube_video_files_new):
+    """
+    Test that upload_youtube_video uploads a video, records its YouTube id and
+    reserves quota for it
+    """
+    video_file = youtube_video_files_new[0]
     mock_youtube = mocker.patch("videos.tasks.YouTubeApi")
     mock_uploader = mock_youtube.return_value.upload_video
-    # upload_video now returns a tuple (response, course_tag)
+    youtube_id = "".join([choice(string.ascii_lowercase) for n in range(8)])  # noqa: S311
+    # upload_video returns a tuple (response, merged_tags)
     mock_uploader.return_value = (
-        {
-            "id": "".join([choice(string.ascii_lowercase) for n in range(8)]),  # noqa: S311
-            "status": {"uploadStatus": "uploaded"},
-        },
-        None,  # course_tag
+        {"id": youtube_id, "status": {"uploadStatus": "uploaded"}},
+        None,
     )
 
-    upload_youtube_videos.delay()
-    assert mock_uploader.call_count == (min(3, max_uploads) if is_enabled else 0)
-    assert mock_youtube.call_count == (1 if is_enabled else 0)
-    if is_enabled:
-        for video_file in VideoFile.objects.order_by("-created_on")[
-            : settings.YT_UPLOAD_LIMIT
-        ]:
-            assert video_file.destination_id is not None
-            assert video_file.destination_status == YouTubeStatus.UPLOADED
-            assert video_file.status == VideoFileStatus.UPLOADED
+    upload_youtube_video.delay(video_file.id)
+    mock_uploader.assert_called_once_with(video_file, existing_tags="")
+    video_file.refresh_from_db()
+    assert video_file.destination_id == youtube_id
+    assert video_file.destination_status == YouTubeStatus.UPLOADED
+    assert video_file.status == VideoFileStatus.UPLOADED
+    assert get_youtube_quota_remaining() == (
+        settings.YT_DAILY_QUOTA - QUOTA_COST_VIDEO_INSERT
+    )
+
+    # A video that has already been uploaded should not be uploaded again
+    upload_youtube_video.delay(video_file.id)
+    mock_uploader.assert_called_once()
+
+
+@pytest.mark.usefixtures("youtube_quota")
+def test_upload_youtube_video_no_quota(settings, mocker, youtube_video_files_new):
+    """upload_youtube_video should not upload if there is not enough quota left"""
+    settings.YT_DAILY_QUOTA = QUOTA_COST_VIDEO_INSERT - 1
+    mock_youtube = mocker.patch("videos.tasks.YouTubeApi")
+    upload_youtube_video.delay(youtube_video_files_new[0].id)
+    mock_youtube.assert_not_called()
+    youtube_video_files_new[0].refresh_from_db()
+    assert youtube_video_files_new[0].status == VideoFileStatus.CREATED
 
 
+@pytest.mark.usefixtures("youtube_quota")
 def test_upload_youtube_videos_error(mocker, youtube_video_files_new):
     """
     Test that the VideoFile status is set properly if an error occurs during upload, and all videos are processed
@@ -192,14 +257,16 @@ def test_upload_youtube_videos_error(mocker, youtube_video_files_new):
     mock_uploader = mocker.patch(
         "videos.tasks.YouTubeApi.upload_video", side_effect=OSError
     )
-    upload_youtube_videos.delay()
+    for video_file in youtube_video_files_new:
+        upload_youtube_video.delay(video_file.id)
     assert mock_uploader.call_count == 3
     for video_file in youtube_video_files_new:
         video_file.refresh_from_db()
         assert video_file.status == VideoFileStatus.FAILED
 
 
-def test_upload_youtube_videos_saves_tags_to_metadata(mocker, mocked_celery):
+@pytest.mark.usefixtures("youtube_quota")
+def test_upload_youtube_video_saves_tags_to_metadata(mocker):
     """
     Test that tags (including course tag) are saved back to WebsiteContent metadata after upload
     """
@@ -250,7 +317,7 @@ def test_upload_youtube_videos_saves_tags_to_metadata(mocker, mocked_celery):
     )
 
     # Run the upload task
-    upload_youtube_videos.delay()
+    upload_youtube_video.delay(video_file.id)
 
     # Refresh from database
     video_file.refresh_from_db()
@@ -269,7 +336,8 @@ def test_upload_youtube_videos_saves_tags_to_metadata(mocker, mocked_celery):
     assert saved_tags == "python, django, test-course-fall-2020"
 
 
-def test_upload_youtube_videos_passes_existing_tags_as_kwarg(mocker, mocked_celery):
+@pytest.mark.usefixtures("youtube_quota")
+def test_upload_youtube_video_passes_existing_tags_as_kwarg(mocker):
     """
     Test that existing_tags is passed as a keyword argument to upload_video.
     """
@@ -316,7 +384,7 @@ def test_upload_youtube_videos_passes_existing_tags_as_kwarg(mocker, mocked_cele
     )
 
     # Run the upload task
-    upload_youtube_videos.delay()
+    upload_youtube_video.delay(video_file.id)
 
     # Verify upload_video was called with existing_tags as keyword argument
     mock_uploader.assert_called_once()
@@ -331,12 +399,13 @@ def test_upload_youtube_videos_passes_existing_tags_as_kwarg(mocker, mocked_cele
     assert call_args.kwargs["existing_tags"] == tags
 
 
+@pytest.mark.usefixtures("youtube_quota")
 def test_upload_youtube_videos_no_videos(mocker):
-    """YouTube API shoould not be instantiated if there are no videos to upload"""
-    mock_youtube = mocker.patch("videos.tasks.YouTubeApi")
+    """No uploads should be started if there are no videos to upload"""
+    mock_upload = mocker.patch("videos.tasks.upload_youtube_video.si")
 
     upload_youtube_videos.delay()
-    mock_youtube.assert_not_called()
+    mock_upload.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -346,10 +415,11 @@ def test_upload_youtube_videos_no_videos(mocker):
         ["other error", VideoFileStatus.FAILED],  # noqa: PT007
     ],
 )
+@pytest.mark.usefixtures("youtube_quota")
 def test_upload_youtube_quota_exceeded(mocker, youtube_video_files_new, msg, status):
     """
-    Test that the YoutubeVideo object is deleted if an error occurs during upload,
-    and the loop is halted if the quota is exceeded.
+    Test that the VideoFile status is set properly if an error occurs during upload,
+    and that the other uploads are skipped if the quota is exceeded.
     """
     mock_uploader = mocker.patch(
         "videos.tasks.YouTubeApi.upload_video",
@@ -357,8 +427,10 @@ def test_upload_youtube_quota_exceeded(mocker, youtube_video_files_new, msg, sta
             MockHttpErrorResponse(403), str.encode(msg, "utf-8")
         ),
     )
-    upload_youtube_videos.delay()
+    for video_file in youtube_video_files_new:
+        upload_youtube_video.delay(video_file.id)
     assert mock_uploader.call_count == (1 if msg == API_QUOTA_ERROR_MSG else 3)
+    assert (get_youtube_quota_remaining() == 0) is (msg == API_QUOTA_ERROR_MSG)
     for video_file in youtube_video_files_new:
         video_file.refresh_from_db()
         assert video_file.status == status
@@ -512,7 +584,9 @@ def test_update_youtube_statuses(  # pylint:disable=too-many-arguments  # noqa:
     if not is_enabled:
         settings.YT_CLIENT_ID = None
     mock_youtube = mocker.patch("videos.tasks.YouTubeApi")
-    mock_youtube.return_value.video_status.return_value = YouTubeStatus.PROCESSED
+    mock_youtube.return_value.video_statuses.side_effect = lambda video_ids: (
+        dict.fromkeys(video_ids, YouTubeStatus.PROCESSED)
+    )
     mock_mail_youtube_upload_success = mocker.patch(
         "videos.tasks.mail_youtube_upload_success"
     )
@@ -531,6 +605,12 @@ def test_update_youtube_statuses(  # pylint:disable=too-many-arguments  # noqa:
     ).count() == (3 if is_enabled else 0)
     if is_enabled:
         mock_youtube.assert_called_once()
+        mock_youtube.return_value.video_statuses.assert_called_once()
+        assert sorted(
+            mock_youtube.return_value.video_statuses.call_args.args[0]
+        ) == sorted(
+            video_file.destination_id for video_file in youtube_video_files_processing
+        )
 
         for video_file in youtube_video_files_processing:
             mock_mail_youtube_upload_success.assert_any_call(video_file)
@@ -559,22 +639,28 @@ def test_update_youtube_statuses_api_quota_exceeded(
     """
     Test that the update_youtube_statuses task stops without raising an error if the API quota is exceeded.
     """
-    mock_video_status = mocker.patch(
-        "videos.tasks.YouTubeApi.video_status",
+    mock_video_statuses = mocker.patch(
+        "videos.tasks.YouTubeApi.video_statuses",
         side_effect=HttpError(
             MockHttpErrorResponse(403), str.encode(API_QUOTA_ERROR_MSG, "utf-8")
         ),
     )
+    mock_exhaust_quota = mocker.patch("videos.tasks.exhaust_youtube_quota")
     update_youtube_statuses.delay()
-    mock_video_status.assert_called_once()
+    mock_video_statuses.assert_called_once()
+    mock_exhaust_quota.assert_called_once()
+    for video_file in youtube_video_files_processing:
+        video_file.refresh_from_db()
+        assert video_file.status == VideoFileStatus.UPLOADED
 
 
 def test_update_youtube_statuses_http_error(mocker, youtube_video_files_processing):
     """
-    Test that an error is raised if any http error occurs other than exceeding daily API quota
+    Test that an http error other than exceeding the daily API quota is logged once,
+    without emails, and the videos are left for the next run
     """
-    mock_video_status = mocker.patch(
-        "videos.tasks.YouTubeApi.video_status",
+    mock_video_statuses = mocker.patch(
+        "videos.tasks.YouTubeApi.video_statuses",
         side_effect=HttpError(MockHttpErrorResponse(403), b"other error"),
     )
     mock_mail_youtube_upload_failure = mocker.patch(
@@ -582,23 +668,54 @@ def test_update_youtube_statuses_http_error(mocker, youtube_video_files_processi
     )
     mock_log = mocker.patch("videos.tasks.log.exception")
     update_youtube_statuses.delay()
+    mock_video_statuses.assert_called_once()
+    mock_log.assert_called_once_with(
+        "Error getting the statuses of YouTube videos: %s", "other error"
+    )
+    mock_mail_youtube_upload_failure.assert_not_called()
     for video_file in youtube_video_files_processing:
-        mock_video_status.assert_any_call(video_file.destination_id)
-        mock_log.assert_any_call(
-            "Error for youtube_id %s: %s", video_file.destination_id, "other error"
-        )
-        mock_mail_youtube_upload_failure.assert_any_call(video_file)
+        video_file.refresh_from_db()
+        assert video_file.status == VideoFileStatus.UPLOADED
 
 
-def test_update_youtube_statuses_index_error(mocker, youtube_video_files_processing):
-    """
-    Test that an error is raised if a index error occurs
-    """
-    mock_log = mocker.patch("videos.tasks.log.exception")
+@pytest.mark.parametrize(
+    "youtube_status", [YouTubeStatus.FAILED, YouTubeStatus.REJECTED]
+)
+def test_update_youtube_statuses_failed(
+    mocker, youtube_video_files_processing, youtube_status
+):
+    """Only videos that YouTube failed or rejected should be marked failed and emailed about"""
+    failed_video_file, *other_video_files = youtube_video_files_processing
     mocker.patch(
-        "videos.tasks.YouTubeApi.video_status",
-        side_effect=IndexError(),
+        "videos.tasks.YouTubeApi.video_statuses",
+        side_effect=lambda video_ids: {
+            video_id: (
+                youtube_status
+                if video_id == failed_video_file.destination_id
+                else YouTubeStatus.PROCESSING
+            )
+            for video_id in video_ids
+        },
+    )
+    mock_mail_youtube_upload_failure = mocker.patch(
+        "videos.tasks.mail_youtube_upload_failure"
     )
+    update_youtube_statuses.delay()
+    mock_mail_youtube_upload_failure.assert_called_once_with(failed_video_file)
+    failed_video_file.refresh_from_db()
+    assert failed_video_file.status == VideoFileStatus.FAILED
+    assert failed_video_file.destination_status == youtube_status
+    for video_file in other_video_files:
+        video_file.refresh_from_db()
+        assert video_file.status == VideoFileStatus.UPLOADED
+
+
+def test_update_youtube_statuses_not_found(mocker, youtube_video_files_processing):
+    """
+    Test that videos are marked as failed if YouTube does not return their status
+    """
+    mock_log = mocker.patch("videos.tasks.log.error")
+    mocker.patch("videos.tasks.YouTubeApi.video_statuses", return_value={})
     mock_mail_youtube_upload_failure = mocker.patch(
         "videos.tasks.mail_youtube_upload_failure"
     )
@@ -609,6 +726,8 @@ def test_update_youtube_statuses_index_error(mocker, youtube_video_files_process
             video_file.destination_id,
         )
         mock_mail_youtube_upload_failure.assert_any_call(video_file)
+        video_file.refresh_from_db()
+        assert video_file.status == VideoFileStatus.FAILED
 
 
 def test_update_youtube_statuses_no_videos(mocker):
@@ -637,8 +756,11 @@ def test_update_youtube_statuses_no_videos(mocker):
 def test_mail_youtube_upload_success_trigger(mocker, youtube_status, file_status):
     """mail_youtube_upload_success should only be triggered once during the various status transitions."""
     mock_mail_success = mocker.patch("videos.tasks.mail_youtube_upload_success")
-    mock_video_status = mocker.patch("videos.tasks.YouTubeApi.video_status")
-    mock_video_status.return_value = youtube_status
+    mocker.patch("videos.tasks.mail_youtube_upload_failure")
+    mocker.patch(
+        "videos.tasks.YouTubeApi.video_statuses",
+        side_effect=lambda video_ids: dict.fromkeys(video_ids, youtube_status),
+    )
     mocker.patch("videos.tasks.start_transcript_job.s")
     mocker.patch.object(update_youtube_statuses, "replace")
 
@@ -1215,6 +1337,62 @@ def test_copy_video_resource_uses_relation_fields(mocker):
     assert transcript_relation["website"] == destination_course.name
 
 
+@pytest.mark.django_db
+def test_copy_video_resources(mocker):
+    """copy_video_resources copies every video's files to S3 in one batch."""
+    mocker.patch("videos.tasks.copy_gdrive_file", return_value=None)
+    mocker.patch("videos.tasks.create_drivefile")
+    mocker.patch("videos.tasks.sync_website_content_references")
+    source_course = WebsiteFactory.create()
+    destination_course = WebsiteFactory.create()
+    source_resources = []
+    for lecture in ("lecture1", "lecture2"):
+        captions_content = WebsiteContentFactory.create(
+            website=source_course,
+            filename=f"{lecture}_captions_vtt",
+            file=f"courses/{source_course.name}/{lecture}_captions.vtt",
+        )
+        source_resources.append(
+            WebsiteContentFactory.create(
+                website=source_course,
+                filename=f"{lecture}_mp4",
+                file=f"courses/{source_course.name}/{lecture}.mp4",
+                metadata={
+                    "video_files": {
+                        settings.YT_FIELD_CAPTIONS_RESOURCES.split(".")[-1]: {
+                            "content": [str(captions_content.text_id)],
+                            "website": source_course.name,
+                        },
+                    }
+                },
+            )
+        )
+    mock_copy_objs_s3 = mocker.patch(
+        "videos.tasks.copy_objs_s3",
+        side_effect=lambda objs, course: {
+            obj.id: f"courses/{course.name}/copy-{obj.id}" for obj in objs
+        },
+    )
+    mock_copy_obj_s3 = mocker.patch("videos.utils.copy_obj_s3")
+
+    copy_video_resources(
+        str(source_course.uuid),
+        str(destination_course.uuid),
+        [str(resource.text_id) for resource in source_resources],
+    )
+
+    mock_copy_objs_s3.assert_called_once()
+    assert len(mock_copy_objs_s3.call_args[0][0]) == 4
+    mock_copy_obj_s3.assert_not_called()
+    assert (
+        WebsiteContent.objects.filter(
+            website=destination_course,
+            file__startswith=f"courses/{destination_course.name}/copy-",
+        ).count()
+        == 4
+    )
+
+
 def test_create_drivefile(mocker):
     """Test that create_drivefile correctly creates a DriveFile for a given Google Drive file in the destination course."""
     mock_gdrive_file = DriveFileFactory.create()
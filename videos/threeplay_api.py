@@ -1,27 +1,62 @@
 """3play api requests"""
 
 import logging
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from tempfile import SpooledTemporaryFile
 from typing import TYPE_CHECKING
 from urllib.parse import urljoin
 
 import requests
 from django.conf import settings
 from django.core.files import File
-
-from videos.constants import DESTINATION_YOUTUBE
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from videos.constants import (
+    DESTINATION_YOUTUBE,
+    PDF_FORMAT_ID,
+    THREEPLAY_DOWNLOAD_CHUNK_SIZE,
+    THREEPLAY_DOWNLOAD_MAX_MEMORY,
+    THREEPLAY_RETRY_STATUSES,
+    WEBVTT_FORMAT_ID,
+)
 
 if TYPE_CHECKING:
     from videos.models import Video
 
 log = logging.getLogger(__name__)
 
+THREEPLAY_NOT_FOUND_RESPONSE = (
+    b'{"is_error":true,"error_description":"record not found"}'
+)
+
+
+@cache
+def get_session() -> requests.Session:
+    """
+    Return the session shared by all 3Play requests, which pools connections
+    and retries failed idempotent requests with exponential backoff
+    """
+    retry = Retry(
+        total=settings.THREEPLAY_MAX_RETRIES,
+        backoff_factor=1,
+        status_forcelist=THREEPLAY_RETRY_STATUSES,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_maxsize=max(settings.THREEPLAY_CONCURRENCY * 2, 10), max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
 
 def get_folder(name: str) -> dict:
     """3play data request to get folders by name"""
     payload = {"name": name, "api_key": settings.THREEPLAY_API_KEY}
     url = "https://api.3playmedia.com/v3/batches/"
-    response = requests.get(url, payload, timeout=60)
+    response = get_session().get(url, payload, timeout=60)
     if response:
         return response.json()
     else:
@@ -32,7 +67,7 @@ def create_folder(name: str) -> dict:
     """3play data request to create folder"""
     payload = {"name": name, "api_key": settings.THREEPLAY_API_KEY}
     url = "https://api.3playmedia.com/v3/batches/"
-    response = requests.post(url, payload, timeout=60)
+    response = get_session().post(url, payload, timeout=60)
     if response:
         return response.json()
     else:
@@ -56,7 +91,7 @@ def threeplay_updated_media_file_request() -> dict:
     """3play data request to get files with 'updated' tag"""
     payload = {"label": "updated", "api_key": settings.THREEPLAY_API_KEY}
     url = "https://api.3playmedia.com/v3/files"
-    response = requests.get(url, payload, timeout=60)
+    response = get_session().get(url, payload, timeout=60)
     if response:
         return response.json()
     else:
@@ -81,7 +116,7 @@ def threeplay_upload_video_request(
     url = "https://api.3playmedia.com/v3/files/"
 
     try:
-        response = requests.post(url, payload, timeout=timeout)
+        response = get_session().post(url, payload, timeout=timeout)
         response.raise_for_status()
 
         return response.json()
@@ -124,7 +159,7 @@ def threeplay_order_transcript_request(
         payload["callback"] = callback_url
 
     try:
-        response = requests.post(url, payload, timeout=timeout)
+        response = get_session().post(url, payload, timeout=timeout)
         response.raise_for_status()
 
         return response.json()
@@ -150,7 +185,7 @@ def threeplay_remove_tags(threeplay_video_id: int):
     """3play patch to remove tag from video file"""
     payload = {"label": "", "api_key": settings.THREEPLAY_API_KEY}
     url = f"https://api.3playmedia.com/v3/files/{threeplay_video_id}"
-    requests.patch(url, payload, timeout=60)
+    get_session().patch(url, payload, timeout=60)
 
 
 def threeplay_transcript_api_request(youtube_id: str) -> dict:
@@ -160,34 +195,38 @@ def threeplay_transcript_api_request(youtube_id: str) -> dict:
         "api_key": settings.THREEPLAY_API_KEY,
     }
     url = "https://api.3playmedia.com/v3/transcripts"
-    response = requests.get(url, payload, timeout=60)
+    response = get_session().get(url, payload, timeout=60)
     if response:
         return response.json()
     else:
         return {}
 
 
-def fetch_file(source_url: str) -> BytesIO:
-    """Fetch transcript file from 3play site"""
-
-    response = requests.get(source_url, timeout=60)
-
-    if (
-        response.status_code != 200  # noqa: PLR2004
-        or response.content
-        == b'{"is_error":true,"error_description":"record not found"}'
-    ):
-        log.error(
-            "Could not open 3play transcript at %s",
-            source_url,
-        )
-        return False
-
-    file = BytesIO()
-    file.write(response.content)
-    file.seek(0)
-
-    return file
+def fetch_file(source_url: str) -> SpooledTemporaryFile | bool:
+    """
+    Fetch transcript file from 3play site, streaming it to a temporary file that
+    is only kept in memory if it is small. The caller is responsible for closing it.
+    """
+    with get_session().get(source_url, timeout=60, stream=True) as response:
+        if response.status_code == 200:  # noqa: PLR2004
+            file = SpooledTemporaryFile(max_size=THREEPLAY_DOWNLOAD_MAX_MEMORY)  # noqa: SIM115
+            for chunk in response.iter_content(
+                chunk_size=THREEPLAY_DOWNLOAD_CHUNK_SIZE
+            ):
+                file.write(chunk)
+            file.seek(0)
+            if file.read(len(THREEPLAY_NOT_FOUND_RESPONSE) + 1) != (
+                THREEPLAY_NOT_FOUND_RESPONSE
+            ):
+                file.seek(0)
+                return file
+            file.close()
+
+    log.error(
+        "Could not open 3play transcript at %s",
+        source_url,
+    )
+    return False
 
 
 def update_transcripts_for_video(video: Video) -> bool:
@@ -217,19 +256,31 @@ def update_transcripts_for_video(video: Video) -> bool:
             f"{transcript_id}?project_id={settings.THREEPLAY_PROJECT_ID}"
         )
 
-        pdf_url = transcript_url_base + "&format_id=46"
-        pdf_response = fetch_file(pdf_url)
-        if pdf_response:
-            video.pdf_transcript_file.save(
-                "transcript.pdf", File(pdf_response, name="transcript.pdf")
+        # The PDF and WebVTT files are downloaded at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            pdf_response, webvtt_response = executor.map(
+                fetch_file,
+                [
+                    f"{transcript_url_base}&format_id={PDF_FORMAT_ID}",
+                    f"{transcript_url_base}&format_id={WEBVTT_FORMAT_ID}",
+                ],
             )
 
-        webvtt_url = transcript_url_base + "&format_id=51"
-        webvtt_response = fetch_file(webvtt_url)
-        if webvtt_response:
-            video.webvtt_transcript_file.save(
-                "transcript.webvtt", File(webvtt_response, name="transcript.webvtt")
-            )
+        try:
+            if pdf_response:
+                video.pdf_transcript_file.save(
+                    "transcript.pdf", File(pdf_response, name="transcript.pdf")
+                )
+
+            if webvtt_response:
+                video.webvtt_transcript_file.save(
+                    "transcript.webvtt",
+                    File(webvtt_response, name="transcript.webvtt"),
+                )
+        finally:
+            for response in (pdf_response, webvtt_response):
+                if response:
+                    response.close()
 
         video.save()
         return True
@@ -12,6 +12,7 @@ from videos.threeplay_api import (
     fetch_file,
     get_folder,
     get_or_create_folder,
+    get_session,
     threeplay_order_transcript_request,
     threeplay_remove_tags,
     threeplay_transcript_api_request,
@@ -24,11 +25,29 @@ from websites.site_config_api import SiteConfig
 pytestmark = pytest.mark.django_db
 
 
-def test_threeplay_updated_media_file_request(mocker, settings):
+@pytest.fixture
+def mock_session(mocker):
+    """Mock the session shared by 3Play requests"""
+    return mocker.patch("videos.threeplay_api.get_session").return_value
+
+
+def test_get_session(settings):
+    """get_session should return one session that retries failed requests"""
+    settings.THREEPLAY_MAX_RETRIES = 5
+    get_session.cache_clear()
+    session = get_session()
+    assert get_session() is session
+    retry = session.get_adapter("https://api.3playmedia.com/v3/files").max_retries
+    assert retry.total == 5
+    assert 503 in retry.status_forcelist
+    get_session.cache_clear()
+
+
+def test_threeplay_updated_media_file_request(mock_session, settings):
     """Test threeplay_updated_media_file_request"""
 
     settings.THREEPLAY_API_KEY = "key"
-    mock_get_call = mocker.patch("videos.threeplay_api.requests.get")
+    mock_get_call = mock_session.get
 
     threeplay_updated_media_file_request()
 
@@ -39,11 +58,11 @@ def test_threeplay_updated_media_file_request(mocker, settings):
     )
 
 
-def test_threeplay_remove_tags(mocker, settings):
+def test_threeplay_remove_tags(mock_session, settings):
     """Test threeplay_remove_tags"""
 
     settings.THREEPLAY_API_KEY = "key"
-    mock_patch_call = mocker.patch("videos.threeplay_api.requests.patch")
+    mock_patch_call = mock_session.patch
 
     threeplay_remove_tags(12345)
 
@@ -54,11 +73,11 @@ def test_threeplay_remove_tags(mocker, settings):
     )
 
 
-def test_threeplay_transcript_api_request(mocker, settings):
+def test_threeplay_transcript_api_request(mock_session, settings):
     """Test threeplay_transcript_api_request"""
 
     settings.THREEPLAY_API_KEY = "key"
-    mock_get_call = mocker.patch("videos.threeplay_api.requests.get")
+    mock_get_call = mock_session.get
 
     threeplay_transcript_api_request("youtube_id")
 
@@ -77,22 +96,24 @@ def test_threeplay_transcript_api_request(mocker, settings):
         (500, b"content"),
     ],
 )
-def test_fetch_file(mocker, content, status_code):
+def test_fetch_file(mock_session, content, status_code):
     """Test fetch_file"""
-    request_call = mocker.patch("videos.threeplay_api.requests.get")
-    request_call.return_value.content = content
-    request_call.return_value.status_code = status_code
+    response = mock_session.get.return_value.__enter__.return_value
+    response.iter_content.return_value = [content[:3], content[3:]]
+    response.status_code = status_code
 
     result = fetch_file("source_url.com")
 
+    mock_session.get.assert_called_once_with("source_url.com", timeout=60, stream=True)
     if status_code == 200 and content == b"content":
-        assert result.getvalue() == content
+        with result:
+            assert result.read() == content
     else:
         assert not result
 
 
-@pytest.mark.parametrize("pdf_transcript_content", [False, BytesIO(b"content")])
-@pytest.mark.parametrize("webvtt_transcript_content", [False, BytesIO(b"content")])
+@pytest.mark.parametrize("pdf_transcript_content", [False, True])
+@pytest.mark.parametrize("webvtt_transcript_content", [False, True])
 @pytest.mark.parametrize("status", ["complete", "in_progress"])
 def test_update_transcripts_for_video(
     mocker, settings, pdf_transcript_content, webvtt_transcript_content, status
@@ -119,8 +140,18 @@ def test_update_transcripts_for_video(
         return_value=threeplay_response,
     )
 
-    mock_fetch_file = mocker.patch("videos.threeplay_api.fetch_file")
-    mock_fetch_file.side_effect = [pdf_transcript_content, webvtt_transcript_content]
+    mock_fetch_file = mocker.patch(
+        "videos.threeplay_api.fetch_file",
+        side_effect=lambda url: (
+            BytesIO(b"content")
+            if (
+                pdf_transcript_content
+                if url.endswith("format_id=46")
+                else webvtt_transcript_content
+            )
+            else False
+        ),
+    )
 
     update_transcripts_for_video(video)
 
@@ -161,10 +192,10 @@ def test_update_transcripts_for_video(
         assert video_file.video.webvtt_transcript_file == ""
 
 
-def test_get_folder_request(mocker, settings):
+def test_get_folder_request(mock_session, settings):
     """Test get_folder"""
     settings.THREEPLAY_API_KEY = "key"
-    mock_get_call = mocker.patch("videos.threeplay_api.requests.get")
+    mock_get_call = mock_session.get
 
     response = get_folder("short_id")
 
@@ -176,10 +207,10 @@ def test_get_folder_request(mocker, settings):
     assert response == mock_get_call.return_value.json()
 
 
-def test_create_folder_request(mocker, settings):
+def test_create_folder_request(mock_session, settings):
     """Test create_folder"""
     settings.THREEPLAY_API_KEY = "key"
-    mock_post_call = mocker.patch("videos.threeplay_api.requests.post")
+    mock_post_call = mock_session.post
 
     response = create_folder("short_id")
 
@@ -194,13 +225,13 @@ def test_create_folder_request(mocker, settings):
 @pytest.mark.parametrize(
     "get_folder_response", [{}, {"data": []}, {"data": [{"id": 1}]}]
 )
-def test_get_or_create_folder(mocker, settings, get_folder_response):
+def test_get_or_create_folder(mock_session, settings, get_folder_response):
     """Test get_or_create_folder"""
 
     settings.THREEPLAY_API_KEY = "key"
 
-    mock_get_call = mocker.patch("videos.threeplay_api.requests.get")
-    mock_post_call = mocker.patch("videos.threeplay_api.requests.post")
+    mock_get_call = mock_session.get
+    mock_post_call = mock_session.post
 
     mock_get_call.return_value.json.return_value = get_folder_response
     mock_post_call.return_value.json.return_value = {"data": {"id": 2}}
@@ -220,12 +251,12 @@ def test_get_or_create_folder(mocker, settings, get_folder_response):
         assert response == 2
 
 
-def test_threeplay_upload_video_request(mocker, settings):
+def test_threeplay_upload_video_request(mock_session, mocker, settings):
     """Test threeplay_upload_video_request"""
 
     settings.THREEPLAY_API_KEY = "key"
     mocker.patch("videos.threeplay_api.get_or_create_folder", return_value=123)
-    mock_post_call = mocker.patch("videos.threeplay_api.requests.post")
+    mock_post_call = mock_session.post
 
     payload = {
         "source_url": "https://www.youtube.com/watch?v=youtube_id",
@@ -245,14 +276,16 @@ def test_threeplay_upload_video_request(mocker, settings):
 
 
 @pytest.mark.parametrize("threeplay_callback_key", [None, "threeplay_callback_key"])
-def test_threeplay_order_transcript_request(mocker, settings, threeplay_callback_key):
+def test_threeplay_order_transcript_request(
+    mock_session, settings, threeplay_callback_key
+):
     """Test threeplay_order_transcript_request"""
 
     settings.SITE_BASE_URL = "http://url.edu/"
     settings.THREEPLAY_API_KEY = "key"
     settings.THREEPLAY_CALLBACK_KEY = threeplay_callback_key
 
-    mock_post_call = mocker.patch("videos.threeplay_api.requests.post")
+    mock_post_call = mock_session.post
 
     payload = {
         "turnaround_level_id": 5,
@@ -275,12 +308,14 @@ def test_threeplay_order_transcript_request(mocker, settings, threeplay_callback
     )
 
 
-def test_threeplay_upload_video_request_connection_error_converted(mocker, settings):
+def test_threeplay_upload_video_request_connection_error_converted(
+    mock_session, mocker, settings
+):
     """Test that ConnectionError exceptions are converted to ConnectionError with context"""
 
     settings.THREEPLAY_API_KEY = "key"
     mocker.patch("videos.threeplay_api.get_or_create_folder", return_value=123)
-    mock_post_call = mocker.patch("videos.threeplay_api.requests.post")
+    mock_post_call = mock_session.post
     mock_post_call.side_effect = requests.exceptions.ConnectionError(
         "Connection failed"
     )
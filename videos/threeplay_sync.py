@@ -7,20 +7,22 @@ from uuid import uuid4
 from django.conf import settings
 from django.core.files import File
 
+from content_sync.api import upsert_content_sync_state
 from main.s3_utils import get_boto3_resource
 from main.utils import get_base_filename, get_dirpath_and_filename, get_file_extension
 from videos.constants import PDF_FORMAT_ID, WEBVTT_FORMAT_ID
 from videos.threeplay_api import fetch_file, threeplay_transcript_api_request
 from videos.utils import (
+    CaptionTranscriptIndex,
     generate_s3_path,
     get_content_dirpath,
     parse_caption_language_locale,
 )
 from websites.api import sync_website_content_references
-from websites.models import WebsiteContent
+from websites.models import Website, WebsiteContent
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
 log = logging.getLogger()
 
@@ -86,7 +88,9 @@ def _resolved_language(resource: WebsiteContent) -> str | None:
 
 
 def _threeplay_resource_already_linked(
-    video: WebsiteContent, resource_field: str
+    video: WebsiteContent,
+    resource_field: str,
+    index: CaptionTranscriptIndex | None = None,
 ) -> bool:
     """Return True if an English resource is already linked in the content list.
 
@@ -104,27 +108,31 @@ def _threeplay_resource_already_linked(
         existing_content = [existing_content]
     if not isinstance(existing_content, list) or not existing_content:
         return False
-    return any(
-        _resolved_language(resource) == "en"
-        for resource in WebsiteContent.objects.filter(
+    resources = (
+        index.get_by_text_ids(existing_content)
+        if index is not None
+        else WebsiteContent.objects.filter(
             website=video.website, text_id__in=existing_content
         )
     )
+    return any(_resolved_language(resource) == "en" for resource in resources)
 
 
-def _attach_transcript_if_missing(
+def _attach_transcript_if_missing(  # noqa: PLR0913, PLR0917
     video: WebsiteContent,
     base_url: str,
     youtube_id: str,
     summary: dict | None = None,
     write_output: Callable[..., None] = log.info,
-) -> None:
+    index: CaptionTranscriptIndex | None = None,
+) -> bool:
     """
     Attach transcript to video if it does not exist.
     Fetches from 3Play API and updates the video metadata.
+    Returns True if the video metadata was modified.
     """
-    if _threeplay_resource_already_linked(video, "video_transcript_resources"):
-        return
+    if _threeplay_resource_already_linked(video, "video_transcript_resources", index):
+        return False
 
     pdf_url = base_url + f"&format_id={PDF_FORMAT_ID}"
     pdf_response = fetch_file(pdf_url)
@@ -133,9 +141,12 @@ def _attach_transcript_if_missing(
         summary["transcripts"]["total"] += 1
 
     if pdf_response:
-        file_size = len(pdf_response.getvalue())
-        pdf_file = File(pdf_response, name=f"{youtube_id}.pdf")
-        text_id = _create_new_content(pdf_file, video, file_size=file_size)
+        with pdf_response:
+            pdf_file = File(pdf_response, name=f"{youtube_id}.pdf")
+            file_size = pdf_file.size
+            text_id = _create_new_content(
+                pdf_file, video, file_size=file_size, index=index
+            )
         _append_resource_to_video_files(video, "video_transcript_resources", text_id)
         if summary:
             summary["transcripts"]["updated"] += 1
@@ -144,26 +155,30 @@ def _attach_transcript_if_missing(
             video.title,
             video.website.short_id,
         )
-    elif summary:
+        return True
+    if summary:
         summary["transcripts"]["missing"] += 1
         summary["transcripts"]["missing_details"].append(
             (youtube_id, video.website.short_id)
         )
+    return False
 
 
-def _attach_captions_if_missing(
+def _attach_captions_if_missing(  # noqa: PLR0913, PLR0917
     video: WebsiteContent,
     base_url: str,
     youtube_id: str,
     summary: dict | None = None,
     write_output: Callable[..., None] = log.info,
-) -> None:
+    index: CaptionTranscriptIndex | None = None,
+) -> bool:
     """
     Attach captions to video if it does not exist.
     Fetches from 3Play API and updates the video metadata.
+    Returns True if the video metadata was modified.
     """
-    if _threeplay_resource_already_linked(video, "video_captions_resources"):
-        return
+    if _threeplay_resource_already_linked(video, "video_captions_resources", index):
+        return False
 
     webvtt_url = base_url + f"&format_id={WEBVTT_FORMAT_ID}"
     webvtt_response = fetch_file(webvtt_url)
@@ -171,9 +186,10 @@ def _attach_captions_if_missing(
         summary["captions"]["total"] += 1
 
     if webvtt_response:
-        file_size = len(webvtt_response.getvalue())
-        vtt_file = File(webvtt_response, name=f"{youtube_id}.webvtt")
-        text_id = _create_new_content(vtt_file, video, file_size)
+        with webvtt_response:
+            vtt_file = File(webvtt_response, name=f"{youtube_id}.webvtt")
+            file_size = vtt_file.size
+            text_id = _create_new_content(vtt_file, video, file_size, index=index)
         _append_resource_to_video_files(video, "video_captions_resources", text_id)
         if summary:
             summary["captions"]["updated"] += 1
@@ -182,11 +198,13 @@ def _attach_captions_if_missing(
             video.title,
             video.website.short_id,
         )
-    elif summary:
+        return True
+    if summary:
         summary["captions"]["missing"] += 1
         summary["captions"]["missing_details"].append(
             (youtube_id, video.website.short_id)
         )
+    return False
 
 
 def link_threeplay_files_as_resources(video, video_resource: WebsiteContent) -> bool:
@@ -230,10 +248,15 @@ def sync_video_captions_and_transcripts(
     summary: dict | None = None,
     missing_results: dict | None = None,
     write_output: Callable[..., None] = log.info,
-) -> None:
+    index: CaptionTranscriptIndex | None = None,
+) -> bool:
     """
     Fetch captions/transcripts via 3play and either attach them to the video
     metadata or record them as missing.
+
+    With an ``index`` of the video's website, existing resources are looked up
+    in memory and the video is left unsaved for the caller to persist in bulk.
+    Returns True if the video metadata was modified.
     """
     youtube_id = video.metadata["video_metadata"]["youtube_id"]
     threeplay_transcript_json = threeplay_transcript_api_request(youtube_id)
@@ -249,7 +272,7 @@ def sync_video_captions_and_transcripts(
             video.title,
             video.website.short_id,
         )
-        return
+        return False
 
     transcript_id = threeplay_transcript_json["data"][0].get("id")
     media_file_id = threeplay_transcript_json["data"][0].get("media_file_id")
@@ -259,13 +282,56 @@ def sync_video_captions_and_transcripts(
         project_id=settings.THREEPLAY_PROJECT_ID,
     )
     # If transcript does not exist
-    _attach_transcript_if_missing(video, base_url, youtube_id, summary, write_output)
+    transcript_changed = _attach_transcript_if_missing(
+        video, base_url, youtube_id, summary, write_output, index
+    )
 
     # If captions does not exist
-    _attach_captions_if_missing(video, base_url, youtube_id, summary, write_output)
-    video.skip_sync = True
-    video.save()
-    sync_website_content_references(video)
+    captions_changed = _attach_captions_if_missing(
+        video, base_url, youtube_id, summary, write_output, index
+    )
+    if index is None:
+        video.skip_sync = True
+        video.save()
+        sync_website_content_references(video)
+    return transcript_changed or captions_changed
+
+
+def sync_website_captions_and_transcripts(
+    website: Website,
+    videos: Iterable[WebsiteContent],
+    summary: dict | None = None,
+    missing_results: dict | None = None,
+    write_output: Callable[..., None] = log.info,
+) -> list[WebsiteContent]:
+    """
+    Sync captions/transcripts for many video resources of one website.
+
+    The website's caption and transcript resources are loaded once into a
+    CaptionTranscriptIndex, and the modified videos are saved with a single
+    bulk update. Returns the modified videos.
+    """
+    index = CaptionTranscriptIndex(website)
+    updated_videos = [
+        video
+        for video in videos
+        if sync_video_captions_and_transcripts(
+            video, summary, missing_results, write_output, index
+        )
+    ]
+    if not updated_videos:
+        return updated_videos
+
+    WebsiteContent.objects.bulk_update(updated_videos, ["metadata"])
+    # bulk_update does not call pre/post_save signals.
+    # So we'll do the sync state update ourselves.
+    for video in updated_videos:
+        upsert_content_sync_state(video)
+        sync_website_content_references(video)
+    website.has_unpublished_draft = True
+    website.has_unpublished_live = True
+    website.save()
+    return updated_videos
 
 
 def upload_to_s3(file_content: File, video: WebsiteContent) -> str:
@@ -304,11 +370,14 @@ def generate_metadata(
 
 
 def _create_new_content(
-    file_content: File, video: WebsiteContent, file_size: int | None = None
+    file_content: File,
+    video: WebsiteContent,
+    file_size: int | None = None,
+    index: CaptionTranscriptIndex | None = None,
 ) -> str:
     """
     Create and save a new WebsiteContent object
-    for a caption or transcript file.
+    for a caption or transcript file, recording it in ``index`` if given.
     Returns the new resource's text_id.
     """
     new_text_id = str(uuid4())
@@ -341,5 +410,7 @@ def _create_new_content(
     obj.metadata["file_size"] = file_size
     obj.file = new_s3_loc
     obj.save()
+    if index is not None:
+        index.add(obj)
 
     return str(obj.text_id)
@@ -7,6 +7,7 @@ import pytest
 from videos.threeplay_sync import (
     link_threeplay_files_as_resources,
     sync_video_captions_and_transcripts,
+    sync_website_captions_and_transcripts,
 )
 from websites.constants import CONTENT_TYPE_RESOURCE
 from websites.factories import (
@@ -393,6 +394,87 @@ def test_sync_video_captions_and_transcripts_appends_to_scalar_string_content(mo
     assert len(transcript_content) == 2
 
 
+def test_sync_website_captions_and_transcripts(mocker):
+    """Website-level sync should skip linked videos and bulk save the rest."""
+    starter = WebsiteStarterFactory.create(slug="ocw-course-v2")
+    website = WebsiteFactory.create(starter=starter)
+    captions_resource = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture1_captions_vtt",
+        file=f"courses/{website.name}/lecture1_captions.vtt",
+    )
+    transcript_resource = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture1_transcript_pdf",
+        file=f"courses/{website.name}/lecture1_transcript.pdf",
+    )
+    linked_video = WebsiteContentFactory.create(
+        website=website,
+        type=CONTENT_TYPE_RESOURCE,
+        metadata={
+            "resourcetype": "Video",
+            "video_metadata": {"youtube_id": "yt123"},
+            "video_files": {
+                "video_captions_resources": {
+                    "content": [str(captions_resource.text_id)],
+                    "website": website.name,
+                },
+                "video_transcript_resources": {
+                    "content": [str(transcript_resource.text_id)],
+                    "website": website.name,
+                },
+            },
+        },
+    )
+    unlinked_video = WebsiteContentFactory.create(
+        website=website,
+        type=CONTENT_TYPE_RESOURCE,
+        metadata={
+            "resourcetype": "Video",
+            "video_metadata": {"youtube_id": "yt789"},
+            "video_files": {},
+        },
+    )
+
+    mocker.patch(
+        "videos.threeplay_sync.threeplay_transcript_api_request",
+        return_value={"data": [{"status": "complete", "id": 11, "media_file_id": 22}]},
+    )
+    fetch_file_mock = mocker.patch(
+        "videos.threeplay_sync.fetch_file",
+        side_effect=[BytesIO(b"pdf"), BytesIO(b"webvtt")],
+    )
+    mocker.patch(
+        "videos.threeplay_sync.upload_to_s3",
+        side_effect=[
+            f"/courses/{website.name}/yt789_transcript.pdf",
+            f"/courses/{website.name}/yt789_captions.webvtt",
+        ],
+    )
+    save_mock = mocker.spy(WebsiteContent, "save")
+    upsert_mock = mocker.patch("videos.threeplay_sync.upsert_content_sync_state")
+
+    updated = sync_website_captions_and_transcripts(
+        website, [linked_video, unlinked_video]
+    )
+
+    assert updated == [unlinked_video]
+    assert fetch_file_mock.call_count == 2
+    # The video itself is saved in bulk rather than one by one
+    assert unlinked_video not in [call.args[0] for call in save_mock.call_args_list]
+    upsert_mock.assert_called_once_with(unlinked_video)
+    unlinked_video.refresh_from_db()
+    vf = unlinked_video.metadata["video_files"]
+    assert len(vf["video_transcript_resources"]["content"]) == 1
+    assert len(vf["video_captions_resources"]["content"]) == 1
+    assert set(unlinked_video.referenced_by.values_list("file", flat=True)) == {
+        f"/courses/{website.name}/yt789_transcript.pdf",
+        f"/courses/{website.name}/yt789_captions.webvtt",
+    }
+    website.refresh_from_db()
+    assert website.has_unpublished_draft is True
+
+
 def test_link_threeplay_files_as_resources(mocker):
     """Downloaded 3Play files become convention-named resources linked via _resources."""
     starter = WebsiteStarterFactory.create(slug="ocw-course-v2")
@@ -5,15 +5,26 @@ This module provides several utility functions that simplify the task of working
 
 import os
 import re
+from collections import defaultdict
 from copy import deepcopy
 
 from django.conf import settings
-
-from main.s3_utils import get_boto3_resource
-from main.utils import get_dirpath_and_filename, get_file_extension, uuid_string
-from videos.constants import YT_LIST_BATCH_SIZE
+from django.db.models import Q
+
+from main.s3_utils import copy_s3_objects
+from main.utils import (
+    get_base_filename,
+    get_dirpath_and_filename,
+    get_file_extension,
+    uuid_string,
+)
+from videos.constants import (
+    CAPTION_FILE_EXTENSIONS,
+    TRANSCRIPT_FILE_EXTENSIONS,
+    YT_LIST_BATCH_SIZE,
+)
 from websites.models import Website, WebsiteContent, WebsiteStarter
-from websites.utils import get_dict_field, set_dict_field
+from websites.utils import get_dict_field, get_dict_query_field, set_dict_field
 
 
 def generate_s3_path(file_or_webcontent, website):
@@ -56,21 +67,41 @@ def get_content_dirpath(slug, collection_type):
 
 def copy_obj_s3(source_obj: WebsiteContent, dest_course: Website) -> str:
     """Copy source_obj to the S3 bucket of dest_course"""
-    s3 = get_boto3_resource("s3")
-    new_s3_path = generate_s3_path(source_obj, dest_course)
-    s3.Object(settings.AWS_STORAGE_BUCKET_NAME, new_s3_path).copy_from(
-        CopySource=f"{settings.AWS_STORAGE_BUCKET_NAME.rstrip('/')}/{str(source_obj.file).lstrip('/')}"
+    return copy_objs_s3([source_obj], dest_course)[source_obj.id]
+
+
+def copy_objs_s3(
+    source_objs: list[WebsiteContent], dest_course: Website
+) -> dict[int, str]:
+    """
+    Copy the files of source_objs to the S3 bucket of dest_course concurrently,
+    returning the new S3 path of each copied object keyed by its id
+    """
+    new_s3_paths = {
+        source_obj.id: generate_s3_path(source_obj, dest_course)
+        for source_obj in source_objs
+        if source_obj.file
+    }
+    copy_s3_objects(
+        [
+            (str(source_obj.file).lstrip("/"), new_s3_paths[source_obj.id])
+            for source_obj in source_objs
+            if source_obj.id in new_s3_paths
+        ]
     )
-    return new_s3_path
+    return new_s3_paths
 
 
-def create_new_content(source_obj, to_course):
+def create_new_content(source_obj, to_course, new_s3_path: str | None = None):
     """Create new WebsiteContent object from source_obj in to_course,
     or update existing object if it exists.
+
+    Pass the new_s3_path of a file already copied by copy_objs_s3 to skip
+    copying it again.
     """
     new_text_id = uuid_string()
     if source_obj.file:
-        new_s3_loc = copy_obj_s3(source_obj, to_course)
+        new_s3_loc = new_s3_path or copy_obj_s3(source_obj, to_course)
         new_dirpath = "content/resources"
         new_filename = get_dirpath_and_filename(new_s3_loc)[1]
     else:
@@ -380,3 +411,109 @@ def resource_file_paths(resources: list) -> list:
                 entry["locale"] = locale
             result.append(entry)
     return result
+
+
+class CaptionTranscriptIndex:
+    """A website's caption and transcript resources, loaded with one query.
+
+    Resources are keyed by ``(youtube_id, language, kind)`` where ``kind`` is
+    ``"captions"`` or ``"transcript"``, and are matched to videos the same way
+    ``Video.caption_transcript_resources()`` does: by the
+    ``{video_filename}_captions`` / ``{video_filename}_transcript`` filename
+    prefix, then by the real extension of their uploaded file.  This lets a
+    caller that walks many videos of one website match and link them in
+    memory instead of querying per video and per language.
+    """
+
+    KINDS = {
+        "captions": CAPTION_FILE_EXTENSIONS,
+        "transcript": TRANSCRIPT_FILE_EXTENSIONS,
+    }
+
+    def __init__(self, website: Website):
+        self.website = website
+        self._by_text_id: dict[str, WebsiteContent | None] = {}
+        self._by_key: dict[tuple[str, str, str], list[WebsiteContent]] = defaultdict(
+            list
+        )
+        self._video_filenames: dict[str, str] = {}
+        youtube_id_field = get_dict_query_field("metadata", settings.YT_FIELD_ID)
+        contents = list(
+            WebsiteContent.objects.filter(website=website)
+            .filter(
+                Q(**{f"{youtube_id_field}__isnull": False})
+                | Q(filename__contains="_captions")
+                | Q(filename__contains="_transcript")
+            )
+            .order_by("id")
+        )
+        for content in contents:
+            self._by_text_id[str(content.text_id)] = content
+            youtube_id = get_dict_field(content.metadata or {}, settings.YT_FIELD_ID)
+            # The first matching resource wins, as with .first() per video
+            if youtube_id and youtube_id not in self._video_filenames:
+                self._video_filenames[youtube_id] = get_base_filename(content.filename)
+        self._youtube_ids = defaultdict(list)
+        for youtube_id, video_filename in self._video_filenames.items():
+            self._youtube_ids[video_filename].append(youtube_id)
+        for content in contents:
+            self._add_to_keys(content)
+
+    def _add_to_keys(self, content: WebsiteContent):
+        """Index a resource under every video whose filename prefixes it"""
+        if not content.file:
+            return
+        extension = get_file_extension(content.file.name)
+        for kind, extensions in self.KINDS.items():
+            if extension not in extensions:
+                continue
+            language, _ = resolve_language_locale(content)
+            marker = f"_{kind}"
+            for match in re.finditer(re.escape(marker), content.filename):
+                for youtube_id in self._youtube_ids.get(
+                    content.filename[: match.start()], []
+                ):
+                    self._by_key[(youtube_id, language, kind)].append(content)
+
+    def add(self, content: WebsiteContent):
+        """Record a resource created by the caller so the index stays current"""
+        self._by_text_id[str(content.text_id)] = content
+        self._add_to_keys(content)
+
+    def resources(
+        self, youtube_id: str, kind: str, language: str | None = None
+    ) -> list[WebsiteContent]:
+        """Return the video's resources of one kind, optionally in one language"""
+        if language is not None:
+            return list(self._by_key.get((youtube_id, language, kind), []))
+        return sorted(
+            (
+                content
+                for (key_youtube_id, _, key_kind), contents in self._by_key.items()
+                if key_youtube_id == youtube_id and key_kind == kind
+                for content in contents
+            ),
+            key=lambda content: content.id,
+        )
+
+    def get_by_text_ids(self, text_ids: list[str]) -> list[WebsiteContent]:
+        """Return the website's resources with the given text ids.
+
+        Ids the index has not seen yet are looked up with a single query and
+        remembered, including ones that do not exist.
+        """
+        missing = [
+            text_id for text_id in text_ids if str(text_id) not in self._by_text_id
+        ]
+        if missing:
+            for text_id in missing:
+                self._by_text_id[str(text_id)] = None
+            for content in WebsiteContent.objects.filter(
+                website=self.website, text_id__in=missing
+            ):
+                self._by_text_id[str(content.text_id)] = content
+        return [
+            self._by_text_id[str(text_id)]
+            for text_id in text_ids
+            if self._by_text_id[str(text_id)] is not None
+        ]
@@ -6,6 +6,7 @@ import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from videos.utils import (
+    CaptionTranscriptIndex,
     clean_uuid_filename,
     create_new_content,
     generate_s3_path,
@@ -295,3 +296,66 @@ def test_resource_file_paths_omits_locale_when_absent():
     assert resource_file_paths([resource]) == [
         {"file": "/courses/s/lecture1_captions.vtt", "language": "de"}
     ]
+
+
+def test_caption_transcript_index(django_assert_num_queries):
+    """CaptionTranscriptIndex should key a website's captions and transcripts
+    by youtube id, language and kind after a single query
+    """
+    website = WebsiteFactory.create()
+    other_website = WebsiteFactory.create()
+    for filename, youtube_id in (("lecture1_mp4", "yt-1"), ("lecture2_mp4", "yt-2")):
+        WebsiteContentFactory.create(
+            website=website,
+            filename=filename,
+            metadata={"video_metadata": {"youtube_id": youtube_id}},
+        )
+    captions_en = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture1_captions_vtt",
+        file=f"courses/{website.name}/lecture1_captions.vtt",
+    )
+    captions_fr = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture1_captions-fr_webvtt",
+        file=f"courses/{website.name}/lecture1_captions-fr.webvtt",
+    )
+    transcript = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture2_transcript_pdf2",
+        file=f"courses/{website.name}/lecture2_transcript.pdf",
+    )
+    WebsiteContentFactory.create(
+        website=other_website,
+        filename="lecture1_captions_vtt",
+        file=f"courses/{other_website.name}/lecture1_captions.vtt",
+    )
+
+    with django_assert_num_queries(1):
+        index = CaptionTranscriptIndex(website)
+        assert index.resources("yt-1", "captions") == [captions_en, captions_fr]
+        assert index.resources("yt-1", "captions", "fr") == [captions_fr]
+        assert index.resources("yt-1", "transcript") == []
+        assert index.resources("yt-2", "transcript", "en") == [transcript]
+        assert index.get_by_text_ids([captions_en.text_id]) == [captions_en]
+
+    added = WebsiteContentFactory.create(
+        website=website,
+        filename="lecture2_captions-es_vtt",
+        file=f"courses/{website.name}/lecture2_captions-es.vtt",
+    )
+    index.add(added)
+    assert index.resources("yt-2", "captions", "es") == [added]
+
+
+def test_caption_transcript_index_get_by_text_ids(django_assert_num_queries):
+    """get_by_text_ids should look up unknown ids once, including missing ones"""
+    website = WebsiteFactory.create()
+    page = WebsiteContentFactory.create(website=website, filename="page")
+    index = CaptionTranscriptIndex(website)
+    missing_text_id = str(uuid4())
+
+    with django_assert_num_queries(1):
+        assert index.get_by_text_ids([str(page.text_id), missing_text_id]) == [page]
+    with django_assert_num_queries(0):
+        assert index.get_by_text_ids([str(page.text_id), missing_text_id]) == [page]
@@ -1,20 +1,28 @@
 """YouTube API interface"""
 
 import http
+import json
 import logging
 import re
 import time
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
 from io import BytesIO
 from typing import TYPE_CHECKING, Literal
 from urllib.parse import urljoin
 
+import pytz
 from django.conf import settings
 from django.db.models import Q
+from django_redis import get_redis_connection
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseUpload
+from mitol.common.utils import chunks
 from mitol.mail.api import get_message_sender
 from smart_open.s3 import Reader
 
@@ -23,8 +31,17 @@ from main.s3_utils import get_boto3_client
 from main.utils import truncate_words
 from videos.constants import (
     DESTINATION_YOUTUBE,
+    QUOTA_COST_CAPTION_LIST,
+    QUOTA_COST_CAPTION_UPDATE,
+    QUOTA_COST_VIDEO_LIST,
+    QUOTA_COST_VIDEO_UPDATE,
+    YT_LIST_BATCH_SIZE,
     YT_MAX_LENGTH_DESCRIPTION,
     YT_MAX_LENGTH_TITLE,
+    YT_METADATA_KEY_PREFIX,
+    YT_METADATA_KEY_TTL,
+    YT_QUOTA_KEY_TTL,
+    YT_QUOTA_TIMEZONE,
 )
 from videos.messages import YouTubeUploadFailureMessage, YouTubeUploadSuccessMessage
 from videos.models import VideoFile
@@ -34,6 +51,8 @@ from websites.constants import RESOURCE_TYPE_VIDEO
 from websites.utils import get_dict_field, get_dict_query_field, set_dict_field
 
 if TYPE_CHECKING:
+    from django.db.models.fields.files import FieldFile
+
     from websites.models import Website, WebsiteContent
 
 log = logging.getLogger(__name__)
@@ -58,6 +77,58 @@ def is_youtube_enabled() -> bool:
     )
 
 
+def _youtube_quota_key() -> str:
+    """Return the Redis key that holds today's YouTube API quota usage"""
+    today = datetime.now(tz=pytz.timezone(YT_QUOTA_TIMEZONE)).date()
+    return f"youtube-quota-{today.isoformat()}"
+
+
+def get_youtube_quota_remaining() -> int:
+    """Return the number of YouTube API quota units left today"""
+    used = get_redis_connection("redis").get(_youtube_quota_key())
+    return max(settings.YT_DAILY_QUOTA - int(used or 0), 0)
+
+
+def record_youtube_quota(units: int) -> int:
+    """Record YouTube API quota units that were spent, returning today's total"""
+    key = _youtube_quota_key()
+    with get_redis_connection("redis").pipeline() as pipe:
+        pipe.incrby(key, units)
+        pipe.expire(key, YT_QUOTA_KEY_TTL)
+        used, _ = pipe.execute()
+    return used
+
+
+def reserve_youtube_quota(units: int) -> bool:
+    """
+    Reserve YouTube API quota units for a call that is about to be made.
+    The reservation is atomic across workers, and is given back if it would
+    exceed the daily quota.
+    """
+    if record_youtube_quota(units) > settings.YT_DAILY_QUOTA:
+        release_youtube_quota(units)
+        return False
+    return True
+
+
+def release_youtube_quota(units: int):
+    """Give back reserved YouTube API quota units for calls that were not made"""
+    if units > 0:
+        get_redis_connection("redis").decrby(_youtube_quota_key(), units)
+
+
+def exhaust_youtube_quota():
+    """Mark today's quota as used up, after YouTube reports that it is"""
+    get_redis_connection("redis").set(
+        _youtube_quota_key(), settings.YT_DAILY_QUOTA, ex=YT_QUOTA_KEY_TTL
+    )
+
+
+def clear_youtube_quota():
+    """Forget today's recorded YouTube API quota usage"""
+    get_redis_connection("redis").delete(_youtube_quota_key())
+
+
 def mail_youtube_upload_failure(video_file: VideoFile):
     """Notify collaborators that a youtube upload failed"""
     try:
@@ -169,6 +240,31 @@ def strip_bad_chars(txt):
     return re.sub("<|>", "", txt)
 
 
+def get_video_snippet(resource: WebsiteContent) -> tuple[dict, str]:
+    """
+    Return the YouTube snippet for a video resource, along with the resource's
+    tags merged with the course tag.
+    """
+    metadata = resource.metadata
+    description = get_dict_field(metadata, settings.YT_FIELD_DESCRIPTION)
+    speakers = get_dict_field(metadata, settings.YT_FIELD_SPEAKERS)
+    if speakers:
+        description = f"{description}\n\nSpeakers: {speakers}"
+    course_slug = get_course_tag(resource.website)
+
+    # Get merged tags with course slug
+    merged_tags = get_tags_with_course(metadata, course_slug)
+    snippet = {
+        "title": truncate_words(strip_bad_chars(resource.title), YT_MAX_LENGTH_TITLE),
+        "description": truncate_words(
+            strip_bad_chars(description), YT_MAX_LENGTH_DESCRIPTION
+        ),
+        "tags": parse_tags(merged_tags),
+        "categoryId": settings.YT_CATEGORY_ID,
+    }
+    return snippet, merged_tags
+
+
 class YouTubeApi:
     """
     Class interface to YouTube API calls
@@ -205,6 +301,26 @@ class YouTubeApi:
         results = self.client.videos().list(part="status", id=video_id).execute()
         return results["items"][0]["status"]["uploadStatus"]
 
+    def video_statuses(self, video_ids: list[str]) -> dict[str, str]:
+        """
+        Get the upload statuses of videos, listing up to 50 videos per API call.
+
+        Args:
+            video_ids(list of str): YouTube video ids
+
+        Returns:
+            dict: Mapping of video id -> upload status, for videos that were found
+        """
+        statuses = {}
+        for batch in chunks(video_ids, chunk_size=YT_LIST_BATCH_SIZE):
+            record_youtube_quota(QUOTA_COST_VIDEO_LIST)
+            results = (
+                self.client.videos().list(part="status", id=",".join(batch)).execute()
+            )
+            for item in results.get("items", []):
+                statuses[item["id"]] = item["status"]["uploadStatus"]
+        return statuses
+
     def upload_video(
         self,
         videofile: VideoFile,
@@ -291,7 +407,11 @@ class YouTubeApi:
         if not videofile or not videofile.video.webvtt_transcript_file:
             return
 
-        with videofile.video.webvtt_transcript_file.open(mode="rb") as f:
+        self.upload_captions(youtube_id, videofile.video.webvtt_transcript_file)
+
+    def upload_captions(self, youtube_id: str, transcript_file: FieldFile):
+        """Upload a WebVTT transcript as the English captions of a video"""
+        with transcript_file.open(mode="rb") as f:
             content = f.read()
 
         media_body = MediaIoBaseUpload(
@@ -332,37 +452,21 @@ class YouTubeApi:
                 media_body=media_body,
             ).execute()
 
+    def update_snippet(self, youtube_id: str, snippet: dict):
+        """Update the title, description, tags and category of a video"""
+        self.client.videos().update(
+            part="snippet",
+            body={"id": youtube_id, "snippet": snippet},
+        ).execute()
+
     def update_video(self, resource: WebsiteContent, privacy=None):
         """
         Update a video's metadata based on a WebsiteContent object that is assumed to have certain fields.
         """  # noqa: E501
-        metadata = resource.metadata
-        description = get_dict_field(metadata, settings.YT_FIELD_DESCRIPTION)
-        speakers = get_dict_field(metadata, settings.YT_FIELD_SPEAKERS)
-        if speakers:
-            description = f"{description}\n\nSpeakers: {speakers}"
-        youtube_id = get_dict_field(metadata, settings.YT_FIELD_ID)
-        course_slug = get_course_tag(resource.website)
-
-        # Get merged tags with course slug
-        merged_tags = get_tags_with_course(metadata, course_slug)
+        youtube_id = get_dict_field(resource.metadata, settings.YT_FIELD_ID)
+        snippet, merged_tags = get_video_snippet(resource)
 
-        self.client.videos().update(
-            part="snippet",
-            body={
-                "id": youtube_id,
-                "snippet": {
-                    "title": truncate_words(
-                        strip_bad_chars(resource.title), YT_MAX_LENGTH_TITLE
-                    ),
-                    "description": truncate_words(
-                        strip_bad_chars(description), YT_MAX_LENGTH_DESCRIPTION
-                    ),
-                    "tags": parse_tags(merged_tags),
-                    "categoryId": settings.YT_CATEGORY_ID,
-                },
-            },
-        ).execute()
+        self.update_snippet(youtube_id, snippet)
 
         self.update_captions(resource, youtube_id)
 
@@ -370,7 +474,7 @@ class YouTubeApi:
             self.update_privacy(youtube_id, privacy=privacy)
 
         # Save merged tags back to database only on success
-        set_dict_field(metadata, settings.YT_FIELD_TAGS, merged_tags)
+        set_dict_field(resource.metadata, settings.YT_FIELD_TAGS, merged_tags)
         resource.save()
 
     def update_video_tags(self, youtube_id: str, tags: str):
@@ -511,36 +615,206 @@ def get_video_privacy_status(
         return None
 
 
-def update_youtube_metadata(website: Website, version=VERSION_DRAFT) -> None:
-    """Update YouTube video metadata via the API"""
-    if not is_youtube_enabled() or not is_ocw_site(website):
-        return
+@dataclass
+class VideoMetadataPush:
+    """The metadata to push to a YouTube video"""
+
+    resource: WebsiteContent
+    youtube_id: str
+    snippet: dict
+    merged_tags: str
+    privacy: str | None
+    transcript_file: FieldFile | None
+    # Transcripts are always saved under the same name, so the time their video
+    # was last saved is what tells a new transcript apart
+    transcript_updated_on: datetime | None = None
+
+    @property
+    def digest(self) -> str:
+        """Return a hash of everything that is pushed to YouTube"""
+        return sha256(
+            json.dumps(
+                {
+                    "snippet": self.snippet,
+                    "privacy": self.privacy,
+                    "captions": (
+                        [
+                            self.transcript_file.name,
+                            self.transcript_updated_on.isoformat()
+                            if self.transcript_updated_on
+                            else None,
+                        ]
+                        if self.transcript_file
+                        else None
+                    ),
+                },
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    @property
+    def quota_cost(self) -> int:
+        """Return the YouTube API quota units that the push uses"""
+        cost = QUOTA_COST_VIDEO_UPDATE
+        if self.transcript_file:
+            cost += QUOTA_COST_CAPTION_LIST + QUOTA_COST_CAPTION_UPDATE
+        if self.privacy:
+            cost += QUOTA_COST_VIDEO_UPDATE
+        return cost
+
+
+def _get_video_metadata_pushes(
+    website: Website, version: str
+) -> list[VideoMetadataPush]:
+    """
+    Return the metadata to push for each video resource of a website that was
+    uploaded from this site, whether or not it has changed.
+    """
     query_id_field = get_dict_query_field("metadata", settings.YT_FIELD_ID)
-    video_resources = website.websitecontent_set.filter(
-        Q(metadata__resourcetype=RESOURCE_TYPE_VIDEO)
-    ).exclude(Q(**{query_id_field: None}) | Q(**{query_id_field: ""}))
-    if video_resources.count() == 0:
-        return
+    video_resources = (
+        website.websitecontent_set.filter(Q(metadata__resourcetype=RESOURCE_TYPE_VIDEO))
+        .exclude(Q(**{query_id_field: None}) | Q(**{query_id_field: ""}))
+        .select_related("website")
+    )
+    youtube_ids = {
+        resource: get_dict_field(resource.metadata, settings.YT_FIELD_ID)
+        for resource in video_resources
+    }
+    if not youtube_ids:
+        return []
+    # do not run this for any old imported videos
+    eligible_ids = set()
+    transcript_videos = {}
+    for video_file in (
+        VideoFile.objects.filter(
+            video__website=website, destination_id__in=set(youtube_ids.values())
+        )
+        .select_related("video")
+        .order_by("pk")
+    ):
+        eligible_ids.add(video_file.destination_id)
+        if video_file.destination == DESTINATION_YOUTUBE:
+            transcript_videos[video_file.destination_id] = (
+                video_file.video if video_file.video.webvtt_transcript_file else None
+            )
+
     previously_published: bool = (
         website.publish_date is not None and not website.unpublished
     )
-    youtube: YouTubeApi = YouTubeApi()
-    for video_resource in video_resources:
-        is_draft = get_dict_field(video_resource.metadata, "draft") is True
-        youtube_id = get_dict_field(video_resource.metadata, settings.YT_FIELD_ID)
-        # do not run this for any old imported videos
-        if VideoFile.objects.filter(
-            video__website=website, destination_id=youtube_id
-        ).exists():
-            try:
-                privacy = get_video_privacy_status(
+    pushes = []
+    for resource, youtube_id in youtube_ids.items():
+        if youtube_id not in eligible_ids:
+            continue
+        snippet, merged_tags = get_video_snippet(resource)
+        transcript_video = transcript_videos.get(youtube_id)
+        pushes.append(
+            VideoMetadataPush(
+                resource=resource,
+                youtube_id=youtube_id,
+                snippet=snippet,
+                merged_tags=merged_tags,
+                privacy=get_video_privacy_status(
                     version=version,
-                    is_draft=is_draft,
+                    is_draft=get_dict_field(resource.metadata, "draft") is True,
                     previously_published=previously_published,
-                )
-                youtube.update_video(video_resource, privacy=privacy)
-            except Exception:
-                log.exception(
-                    "Unexpected error updating metadata for video resource %d",
-                    video_resource.id,
-                )
+                ),
+                transcript_file=(
+                    transcript_video.webvtt_transcript_file
+                    if transcript_video
+                    else None
+                ),
+                transcript_updated_on=(
+                    transcript_video.updated_on if transcript_video else None
+                ),
+            )
+        )
+    return pushes
+
+
+def _push_video_metadata(
+    youtube: YouTubeApi, pushes: list[VideoMetadataPush]
+) -> list[VideoMetadataPush]:
+    """
+    Push metadata to YouTube one video after another with the same client, since
+    API clients are not thread safe. Returns the pushes that succeeded. When a
+    push fails, the quota reserved for the calls it did not make is given back.
+    """
+    pushed = []
+    for push in pushes:
+        spent = 0
+        try:
+            spent += QUOTA_COST_VIDEO_UPDATE
+            youtube.update_snippet(push.youtube_id, push.snippet)
+            if push.transcript_file:
+                spent += QUOTA_COST_CAPTION_LIST + QUOTA_COST_CAPTION_UPDATE
+                youtube.upload_captions(push.youtube_id, push.transcript_file)
+            if push.privacy:
+                spent += QUOTA_COST_VIDEO_UPDATE
+                youtube.update_privacy(push.youtube_id, privacy=push.privacy)
+        except Exception:
+            log.exception(
+                "Unexpected error updating metadata for video resource %d",
+                push.resource.id,
+            )
+            release_youtube_quota(push.quota_cost - spent)
+        else:
+            pushed.append(push)
+    return pushed
+
+
+def update_youtube_metadata(website: Website, version=VERSION_DRAFT) -> None:
+    """
+    Update YouTube video metadata via the API, for the videos whose metadata
+    differs from what was last pushed to them
+    """
+    if not is_youtube_enabled() or not is_ocw_site(website):
+        return
+    pushes = _get_video_metadata_pushes(website, version)
+    if not pushes:
+        return
+    redis = get_redis_connection("redis")
+    last_digests = redis.mget(
+        [f"{YT_METADATA_KEY_PREFIX}{push.youtube_id}" for push in pushes]
+    )
+    pushes = [
+        push
+        for push, last_digest in zip(pushes, last_digests, strict=True)
+        if last_digest is None or last_digest.decode("utf-8") != push.digest
+    ]
+    if not pushes:
+        return
+    reserved = [push for push in pushes if reserve_youtube_quota(push.quota_cost)]
+    if len(reserved) < len(pushes):
+        log.warning(
+            "YouTube API quota exceeded, not updating metadata for %d videos of %s",
+            len(pushes) - len(reserved),
+            website.name,
+        )
+    if not reserved:
+        return
+
+    workers = min(settings.YT_METADATA_CONCURRENCY, len(reserved))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pushed = [
+            push
+            for results in executor.map(
+                _push_video_metadata,
+                [YouTubeApi() for _ in range(workers)],
+                [reserved[idx::workers] for idx in range(workers)],
+            )
+            for push in results
+        ]
+
+    with redis.pipeline() as pipe:
+        for push in pushed:
+            # Save merged tags back to database only on success
+            set_dict_field(
+                push.resource.metadata, settings.YT_FIELD_TAGS, push.merged_tags
+            )
+            push.resource.save()
+            pipe.set(
+                f"{YT_METADATA_KEY_PREFIX}{push.youtube_id}",
+                push.digest,
+                ex=YT_METADATA_KEY_TTL,
+            )
+        pipe.execute()
@@ -16,6 +16,9 @@ from users.factories import UserFactory
 from videos.conftest import MockHttpErrorResponse
 from videos.constants import (
     DESTINATION_YOUTUBE,
+    QUOTA_COST_VIDEO_INSERT,
+    QUOTA_COST_VIDEO_LIST,
+    QUOTA_COST_VIDEO_UPDATE,
     YT_MAX_LENGTH_DESCRIPTION,
     YT_MAX_LENGTH_TITLE,
 )
@@ -26,9 +29,14 @@ from videos.youtube import (
     CAPTION_UPLOAD_NAME,
     YouTubeApi,
     YouTubeUploadException,
+    exhaust_youtube_quota,
     get_video_privacy_status,
+    get_video_snippet,
+    get_youtube_quota_remaining,
     mail_youtube_upload_failure,
     mail_youtube_upload_success,
+    record_youtube_quota,
+    reserve_youtube_quota,
     strip_bad_chars,
     update_youtube_metadata,
 )
@@ -522,6 +530,50 @@ def test_video_status(youtube_mocker):
     )
 
 
+@pytest.mark.usefixtures("youtube_quota")
+def test_video_statuses(youtube_mocker):
+    """video_statuses should list up to 50 videos per call and record the quota used"""
+    video_ids = [f"video{idx}" for idx in range(120)]
+    mock_list = youtube_mocker().videos.return_value.list
+    mock_list.return_value.execute.side_effect = [
+        {
+            "items": [
+                {"id": video_id, "status": {"uploadStatus": "processed"}}
+                for video_id in video_ids[start : start + 50]
+                if video_id != "video7"
+            ]
+        }
+        for start in range(0, 120, 50)
+    ]
+    remaining = get_youtube_quota_remaining()
+
+    statuses = YouTubeApi().video_statuses(video_ids)
+
+    assert statuses == {
+        video_id: "processed" for video_id in video_ids if video_id != "video7"
+    }
+    assert [call.kwargs for call in mock_list.call_args_list] == [
+        {"part": "status", "id": ",".join(video_ids[start : start + 50])}
+        for start in range(0, 120, 50)
+    ]
+    assert get_youtube_quota_remaining() == remaining - 3 * QUOTA_COST_VIDEO_LIST
+
+
+@pytest.mark.usefixtures("youtube_quota")
+def test_youtube_quota(settings):
+    """Quota should only be reserved while there is enough of it left today"""
+    settings.YT_DAILY_QUOTA = QUOTA_COST_VIDEO_INSERT * 2 + 10
+    assert get_youtube_quota_remaining() == settings.YT_DAILY_QUOTA
+    assert reserve_youtube_quota(QUOTA_COST_VIDEO_INSERT) is True
+    assert reserve_youtube_quota(QUOTA_COST_VIDEO_INSERT) is True
+    assert reserve_youtube_quota(QUOTA_COST_VIDEO_INSERT) is False
+    assert get_youtube_quota_remaining() == 10
+    assert record_youtube_quota(QUOTA_COST_VIDEO_LIST) == settings.YT_DAILY_QUOTA - 9
+    exhaust_youtube_quota()
+    assert get_youtube_quota_remaining() == 0
+    assert reserve_youtube_quota(QUOTA_COST_VIDEO_LIST) is False
+
+
 def test_strip_bad_chars():
     """
     Test that `<`,`>` characters are removed from text
@@ -704,6 +756,7 @@ def test_mail_youtube_upload_failure_sender_exception(mocker, mock_mail):
     )
 
 
+@pytest.mark.usefixtures("youtube_quota", "youtube_metadata_digests")
 @pytest.mark.parametrize(
     ("res_draft", "expected_privacy"), [(True, None), (False, "public")]
 )
@@ -728,9 +781,10 @@ def test_update_youtube_metadata(  # pylint:disable=too-many-arguments  # noqa:
     expected_privacy,
     previously_published,
 ):
-    """Check that youtube.update_video is called for appropriate resources and not others"""
+    """Check that YouTube metadata is updated for appropriate resources and not others"""
     mock_youtube = mocker.patch("videos.youtube.YouTubeApi")
-    mock_update_video = mock_youtube.return_value.update_video
+    mock_update_snippet = mock_youtube.return_value.update_snippet
+    mock_update_privacy = mock_youtube.return_value.update_privacy
     mocker.patch("videos.youtube.is_ocw_site", return_value=is_ocw)
     mocker.patch("videos.youtube.is_youtube_enabled", return_value=youtube_enabled)
     youtube_website.publish_date = timezone.now() if previously_published else None
@@ -751,36 +805,126 @@ def test_update_youtube_metadata(  # pylint:disable=too-many-arguments  # noqa:
             set_dict_field(content.metadata, "draft", res_draft)
             content.save()
     update_youtube_metadata(youtube_website, version=version)
-    if youtube_enabled and is_ocw:
-        mock_youtube.assert_called_once()
-        # Don't update metadata for imported ocw course videos except on production
-        if video_file_exists:
-            assert mock_update_video.call_count == 2
-            for youtube_id in ["abc123", "def456"]:
-                final_privacy = get_video_privacy_status(
-                    version=version,
-                    is_draft=res_draft,
-                    previously_published=previously_published,
-                )
-
-                mock_update_video.assert_any_call(
-                    WebsiteContent.objects.get(
-                        website=youtube_website,
-                        metadata__video_metadata__youtube_id=youtube_id,
-                    ),
-                    privacy=final_privacy,
-                )
-        else:
-            mock_update_video.assert_not_called()
+    # Don't update metadata for imported ocw course videos except on production
+    if youtube_enabled and is_ocw and video_file_exists:
+        assert mock_youtube.call_count == 2
+        assert mock_update_snippet.call_count == 2
+        final_privacy = get_video_privacy_status(
+            version=version,
+            is_draft=res_draft,
+            previously_published=previously_published,
+        )
+        for youtube_id in ["abc123", "def456"]:
+            resource = WebsiteContent.objects.get(
+                website=youtube_website,
+                metadata__video_metadata__youtube_id=youtube_id,
+            )
+            mock_update_snippet.assert_any_call(
+                youtube_id, get_video_snippet(resource)[0]
+            )
+            if final_privacy:
+                mock_update_privacy.assert_any_call(youtube_id, privacy=final_privacy)
+        if not final_privacy:
+            mock_update_privacy.assert_not_called()
     else:
-        mock_update_video.assert_not_called()
+        mock_youtube.assert_not_called()
+
+
+@pytest.mark.usefixtures("youtube_quota", "youtube_metadata_digests")
+def test_update_youtube_metadata_changed(mocker, youtube_website):
+    """Only videos whose metadata changed since the last push should be updated"""
+    mock_youtube = mocker.patch("videos.youtube.YouTubeApi")
+    mock_update_snippet = mock_youtube.return_value.update_snippet
+    mocker.patch("videos.youtube.is_ocw_site", return_value=True)
+    mocker.patch("videos.youtube.is_youtube_enabled", return_value=True)
+    for youtube_id in ["abc123", "def456"]:
+        VideoFileFactory.create(
+            video=VideoFactory.create(website=youtube_website),
+            destination=DESTINATION_YOUTUBE,
+            destination_id=youtube_id,
+        )
+
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    assert mock_update_snippet.call_count == 2
+
+    mock_update_snippet.reset_mock()
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    mock_update_snippet.assert_not_called()
+
+    content = WebsiteContent.objects.get(
+        website=youtube_website, metadata__video_metadata__youtube_id="def456"
+    )
+    content.title = "A new title"
+    content.save()
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    mock_update_snippet.assert_called_once_with("def456", get_video_snippet(content)[0])
+
+    # A change of privacy should be pushed too
+    mock_update_snippet.reset_mock()
+    update_youtube_metadata(youtube_website, version=VERSION_LIVE)
+    assert mock_update_snippet.call_count == 2
+
+
+@pytest.mark.usefixtures("youtube_quota", "youtube_metadata_digests")
+def test_update_youtube_metadata_captions_changed(mocker, youtube_website):
+    """New captions saved under the same file name should be pushed again"""
+    mock_youtube = mocker.patch("videos.youtube.YouTubeApi")
+    mock_upload_captions = mock_youtube.return_value.upload_captions
+    mocker.patch("videos.youtube.is_ocw_site", return_value=True)
+    mocker.patch("videos.youtube.is_youtube_enabled", return_value=True)
+    video = VideoFactory.create(website=youtube_website)
+    video.webvtt_transcript_file = SimpleUploadedFile(
+        "transcript.webvtt", b"old captions"
+    )
+    video.save()
+    VideoFileFactory.create(
+        video=video, destination=DESTINATION_YOUTUBE, destination_id="abc123"
+    )
+
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    mock_upload_captions.assert_called_once()
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    mock_upload_captions.assert_called_once()
+
+    # 3Play transcripts overwrite the same file, then the video is saved
+    transcript_name = video.webvtt_transcript_file.name
+    with video.webvtt_transcript_file.open("wb") as transcript:
+        transcript.write(b"new captions")
+    video.save()
+    assert video.webvtt_transcript_file.name == transcript_name
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    assert mock_upload_captions.call_count == 2
 
 
-def test_update_youtube_metadata_error(mocker, youtube_website):
+@pytest.mark.usefixtures("youtube_quota", "youtube_metadata_digests")
+def test_update_youtube_metadata_quota(settings, mocker, youtube_website):
+    """Videos should not be updated if there is not enough quota left for them"""
+    settings.YT_DAILY_QUOTA = QUOTA_COST_VIDEO_UPDATE * 3
+    youtube_website.publish_date = None
+    youtube_website.save()
+    mock_youtube = mocker.patch("videos.youtube.YouTubeApi")
+    mock_update_snippet = mock_youtube.return_value.update_snippet
+    mocker.patch("videos.youtube.is_ocw_site", return_value=True)
+    mocker.patch("videos.youtube.is_youtube_enabled", return_value=True)
+    for youtube_id in ["abc123", "def456"]:
+        VideoFileFactory.create(
+            video=VideoFactory.create(website=youtube_website),
+            destination=DESTINATION_YOUTUBE,
+            destination_id=youtube_id,
+        )
+
+    # Each unpublished video needs one update for its snippet and one for its privacy
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    mock_update_snippet.assert_called_once()
+    assert get_youtube_quota_remaining() == QUOTA_COST_VIDEO_UPDATE
+
+
+@pytest.mark.usefixtures("youtube_quota", "youtube_metadata_digests")
+def test_update_youtube_metadata_error(settings, mocker, youtube_website):
     """Log any error and move on"""
     mock_log = mocker.patch("videos.youtube.log.exception")
     mock_youtube = mocker.patch("videos.youtube.YouTubeApi")
-    mock_youtube.return_value.update_video = mocker.Mock(
+    mock_youtube.return_value.update_snippet = mocker.Mock(
         side_effect=Exception("generic exception")
     )
     mocker.patch("videos.youtube.is_ocw_site", return_value=True)
@@ -794,6 +938,15 @@ def test_update_youtube_metadata_error(mocker, youtube_website):
     mock_log.assert_any_call(
         "Unexpected error updating metadata for video resource %d", mocker.ANY
     )
+    # Only the quota of the call that was made is kept
+    assert (
+        get_youtube_quota_remaining()
+        == settings.YT_DAILY_QUOTA - QUOTA_COST_VIDEO_UPDATE
+    )
+
+    # The failed update should be tried again on the next publish
+    update_youtube_metadata(youtube_website, version=VERSION_DRAFT)
+    assert mock_youtube.return_value.update_snippet.call_count == 2
 
 
 def test_update_youtube_metadata_no_videos(mocker):
@@ -3,17 +3,30 @@
 import logging
 import os
 import re
+from collections import defaultdict
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 from uuid import UUID
 
 from django.conf import settings
-from django.db.models import CharField, Q, QuerySet
+from django.db import transaction
+from django.db.models import (
+    Case,
+    CharField,
+    DurationField,
+    F,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
 from django.db.models.functions import Cast, Length
 from magic import Magic
 from mitol.common.utils import max_or_none, now_in_utc
 from mitol.mail.api import get_message_sender
 
 from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
+from content_sync.models import SiteBuildInputs
 from main.utils import (
     NestableKeyTextTransform,
     get_base_filename,
@@ -31,6 +44,7 @@ from websites.constants import (
     CONTENT_FILENAME_MAX_LEN,
     PUBLISH_STATUS_ABORTED,
     PUBLISH_STATUS_ERRORED,
+    PUBLISH_STATUS_STARTED,
     PUBLISH_STATUS_SUCCEEDED,
     PUBLISH_STATUSES_FINAL,
     RESOURCE_TYPE_VIDEO,
@@ -49,6 +63,7 @@ from websites.utils import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from datetime import datetime
 
     from django.core.files.uploadedfile import UploadedFile
@@ -485,20 +500,32 @@ def reset_publishing_fields(website_name: str):
     )
 
 
-def update_website_status(  # noqa: PLR0913, PLR0917
+def _get_build_duration(version: str, update_time: datetime) -> Case:
+    """
+    Return an expression for the build duration of a Website version whose build
+    just succeeded. It is the time since the started status if that was the last
+    status, and is otherwise left as it was. Being an expression, it is worked
+    out for each row when many Websites are updated at once.
+    """
+    return Case(
+        When(
+            **{f"{version}_publish_status": PUBLISH_STATUS_STARTED},
+            then=Value(update_time) - F(f"{version}_publish_status_updated_on"),
+        ),
+        default=F(f"{version}_build_duration"),
+        output_field=DurationField(),
+    )
+
+
+def _get_website_status_update(
     website: Website,
     version: str,
     status: str,
     update_time: datetime,
-    unpublished=False,  # noqa: FBT002
-    build_id=None,
-    is_cdn_cache_step=False,  # noqa: FBT002
-):
-    is_studio_publish = str(build_id) in [
-        str(website.latest_build_id_live),
-        str(website.latest_build_id_draft),
-    ]
-    """Update some status fields in Website"""
+    *,
+    unpublished: bool = False,
+) -> tuple[User | None, dict]:
+    """Return the user to notify and the Website fields to update for a status"""
     if version == VERSION_DRAFT:
         user = website.draft_last_published_by
         update_kwargs = {
@@ -508,6 +535,9 @@ def update_website_status(  # noqa: PLR0913, PLR0917
         if status in PUBLISH_STATUSES_FINAL:
             if status == PUBLISH_STATUS_SUCCEEDED:
                 update_kwargs["draft_build_date"] = update_time
+                update_kwargs["draft_build_duration"] = _get_build_duration(
+                    VERSION_DRAFT, update_time
+                )
             else:
                 # Allow user to retry
                 update_kwargs["has_unpublished_draft"] = True
@@ -531,10 +561,30 @@ def update_website_status(  # noqa: PLR0913, PLR0917
                 if website.first_published_to_production is None:
                     update_kwargs["first_published_to_production"] = update_time
                 update_kwargs["live_build_date"] = update_time
+                update_kwargs["live_build_duration"] = _get_build_duration(
+                    VERSION_LIVE, update_time
+                )
             else:
                 # Allow user to retry
                 update_kwargs["has_unpublished_live"] = True
-    Website.objects.filter(name=website.name).update(**update_kwargs)
+    return user, update_kwargs
+
+
+def _notify_website_status(  # noqa: PLR0913
+    website: Website,
+    version: str,
+    status: str,
+    user: User | None,
+    *,
+    unpublished: bool = False,
+    build_id=None,
+    is_cdn_cache_step: bool = False,
+):
+    """Log failed builds and email the publisher once a studio publish finishes"""
+    is_studio_publish = str(build_id) in [
+        str(website.latest_build_id_live),
+        str(website.latest_build_id_draft),
+    ]
     if status in (PUBLISH_STATUS_ERRORED, PUBLISH_STATUS_ABORTED):
         log.error("A %s pipeline build failed for %s", version, website.name)
     if (
@@ -549,6 +599,96 @@ def update_website_status(  # noqa: PLR0913, PLR0917
         )
 
 
+def update_website_status(  # noqa: PLR0913, PLR0917
+    website: Website,
+    version: str,
+    status: str,
+    update_time: datetime,
+    unpublished=False,  # noqa: FBT002
+    build_id=None,
+    is_cdn_cache_step=False,  # noqa: FBT002
+):
+    """Update some status fields in Website"""
+    user, update_kwargs = _get_website_status_update(
+        website, version, status, update_time, unpublished=unpublished
+    )
+    Website.objects.filter(name=website.name).update(**update_kwargs)
+    if status == PUBLISH_STATUS_SUCCEEDED:
+        SiteBuildInputs.objects.filter(
+            website__name=website.name, version=version
+        ).apply_pending()
+    _notify_website_status(
+        website,
+        version,
+        status,
+        user,
+        unpublished=unpublished,
+        build_id=build_id,
+        is_cdn_cache_step=is_cdn_cache_step,
+    )
+
+
+@dataclass(frozen=True)
+class WebsiteStatusUpdate:
+    """A publishing status update for a Website, see update_website_statuses"""
+
+    website: Website
+    version: str
+    status: str
+    build_id: int | None = None
+    unpublished: bool = False
+    is_cdn_cache_step: bool = False
+
+
+def update_website_statuses(
+    status_updates: Iterable[WebsiteStatusUpdate], update_time: datetime
+):
+    """
+    Update the status fields of many Websites, like update_website_status. Websites
+    that need the same fields updated share one UPDATE query.
+
+    Args:
+        status_updates(Iterable[WebsiteStatusUpdate]): The status updates to apply
+        update_time(datetime): The time of the status updates
+    """
+    names_by_update = defaultdict(list)
+    notifications = []
+    for update in status_updates:
+        unpublished = update.unpublished and update.version == VERSION_LIVE
+        user, update_kwargs = _get_website_status_update(
+            update.website,
+            update.version,
+            update.status,
+            update_time,
+            unpublished=unpublished,
+        )
+        names_by_update[tuple(sorted(update_kwargs.items()))].append(
+            update.website.name
+        )
+        notifications.append((update, user, unpublished))
+    succeeded_names = defaultdict(list)
+    for update, _, _ in notifications:
+        if update.status == PUBLISH_STATUS_SUCCEEDED:
+            succeeded_names[update.version].append(update.website.name)
+    with transaction.atomic():
+        for update_items, names in names_by_update.items():
+            Website.objects.filter(name__in=names).update(**dict(update_items))
+        for version, names in succeeded_names.items():
+            SiteBuildInputs.objects.filter(
+                website__name__in=names, version=version
+            ).apply_pending()
+    for update, user, unpublished in notifications:
+        _notify_website_status(
+            update.website,
+            update.version,
+            update.status,
+            user,
+            unpublished=unpublished,
+            build_id=update.build_id,
+            is_cdn_cache_step=update.is_cdn_cache_step,
+        )
+
+
 def get_content_warnings(website):
     """
     Return array with error/warning messages for any website content missing expected data
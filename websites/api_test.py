@@ -1,5 +1,6 @@
 """Tests for websites API functionality"""
 
+from datetime import timedelta
 from unittest.mock import patch
 from uuid import UUID
 
@@ -11,6 +12,7 @@ from content_sync.constants import VERSION_DRAFT, VERSION_LIVE
 from users.factories import UserFactory
 from videos.constants import YT_THUMBNAIL_IMG
 from websites.api import (
+    WebsiteStatusUpdate,
     auto_link_video_captions_transcript,
     detect_mime_type,
     fetch_website,
@@ -24,6 +26,7 @@ from websites.api import (
     sync_website_content_references,
     unlink_deleted_resource_from_videos,
     update_website_status,
+    update_website_statuses,
     update_youtube_thumbnail,
     videos_missing_captions,
     videos_with_truncatable_text,
@@ -487,6 +490,65 @@ def test_update_website_status(mocker, status, notify, has_user, version):
     assert mock_log.call_count == (1 if status == PUBLISH_STATUS_ERRORED else 0)
 
 
+def test_update_website_statuses(mocker, django_assert_max_num_queries):
+    """update_website_statuses should update websites sharing an update together"""
+    mock_mail = mocker.patch("websites.api.mail_on_publish")
+    user = UserFactory.create()
+    succeeded = WebsiteFactory.create_batch(
+        3, live_last_published_by=user, latest_build_id_live=1
+    )
+    started = WebsiteFactory.create(draft_last_published_by=user)
+    now = now_in_utc()
+    with django_assert_max_num_queries(5):
+        update_website_statuses(
+            [
+                *[
+                    WebsiteStatusUpdate(
+                        website, VERSION_LIVE, PUBLISH_STATUS_SUCCEEDED, build_id=1
+                    )
+                    for website in succeeded
+                ],
+                WebsiteStatusUpdate(started, VERSION_DRAFT, PUBLISH_STATUS_STARTED),
+            ],
+            now,
+        )
+    for website in succeeded:
+        website.refresh_from_db()
+        assert website.live_publish_status == PUBLISH_STATUS_SUCCEEDED
+        assert website.live_build_date == now
+    started.refresh_from_db()
+    assert started.draft_publish_status == PUBLISH_STATUS_STARTED
+    assert started.draft_publish_status_updated_on == now
+    assert mock_mail.call_count == len(succeeded)
+
+
+@pytest.mark.parametrize("version", [VERSION_DRAFT, VERSION_LIVE])
+@pytest.mark.parametrize("was_started", [True, False])
+def test_update_website_status_build_duration(mocker, version, was_started):
+    """A successful build should record how long the version took since it started"""
+    mocker.patch("websites.api.mail_on_publish")
+    other_version = VERSION_LIVE if version == VERSION_DRAFT else VERSION_DRAFT
+    previous_duration = timedelta(minutes=5)
+    other_duration = timedelta(minutes=40)
+    now = now_in_utc()
+    website = WebsiteFactory.create(
+        **{
+            f"{version}_build_duration": previous_duration,
+            f"{version}_publish_status": (
+                PUBLISH_STATUS_STARTED if was_started else PUBLISH_STATUS_ERRORED
+            ),
+            f"{version}_publish_status_updated_on": now - timedelta(minutes=20),
+            f"{other_version}_build_duration": other_duration,
+        },
+    )
+    update_website_status(website, version, PUBLISH_STATUS_SUCCEEDED, now)
+    website.refresh_from_db()
+    assert getattr(website, f"{version}_build_duration") == (
+        timedelta(minutes=20) if was_started else previous_duration
+    )
+    assert getattr(website, f"{other_version}_build_duration") == other_duration
+
+
 @pytest.mark.parametrize("version", [VERSION_DRAFT, VERSION_LIVE])
 @patch("websites.api.mail_on_publish")
 def test_update_website_status_sends_notification(mock_mail_on_publish, version):
@@ -2,11 +2,10 @@
 
 from collections import namedtuple
 
-from botocore.exceptions import ClientError
 from django.conf import settings
 
 from main.management.commands.filter import WebsiteFilterCommand
-from main.s3_utils import get_boto3_resource
+from main.s3_inventory import S3Inventory
 from main.utils import get_base_filename, get_file_extension
 from videos.utils import parse_caption_language_locale
 from websites.api import get_valid_new_filename
@@ -46,16 +45,9 @@ _FIELD_CONFIG = (
 _BULK_UPDATE_BATCH_SIZE = 500
 
 
-def _load_s3_object(s3, bucket_name, key):
-    """Return the loaded S3 object, or None if it doesn't exist."""
-    obj = s3.Object(bucket_name, key)
-    try:
-        obj.load()
-    except ClientError as exc:
-        if exc.response["Error"]["Code"] in ("404", "NoSuchKey"):
-            return None
-        raise
-    return obj
+def _load_s3_object(inventory, key):
+    """Return the inventoried S3 object, or None if it doesn't exist."""
+    return inventory.lookup(key)
 
 
 class Command(WebsiteFilterCommand):
@@ -161,8 +153,7 @@ class Command(WebsiteFilterCommand):
         if resource is not None:
             return resource
 
-        bucket_name = settings.AWS_STORAGE_BUCKET_NAME
-        s3_object = _load_s3_object(self.s3, bucket_name, key)
+        s3_object = _load_s3_object(self.inventory, key)
         if s3_object is None:
             self.stdout.write(
                 f"Skipping missing S3 object for "
@@ -209,7 +200,7 @@ class Command(WebsiteFilterCommand):
         # to the bare shape if there's no starter to read a schema from.
         resource_type_fields = {
             "file_type": field_config.file_type,
-            "file_size": s3_object.content_length,
+            "file_size": s3_object.size,
             **dict.fromkeys(settings.RESOURCE_TYPE_FIELDS, field_config.resourcetype),
         }
         if content.website.starter is not None:
@@ -356,54 +347,54 @@ class Command(WebsiteFilterCommand):
         """Run the backfill."""
         super().handle(*args, **options)
 
-        self.s3 = get_boto3_resource("s3")
-        total_updated = 0
-        all_updated_website_ids = set()
-        objects_to_update = []
-        batch_website_ids = set()
-        website_qset = self.filter_websites(Website.objects.all())
-
-        content_qset = (
-            WebsiteContent.objects.filter(
-                website__in=website_qset,
-                metadata__resourcetype="Video",
-                metadata__video_files__isnull=False,
-            )
-            .select_related("website", "website__starter")
-            .only(
-                "id",
-                "filename",
-                "dirpath",
-                "title",
-                "metadata",
-                "website__name",
-                "website__url_path",
-                "website__starter__config",
+        with S3Inventory() as self.inventory:
+            total_updated = 0
+            all_updated_website_ids = set()
+            objects_to_update = []
+            batch_website_ids = set()
+            website_qset = self.filter_websites(Website.objects.all())
+
+            content_qset = (
+                WebsiteContent.objects.filter(
+                    website__in=website_qset,
+                    metadata__resourcetype="Video",
+                    metadata__video_files__isnull=False,
+                )
+                .select_related("website", "website__starter")
+                .only(
+                    "id",
+                    "filename",
+                    "dirpath",
+                    "title",
+                    "metadata",
+                    "website__name",
+                    "website__url_path",
+                    "website__starter__config",
+                )
             )
-        )
-
-        # Not a small, curated set: this matches every video with a
-        # video_files key across every website, in the thousands on real
-        # data, so .iterator() avoiding loading the whole queryset into
-        # memory at once matters here.
-        for content in content_qset.iterator():
-            if self._backfill_video(content):
-                objects_to_update.append(content)
-                batch_website_ids.add(content.website_id)
 
-            if len(objects_to_update) >= _BULK_UPDATE_BATCH_SIZE:
+            # Not a small, curated set: this matches every video with a
+            # video_files key across every website, in the thousands on real
+            # data, so .iterator() avoiding loading the whole queryset into
+            # memory at once matters here.
+            for content in content_qset.iterator():
+                if self._backfill_video(content):
+                    objects_to_update.append(content)
+                    batch_website_ids.add(content.website_id)
+
+                if len(objects_to_update) >= _BULK_UPDATE_BATCH_SIZE:
+                    self._flush(objects_to_update, batch_website_ids)
+                    total_updated += len(objects_to_update)
+                    all_updated_website_ids |= batch_website_ids
+                    objects_to_update = []
+                    batch_website_ids = set()
+
+            if objects_to_update:
                 self._flush(objects_to_update, batch_website_ids)
                 total_updated += len(objects_to_update)
                 all_updated_website_ids |= batch_website_ids
-                objects_to_update = []
-                batch_website_ids = set()
 
-        if objects_to_update:
-            self._flush(objects_to_update, batch_website_ids)
-            total_updated += len(objects_to_update)
-            all_updated_website_ids |= batch_website_ids
-
-        self.stdout.write(
-            f"Backfilled {total_updated} video resources across "
-            f"{len(all_updated_website_ids)} websites."
-        )
+            self.stdout.write(
+                f"Backfilled {total_updated} video resources across "
+                f"{len(all_updated_website_ids)} websites."
+            )
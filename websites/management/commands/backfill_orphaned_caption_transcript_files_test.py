@@ -468,12 +468,12 @@ def test_partial_progress_persists_on_mid_run_failure(mock_s3, monkeypatch):
     original_load = cmd_module._load_s3_object  # noqa: SLF001
     call_count = 0
 
-    def _fail_on_third_call(s3, bucket_name, key):
+    def _fail_on_third_call(inventory, key):
         nonlocal call_count
         call_count += 1
         if call_count == 3:
             raise TransientS3Error
-        return original_load(s3, bucket_name, key)
+        return original_load(inventory, key)
 
     monkeypatch.setattr(cmd_module, "_load_s3_object", _fail_on_third_call)
 
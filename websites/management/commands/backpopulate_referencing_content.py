@@ -4,6 +4,7 @@ from django.conf import settings
 from django.db import transaction
 from mitol.common.utils import now_in_utc
 
+from main.constants import DEFAULT_BATCH_SIZE
 from main.management.commands.filter import WebsiteFilterCommand
 from websites import constants
 from websites.models import Website, WebsiteContent
@@ -13,8 +14,6 @@ from websites.utils import (
     resolve_video_file_referenced_content_ids,
 )
 
-BATCH_SIZE_DEFAULT = 500  # Default batch size for processing content
-
 # Top-level metadata keys under which video caption/transcript resources are
 # stored, derived from settings so custom field paths are respected.
 _VIDEO_FILE_TOP_KEYS = frozenset(
@@ -30,21 +29,11 @@ class Command(WebsiteFilterCommand):
 
     help = "Backpopulate referencing content for existing resources"
 
-    def add_arguments(self, parser, *args, **kwargs):
-        """Add command arguments."""
-        super().add_arguments(parser, *args, **kwargs)
-        parser.add_argument(
-            "--batch-size",
-            type=int,
-            default=BATCH_SIZE_DEFAULT,
-            help="Number of content items to process in each batch (default: )",
-        )
-
     def handle(self, *args, **options):
         """Handle the management command execution."""
         super().handle(*args, **options)
 
-        batch_size = options["batch_size"] or BATCH_SIZE_DEFAULT
+        batch_size = options["batch_size"] or DEFAULT_BATCH_SIZE
         verbosity = options["verbosity"]
 
         self.stdout.write("Backpopulating referencing content for existing resources")
@@ -64,29 +53,15 @@ class Command(WebsiteFilterCommand):
             )
 
         total_updated = 0
-        offset = 0
-
-        while offset < total_content:
-            if verbosity >= 1:
-                self.stdout.write(
-                    f"Processing batch {offset // batch_size + 1}: "
-                    f"items {offset + 1} to {min(offset + batch_size, total_content)}"
-                )
-
-            batch_updated = self._process_batch(
-                website_qset, offset, batch_size, verbosity
-            )
+        for content_batch in self.iterate_batches(
+            WebsiteContent.objects.filter(website__in=website_qset),
+            batch_size=batch_size,
+            total=total_content,
+        ):
+            batch_updated = self._process_batch(content_batch, verbosity)
             total_updated += batch_updated
-            offset += batch_size
-
-            # Progress update
-            processed = min(offset, total_content)
             if verbosity >= 1:
-                self.stdout.write(
-                    f"Processed {processed}/{total_content} items "
-                    f"({processed / total_content * 100:.1f}%) - "
-                    f"{batch_updated} updated in this batch"
-                )
+                self.stdout.write(f"{batch_updated} updated in this batch")
 
         total_seconds = (now_in_utc() - start).total_seconds()
         self.stdout.write(
@@ -98,13 +73,8 @@ class Command(WebsiteFilterCommand):
             f"{total_updated} content updated"
         )
 
-    def _process_batch(self, website_qset, offset, batch_size, verbosity):
+    def _process_batch(self, content_batch, verbosity):
         """Process a batch of content items."""
-        # Fetch a batch of content
-        content_batch = WebsiteContent.objects.filter(website__in=website_qset)[
-            offset : offset + batch_size
-        ]
-
         if verbosity >= 3:  # noqa: PLR2004
             self.stdout.write(f"Fetched {len(content_batch)} content items for batch")
 
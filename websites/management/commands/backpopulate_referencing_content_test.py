@@ -27,6 +27,7 @@ from websites.factories import (
     WebsiteStarterFactory,
 )
 from websites.management.commands.backpopulate_referencing_content import Command
+from websites.models import WebsiteContent
 
 pytestmark = pytest.mark.django_db
 
@@ -114,8 +115,8 @@ class BackpopulateReferencingContentCommandTest(TestCase):
         """Test _process_batch method"""
         command = Command()
 
-        website_qset = [self.website1]
-        batch_updated = command._process_batch(website_qset, 0, 10, verbosity=0)  # noqa: SLF001
+        content_batch = list(WebsiteContent.objects.filter(website=self.website1))
+        batch_updated = command._process_batch(content_batch, verbosity=0)  # noqa: SLF001
 
         assert batch_updated == 1
 
@@ -129,7 +130,8 @@ class BackpopulateReferencingContentCommandTest(TestCase):
         website = WebsiteFactory.create()
         WebsiteContentFactory.create(website=website, type=CONTENT_TYPE_RESOURCE)
 
-        batch_updated = command._process_batch([website], 0, 10, verbosity=0)  # noqa: SLF001
+        content_batch = list(WebsiteContent.objects.filter(website=website))
+        batch_updated = command._process_batch(content_batch, verbosity=0)  # noqa: SLF001
 
         assert batch_updated == 0
 
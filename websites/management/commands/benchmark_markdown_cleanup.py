@@ -0,0 +1,75 @@
+"""Time the grammars used by markdown_cleanup rules over a fixture corpus."""  # noqa: INP001
+
+from django.core.management import BaseCommand, CommandError
+
+from websites.management.commands.markdown_cleaning.benchmark import (
+    DEFAULT_CORPUS_PATH,
+    benchmark_rules,
+    load_corpus,
+)
+from websites.management.commands.markdown_cleaning.parsing_utils import (
+    enable_packrat,
+)
+from websites.management.commands.markdown_cleanup import Command as CleanupCommand
+
+
+class Command(BaseCommand):
+    """Time the grammars used by markdown_cleanup rules over a fixture corpus."""
+
+    help = __doc__
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corpus",
+            dest="corpus",
+            default=DEFAULT_CORPUS_PATH,
+            help="Path to a WebsiteContent JSON fixture to use as the corpus.",
+        )
+        parser.add_argument(
+            "--repeat",
+            dest="repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs per rule. The best run is reported.",
+        )
+        parser.add_argument(
+            "--packrat",
+            dest="packrat",
+            action="store_true",
+            default=False,
+            help="Enable pyparsing packrat memoization before timing.",
+        )
+        parser.add_argument(
+            "--max-ms-per-kb",
+            dest="max_ms_per_kb",
+            type=float,
+            default=None,
+            help="If provided, fail when any rule is slower than this many milliseconds per KB of text.",  # noqa: E501
+        )
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        if options["packrat"]:
+            enable_packrat()
+        corpus = load_corpus(options["corpus"])
+        timings = benchmark_rules(
+            CleanupCommand.Rules, corpus, repeat=options["repeat"]
+        )
+
+        self.stdout.write(
+            f"{'rule':<36}{'texts':>8}{'chars':>10}{'matches':>9}{'ms':>10}{'ms/KB':>9}"
+        )
+        for timing in timings:
+            self.stdout.write(
+                f"{timing.alias:<36}{timing.texts:>8}{timing.characters:>10}"
+                f"{timing.matches:>9}{timing.seconds * 1000:>10.2f}"
+                f"{timing.ms_per_kb:>9.2f}"
+            )
+
+        max_ms_per_kb = options["max_ms_per_kb"]
+        if max_ms_per_kb is not None:
+            slow = [
+                timing.alias for timing in timings if timing.ms_per_kb > max_ms_per_kb
+            ]
+            if slow:
+                msg = f"Rules slower than {max_ms_per_kb} ms/KB: {slow}"
+                raise CommandError(msg)
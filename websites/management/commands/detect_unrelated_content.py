@@ -14,6 +14,7 @@ from tempfile import NamedTemporaryFile
 from django.conf import settings
 
 from main.management.commands.filter import WebsiteFilterCommand
+from main.s3_inventory import S3Inventory, list_prefix
 from main.s3_utils import get_boto3_resource
 from websites.models import Website, WebsiteContent
 
@@ -22,19 +23,7 @@ def list_all_s3_keys(s3_client, bucket, prefix):
     """
     Retrieve all object keys from an S3 bucket using pagination.
     """
-    all_keys = set()
-    response = s3_client.list_objects_v2(Bucket=bucket, Prefix=prefix)
-    while True:
-        if response.get("Contents"):
-            all_keys.update(item["Key"] for item in response["Contents"])
-        if response.get("IsTruncated"):
-            token = response.get("NextContinuationToken")
-            response = s3_client.list_objects_v2(
-                Bucket=bucket, Prefix=prefix, ContinuationToken=token
-            )
-        else:
-            break
-    return all_keys
+    return {obj.key for obj in list_prefix(s3_client, bucket, prefix)}
 
 
 class Command(WebsiteFilterCommand):
@@ -50,6 +39,13 @@ class Command(WebsiteFilterCommand):
         parser.add_argument(
             "--delete", action="store_true", help="Delete unrelated resources from S3"
         )
+        parser.add_argument(
+            "--inventory-ttl",
+            dest="inventory_ttl",
+            type=int,
+            default=None,
+            help="Reuse S3 listings from the local inventory that are younger than this many seconds",  # noqa: E501
+        )
 
     def handle(self, *args, **options):
         """
@@ -73,57 +69,69 @@ class Command(WebsiteFilterCommand):
 
         self.unrelated_files_count = 0
 
-        for website in websites:
-            self._process_files(website.s3_path, website, s3, unrelated_files_by_site)
+        with S3Inventory(ttl=options["inventory_ttl"]) as inventory:
+            websites = list(websites)
+            inventory.refresh(self._get_prefix(website.s3_path) for website in websites)
+            for website in websites:
+                self._process_files(
+                    website.s3_path, website, inventory, unrelated_files_by_site
+                )
 
-        if unrelated_files_by_site:
-            self.stdout.write(
-                self.style.SUCCESS("Unrelated content found in the bucket!")
-            )
-            is_delete = options.get("delete")
-            if is_delete:
-                deleted_keys = self._delete_unrelated_files(s3, unrelated_files_by_site)
-                action = "deleted"
-                result_data = deleted_keys
-                count = len(deleted_keys)
+            if unrelated_files_by_site:
+                self.stdout.write(
+                    self.style.SUCCESS("Unrelated content found in the bucket!")
+                )
+                is_delete = options.get("delete")
+                if is_delete:
+                    deleted_keys = self._delete_unrelated_files(
+                        s3, unrelated_files_by_site
+                    )
+                    inventory.discard(deleted_keys)
+                    action = "deleted"
+                    result_data = deleted_keys
+                    count = len(deleted_keys)
+                else:
+                    action = "detected"
+                    result_data = unrelated_files_by_site
+                    count = self.unrelated_files_count
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{action.capitalize()} {count} unrelated files from S3."
+                    )
+                )
+                self._output_result(result_data, count, action)
             else:
-                action = "detected"
-                result_data = unrelated_files_by_site
-                count = self.unrelated_files_count
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"{action.capitalize()} {count} unrelated files from S3."
+                self.stdout.write(
+                    self.style.WARNING("No unrelated content found in the bucket.")
                 )
-            )
-            self._output_result(result_data, count, action)
-        else:
-            self.stdout.write(
-                self.style.WARNING("No unrelated content found in the bucket.")
-            )
 
-    def _process_files(self, prefix, website, s3, unrelated_files_by_site):
+    @staticmethod
+    def _get_prefix(s3_path):
+        """
+        Terminate the prefix with "/" so the listing does not match sibling
+        sites whose name has this site's name as a string prefix. Without it,
+        listing "courses/game-theory" also returns the keys of
+        "courses/game-theory-and-political-theory", which would then be
+        flagged as unrelated and deleted. A site's objects all live *under*
+        "<s3_path>/", so the trailing slash still matches every one of them
+        and only excludes the colliding siblings.
+        """
+        if not s3_path.endswith("/"):
+            return f"{s3_path}/"
+        return s3_path
+
+    def _process_files(self, prefix, website, inventory, unrelated_files_by_site):
         """
         Process files in the S3 bucket for a given website.
-        This function retrieves all S3 keys for the specified prefix and
-        compares them with the files associated with the website.
+        This function reads all S3 keys for the specified prefix from the
+        inventory and compares them with the files associated with the website.
         Args:
             prefix (str): The S3 prefix for the website.
             website (Website): The website object.
-            s3: The S3 resource object.
+            inventory (S3Inventory): An inventory with the prefix already listed.
             unrelated_files_by_site (dict): A dictionary to store unrelated files.
         """
-        # Terminate the prefix with "/" so the listing does not match sibling
-        # sites whose name has this site's name as a string prefix. Without it,
-        # listing "courses/game-theory" also returns the keys of
-        # "courses/game-theory-and-political-theory", which would then be
-        # flagged as unrelated and deleted. A site's objects all live *under*
-        # "<s3_path>/", so the trailing slash still matches every one of them
-        # and only excludes the colliding siblings.
-        if not prefix.endswith("/"):
-            prefix = f"{prefix}/"
-        s3_file_keys = list_all_s3_keys(
-            s3.meta.client, settings.AWS_STORAGE_BUCKET_NAME, prefix
-        )
+        s3_file_keys = inventory.keys(self._get_prefix(prefix))
         if s3_file_keys:
             normalized_website_content_files = self._filter_unrelated_files(website)
 
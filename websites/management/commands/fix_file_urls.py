@@ -2,13 +2,14 @@
 
 import csv
 import re
+from itertools import chain
 
 from django.conf import settings
 from mitol.common.utils import now_in_utc
 
 from content_sync.tasks import sync_unsynced_websites
 from main.management.commands.filter import WebsiteFilterCommand
-from main.s3_utils import get_boto3_resource
+from main.s3_inventory import S3Inventory
 from websites.constants import CONTENT_TYPE_RESOURCE
 from websites.models import WebsiteContent
 
@@ -65,33 +66,46 @@ class Command(WebsiteFilterCommand):
         )
         bad_paths = self.filter_website_contents(website_contents=bad_paths)
 
+        bad_paths_count = bad_paths.count()
         self.stdout.write(
-            f"Found {bad_paths.count()} resources with '{prefix}/' file paths missing website names"  # noqa: E501
+            f"Found {bad_paths_count} resources with '{prefix}/' file paths missing website names"  # noqa: E501
         )
 
-        s3_bucket = get_boto3_resource("s3").Bucket(
-            name=settings.AWS_STORAGE_BUCKET_NAME
-        )
-        for content in bad_paths:
-            new_path = re.sub(
-                rf"^(/?{prefix}/)(.*)",
-                rf"{prefix}/{content.website.name}/\2",
-                content.file.name,
+        # Each affected website's folder is listed once up front, rather than
+        # listing the new path of every resource individually.
+        with S3Inventory() as inventory:
+            inventory.refresh(
+                f"{prefix}/{website_name}/"
+                for website_name in bad_paths.values_list("website__name", flat=True)
             )
-            file_exists = len(list(s3_bucket.objects.filter(Prefix=new_path))) == 1
-            content_summary = {
-                "website": content.website.name,
-                "content": content.text_id,
-                "original_path": content.file,
-                "new_path": new_path,
-                "exists": file_exists,
-            }
-            if not file_exists:
-                self.stderr.write(f"Content not found at new path: {content_summary}.")
-            modified_content.append(content_summary)
-            if commit_changes and file_exists:
-                content.file = new_path
-                content.save()
+            for content in chain.from_iterable(
+                self.iterate_batches(
+                    bad_paths.select_related("website"),
+                    batch_size=options["batch_size"],
+                    total=bad_paths_count,
+                )
+            ):
+                new_path = re.sub(
+                    rf"^(/?{prefix}/)(.*)",
+                    rf"{prefix}/{content.website.name}/\2",
+                    content.file.name,
+                )
+                file_exists = len(inventory.keys(new_path)) == 1
+                content_summary = {
+                    "website": content.website.name,
+                    "content": content.text_id,
+                    "original_path": content.file,
+                    "new_path": new_path,
+                    "exists": file_exists,
+                }
+                if not file_exists:
+                    self.stderr.write(
+                        f"Content not found at new path: {content_summary}."
+                    )
+                modified_content.append(content_summary)
+                if commit_changes and file_exists:
+                    content.file = new_path
+                    content.save()
 
         if csv_output and modified_content:
             self.stdout.write(f"Writing affected content to csv file {csv_output}")
@@ -0,0 +1,130 @@
+"""Time the grammars used by markdown cleanup rules over a corpus of content."""
+
+import json
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from websites.management.commands.markdown_cleaning.cleaner import (
+    WebsiteContentMarkdownCleaner,
+)
+from websites.management.commands.markdown_cleaning.cleanup_rule import (
+    MarkdownCleanupRule,
+    PyparsingRule,
+    RegexpCleanupRule,
+)
+from websites.management.commands.markdown_cleaning.parsing_utils import get_parser
+from websites.models import WebsiteContent
+
+DEFAULT_CORPUS_PATH = "test_site_fixtures/test_website_content.json"
+
+
+@dataclass
+class RuleTiming:
+    """Timing results for a single rule."""
+
+    alias: str
+    texts: int
+    characters: int
+    matches: int
+    seconds: float
+
+    @property
+    def ms_per_kb(self) -> float:
+        """Milliseconds spent per kilobyte of scanned text."""
+        if not self.characters:
+            return 0.0
+        return self.seconds * 1000 / (self.characters / 1024)
+
+
+def load_corpus(path: str = DEFAULT_CORPUS_PATH) -> list[WebsiteContent]:
+    """
+    Load unsaved WebsiteContent objects from a JSON fixture, such as the one
+    written by the export_test_sites command.
+    """
+    with Path(path).open(encoding="utf-8") as corpus_file:
+        records = json.load(corpus_file)
+    return [
+        WebsiteContent(
+            markdown=record["fields"].get("markdown"),
+            metadata=record["fields"].get("metadata"),
+        )
+        for record in records
+        if record.get("model") == "websites.websitecontent"
+    ]
+
+
+def get_rule_texts(
+    Rule: type[MarkdownCleanupRule], corpus: list[WebsiteContent]
+) -> list[str]:
+    """Return every non-empty text in the corpus that the rule would scan."""
+    texts = []
+    for website_content in corpus:
+        for field in Rule.fields:
+            text = WebsiteContentMarkdownCleaner.get_field_to_change(
+                website_content, field
+            )
+            if isinstance(text, str) and text:
+                texts.append(text)
+    return texts
+
+
+def get_rule_scanner(Rule: type[MarkdownCleanupRule]):
+    """
+    Return a function that counts the matches of the rule's grammar in a text,
+    or None if the rule does not use a grammar.
+
+    Grammars are timed without instantiating the rule, since most rules load
+    lookup tables from the database on init.
+    """
+    if issubclass(Rule, PyparsingRule):
+        parser = get_parser(Rule.Parser)
+
+        def scan_with_parser(text: str) -> int:
+            parser.set_parse_action()
+            return sum(1 for _ in parser.scan_string(text))
+
+        return scan_with_parser
+    if issubclass(Rule, RegexpCleanupRule):
+        compiled = re.compile(Rule.regex)
+
+        def scan_with_regex(text: str) -> int:
+            return sum(1 for _ in compiled.finditer(text))
+
+        return scan_with_regex
+    return None
+
+
+def benchmark_rules(
+    Rules: list[type[MarkdownCleanupRule]],
+    corpus: list[WebsiteContent],
+    repeat: int = 1,
+) -> list[RuleTiming]:
+    """
+    Time each rule's grammar over the corpus. The best of `repeat` runs is
+    reported for each rule.
+    """
+    timings = []
+    for Rule in Rules:
+        scan = get_rule_scanner(Rule)
+        if scan is None:
+            continue
+        texts = get_rule_texts(Rule, corpus)
+        best = None
+        matches = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matches = sum(scan(text) for text in texts)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(
+            RuleTiming(
+                alias=Rule.alias,
+                texts=len(texts),
+                characters=sum(len(text) for text in texts),
+                matches=matches,
+                seconds=best or 0.0,
+            )
+        )
+    return timings
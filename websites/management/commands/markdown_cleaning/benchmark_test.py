@@ -0,0 +1,52 @@
+import json
+
+from websites.management.commands.markdown_cleaning.benchmark import (
+    benchmark_rules,
+    load_corpus,
+)
+from websites.management.commands.markdown_cleaning.rules import (
+    LinkUnescapeRule,
+    NavItemToExternalResourceRule,
+    ShortcodeLoggingRule,
+)
+
+
+def test_benchmark_rules(tmp_path):
+    """benchmark_rules should time each grammar-based rule over the corpus."""
+    corpus_path = tmp_path / "corpus.json"
+    corpus_path.write_text(
+        json.dumps(
+            [
+                {
+                    "model": "websites.websitecontent",
+                    "fields": {
+                        "markdown": "A {{< sup 2 >}} and [link](url) {{< sub 1 >}}",
+                        "metadata": {},
+                    },
+                },
+                {
+                    "model": "websites.websitecontent",
+                    "fields": {"markdown": None, "metadata": None},
+                },
+                {"model": "websites.website", "fields": {"name": "ignored"}},
+            ]
+        )
+    )
+    corpus = load_corpus(str(corpus_path))
+    assert len(corpus) == 2
+
+    timings = benchmark_rules(
+        [ShortcodeLoggingRule, LinkUnescapeRule, NavItemToExternalResourceRule],
+        corpus,
+        repeat=2,
+    )
+
+    assert [timing.alias for timing in timings] == [
+        ShortcodeLoggingRule.alias,
+        LinkUnescapeRule.alias,
+    ]
+    shortcode_timing = timings[0]
+    assert shortcode_timing.texts == 1
+    assert shortcode_timing.matches == 2
+    assert shortcode_timing.seconds >= 0
+    assert shortcode_timing.ms_per_kb >= 0
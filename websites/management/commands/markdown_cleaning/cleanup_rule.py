@@ -3,6 +3,8 @@ import re
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Union
 
+from websites.management.commands.markdown_cleaning.parsing_utils import get_parser
+
 if TYPE_CHECKING:
     from pyparsing import ParseResults
 
@@ -135,7 +137,7 @@ class PyparsingRule(MarkdownCleanupRule):
 
     def __init__(self) -> None:
         super().__init__()
-        self.parser = self.Parser()
+        self.parser = get_parser(self.Parser)
 
     def should_parse(self, _text: str):
         """
@@ -67,3 +67,10 @@ HUGO_SUB_UNQUOTED_PATTERN = re.compile(r'\{\{<\s*sub\s+([^\s">]+)\s*>\}\}')
 
 # Maximum iterations for nested shortcode conversion to prevent infinite loops
 MAX_SHORTCODE_CONVERSION_ITERATIONS = 5
+
+# Size limit for pyparsing's packrat memoization cache, if it is enabled via
+# parsing_utils.enable_packrat.
+PACKRAT_CACHE_SIZE = 1024
+
+# Maximum number of distinct compiled grammars kept in the parser registry.
+PARSER_REGISTRY_MAX_SIZE = 16
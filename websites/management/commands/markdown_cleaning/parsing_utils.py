@@ -1,5 +1,6 @@
 import re
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from typing import ClassVar, Union
 from uuid import UUID
 
@@ -12,6 +13,8 @@ from websites.management.commands.markdown_cleaning.constants import (
     HUGO_SUP_QUOTED_PATTERN,
     HUGO_SUP_UNQUOTED_PATTERN,
     MAX_SHORTCODE_CONVERSION_ITERATIONS,
+    PACKRAT_CACHE_SIZE,
+    PARSER_REGISTRY_MAX_SIZE,
 )
 
 INITIAL_DEFAULT_WHITESPACE_CHARS = ParserElement.DEFAULT_WHITE_CHARS
@@ -79,6 +82,48 @@ class WrappedParser:
         return self.grammar.scan_string(string)
 
 
+def enable_packrat(cache_size: int = PACKRAT_CACHE_SIZE):
+    """
+    Enable pyparsing's packrat memoization with a bounded cache.
+
+    This is process-wide and off by default: the link and shortcode grammars
+    scan character-by-character and rarely revisit a location, so the cache
+    bookkeeping usually costs more than it saves. Use the
+    benchmark_markdown_cleanup command to compare before turning it on.
+    Left-recursion memoization is not offered since none of the grammars are
+    left-recursive and pyparsing does not allow both at once.
+    """
+    ParserElement.enable_packrat(cache_size_limit=cache_size)
+
+
+@lru_cache(maxsize=PARSER_REGISTRY_MAX_SIZE)
+def _build_parser(parser_class, kwargs: tuple) -> WrappedParser:
+    """Build a parser for the registry. Only called on a registry miss."""
+    return parser_class(**dict(kwargs))
+
+
+def get_parser(parser_factory, **kwargs) -> WrappedParser:
+    """
+    Return a shared, lazily compiled parser instance.
+
+    Grammars are expensive to construct, so parsers are compiled once per
+    (parser class, kwargs) combination and then reused.
+
+    Args:
+        parser_factory: A WrappedParser subclass, or a functools.partial of
+            one (as used by PyparsingRule.Parser).
+        kwargs: Keyword arguments passed to the parser constructor.
+
+    Note: Parse actions are set on the shared instance, so callers must set
+    their own parse actions before each use (PyparsingRule.transform_text
+    already does this).
+    """
+    if isinstance(parser_factory, partial):
+        kwargs = {**parser_factory.keywords, **kwargs}
+        parser_factory = parser_factory.func
+    return _build_parser(parser_factory, tuple(sorted(kwargs.items())))
+
+
 def escape_double_quotes(s: str):
     """Encase `s` in double quotes and escape double quotes within `s`."""
     return s.replace('"', '\\"')
@@ -1,9 +1,12 @@
 import uuid
+from functools import partial
 
 import pytest
 
+from websites.management.commands.markdown_cleaning.link_parser import LinkParser
 from websites.management.commands.markdown_cleaning.parsing_utils import (
     convert_shortcodes_to_html,
+    get_parser,
     unescape_quoted_string,
 )
 from websites.management.commands.markdown_cleaning.shortcode_parser import (
@@ -475,3 +478,24 @@ def test_convert_shortcodes_to_html(input_text, expected_output):
     """Test that convert_shortcodes_to_html converts Hugo shortcodes to HTML."""
     result = convert_shortcodes_to_html(input_text)
     assert result == expected_output
+
+
+def test_get_parser_reuses_instances():
+    """get_parser should compile each parser/kwargs combination only once."""
+    shortcode_parser = get_parser(ShortcodeParser)
+    assert get_parser(ShortcodeParser) is shortcode_parser
+    assert get_parser(LinkParser) is not get_parser(LinkParser, recursive=True)
+    assert get_parser(LinkParser, recursive=True) is get_parser(
+        partial(LinkParser, recursive=True)
+    )
+
+
+def test_get_parser_shared_instance_parses():
+    """A shared parser should keep working across parse action changes."""
+    parser = get_parser(ShortcodeParser)
+    parser.set_parse_action(lambda s, l, toks: "replaced")  # noqa: ARG005, E741
+    assert parser.transform_string("a {{< sup 2 >}} b") == "a replaced b"
+    parser.set_parse_action()
+    assert parser.parse_string("{{< sup 2 >}}").shortcode == ShortcodeTag(
+        "sup", [ShortcodeParam("2")]
+    )
@@ -4,6 +4,7 @@ import csv
 import re
 import sys
 from collections import Counter
+from itertools import chain
 from typing import NamedTuple
 
 from django.conf import settings
@@ -11,7 +12,8 @@ from django.core.management.base import CommandError
 from django.db import transaction
 
 from gdrive_sync.models import DriveFile
-from main.management.commands.filter import WebsiteFilterCommand
+from main.constants import DEFAULT_BATCH_SIZE
+from main.management.commands.filter import WebsiteFilterCommand, keyset_batches
 from main.s3_utils import get_boto3_client
 from websites.models import Website, WebsiteContent
 
@@ -55,7 +57,7 @@ def strip_uuid_prefix(path):
     return f"{lead}{new_path}"
 
 
-def _collect_renames(queryset):
+def _collect_renames(queryset, batch_size=DEFAULT_BATCH_SIZE):
     """
     Scan *queryset* for WebsiteContent records whose file basename has a UUID
     prefix and return the planned renames.
@@ -71,6 +73,8 @@ def _collect_renames(queryset):
 
     Pre-fetches all existing file→pk mappings once upfront so the per-record
     conflict check is an O(1) dict lookup rather than an individual DB query.
+    The queryset itself is scanned in keyset-paginated batches of *batch_size*,
+    loading only the columns needed to plan renames.
     """
     skipped = 0
     # Restrict conflict detection to the websites present in the queryset.
@@ -87,7 +91,10 @@ def _collect_renames(queryset):
 
     # Pass 1: collect all candidates that have a strippable UUID prefix.
     candidates = []
-    for content in queryset.iterator():
+    batches = keyset_batches(
+        queryset, batch_size=batch_size, fields=("id", "website", "file")
+    )
+    for content in chain.from_iterable(batches):
         old_key = str(content.file)
         new_key = strip_uuid_prefix(old_key)
 
@@ -243,7 +250,9 @@ class Command(WebsiteFilterCommand):
         )
 
         # --- Discovery phase (no S3/DB writes) ---
-        renames, skipped_count = _collect_renames(contents)
+        renames, skipped_count = _collect_renames(
+            contents, batch_size=options["batch_size"]
+        )
 
         if dry_run:
             output_path = options.get("output")
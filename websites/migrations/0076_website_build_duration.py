@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("websites", "0075_remove_video_file_path_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="website",
+            name="draft_build_duration",
+            field=models.DurationField(
+                blank=True,
+                help_text=(
+                    "How long the latest successful draft build took, from its "
+                    "started status to its succeeded status. Used to schedule "
+                    "draft mass builds."
+                ),
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="website",
+            name="live_build_duration",
+            field=models.DurationField(
+                blank=True,
+                help_text=(
+                    "How long the latest successful live build took, from its "
+                    "started status to its succeeded status. Used to schedule "
+                    "live mass builds."
+                ),
+                null=True,
+            ),
+        ),
+    ]
@@ -130,6 +130,14 @@ class Website(TimestampedModel):
         on_delete=models.SET_NULL,
         related_name="live_publisher",
     )
+    live_build_duration = models.DurationField(
+        null=True,
+        blank=True,
+        help_text=(
+            "How long the latest successful live build took, from its started "
+            "status to its succeeded status. Used to schedule live mass builds."
+        ),
+    )
 
     # Draft publish fields
     draft_publish_date = models.DateTimeField(null=True, blank=True)
@@ -160,6 +168,15 @@ class Website(TimestampedModel):
         related_name="draft_publisher",
     )
 
+    draft_build_duration = models.DurationField(
+        null=True,
+        blank=True,
+        help_text=(
+            "How long the latest successful draft build took, from its started "
+            "status to its succeeded status. Used to schedule draft mass builds."
+        ),
+    )
+
     # Unpublish fields
     unpublish_status = models.CharField(  # noqa: DJ001
         max_length=20,
@@ -4,12 +4,14 @@ import logging
 import re
 from collections import defaultdict
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import F, Q, QuerySet
+from django.db.models.fields.json import KT
 from django.utils.text import slugify
 from guardian.shortcuts import get_groups_with_perms, get_users_with_perms
 from rest_framework import serializers
@@ -44,6 +46,9 @@ from websites.permissions import is_global_admin, is_site_admin
 from websites.site_config_api import SiteConfig
 from websites.utils import permissions_group_name_for_role
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 log = logging.getLogger(__name__)
 
 
@@ -204,6 +209,36 @@ class WebsiteMassBuildSerializer(serializers.ModelSerializer):
             return ""
         return self.get_site_url(instance)
 
+    @staticmethod
+    def iter_values(websites: QuerySet, chunk_size: int = 2000) -> Iterator[dict]:
+        """
+        Yield the serialized data of each website from a single query of the columns
+        it needs, streamed from the database in chunks, without model instances.
+        """
+        for values in websites.values(
+            "name",
+            "short_id",
+            "url_path",
+            starter_slug=F("starter__slug"),
+            root_url_path=KT(
+                f"starter__config__{constants.WEBSITE_CONFIG_ROOT_URL_PATH_KEY}"
+            ),
+        ).iterator(chunk_size=chunk_size):
+            # Same as Website.s3_path, whose SiteConfig strips the root url path
+            url_parts = [(values["root_url_path"] or "").strip("/"), values["name"]]
+            yield {
+                "name": values["name"],
+                "short_id": values["short_id"],
+                "starter_slug": values["starter_slug"],
+                "site_url": values["url_path"],
+                "base_url": (
+                    ""
+                    if values["name"] == settings.ROOT_WEBSITE_NAME
+                    else values["url_path"]
+                ),
+                "s3_path": "/".join([part.strip("/") for part in url_parts if part]),
+            }
+
     class Meta:
         model = Website
         fields = ["name", "short_id", "starter_slug", "site_url", "base_url", "s3_path"]
@@ -221,15 +256,19 @@ class WebsiteUnpublishSerializer(serializers.ModelSerializer):
         return instance.url_path
 
     def get_site_uid(self, instance):
-        """Get the website uid"""
-        meta_content = WebsiteContent.objects.filter(  # noqa: ORM001
-            type=CONTENT_TYPE_METADATA, website=instance
-        ).first()
-        legacy_uid = (
-            meta_content.metadata.get("legacy_uid", "")
-            if meta_content is not None
-            else ""
-        ).replace("-", "")
+        """Get the website uid, from the legacy_uid annotation if there is one"""
+        if hasattr(instance, "legacy_uid"):
+            legacy_uid = instance.legacy_uid or ""
+        else:
+            meta_content = WebsiteContent.objects.filter(  # noqa: ORM001
+                type=CONTENT_TYPE_METADATA, website=instance
+            ).first()
+            legacy_uid = (
+                meta_content.metadata.get("legacy_uid", "")
+                if meta_content is not None
+                else ""
+            )
+        legacy_uid = legacy_uid.replace("-", "")
         return legacy_uid or instance.uuid.hex
 
     class Meta:
@@ -37,7 +37,7 @@ from websites.factories import (
     WebsiteFactory,
     WebsiteStarterFactory,
 )
-from websites.models import WebsiteContent, WebsiteStarter
+from websites.models import Website, WebsiteContent, WebsiteStarter
 from websites.serializers import (
     ExportWebsiteContentSerializer,
     ExportWebsiteSerializer,
@@ -715,6 +715,22 @@ def test_website_publish_serializer_base_url(settings, is_root_site):
     assert serializer.data["base_url"] == ("" if is_root_site else site.url_path)
 
 
+@pytest.mark.parametrize("root_url_path", ["/courses/", "/", ""])
+def test_website_mass_build_serializer_iter_values(settings, root_url_path):
+    """WebsiteMassBuildSerializer.iter_values should yield the same data as the serializer"""
+    starter = WebsiteStarterFactory.create(
+        config={**WebsiteStarterFactory.build().config, "root-url-path": root_url_path}
+    )
+    sites = WebsiteFactory.create_batch(3, starter=starter, with_url_path=True)
+    settings.ROOT_WEBSITE_NAME = sites[0].name
+    websites = Website.objects.filter(pk__in=[site.pk for site in sites]).order_by(
+        "name"
+    )
+    assert list(WebsiteMassBuildSerializer.iter_values(websites, chunk_size=2)) == [
+        dict(data) for data in WebsiteMassBuildSerializer(websites, many=True).data
+    ]
+
+
 @pytest.mark.parametrize("has_metadata", [True, False])
 @pytest.mark.parametrize("has_legacy_uid", [True, False])
 def test_website_unpublish_serializer(has_legacy_uid, has_metadata):
@@ -1,14 +1,40 @@
 """Views for websites"""
 
+import hashlib
 import json
 import logging
 import os
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_right
+from itertools import batched
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.contrib.auth.models import Group
+from django.contrib.postgres.aggregates import StringAgg
 from django.contrib.postgres.search import SearchQuery, SearchVector
-from django.db.models import Case, CharField, F, OuterRef, Prefetch, Q, Value, When
+from django.core.cache import caches
+from django.db.models import (
+    Case,
+    CharField,
+    Count,
+    F,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+from django.db.models.fields.json import KT
+from django.db.models.functions import MD5, Cast, Collate, Concat
+from django.http import StreamingHttpResponse
 from django.utils.functional import cached_property
+from django.utils.http import parse_etags, quote_etag
 from django.utils.text import slugify
 from guardian.shortcuts import get_groups_with_perms, get_objects_for_user
 from mitol.common.utils.datetime import now_in_utc
@@ -17,6 +43,7 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_extensions.mixins import NestedViewSetMixin
 
 from content_sync.api import (
@@ -39,9 +66,11 @@ from main.views import DefaultPagination
 from users.models import User
 from websites import constants
 from websites.api import (
+    WebsiteStatusUpdate,
     get_valid_new_filename,
     sync_website_content_references,
     update_website_status,
+    update_website_statuses,
 )
 from websites.constants import (
     CONTENT_TYPE_COURSE_LIST,
@@ -93,6 +122,9 @@ from websites.utils import (
     permissions_group_name_for_role,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
 log = logging.getLogger(__name__)
 
 
@@ -348,6 +380,65 @@ class WebsiteViewSet(
 
         return Response(status=200)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[BearerTokenPermission],
+        url_path="pipeline_statuses",
+    )
+    def pipeline_statuses(self, request):
+        """
+        Process a batch of webhook requests from concourse pipeline runs. Each status
+        has the same fields as a pipeline_status request, plus the website name.
+        Only the last status for each website and version is applied.
+        """
+        statuses = (
+            request.data.get("statuses")
+            if isinstance(request.data, dict)
+            else request.data
+        )
+        if not isinstance(statuses, list):
+            raise ValidationError({"statuses": "Expected a list of statuses"})
+        latest_statuses = {}
+        for data in statuses:
+            if (
+                not isinstance(data, dict)
+                or not data.get("name")
+                or data.get("version") not in (VERSION_DRAFT, VERSION_LIVE)
+            ):
+                raise ValidationError({"statuses": f"Invalid status: {data}"})
+            if (
+                data.get("build_type") == "offline"
+                or data.get("theme_slug") in settings.OCW_EXTRA_COURSE_THEMES
+            ):
+                continue
+            latest_statuses[(data["name"], data["version"])] = data
+        websites = Website.objects.select_related(
+            "draft_last_published_by", "live_last_published_by", "last_unpublished_by"
+        ).in_bulk({name for name, _ in latest_statuses}, field_name="name")
+        status_updates = [
+            WebsiteStatusUpdate(
+                websites[name],
+                version,
+                data.get("status"),
+                build_id=data.get("build_id"),
+                unpublished=data.get("unpublished", False),
+                is_cdn_cache_step=data.get("is_cdn_cache_step", False),
+            )
+            for (name, version), data in latest_statuses.items()
+            if name in websites
+        ]
+        update_website_statuses(status_updates, now_in_utc())
+        return Response(
+            status=200,
+            data={
+                "updated": len(status_updates),
+                "missing": sorted(
+                    {name for name, _ in latest_statuses} - websites.keys()
+                ),
+            },
+        )
+
     @action(detail=True, methods=["get"], permission_classes=[BearerTokenPermission])
     def hide_download(self, request, name=None):  # noqa: ARG002
         """Process webhook requests from concourse pipeline runs"""
@@ -398,22 +489,174 @@ class WebsiteViewSet(
             )
 
 
-class WebsiteMassBuildViewSet(viewsets.ViewSet):
+class PipelineSiteListMixin:
+    """
+    Serve a list of sites to a pipeline from a cached payload.
+
+    The payload is cached under a fingerprint of the listed sites, computed with a
+    single aggregate query, so it is rebuilt whenever a site is added to or removed
+    from the list or has been saved since. The fingerprint is also the ETag of the
+    response, so a pipeline that sends it back in If-None-Match gets a 304 until
+    the list changes. Pipelines can pass page_size to get the sites a page at a
+    time, then follow the next cursor URL. Unpaginated responses can be streamed,
+    so that the first sites are sent while the rest are still being read.
+    """
+
+    cache_key_prefix = None
+    fingerprint_fields = ("name", "url_path")
+    # Whether to stream unpaginated responses rather than render them with DRF
+    stream_payload = False
+    stream_batch_size = 500
+
+    def get_sites(self) -> QuerySet:
+        """Return the sites to list"""
+        raise NotImplementedError
+
+    def get_fingerprint(self, sites: QuerySet) -> dict:
+        """
+        Return aggregates of the sites that change whenever the payload does. The
+        fingerprint fields are digested as well as the latest updated_on, because
+        QuerySet.update() does not touch updated_on.
+        """
+        values = []
+        for field in self.fingerprint_fields:
+            values += [Value(":"), Cast(field, TextField())]
+        return sites.aggregate(
+            count=Count("pk"),
+            digest=MD5(
+                StringAgg(
+                    Concat(*values[1:], output_field=TextField()),
+                    ",",
+                    order_by="name",
+                )
+            ),
+            updated_on=Max("updated_on"),
+            starter_updated_on=Max("starter__updated_on"),
+        )
+
+    def serialize_sites(self, sites: QuerySet) -> Iterable[dict]:
+        """Return the payload for the sites, one dict with a name per site"""
+        raise NotImplementedError
+
+    def cache_sites(self, cache_key: str, sites: QuerySet) -> Iterator[dict]:
+        """Yield the payload for the sites, then cache it"""
+        payload = []
+        for site in self.serialize_sites(sites):
+            payload.append(site)
+            yield site
+        caches["redis"].set(
+            cache_key,
+            sorted(payload, key=itemgetter("name")),
+            settings.PIPELINE_SITE_LIST_CACHE_TIMEOUT,
+        )
+
+    def stream_sites(self, payload: Iterable[dict]) -> Iterator[str]:
+        """Yield the payload as compact JSON, a batch of sites at a time"""
+        yield '{"sites":['
+        separator = ""
+        for batch in batched(payload, self.stream_batch_size, strict=False):
+            yield separator + ",".join(
+                json.dumps(site, separators=(",", ":")) for site in batch
+            )
+            separator = ","
+        yield "]}"
+
+    def list(self, request):
+        """Return the sites, or a 304 if the request has a matching ETag"""
+        sites = self.get_sites()
+        fingerprint = self.get_fingerprint(sites)
+        digest = hashlib.sha256(
+            json.dumps(
+                [self.cache_key_prefix, settings.ROOT_WEBSITE_NAME, fingerprint],
+                default=str,
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+        try:
+            page_size = min(
+                int(request.query_params.get("page_size", 0)),
+                settings.PIPELINE_SITE_LIST_MAX_PAGE_SIZE,
+            )
+        except ValueError as exc:
+            msg = "Invalid page_size"
+            raise ValidationError(msg) from exc
+        cursor = request.query_params.get("cursor")
+        etag = quote_etag(
+            hashlib.sha256(f"{digest}:{page_size}:{cursor}".encode()).hexdigest()
+        )
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        cache_key = f"{self.cache_key_prefix}-{digest}"
+        payload = caches["redis"].get(cache_key)
+        if page_size <= 0 and self.stream_payload:
+            return StreamingHttpResponse(
+                self.stream_sites(
+                    payload
+                    if payload is not None
+                    else self.cache_sites(cache_key, sites)
+                ),
+                content_type="application/json",
+                headers={"ETag": etag},
+            )
+        if payload is None:
+            # Sorted here rather than by the database, so that the cursor lookup
+            # uses the same collation as the ordering
+            payload = sorted(self.serialize_sites(sites), key=itemgetter("name"))
+            caches["redis"].set(
+                cache_key, payload, settings.PIPELINE_SITE_LIST_CACHE_TIMEOUT
+            )
+        if page_size <= 0:
+            return Response({"sites": payload}, headers={"ETag": etag})
+
+        start = 0
+        if cursor:
+            try:
+                after_name = urlsafe_b64decode(cursor.encode()).decode()
+            except (ValueError, UnicodeDecodeError) as exc:
+                msg = "Invalid cursor"
+                raise ValidationError(msg) from exc
+            start = bisect_right(payload, after_name, key=itemgetter("name"))
+        page = payload[start : start + page_size]
+        next_url = (
+            replace_query_param(
+                request.build_absolute_uri(),
+                "cursor",
+                urlsafe_b64encode(page[-1]["name"].encode()).decode(),
+            )
+            if start + page_size < len(payload)
+            else None
+        )
+        return Response({"sites": page, "next": next_url}, headers={"ETag": etag})
+
+
+class WebsiteMassBuildViewSet(PipelineSiteListMixin, viewsets.ViewSet):
     """Return a list of previously published sites, with the info required by the mass-build-sites pipeline"""  # noqa: E501
 
     serializer_class = WebsiteMassBuildSerializer
     permission_classes = (BearerTokenPermission,)
+    cache_key_prefix = "mass-build-sites"
+    stream_payload = True
 
-    def list(self, request):  # noqa: ARG002
-        """Return a list of websites that have been previously published, per version"""
+    @property
+    def fingerprint_fields(self):
+        """Also cover the short_id and the publish date of each site"""
+        return ("name", "url_path", "short_id", self.publish_date_field)
+
+    @property
+    def publish_date_field(self):
+        """Return the publish date field for the requested version"""
         version = self.request.query_params.get("version")
-        starter = self.request.query_params.get("starter")
         if version not in (VERSION_LIVE, VERSION_DRAFT):
             msg = "Invalid version"
             raise ValidationError(msg)
-        publish_date_field = (
-            "publish_date" if version == VERSION_LIVE else "draft_publish_date"
-        )
+        return "publish_date" if version == VERSION_LIVE else "draft_publish_date"
+
+    def get_sites(self) -> QuerySet:
+        """Return a list of websites that have been previously published, per version"""
+        version = self.request.query_params.get("version")
+        starter = self.request.query_params.get("starter")
+        publish_date_field = self.publish_date_field
 
         # Get all sites, minus any sites that have never been successfully published
         sites = Website.objects.exclude(
@@ -426,31 +669,60 @@ class WebsiteMassBuildViewSet(viewsets.ViewSet):
         if starter:
             sites = sites.filter(starter=WebsiteStarter.objects.get(slug=starter))
         # Exclude the test sites from the mass build
-        sites = sites.exclude(name__in=settings.OCW_TEST_SITE_SLUGS)
-        sites = sites.prefetch_related("starter").order_by("name")
-        serializer = WebsiteMassBuildSerializer(instance=sites, many=True)
-        return Response({"sites": serializer.data})
+        return sites.exclude(name__in=settings.OCW_TEST_SITE_SLUGS)
+
+    def serialize_sites(self, sites: QuerySet) -> Iterator[dict]:
+        """
+        Serialize the sites in codepoint order of their names. That is the order of
+        the cached payload, so a streamed response has the same body whether or not
+        it was cached.
+        """
+        return WebsiteMassBuildSerializer.iter_values(
+            sites.order_by(Collate("name", "C"))
+        )
 
 
-class WebsiteUnpublishViewSet(viewsets.ViewSet):
+class WebsiteUnpublishViewSet(PipelineSiteListMixin, viewsets.ViewSet):
     """
     Return a list of sites that need to be unpublished, with the info required by the remove-unpublished-sites pipeline
     """  # noqa: E501
 
     permission_classes = (BearerTokenPermission,)
+    cache_key_prefix = "unpublished-sites"
 
-    def list(self, request):  # noqa: ARG002
+    def get_sites(self) -> QuerySet:
         """Return a list of websites that need to be processed by the remove-unpublished-sites pipeline"""  # noqa: E501
-        sites = (
-            Website.objects.exclude(
-                Q(unpublish_status=PUBLISH_STATUS_SUCCEEDED)
-                | Q(unpublish_status__isnull=True)
+        return Website.objects.exclude(
+            Q(unpublish_status=PUBLISH_STATUS_SUCCEEDED)
+            | Q(unpublish_status__isnull=True)
+        )
+
+    def get_fingerprint(self, sites: QuerySet) -> dict:
+        """Also cover the sitemetadata, which the site uids come from"""
+        return {
+            **super().get_fingerprint(sites),
+            **sites.aggregate(
+                metadata_updated_on=Max(
+                    "websitecontent__updated_on",
+                    filter=Q(websitecontent__type=CONTENT_TYPE_METADATA),
+                )
+            ),
+        }
+
+    def serialize_sites(self, sites: QuerySet) -> list[dict]:
+        """Serialize the sites, with the legacy uid of each one"""
+        sites = sites.annotate(
+            legacy_uid=Subquery(
+                WebsiteContent.objects.filter(
+                    website=OuterRef("pk"), type=CONTENT_TYPE_METADATA
+                )
+                .order_by("pk")
+                .values(uid=KT("metadata__legacy_uid"))[:1]
             )
-            .prefetch_related("starter")
-            .order_by("name")
         )
-        serializer = WebsiteUnpublishSerializer(instance=sites, many=True)
-        return Response({"sites": serializer.data})
+        return [
+            dict(site) for site in WebsiteUnpublishSerializer(sites, many=True).data
+        ]
 
 
 class WebsiteStarterViewSet(
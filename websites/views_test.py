@@ -1,6 +1,7 @@
 """Tests for websites views"""
 
 import datetime
+import json
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -36,6 +37,7 @@ from websites.models import Website, WebsiteContent
 from websites.serializers import (
     WebsiteContentDetailSerializer,
     WebsiteDetailSerializer,
+    WebsiteMassBuildSerializer,
     WebsiteStarterDetailSerializer,
     WebsiteStarterSerializer,
     WebsiteStatusSerializer,
@@ -1595,7 +1597,7 @@ def test_mass_build_endpoint_list(settings, drf_client, version, unpublished):
     drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {settings.API_BEARER_TOKEN}")
     resp = drf_client.get(f"{reverse('mass_build_api-list')}?version={version}")
     assert resp.status_code == 200
-    site_dict = {site["name"]: site for site in resp.data["sites"]}
+    site_dict = {site["name"]: site for site in get_streamed_json(resp)["sites"]}
     if not unpublished or version == VERSION_DRAFT:
         assert len(site_dict.keys()) == 2
         for expected_site in expected_sites:
@@ -1656,6 +1658,121 @@ def test_unpublished_removal_endpoint_list(settings, drf_client):
         assert publish_site["site_uid"] == expected_site.uuid.hex
 
 
+def get_streamed_json(resp):
+    """Return the JSON content of a streaming response"""
+    return json.loads(b"".join(resp.streaming_content))
+
+
+@pytest.fixture
+def site_list_client(settings, drf_client):
+    """Return a client for the pipeline site list endpoints, with a local memory cache"""
+    settings.CACHES = {
+        **settings.CACHES,
+        "redis": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    settings.API_BEARER_TOKEN = "abc123"  # noqa: S105
+    drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {settings.API_BEARER_TOKEN}")
+    return drf_client
+
+
+def test_mass_build_endpoint_list_etag(mocker, site_list_client):
+    """The mass build endpoint should cache its payload and return a 304 for a matching ETag"""
+    sites = WebsiteFactory.create_batch(
+        2, publish_date=now_in_utc(), unpublish_status=None, with_url_path=True
+    )
+    url = f"{reverse('mass_build_api-list')}?version={VERSION_LIVE}"
+    resp = site_list_client.get(url)
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+    data = get_streamed_json(resp)
+    mock_serialize = mocker.spy(WebsiteMassBuildSerializer, "iter_values")
+    assert get_streamed_json(site_list_client.get(url)) == data
+    assert site_list_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    mock_serialize.assert_not_called()
+
+    Website.objects.filter(pk=sites[0].pk).update(url_path="courses/new-path")
+    resp = site_list_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+    assert {site["name"]: site for site in get_streamed_json(resp)["sites"]}[
+        sites[0].name
+    ]["site_url"] == "courses/new-path"
+
+
+def test_mass_build_endpoint_list_pages(settings, site_list_client):
+    """The mass build endpoint should return pages of sites with a cursor to the next one"""
+    settings.PIPELINE_SITE_LIST_MAX_PAGE_SIZE = 2
+    sites = WebsiteFactory.create_batch(
+        5, draft_publish_date=now_in_utc(), with_url_path=True
+    )
+    url = f"{reverse('mass_build_api-list')}?version={VERSION_DRAFT}&page_size=3"
+    names = []
+    while url:
+        resp = site_list_client.get(url)
+        assert resp.status_code == 200
+        assert len(resp.data["sites"]) <= 2
+        names += [site["name"] for site in resp.data["sites"]]
+        url = resp.data["next"]
+    assert names == sorted(site.name for site in sites)
+
+
+def test_mass_build_endpoint_list_order(site_list_client):
+    """Streamed responses should list the sites in the same order whether or not they were cached"""
+    for name in ["b-site", "B-site", "a-site"]:
+        WebsiteFactory.create(
+            name=name,
+            publish_date=now_in_utc(),
+            unpublish_status=None,
+            with_url_path=True,
+        )
+    url = f"{reverse('mass_build_api-list')}?version={VERSION_LIVE}"
+    names = [
+        site["name"] for site in get_streamed_json(site_list_client.get(url))["sites"]
+    ]
+    assert names == ["B-site", "a-site", "b-site"]
+    assert (
+        get_streamed_json(site_list_client.get(url))["sites"]
+        == (site_list_client.get(f"{url}&page_size=3").data["sites"])
+    )
+    assert [
+        site["name"] for site in get_streamed_json(site_list_client.get(url))["sites"]
+    ] == names
+
+
+def test_mass_build_endpoint_list_bad_cursor(site_list_client):
+    """The mass build endpoint should return a 400 for an invalid cursor"""
+    resp = site_list_client.get(
+        f"{reverse('mass_build_api-list')}?version={VERSION_LIVE}&page_size=2&cursor=a"
+    )
+    assert resp.status_code == 400
+
+
+def test_unpublished_removal_endpoint_list_legacy_uid(
+    django_assert_max_num_queries, site_list_client
+):
+    """The unpublished removal endpoint should get legacy uids without a query per site"""
+    sites = WebsiteFactory.create_batch(3, unpublished=True)
+    for site in sites:
+        WebsiteContentFactory.create(
+            type=CONTENT_TYPE_METADATA,
+            website=site,
+            metadata={"legacy_uid": f"{site.short_id}-uid"},
+        )
+    with django_assert_max_num_queries(4):
+        resp = site_list_client.get(reverse("unpublished_removal_api-list"))
+    assert resp.status_code == 200
+    assert {site["name"]: site["site_uid"] for site in resp.data["sites"]} == {
+        site.name: f"{site.short_id}-uid".replace("-", "") for site in sites
+    }
+
+    WebsiteContent.objects.filter(website=sites[0]).first().save()
+    resp = site_list_client.get(
+        reverse("unpublished_removal_api-list"),
+        HTTP_IF_NONE_MATCH=resp.headers["ETag"],
+    )
+    assert resp.status_code == 200
+
+
 @pytest.mark.parametrize("bad_token", ["wrongtoken", None])
 def test_unpublished_removal_endpoint_list_bad_token(settings, drf_client, bad_token):
     """The WebsiteUnpublishViewSet endpoint should return a 403 if the token is invalid or missing"""
@@ -1708,6 +1825,79 @@ def test_pipeline_status_build_type(  # noqa: PLR0913, PLR0917
         mock_update_website_status.assert_not_called()
 
 
+def test_pipeline_statuses(settings, mocker, drf_client):
+    """pipeline_statuses should apply the last status for each website and version"""
+    mocker.patch("websites.api.mail_on_publish")
+    settings.API_BEARER_TOKEN = "test_token"  # noqa: S105
+    settings.OCW_EXTRA_COURSE_THEMES = ["ocw-course-v3"]
+    drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {settings.API_BEARER_TOKEN}")
+    websites = WebsiteFactory.create_batch(3)
+    statuses = [
+        {"name": website.name, "version": VERSION_LIVE, "status": "started"}
+        for website in websites
+    ]
+    statuses.extend(
+        [
+            {"name": websites[0].name, "version": VERSION_LIVE, "status": "succeeded"},
+            {"name": websites[1].name, "version": VERSION_DRAFT, "status": "errored"},
+            {
+                "name": websites[2].name,
+                "version": VERSION_LIVE,
+                "status": "errored",
+                "build_type": "offline",
+            },
+            {"name": "missing-site", "version": VERSION_LIVE, "status": "started"},
+        ]
+    )
+    resp = drf_client.post(
+        reverse("websites_api-pipeline-statuses"),
+        data={"statuses": statuses},
+        format="json",
+    )
+    assert resp.status_code == 200
+    assert resp.data == {"updated": 4, "missing": ["missing-site"]}
+    for website, live_status, draft_status in zip(
+        websites,
+        ["succeeded", "started", "started"],
+        [websites[0].draft_publish_status, "errored", websites[2].draft_publish_status],
+    ):
+        website.refresh_from_db()
+        assert website.live_publish_status == live_status
+        assert website.draft_publish_status == draft_status
+
+
+@pytest.mark.parametrize(
+    "statuses",
+    [
+        {"name": "site", "version": VERSION_LIVE},
+        [{"version": VERSION_LIVE, "status": "started"}],
+        [{"name": "site", "version": "other", "status": "started"}],
+    ],
+)
+def test_pipeline_statuses_invalid(settings, drf_client, statuses):
+    """pipeline_statuses should reject statuses without a name and version"""
+    settings.API_BEARER_TOKEN = "test_token"  # noqa: S105
+    drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {settings.API_BEARER_TOKEN}")
+    resp = drf_client.post(
+        reverse("websites_api-pipeline-statuses"),
+        data={"statuses": statuses},
+        format="json",
+    )
+    assert resp.status_code == 400
+
+
+def test_pipeline_statuses_denied(settings, drf_client):
+    """pipeline_statuses should raise a permission error without a valid token"""
+    settings.API_BEARER_TOKEN = "test_token"  # noqa: S105
+    drf_client.credentials(HTTP_AUTHORIZATION="Bearer wrong-token")
+    resp = drf_client.post(
+        reverse("websites_api-pipeline-statuses"),
+        data={"statuses": []},
+        format="json",
+    )
+    assert resp.status_code == 403
+
+
 def test_referencing_content_clears_when_references_removed(
     drf_client, global_admin_user
 ):